@@ -0,0 +1,527 @@
+"""
+Cortex Latency Benchmarks
+
+Runs the voice pipeline stage by stage on recorded fixtures and reports
+p50 / p95 / p99 latency per stage. Needs no microphone, speakers or display,
+so it can run on a headless Linux box or in CI.
+
+Stages:
+- asr:     WAV fixtures -> real Listener (VAD + Whisper) through WavReplayBackend
+- nlu:     fixture transcripts + one pattern per intent -> NeuralIntentModel.predict
+- routing: every intent tag -> CortexEngine.execute_intent, with side-effecting
+           engines replaced by stubs (nothing is launched, nothing is spoken)
+- tts:     Piper (raw PCM) or pyttsx3 (to a temp file) rendering into a null sink
+
+Usage:
+    python -m benchmarks.run_benchmarks                    # run and compare to baseline
+    python -m benchmarks.run_benchmarks --save-baseline    # store results as the new baseline
+    python -m benchmarks.run_benchmarks --stages nlu,routing --runs 20
+    python -m benchmarks.run_benchmarks --make-fixtures    # synthesize WAVs from the manifest
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+MANIFEST_PATH = os.path.join(FIXTURES_DIR, "manifest.json")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from core.tracing import get_tracer, now_ns  # noqa: E402
+
+ALL_STAGES = ("asr", "nlu", "routing", "tts")
+
+# Intents that would end the session or rewrite user_config.json
+UNSAFE_ROUTING_TAGS = {"exit", "change_name"}
+
+# Off-vocabulary phrases so the NLU fallback paths get measured too
+NLU_EXTRA_TEXTS = [
+    "",
+    "purple elephants dancing on the moon",
+    "could you maybe perhaps do the thing from yesterday",
+    "hey cortex what is the weather like in tokyo tomorrow morning",
+]
+
+
+# ── Helpers ──
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers (pct in 0..100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples):
+    """Reduces {metric: [ms, ...]} to {metric: {n, p50, p95, p99}}."""
+    return {
+        metric: {
+            "n": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+        }
+        for metric, values in sorted(samples.items()) if values
+    }
+
+
+@contextlib.contextmanager
+def quiet(enabled=True):
+    """Hides the pipeline's console chatter while measuring."""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return []
+    with open(MANIFEST_PATH, "r") as f:
+        return json.load(f).get("fixtures", [])
+
+
+def load_intents():
+    """Returns [(intents file name, intent dict)] from data/intents."""
+    intents = []
+    for path in sorted(glob.glob(os.path.join(ROOT_DIR, "data", "intents", "*.json"))):
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"[Bench] Skipping {os.path.basename(path)}: {e}")
+            continue
+        for intent in data.get("intents", []):
+            intents.append((os.path.basename(path), intent))
+    return intents
+
+
+@contextlib.contextmanager
+def traced(label):
+    """Runs the body inside its own tracer command; result["trace"] holds the finished trace."""
+    tracer = get_tracer()
+    result = {"trace": None}
+    cmd_id = tracer.begin_command(label)
+    try:
+        yield result
+    finally:
+        tracer.end_command(cmd_id)
+        for trace in tracer.recent(limit=8):
+            if trace["id"] == cmd_id:
+                result["trace"] = trace
+                break
+
+
+def collect_spans(trace, samples, prefixes):
+    """Adds the duration (ms) of every span whose name starts with one of prefixes."""
+    if not trace:
+        return
+    for span in trace["spans"]:
+        if span["name"].startswith(prefixes):
+            samples.setdefault(span["name"], []).append((span["end"] - span["start"]) / 1e6)
+
+
+# ── Stages ──
+
+def bench_asr(args):
+    from core.audio_io import WavReplayBackend
+    from core.listening import Listener
+
+    fixtures = [f for f in load_manifest() if os.path.exists(os.path.join(FIXTURES_DIR, f["file"]))]
+    if not fixtures:
+        return None, "no WAV fixtures found (record them or run --make-fixtures)"
+
+    audio = WavReplayBackend(realtime=not args.fast_audio)
+    with quiet(not args.verbose):
+        listener = Listener(audio_backend=audio)
+
+    samples = {}
+    misses = 0
+    for _ in range(args.runs):
+        for fixture in fixtures:
+            audio.load(os.path.join(FIXTURES_DIR, fixture["file"]))
+            start = now_ns()
+            with traced(f"asr:{fixture['file']}") as command, quiet(not args.verbose):
+                text = listener.listen(timeout=5)
+            samples.setdefault("asr.listen_total", []).append((now_ns() - start) / 1e6)
+            collect_spans(command["trace"], samples, ("asr.",))
+            expected = fixture.get("text", "").lower().strip(" .?!")
+            if expected and expected not in (text or "").lower():
+                misses += 1
+
+    listener.terminate()
+    total = len(fixtures) * args.runs
+    note = f"{total - misses}/{total} transcripts contained the expected text"
+    return samples, note
+
+
+def bench_nlu(args):
+    from core.nlu import NeuralIntentModel
+
+    with quiet(not args.verbose):
+        nlu = NeuralIntentModel(data_dir=os.path.join(ROOT_DIR, "data", "intents"))
+
+    texts = [f["text"] for f in load_manifest() if f.get("text")]
+    texts += [intent["patterns"][0] for _, intent in load_intents() if intent.get("patterns")]
+    texts += NLU_EXTRA_TEXTS
+
+    samples = {}
+    with quiet(not args.verbose):
+        # Warm-up so one-time lazy initialisation doesn't land in p99
+        nlu.predict(texts[0])
+        for _ in range(args.runs):
+            for text in texts:
+                with traced("nlu") as command:
+                    nlu.predict(text)
+                collect_spans(command["trace"], samples, ("nlu.",))
+
+    return samples, f"{len(texts)} phrases x {args.runs} runs"
+
+
+class NullSpeaker:
+    """Speaker stand-in that swallows every utterance."""
+
+    def __init__(self):
+        self.spoken = 0
+        self.is_speaking_flag = None
+
+    def speak(self, text, blocking=True):
+        self.spoken += 1
+
+    def stop(self):
+        pass
+
+
+class StubEngine:
+    """Claims a fixed set of intent tags and does nothing with them."""
+
+    def __init__(self, tags):
+        self.tags = set(tags)
+        self.calls = 0
+
+    def handle_intent(self, tag, command=""):
+        if tag in self.tags:
+            self.calls += 1
+            return True
+        return False
+
+
+# Which engine owns the intents of each data/intents file
+ROUTING_OWNERS = {
+    "system.json": "system_engine",
+    "files.json": "file_manager",
+    "apps.json": "application_engine",
+    "workspaces.json": "workspace_engine",
+    "automation.json": "automation_engine",
+    "window.json": "automation_engine",
+    "productivity.json": "automation_engine",
+    "general.json": "general_engine",
+    "media.json": "general_engine",
+}
+
+
+def bench_routing(args):
+    from core.engine import CortexEngine
+    from core.engines.static import StaticCommandEngine
+    from core.startup import LazyEngine
+    from core import tracing
+
+    intents = load_intents()
+    owned = {}
+    for filename, intent in intents:
+        owned.setdefault(ROUTING_OWNERS.get(filename, "general_engine"), set()).add(intent["tag"])
+
+    # Build the engine shell without its constructor (no mic, no TTS worker, no threads)
+    engine = CortexEngine.__new__(CortexEngine)
+    engine.status_queue = None
+    engine.action_queue = None
+    engine.reset_event = None
+    engine.shutdown_event = None
+    engine.tracer = tracing.get_tracer()
+    engine.speaker = NullSpeaker()
+    engine.user_config = {"name": "Benchmark"}
+    engine.dictation_active = False
+    engine.is_on_hold = False
+    engine.system_engine = StubEngine(owned.get("system_engine", ()))
+    engine.file_manager = StubEngine(owned.get("file_manager", ()))
+    engine.application_engine = StubEngine(owned.get("application_engine", ()))
+    workspace_stub = StubEngine(owned.get("workspace_engine", ()))
+    automation_stub = StubEngine(owned.get("automation_engine", ()))
+    engine.workspace_engine = LazyEngine("workspace", lambda: workspace_stub,
+                                         claims=lambda tag: tag.startswith("workspace_"))
+    engine.automation_engine = LazyEngine("automation", lambda: automation_stub,
+                                          claims=engine._is_automation_intent)
+    engine.general_engine = StubEngine(owned.get("general_engine", ()))
+
+    # The real static engine (JSON lookup), minus the command it would run
+    with quiet(not args.verbose):
+        engine.static_engine = StaticCommandEngine(engine.speaker, listener=None)
+    engine.static_engine._run_command = lambda command, title: None
+    static_tags = [key for items in engine.static_engine.commands.values() for key in items]
+
+    tags = [tag for tag in sorted({intent["tag"] for _, intent in intents} | set(static_tags))
+            if tag not in UNSAFE_ROUTING_TAGS]
+    patterns = {intent["tag"]: (intent.get("patterns") or [""])[0] for _, intent in intents}
+
+    samples = {}
+    unrouted = set()
+    with quiet(not args.verbose):
+        for _ in range(args.runs):
+            for tag in tags:
+                with traced(f"route:{tag}") as command:
+                    result = engine.execute_intent(tag, patterns.get(tag, tag.replace("_", " ")))
+                if not result:
+                    unrouted.add(tag)
+                collect_spans(command["trace"], samples, ("engine.",))
+
+    note = f"{len(tags)} tags x {args.runs} runs"
+    if unrouted:
+        note += f", {len(unrouted)} tags not claimed by any engine"
+    return samples, note
+
+
+def find_piper():
+    """Returns (piper binary, voice model) if Piper can be used here, else (None, None)."""
+    if platform.system() == "Windows":
+        binary = os.path.join(ROOT_DIR, "piper_engine", "piper_windows", "piper", "piper.exe")
+    else:
+        binary = os.path.join(ROOT_DIR, "piper_engine", "piper", "piper")
+    if not (os.path.exists(binary) and os.access(binary, os.X_OK)):
+        return None, None
+    models = sorted(glob.glob(os.path.join(ROOT_DIR, "piper_engine", "voices", "*.onnx")))
+    if not models:
+        return None, None
+    return binary, models[0]
+
+
+def bench_tts(args):
+    texts = [f["text"] for f in load_manifest() if f.get("text")] or ["Executing system check."]
+    samples = {}
+
+    piper, model = find_piper()
+    if piper:
+        for _ in range(args.runs):
+            for text in texts:
+                start = now_ns()
+                proc = subprocess.Popen([piper, "--model", model, "--output_raw"],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL)
+                proc.stdin.write(text.encode("utf-8"))
+                proc.stdin.close()
+                first = None
+                # Null sink: read the PCM stream as the worker would and discard it
+                while True:
+                    data = proc.stdout.read(4096)
+                    if not data:
+                        break
+                    if first is None:
+                        first = now_ns()
+                proc.wait()
+                end = now_ns()
+                samples.setdefault("tts.first_audio", []).append(((first or end) - start) / 1e6)
+                samples.setdefault("tts.render_total", []).append((end - start) / 1e6)
+        return samples, f"piper ({os.path.basename(model)})"
+
+    try:
+        import pyttsx3
+    except ImportError:
+        return None, "no Piper voice model and pyttsx3 is not installed"
+
+    try:
+        with quiet(not args.verbose):
+            engine = pyttsx3.init()
+    except Exception as e:
+        return None, f"pyttsx3 failed to initialise: {e}"
+
+    # pyttsx3 can't stream, so time-to-first-audio is the full render
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = os.path.join(tmp, "null.wav")
+        for _ in range(args.runs):
+            for text in texts:
+                start = now_ns()
+                engine.save_to_file(text, out_path)
+                engine.runAndWait()
+                samples.setdefault("tts.render_total", []).append((now_ns() - start) / 1e6)
+    return samples, "pyttsx3 (render to file)"
+
+
+STAGE_RUNNERS = {
+    "asr": bench_asr,
+    "nlu": bench_nlu,
+    "routing": bench_routing,
+    "tts": bench_tts,
+}
+
+
+# ── Fixtures ──
+
+def make_fixtures():
+    """Synthesizes any missing WAV fixtures listed in the manifest."""
+    fixtures = load_manifest()
+    if not fixtures:
+        print(f"[Bench] No fixtures listed in {MANIFEST_PATH}")
+        return 1
+
+    piper, model = find_piper()
+    engine = None
+    if not piper:
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+        except Exception as e:
+            print(f"[Bench] Neither a Piper voice model nor pyttsx3 is available: {e}")
+            return 1
+
+    for fixture in fixtures:
+        path = os.path.join(FIXTURES_DIR, fixture["file"])
+        if os.path.exists(path):
+            continue
+        if piper:
+            subprocess.run([piper, "--model", model, "--output_file", path],
+                           input=fixture["text"].encode("utf-8"),
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            engine.save_to_file(fixture["text"], path)
+            engine.runAndWait()
+        print(f"[Bench] {'Created' if os.path.exists(path) else 'FAILED'}: {fixture['file']}")
+    return 0
+
+
+# ── Reporting ──
+
+def print_report(results, notes, baseline, tolerance):
+    """Prints the results table and returns the list of regressions."""
+    regressions = []
+    print()
+    print(f"{'metric':<32}{'n':>6}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}   vs baseline (p95)")
+    print("-" * 92)
+    for stage in ALL_STAGES:
+        if stage not in notes:
+            continue
+        print(f"[{stage}] {notes[stage]}")
+        for metric, stats in results.get(stage, {}).items():
+            line = (f"  {metric:<30}{stats['n']:>6}{stats['p50']:>11.2f}"
+                    f"{stats['p95']:>11.2f}{stats['p99']:>11.2f}")
+            base = baseline.get(stage, {}).get(metric)
+            if base and base.get("p95"):
+                delta = (stats["p95"] - base["p95"]) / base["p95"]
+                flag = ""
+                if delta > tolerance:
+                    flag = "  REGRESSION"
+                    regressions.append(f"{stage}/{metric}")
+                line += f"   {base['p95']:9.2f} ({delta:+.0%}){flag}"
+            print(line)
+    print()
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cortex latency benchmarks")
+    parser.add_argument("--stages", default=",".join(ALL_STAGES),
+                        help="comma-separated subset of: " + ", ".join(ALL_STAGES))
+    parser.add_argument("--runs", type=int, default=5, help="repetitions per fixture")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed p95 slowdown vs baseline before flagging (0.2 = 20%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 if any metric regressed")
+    parser.add_argument("--fast-audio", action="store_true",
+                        help="replay WAVs faster than real time (end-of-speech timing no longer realistic)")
+    parser.add_argument("--make-fixtures", action="store_true", help="synthesize missing WAV fixtures and exit")
+    parser.add_argument("--output", help="also write results JSON to this path")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show pipeline output")
+    args = parser.parse_args(argv)
+
+    # Paths in the pipeline (data/, piper_engine/) are resolved relative to the app root
+    os.chdir(ROOT_DIR)
+
+    if args.make_fixtures:
+        return make_fixtures()
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGE_RUNNERS]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    results, notes, failed = {}, {}, []
+    for stage in stages:
+        print(f"[Bench] Running {stage}...")
+        started = time.perf_counter()
+        try:
+            samples, note = STAGE_RUNNERS[stage](args)
+        except Exception as e:
+            # A broken stage is not a skip: it fails the run
+            failed.append(stage)
+            notes[stage] = f"FAILED ({type(e).__name__}: {e})"
+            continue
+        if samples is None:
+            notes[stage] = f"skipped ({note})"
+            continue
+        results[stage] = summarize(samples)
+        notes[stage] = f"{note} [{time.perf_counter() - started:.1f}s]"
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f).get("results", {})
+
+    regressions = print_report(results, notes, baseline, args.tolerance)
+
+    report = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "runs": args.runs,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        # Keep stages that weren't run this time
+        merged = dict(baseline)
+        merged.update(results)
+        report["results"] = merged
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[Bench] Baseline saved to {args.baseline}")
+    elif not baseline:
+        print("[Bench] No baseline yet; run with --save-baseline to create one.")
+
+    status = 0
+    if regressions:
+        print(f"[Bench] {len(regressions)} metric(s) slower than baseline by more than {args.tolerance:.0%}: "
+              + ", ".join(regressions))
+        if args.fail_on_regression:
+            status = 1
+    if failed:
+        print(f"[Bench] {len(failed)} stage(s) failed: {', '.join(failed)}")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -40,14 +40,18 @@ def close_application(app_name, speaker):
     }
     
     target_app = bin_mapping.get(app_name.lower(), app_name)
+    from core.process_ranker import find_processes, terminate
     
     print(f"[Application] Request to close: {app_name} (Target: {target_app})")
 
     try:
         if plat == "linux":
-            # pkill searches pattern
-            subprocess.run(["pkill", "-f", target_app])
-            speaker.speak(f"Closing {app_name}")
+            # psutil by process name (command line as a fallback, like pkill -f), children included
+            gone, alive = terminate(find_processes(target_app))
+            if gone or alive:
+                speaker.speak(f"Closing {app_name}")
+            else:
+                speaker.speak(f"{app_name} doesn't seem to be running.")
             
         elif plat == "macos":
             script = f'quit app "{app_name}"' 
@@ -66,17 +70,11 @@ def close_application(app_name, speaker):
                 speaker.speak(f"Closing {app_name}")
                 return
 
-            # taskkill /IM image_name /F
-            image_name = target_app
-            if not image_name.lower().endswith(".exe") and "." not in image_name:
-                 image_name += ".exe"
-                 
-            print(f"[Application] Closing Windows Process: {image_name}")
-            # Try taskkill first (for exact matches like "notepad.exe")
-            # If target_app was mapped (e.g. "manual mapped exe"), this works well.
-            result = subprocess.run(f"taskkill /IM \"{image_name}\" /F", shell=True, capture_output=True, text=True)
-            
-            if result.returncode == 0:
+            # Terminate by image name through psutil (no taskkill process per request)
+            print(f"[Application] Closing Windows Process: {target_app}")
+            gone, alive = terminate(find_processes(target_app, include_cmdline=False))
+
+            if gone or alive:
                 speaker.speak(f"Closing {app_name}")
             else:
                 # Universal Fallback: Close by Window Title
@@ -2,6 +2,7 @@ import os
 import subprocess
 import json
 from pathlib import Path
+from core.location_tracker import get_tracker
 
 def get_active_window_hyprland():
     """
@@ -18,9 +19,16 @@ def get_active_window_hyprland():
 def get_active_window_title():
     """
     Get the active window title trying multiple methods:
+    0. the location tracker, when it follows focus (no subprocess)
     1. hyprctl (Hyprland)
     2. xprop (X11 / XWayland)
     """
+    tracker = get_tracker()
+    if tracker is not None:
+        title = tracker.window_title()
+        if title is not None:
+            return title or None
+
     # Try Hyprland first
     title = get_active_window_hyprland()
     if title:
@@ -202,6 +210,7 @@ def get_thunar_path():
 def get_active_location(desktop_path=None):
     """
     Detects the current directory the user is viewing using multiple methods:
+    0. The location tracker's cached folder (kept current by D-Bus / window events)
     1. Direct D-Bus queries (most reliable)
     2. Enhanced window title parsing
     3. Desktop fallback (last resort)
@@ -212,16 +221,25 @@ def get_active_location(desktop_path=None):
 
     # Priority 1: Try direct D-Bus queries for file managers
     print("[FileManager] Detecting active location...")
-    
-    # Try Nautilus
-    nautilus_path = get_nautilus_path()
-    if nautilus_path:
-        return nautilus_path
-    
-    # Try Dolphin
-    dolphin_path = get_dolphin_path()
-    if dolphin_path:
-        return dolphin_path
+
+    tracker = get_tracker()
+    if tracker is not None:
+        tracked_path = tracker.location()
+        if tracked_path:
+            print(f"[FileManager] Tracked location: {tracked_path}")
+            return tracked_path
+
+    # The tracker already asked Nautilus and Dolphin over its own connection
+    if tracker is None or not tracker.watching_dbus:
+        # Try Nautilus
+        nautilus_path = get_nautilus_path()
+        if nautilus_path:
+            return nautilus_path
+
+        # Try Dolphin
+        dolphin_path = get_dolphin_path()
+        if dolphin_path:
+            return dolphin_path
     
     # Try Thunar
     thunar_path = get_thunar_path()
@@ -1,4 +1,6 @@
+from pathlib import Path
 from .move_files import extract_name
+from .name_index import resolve, COMPACT
 
 def create_item(is_folder, command, file_manager_instance):
     speaker = file_manager_instance.speaker
@@ -12,6 +14,20 @@ def create_item(is_folder, command, file_manager_instance):
     
     target_path = location / name
     
+    if target_path.exists():
+        speaker.speak(f"{name} already exists in {location.name}.")
+        return
+    
+    # Same name apart from case / separators ("Space_Wallpaper" for "space wallpaper"): don't make a near-duplicate
+    try:
+        existing = [m for m in resolve(location, name, kind="dir" if is_folder else "file", spoken_text=False)
+                    if m.score >= COMPACT and (is_folder or Path(m.name).suffix.lower() == Path(name).suffix.lower())]
+    except OSError:
+        existing = []
+    if existing:
+        speaker.speak(f"There is already a {'folder' if is_folder else 'file'} named {existing[0].name} in {location.name}.")
+        return
+    
     try:
         if is_folder:
             target_path.mkdir(parents=True, exist_ok=True)
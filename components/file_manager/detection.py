@@ -1,6 +1,7 @@
 import subprocess
 import time
 from pathlib import Path
+from core.location_tracker import get_tracker
 
 # Import dependency manager for auto-installing system tools
 try:
@@ -10,14 +11,82 @@ except ImportError:
     _HAS_DEPENDENCY_MANAGER = False
     print("[Warning] Dependency manager not available")
 
+def _dbus_selection():
+    """
+    Asks Dolphin (qdbus) and Nautilus (gdbus) for their selection.
+    """
+    print("[FileManager] Trying detection method 1: qdbus (KDE/Dolphin)")
+    # Method 1: Try qdbus for KDE file managers (Dolphin)
+    try:
+        result = subprocess.run(
+            ['qdbus', 'org.kde.dolphin', '/dolphin/Dolphin_1', 'org.kde.dolphin.MainWindow.selectedUrls'],
+            capture_output=True,
+            text=True,
+            timeout=1
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            print(f"[FileManager] qdbus output: {result.stdout.strip()}")
+            selected_paths = []
+            for line in result.stdout.strip().split('\n'):
+                if line.startswith('file://'):
+                    from urllib.parse import unquote
+                    path_str = unquote(line[7:])
+                    path = Path(path_str)
+                    if path.exists():
+                        selected_paths.append(path)
+            if selected_paths:
+                print(f"[FileManager] qdbus found {len(selected_paths)} files")
+                return selected_paths
+    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+        print(f"[FileManager] qdbus failed: {e}")
+    
+    print("[FileManager] Trying detection method 2: gdbus (GNOME/Nautilus)")
+    # Method 2: Try gdbus for GNOME file managers (Nautilus)
+    try:
+        result = subprocess.run(
+            ['gdbus', 'call', '--session', '--dest', 'org.gnome.Nautilus',
+             '--object-path', '/org/gnome/Nautilus', '--method',
+             'org.gnome.Nautilus.FileOperations.GetSelection'],
+            capture_output=True,
+            text=True,
+            timeout=1
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            print(f"[FileManager] gdbus output: {result.stdout.strip()}")
+            # Parse gdbus output
+            selected_paths = []
+            # This is a simplified parser - actual implementation may vary
+            for line in result.stdout.strip().split('\n'):
+                if 'file://' in line:
+                    from urllib.parse import unquote
+                    import re
+                    urls = re.findall(r'file://[^\s,\'"]+', line)
+                    for url in urls:
+                        path_str = unquote(url[7:])
+                        path = Path(path_str)
+                        if path.exists():
+                            selected_paths.append(path)
+            if selected_paths:
+                print(f"[FileManager] gdbus found {len(selected_paths)} files")
+                return selected_paths
+    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+        print(f"[FileManager] gdbus failed: {e}")
+    return []
+
 def get_selected_files_from_file_manager():
     """
     detect files selected in the active file manager window.
     Supports multiple file managers using different detection methods.
     """
     import os
-    import os
+    tracker = get_tracker()
     if os.name == 'nt':
+        # In-process Shell.Application first; None means pywin32 is missing
+        selected_paths = tracker.selection() if tracker is not None else None
+        if selected_paths is not None:
+            print(f"[FileManager] Explorer selection: {len(selected_paths)} files")
+            return selected_paths
+
         print("[FileManager] Attempting Windows file selection detection via PowerShell...")
         try:
             # PowerShell script to access Shell.Application COM object
@@ -72,63 +141,16 @@ def get_selected_files_from_file_manager():
             
         return []
         
-    print("[FileManager] Trying detection method 1: qdbus (KDE/Dolphin)")
-    # Method 1: Try qdbus for KDE file managers (Dolphin)
-    try:
-        result = subprocess.run(
-            ['qdbus', 'org.kde.dolphin', '/dolphin/Dolphin_1', 'org.kde.dolphin.MainWindow.selectedUrls'],
-            capture_output=True,
-            text=True,
-            timeout=1
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            print(f"[FileManager] qdbus output: {result.stdout.strip()}")
-            selected_paths = []
-            for line in result.stdout.strip().split('\n'):
-                if line.startswith('file://'):
-                    from urllib.parse import unquote
-                    path_str = unquote(line[7:])
-                    path = Path(path_str)
-                    if path.exists():
-                        selected_paths.append(path)
-            if selected_paths:
-                print(f"[FileManager] qdbus found {len(selected_paths)} files")
-                return selected_paths
-    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-        print(f"[FileManager] qdbus failed: {e}")
-    
-    print("[FileManager] Trying detection method 2: gdbus (GNOME/Nautilus)")
-    # Method 2: Try gdbus for GNOME file managers (Nautilus)
-    try:
-        result = subprocess.run(
-            ['gdbus', 'call', '--session', '--dest', 'org.gnome.Nautilus',
-             '--object-path', '/org/gnome/Nautilus', '--method',
-             'org.gnome.Nautilus.FileOperations.GetSelection'],
-            capture_output=True,
-            text=True,
-            timeout=1
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            print(f"[FileManager] gdbus output: {result.stdout.strip()}")
-            # Parse gdbus output
-            selected_paths = []
-            # This is a simplified parser - actual implementation may vary
-            for line in result.stdout.strip().split('\n'):
-                if 'file://' in line:
-                    from urllib.parse import unquote
-                    import re
-                    urls = re.findall(r'file://[^\s,\'"]+', line)
-                    for url in urls:
-                        path_str = unquote(url[7:])
-                        path = Path(path_str)
-                        if path.exists():
-                            selected_paths.append(path)
-            if selected_paths:
-                print(f"[FileManager] gdbus found {len(selected_paths)} files")
-                return selected_paths
-    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-        print(f"[FileManager] gdbus failed: {e}")
-    
+    # Dolphin / Nautilus over the tracker's D-Bus connection; if it answered, skip the subprocess probes
+    selected_paths = tracker.selection() if tracker is not None else None
+    if selected_paths:
+        print(f"[FileManager] Tracker found {len(selected_paths)} selected files")
+        return selected_paths
+    if selected_paths is None:
+        selected_paths = _dbus_selection()
+        if selected_paths:
+            return selected_paths
+
     print("[FileManager] Trying detection method 3: xclip (clipboard fallback)")
     
     # Auto-install dependencies if missing (Linux only)
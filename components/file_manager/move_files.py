@@ -1,6 +1,7 @@
-import shutil
 from pathlib import Path
 from .detection import get_selected_files_from_file_manager
+from .transfer import plan_moves, run_transfer, undo_last
+from .name_index import resolve, EXACT, GOOD_MATCH
 
 def extract_name(command, keywords):
     """
@@ -80,47 +81,40 @@ def move_files(command, file_manager_instance):
         # User specified a filename - find it in the active location
         print(f"[FileManager] Looking for '{filename}' in active location...")
         active_location = file_manager_instance._get_active_location()
-        target_path = active_location / filename
         
-        if target_path.exists():
-            file_manager_instance.selected_items = [target_path]
-            print(f"[FileManager] Found exact match: {target_path}")
-            speaker.speak(f"Added {filename} to move list. Please navigate to the destination folder and say 'paste here' or 'move here'.")
-            return
-        
-        # Fuzzy / Smart Matching if exact match fails
-        # e.g. User says "move space wallpaper", file is "space wallpaper.jpg"
-        print(f"[FileManager] Exact match not found. Trying fuzzy/smart matching in {active_location}...")
-        
-        candidates = []
+        # One cached listing of the folder; matches exact, normalized and sound-alike names
         try:
-            # Scan active location
-            for item in active_location.iterdir():
-                if item.is_file() or item.is_dir():
-                    # Check 1: Stem match (ignoring extension) - HIGH Priority
-                    if item.stem.lower() == filename.lower():
-                        candidates.append((item, 100)) # Score 100
-                    
-                    # Check 2: Name contains query - MEDIUM Priority
-                    elif filename.lower() in item.name.lower():
-                         candidates.append((item, 50))
-        except Exception as e:
+            matches = resolve(active_location, filename)
+        except OSError as e:
             print(f"[FileManager] Error scanning active location: {e}")
-
-        if candidates:
-            # Sort by score (descending)
-            candidates.sort(key=lambda x: x[1], reverse=True)
-            best_match = candidates[0][0]
-            
-            file_manager_instance.selected_items = [best_match]
-            print(f"[FileManager] Found smart match: {best_match}")
-            speaker.speak(f"Found {best_match.name}. Added to move list. Say 'move here' in destination.")
+            matches = []
+        
+        # Two equally good matches ("report.pdf" and "report.docx"): ask rather than pick one
+        ambiguous = len(matches) > 1 and matches[1].score == matches[0].score
+        if matches and matches[0].score >= GOOD_MATCH and not ambiguous:
+            best_match = matches[0]
+            file_manager_instance.selected_items = [best_match.path]
+            print(f"[FileManager] Found match: {best_match.path} (score {best_match.score})")
+            if best_match.score == EXACT:
+                speaker.speak(f"Added {best_match.name} to move list. Please navigate to the destination folder and say 'paste here' or 'move here'.")
+            else:
+                speaker.speak(f"Found {best_match.name}. Added to move list. Say 'move here' in destination.")
             return
-
-        else:
-            print(f"[FileManager] File not found: {target_path}")
-            speaker.speak(f"I could not find {filename} in {active_location.name}.")
+        
+        if matches:
+            # Tied or weak matches: name the closest ones instead of guessing
+            print(f"[FileManager] Unclear matches for '{filename}': {[(m.name, m.score) for m in matches]}")
+            if ambiguous:
+                names = " or ".join(m.name for m in matches if m.score == matches[0].score)
+                speaker.speak(f"There is more than one {filename} here: {names}. Please say the full name.")
+            else:
+                names = " or ".join(m.name for m in matches[:2])
+                speaker.speak(f"I could not find {filename} in {active_location.name}. Did you mean {names}?")
             return
+        
+        print(f"[FileManager] File not found: {active_location / filename}")
+        speaker.speak(f"I could not find {filename} in {active_location.name}.")
+        return
     
     # Fallback: Try to detect selected files from file manager GUI
     print("[FileManager] Attempting to detect selected files from file manager...")
@@ -143,10 +137,11 @@ def move_files(command, file_manager_instance):
     
     speaker.speak(f"{count} {item_word} selected. Navigate to the destination folder and say 'move here' to complete the move.")
 
-def move_here(command, file_manager_instance):
+def move_here(command, file_manager_instance, cancel=None):
     """
     Completes the move operation by moving all selected items to current location.
-    Handles name collisions and provides detailed feedback.
+    Collisions are resolved up front, cross-device moves report progress to the
+    status window, and the batch is journaled so "undo that" can revert it.
     """
     speaker = file_manager_instance.speaker
     
@@ -156,52 +151,73 @@ def move_here(command, file_manager_instance):
 
     dest_location = file_manager_instance._get_active_location()
     
-    success_count = 0
-    skipped_count = 0
-    failed_items = []
+    try:
+        plan = plan_moves(file_manager_instance.selected_items, dest_location)
+    except OSError as e:
+        print(f"[FileManager] Cannot move into {dest_location}: {e}")
+        speaker.speak(f"I can't move files into {dest_location.name}.")
+        return
     
-    for item in file_manager_instance.selected_items:
-        try:
-            # Check if source and destination are the same
-            if item.parent == dest_location:
-                skipped_count += 1
-                continue
-            
-            # Handle name collisions
-            destination = dest_location / item.name
-            if destination.exists():
-                # Append number to avoid collision
-                base_name = item.stem
-                extension = item.suffix
-                counter = 1
-                while destination.exists():
-                    new_name = f"{base_name}_{counter}{extension}"
-                    destination = dest_location / new_name
-                    counter += 1
-            
-            shutil.move(str(item), str(destination))
-            success_count += 1
-            print(f"[FileManager] Moved: {item} -> {destination}")
-        except Exception as e:
-            print(f"[FileManager] Error moving {item}: {e}")
-            failed_items.append(item.name)
-    
-    # Clear selection after attempt
+    # Clear selection before the (possibly long) transfer
     file_manager_instance.selected_items = []
     
+    if any(move.cross_device for move in plan.moves):
+        count = len(plan.moves)
+        speaker.speak(f"Moving {count} {'item' if count == 1 else 'items'} to {dest_location.name}.")
+    
+    result = run_transfer(plan, progress=file_manager_instance.report_transfer, cancel=cancel)
+    for source, destination in result.moved:
+        print(f"[FileManager] Moved: {source} -> {destination}")
+    for source, reason in result.failed:
+        print(f"[FileManager] Error moving {source}: {reason}")
+    
+    success_count = len(result.moved)
+    skipped_count = len(result.skipped)
+    failed_items = [source.name for source, _reason in result.failed]
+    
     # Provide detailed feedback
     if success_count > 0:
         item_word = "item" if success_count == 1 else "items"
         message = f"Successfully moved {success_count} {item_word} to {dest_location.name}."
+        if result.cancelled:
+            message = f"Move cancelled after {success_count} {item_word}."
         
         if skipped_count > 0:
             message += f" Skipped {skipped_count} already in this location."
         if failed_items:
             message += f" Failed to move: {', '.join(failed_items)}."
+        message += " Say undo that to put them back."
             
         speaker.speak(message)
+    elif result.cancelled:
+        speaker.speak("Move cancelled. Nothing was moved.")
     else:
-        if skipped_count > 0:
+        if skipped_count > 0 and not failed_items:
             speaker.speak(f"All items are already in {dest_location.name}.")
         else:
             speaker.speak("Could not move any items. Please check if the files still exist.")
+
+def undo_move(command, file_manager_instance, cancel=None):
+    """
+    Reverts the last journaled move batch.
+    """
+    speaker = file_manager_instance.speaker
+    outcome = undo_last(progress=file_manager_instance.report_transfer, cancel=cancel)
+    if outcome is None:
+        speaker.speak("There is no file move to undo.")
+        return
+    
+    result, conflicts = outcome
+    for source, reason in conflicts + result.failed:
+        print(f"[FileManager] Could not undo {source}: {reason}")
+    
+    count = len(result.moved)
+    item_word = "item" if count == 1 else "items"
+    if result.cancelled:
+        speaker.speak(f"Undo cancelled after {count} {item_word}. Say undo that again to finish.")
+    elif count and not (conflicts or result.failed):
+        speaker.speak(f"Done. Moved {count} {item_word} back.")
+    elif count:
+        speaker.speak(f"Moved {count} {item_word} back. {len(conflicts) + len(result.failed)} could not be restored.")
+    else:
+        speaker.speak("I couldn't undo the last move. The files were moved or replaced since.")
@@ -0,0 +1,193 @@
+"""
+Cortex Folder Name Index
+
+Resolves spoken names ("space wallpaper") to entries of one folder
+("Space_Wallpaper-4K.jpg"), for voice file operations.
+
+- Each folder is listed once with os.scandir. Its entries are tokenized
+  when it is listed and kept until the folder's mtime changes. Type
+  checks come from the directory listing, so entries are not stat()ed
+  one by one.
+- Names are normalized into tokens: case folded, split on separators,
+  camelCase and letter/digit boundaries, extension dropped. Spoken
+  number words become digits ("four k" -> "4 k"). Every token also gets
+  a Soundex-style key, so near-homophones from speech recognition
+  ("wallpaper" / "walpaper", "photos" / "fotos") still match.
+- One pass scores every entry: exact name, then the name without
+  separators, all tokens, all phonetic keys, a substring, and at last a
+  partial token overlap. The best matches come back ranked.
+
+Usage:
+    matches = resolve(Path.home() / "Downloads", "space wallpaper")
+    if matches and matches[0].score >= GOOD_MATCH:
+        path = matches[0].path
+"""
+
+import collections
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+MAX_CACHED_DIRS = 32
+# A listing taken this soon after the folder's last change may have missed
+# a same-tick change (coarse mtimes), so it is not trusted for reuse
+RACY_NS = 2 * 1_000_000_000
+
+EXACT = 100
+COMPACT = 95        # same name without separators / case: "spacewallpaper" ~ "Space_Wallpaper"
+ALL_TOKENS = 85
+PHONETIC = 70
+SUBSTRING = 60
+GOOD_MATCH = PHONETIC   # confident enough to act on without asking
+
+_FILLER = {"the", "a", "an", "my", "file", "folder", "directory", "called", "named"}
+_NUMBERS = {
+    "zero": "0", "one": "1", "two": "2", "three": "3", "four": "4", "five": "5", "six": "6",
+    "seven": "7", "eight": "8", "nine": "9", "ten": "10", "eleven": "11", "twelve": "12",
+    "thirteen": "13", "fourteen": "14", "fifteen": "15", "sixteen": "16", "seventeen": "17",
+    "eighteen": "18", "nineteen": "19", "twenty": "20",
+}
+_SPLIT = re.compile(r"[^0-9a-z]+")
+_CAMEL = re.compile(r"(?<=[a-z])(?=[A-Z])|(?<=[A-Za-z])(?=[0-9])|(?<=[0-9])(?=[A-Za-z])")
+_SOUNDEX = str.maketrans("bfpvcgjkqsxzdtlmnr", "111122222222334556")
+_RESPELLINGS = {"ph": "f", "ce": "se", "ci": "si", "cy": "sy", "ck": "k"}
+_RESPELL = re.compile("|".join(_RESPELLINGS))
+
+Entry = collections.namedtuple("Entry", ["name", "path", "is_dir", "stem", "tokens", "phonetic", "compact"])
+Match = collections.namedtuple("Match", ["path", "name", "is_dir", "score"])
+
+
+def tokenize(text, spoken=False):
+    """'Space_Wallpaper-4K' -> ['space', 'wallpaper', '4', 'k']; spoken text also maps number words."""
+    tokens = [t for t in _SPLIT.split(_CAMEL.sub(" ", text).lower()) if t]
+    if spoken:
+        tokens = [_NUMBERS.get(t, t) for t in tokens if t not in _FILLER] or tokens
+        tokens = [part for t in tokens for part in _CAMEL.sub(" ", t).split()]
+    return tokens
+
+
+def soundex(token):
+    """
+    Soundex-style key ('robert' -> '6163'). Unlike American Soundex the first
+    letter is coded too, and 'ph' / soft 'c' are respelled first, so
+    'photos' and 'fotos' share a key. Digits are kept as they are.
+    """
+    if not token.isalpha():
+        return token
+    token = _RESPELL.sub(lambda m: _RESPELLINGS[m.group(0)], token)
+    codes = token.translate(_SOUNDEX)
+    key, last = (codes[0] if codes[0].isdigit() else "0"), codes[0]
+    for letter, code in zip(token[1:], codes[1:]):
+        if code.isdigit() and code != last:
+            key += code
+            if len(key) == 4:
+                break
+        # h and w don't separate equal codes; vowels do
+        if letter not in "hw":
+            last = code
+    return key.ljust(4, "0")
+
+
+def _entry(dir_entry):
+    try:
+        is_dir = dir_entry.is_dir()
+    except OSError:
+        is_dir = False
+    name = dir_entry.name
+    stem = name if is_dir else os.path.splitext(name)[0] or name
+    tokens = tokenize(stem)
+    return Entry(name, Path(dir_entry.path), is_dir, stem.lower(), tokens,
+                 [soundex(t) for t in tokens], "".join(tokens))
+
+
+class _Listing:
+    def __init__(self, mtime_ns, built_ns, entries):
+        self.mtime_ns = mtime_ns
+        self.built_ns = built_ns
+        self.entries = entries
+
+
+_cache = collections.OrderedDict()      # folder -> _Listing, least recently used first
+_cache_lock = threading.Lock()
+
+
+def entries(directory):
+    """Tokenized entries of `directory`, listed again only when its mtime moved."""
+    directory = os.path.abspath(directory)
+    mtime_ns = os.stat(directory).st_mtime_ns
+    with _cache_lock:
+        listing = _cache.get(directory)
+        if listing and listing.mtime_ns == mtime_ns and listing.built_ns - mtime_ns > RACY_NS:
+            _cache.move_to_end(directory)
+            return listing.entries
+
+    started = time.time()
+    built_ns = time.time_ns()
+    with os.scandir(directory) as it:
+        items = [_entry(e) for e in it]
+    with _cache_lock:
+        _cache[directory] = _Listing(mtime_ns, built_ns, items)
+        _cache.move_to_end(directory)
+        while len(_cache) > MAX_CACHED_DIRS:
+            _cache.popitem(last=False)
+    print(f"[FileManager] Indexed {len(items)} names in {directory} ({(time.time() - started) * 1000:.0f} ms)")
+    return items
+
+
+def _score(entry, name, tokens, keys, compact):
+    if entry.name.lower() == name or entry.stem == name:
+        return EXACT
+    if compact and entry.compact == compact:
+        return COMPACT
+    if not tokens:
+        return 0
+    # Fewer extra words in the entry name rank higher: "wallpaper" prefers "Wallpaper.jpg" over "Wallpaper old (2).jpg"
+    extra = max(0, len(entry.tokens) - len(tokens))
+    bonus = max(0, 9 - extra)
+    entry_tokens = set(entry.tokens)
+    if all(t in entry_tokens for t in tokens):
+        return ALL_TOKENS + bonus
+    entry_keys = set(entry.phonetic)
+    if all(k in entry_keys for k in keys):
+        return PHONETIC + bonus
+    if len(compact) >= 3 and compact in entry.compact:
+        return SUBSTRING + bonus
+    hits = sum(1 for t, k in zip(tokens, keys) if t in entry_tokens or k in entry_keys)
+    if hits * 2 >= len(tokens):
+        return int(40 * hits / len(tokens))
+    return 0
+
+
+def _query(text, spoken):
+    tokens = tokenize(text, spoken)
+    return text.lower(), tokens, [soundex(t) for t in tokens], "".join(tokens)
+
+
+def resolve(directory, spoken, kind=None, limit=5, spoken_text=True):
+    """
+    Best matches for a spoken name among the entries of `directory`, best first.
+    kind: "file", "dir" or None for both. spoken_text=False keeps filler
+    words ("my projects" stays two words), for names the user is creating.
+    """
+    spoken = spoken.strip().strip("'\"")
+    if not spoken:
+        return []
+    query = _query(spoken, spoken_text)
+    stem, extension = os.path.splitext(spoken)
+    # "report 2024.pdf" also matches on its stem, like the entries do
+    stem_query = _query(stem, spoken_text) if stem and 1 < len(extension) <= 6 and extension[1:].isalnum() else None
+    scored = []
+    for entry in entries(directory):
+        if kind == "file" and entry.is_dir or kind == "dir" and not entry.is_dir:
+            continue
+        score = _score(entry, *query)
+        if stem_query is not None:
+            # A stem match ranks just below the same match on the full name, or
+            # "report.pdf" would tie with "report.docx" and could never be chosen
+            score = max(score, _score(entry, *stem_query) - 1)
+        if score > 0:
+            scored.append(Match(entry.path, entry.name, entry.is_dir, score))
+    scored.sort(key=lambda m: (-m.score, len(m.name), m.name.lower()))
+    return scored[:limit]
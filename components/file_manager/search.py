@@ -248,12 +248,12 @@ def background_search(query, speaker, status_queue=None):
     - It signals the UI process to open a fallback search box.
     """
     if speaker:
-        threading.Thread(target=speaker.speak, args=(f"Searching for {query}...",), daemon=True).start()
+        speaker.speak(f"Searching for {query}...")
 
     partitions = _get_partitions()
     if not partitions:
         if speaker: 
-            threading.Thread(target=speaker.speak, args=("No drives found to search.",), daemon=True).start()
+            speaker.speak("No drives found to search.")
         return
 
     # Register active search
@@ -284,14 +284,14 @@ def background_search(query, speaker, status_queue=None):
         if not was_canceled:
             if speaker:
                 msg = f"I couldn't find {query}. Opening a search box so you can type it."
-                threading.Thread(target=speaker.speak, args=(msg,), daemon=True).start()
+                speaker.speak(msg)
             
             # Cross-process signal: Tell UI process to show the search dialog
             if status_queue:
                 status_queue.put(("FILE_SEARCH_GUI", query))
         else:
             if speaker:
-                threading.Thread(target=speaker.speak, args=(f"Search for {query} canceled.",), daemon=True).start()
+                speaker.speak(f"Search for {query} canceled.")
         return
 
     # Process results: Sort and Deduplicate
@@ -318,5 +318,4 @@ def background_search(query, speaker, status_queue=None):
         else:
             msg = f"No exact match for {query}. Found {total} related result{'s' if total > 1 else ''}. Displaying them now."
             
-        # Do not block the search thread waiting for TTS to finish speaking
-        threading.Thread(target=speaker.speak, args=(msg,), daemon=True).start()
+        speaker.speak(msg)
@@ -0,0 +1,435 @@
+"""
+Cortex File Transfer
+
+Bulk move engine behind "move here" and "undo that".
+
+- Planning: the destination is listed once and every name collision is
+  resolved against that listing ("report.pdf" -> "report_1.pdf"). No
+  exists() probe per candidate name. Items already in the destination,
+  missing items and folders moved into themselves are sorted out here.
+- Moves on the same device are a single rename each. Moves to another
+  device are copied by a pool of workers using copy_file_range/sendfile
+  where the OS has them (plain read/write otherwise). Each source is only
+  removed once its copy is complete. A failed or cancelled item has its
+  partial copy removed and its source left alone.
+- Progress dicts are reported at most every PROGRESS_INTERVAL seconds,
+  and only for transfers that take longer than that. The engine forwards
+  them to the status window. Every transfer has a cancel Event, registered
+  under its id, so the UI can stop it.
+- Completed moves are appended to a journal in data/file_journal/, one
+  file per batch. undo_last() moves the newest batch back.
+
+Usage:
+    plan = plan_moves(selected_items, destination)
+    result = run_transfer(plan, progress=print)
+    result.moved            # [(source, destination)]
+    undo_last(progress=print)
+"""
+
+import collections
+import concurrent.futures
+import errno
+import itertools
+import json
+import os
+import shutil
+import stat
+import sys
+import threading
+import time
+from pathlib import Path
+
+from core.runtime_path import get_app_root
+
+COPY_WORKERS = 4
+CHUNK_SIZE = 8 * 1024 * 1024        # bytes per copy call, so cancel and progress stay responsive
+PROGRESS_INTERVAL = 0.2
+MAX_JOURNALS = 20                   # batches that can still be undone
+_CASE_INSENSITIVE = os.name == "nt" or sys.platform == "darwin"
+
+Move = collections.namedtuple("Move", ["source", "destination", "cross_device"])
+Plan = collections.namedtuple("Plan", ["moves", "skipped", "failed", "destination"])
+# skipped: [source] already in the destination; failed: [(source, reason)] found while planning
+TransferResult = collections.namedtuple("TransferResult", [
+    "moved", "skipped", "failed", "cancelled", "bytes", "elapsed", "batch",
+])
+
+
+class TransferCancelled(Exception):
+    pass
+
+
+def journal_dir():
+    return os.path.join(get_app_root(), "data", "file_journal")
+
+
+def _fold(name):
+    return name.lower() if _CASE_INSENSITIVE else name
+
+
+def _unique_name(name, taken):
+    """`name`, or name_1, name_2... (before the extension) if it is already taken."""
+    if _fold(name) not in taken:
+        return name
+    stem, suffix = Path(name).stem, Path(name).suffix
+    for counter in itertools.count(1):
+        candidate = f"{stem}_{counter}{suffix}"
+        if _fold(candidate) not in taken:
+            return candidate
+
+
+def plan_moves(items, destination):
+    """Plan for moving `items` into the folder `destination` (one directory listing in total)."""
+    destination = Path(destination)
+    taken = {_fold(name) for name in os.listdir(destination)}
+    dest_device = os.stat(destination).st_dev
+    resolved_destination = destination.resolve()
+    moves, skipped, failed = [], [], []
+    for item in items:
+        item = Path(item)
+        try:
+            info = os.lstat(item)
+        except OSError:
+            failed.append((item, "it no longer exists"))
+            continue
+        if item.parent == destination:
+            skipped.append(item)
+            continue
+        resolved = item.resolve()
+        if resolved == resolved_destination or resolved in resolved_destination.parents:
+            failed.append((item, "a folder can't be moved into itself"))
+            continue
+        name = _unique_name(item.name, taken)
+        taken.add(_fold(name))
+        moves.append(Move(item, destination / name, info.st_dev != dest_device))
+    return Plan(moves, skipped, failed, destination)
+
+
+# ── Copying ──
+
+def _read_write(src_fd, dst_fd, count):
+    data = os.read(src_fd, count)
+    view = memoryview(data)
+    while view:
+        view = view[os.write(dst_fd, view):]
+    return len(data)
+
+
+def _copy_methods():
+    """Chunk copiers, fastest first. All of them advance the file offsets, so they can be mixed."""
+    methods = []
+    if hasattr(os, "copy_file_range"):
+        methods.append(os.copy_file_range)
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        methods.append(lambda src_fd, dst_fd, count: os.sendfile(dst_fd, src_fd, None, count))
+    methods.append(_read_write)
+    return methods
+
+
+_COPY_METHODS = _copy_methods()
+_UNSUPPORTED = {errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EBADF, errno.ENOTSUP,
+                getattr(errno, "EOPNOTSUPP", errno.ENOTSUP)}
+
+
+def copy_file(source, destination, on_bytes=None, cancel=None):
+    """Copies one file in chunks (never over an existing file), then its metadata."""
+    methods = list(_COPY_METHODS)
+    with open(source, "rb") as fsrc, open(destination, "xb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        while True:
+            if cancel is not None and cancel.is_set():
+                raise TransferCancelled()
+            try:
+                copied = methods[0](src_fd, dst_fd, CHUNK_SIZE)
+            except OSError as e:
+                # The kernel can't do this pair of files (other filesystem, old kernel): next method
+                if e.errno in _UNSUPPORTED and len(methods) > 1:
+                    methods.pop(0)
+                    continue
+                raise
+            if not copied:
+                break
+            if on_bytes:
+                on_bytes(copied)
+    shutil.copystat(source, destination)
+
+
+def _tree_size(path):
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return 0
+    if not stat.S_ISDIR(info.st_mode):
+        return info.st_size if stat.S_ISREG(info.st_mode) else 0
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                info = os.lstat(os.path.join(root, name))
+            except OSError:
+                continue
+            if stat.S_ISREG(info.st_mode):     # links are recreated, not copied
+                total += info.st_size
+    return total
+
+
+def _remove(path):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+# ── Journal ──
+
+class Journal:
+    """Completed moves of one batch, one JSON line each, after a header line."""
+
+    def __init__(self, batch, label, directory=None):
+        directory = directory or journal_dir()
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{batch}.jsonl")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"batch": batch, "label": label, "created": time.time()}) + "\n")
+        _prune_journals(directory)
+
+    def record(self, move):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps([str(move.source), str(move.destination)]) + "\n")
+
+    def discard_if_empty(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = sum(1 for _ in f)
+            if lines <= 1:
+                os.remove(self.path)
+        except OSError:
+            pass
+
+
+def _journals(directory=None):
+    directory = directory or journal_dir()
+    try:
+        names = [n for n in os.listdir(directory) if n.endswith(".jsonl")]
+    except OSError:
+        return []
+    return sorted((os.path.join(directory, n) for n in names), key=os.path.getmtime)
+
+
+def _prune_journals(directory):
+    for path in _journals(directory)[:-MAX_JOURNALS]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _read_journal(path):
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        moves = [json.loads(line) for line in f if line.strip()]
+    return header, moves
+
+
+# ── Transfers ──
+
+_ids = itertools.count(1)
+ACTIVE_TRANSFERS = {}       # transfer id -> cancel Event
+_active_lock = threading.Lock()
+
+
+class Transfer:
+    def __init__(self, plan, label, progress=None, cancel=None, workers=COPY_WORKERS, journal=True):
+        self.plan = plan
+        self.label = label
+        self.progress = progress
+        self.cancel = cancel or threading.Event()
+        self.workers = workers
+        self.journal = journal
+        self.id = next(_ids)
+        self.started = time.time()
+        self._last_report = self.started    # quick transfers never report progress
+        self._lock = threading.Lock()
+        self.state = {"op": self.id, "label": label, "phase": "moving", "files": 0,
+                      "total_files": len(plan.moves), "bytes": 0, "total_bytes": 0, "percent": 0}
+
+    def _report(self, force=False):
+        now = time.time()
+        if self.progress and (force or now - self._last_report >= PROGRESS_INTERVAL):
+            self._last_report = now
+            with self._lock:
+                state = dict(self.state)
+            if state["total_bytes"]:
+                state["percent"] = int(100 * state["bytes"] / state["total_bytes"])
+            elif state["total_files"]:
+                state["percent"] = int(100 * state["files"] / state["total_files"])
+            self.progress(state)
+
+    def _add_bytes(self, count):
+        with self._lock:
+            self.state["bytes"] += count
+
+    def run(self):
+        with _active_lock:
+            ACTIVE_TRANSFERS[self.id] = self.cancel
+        journal = Journal(f"{int(self.started * 1000)}-{self.id}", self.label) if self.journal else None
+        moved, failed = [], list(self.plan.failed)
+        try:
+            self.state["total_bytes"] = sum(_tree_size(m.source) for m in self.plan.moves if m.cross_device)
+            # Renames first: they are instant, and copies can then run undisturbed
+            for move in [m for m in self.plan.moves if not m.cross_device]:
+                if self.cancel.is_set():
+                    break
+                try:
+                    os.makedirs(move.destination.parent, exist_ok=True)
+                    os.rename(move.source, move.destination)
+                except OSError as e:
+                    failed.append((move.source, e.strerror or str(e)))
+                else:
+                    self._done(move, moved, journal)
+                self._report()
+            copies = [m for m in self.plan.moves if m.cross_device]
+            if copies and not self.cancel.is_set():
+                self._copy_all(copies, moved, failed, journal)
+        finally:
+            with _active_lock:
+                ACTIVE_TRANSFERS.pop(self.id, None)
+            if journal is not None:
+                journal.discard_if_empty()
+
+        cancelled = self.cancel.is_set()
+        self.state["phase"] = "cancelled" if cancelled else "done"
+        self._report(force=True)
+        elapsed = time.time() - self.started
+        print(f"[FileManager] {self.label}: {len(moved)} moved, {len(failed)} failed"
+              f"{' (cancelled)' if cancelled else ''} in {elapsed:.1f}s")
+        return TransferResult(moved, list(self.plan.skipped), failed, cancelled, self.state["bytes"], elapsed,
+                              os.path.basename(journal.path)[:-6] if journal is not None and moved else None)
+
+    def _done(self, move, moved, journal):
+        moved.append((move.source, move.destination))
+        if journal is not None:
+            journal.record(move)
+        with self._lock:
+            self.state["files"] += 1
+
+    def _copy_all(self, copies, moved, failed, journal):
+        """Copies every item on the worker pool, then removes each source whose copy completed."""
+        with concurrent.futures.ThreadPoolExecutor(self.workers, thread_name_prefix="FileCopy") as pool:
+            pending = []
+            for move in copies:
+                try:
+                    pending.append((move, self._submit_item(pool, move)))
+                except OSError as e:
+                    _remove(move.destination)
+                    failed.append((move.source, e.strerror or str(e)))
+
+            for move, (futures, directories) in pending:
+                while True:
+                    done, not_done = concurrent.futures.wait(futures, timeout=PROGRESS_INTERVAL)
+                    self._report()
+                    if not not_done:
+                        break
+                error = next((f.exception() for f in futures if f.exception() is not None), None)
+                if error is not None or self.cancel.is_set():
+                    _remove(move.destination)
+                    if not isinstance(error, TransferCancelled) and not self.cancel.is_set():
+                        failed.append((move.source, getattr(error, "strerror", None) or str(error)))
+                    continue
+                try:
+                    # Folder times last: copying the files into them changed them
+                    for source_dir, dest_dir in reversed(directories):
+                        shutil.copystat(source_dir, dest_dir)
+                    _remove(move.source)
+                except OSError as e:
+                    # The copy is complete, but the original (or part of it) is still there
+                    failed.append((move.source, f"copied, but the original could not be removed ({e.strerror})"))
+                    continue
+                self._done(move, moved, journal)
+
+    def _submit_item(self, pool, move):
+        """Creates the folder tree of one item and queues its files. Returns (futures, [(src dir, dst dir)])."""
+        source, destination = str(move.source), str(move.destination)
+        copy = lambda src, dst: copy_file(src, dst, self._add_bytes, self.cancel)
+        if os.path.islink(source):
+            os.symlink(os.readlink(source), destination)
+            return [], []
+        if not os.path.isdir(source):
+            return [pool.submit(copy, source, destination)], []
+
+        futures, directories = [], []
+        for root, dirs, files in os.walk(source):
+            target = os.path.join(destination, os.path.relpath(root, source))
+            os.makedirs(target, exist_ok=(root != source))
+            directories.append((root, target))
+            for name in dirs[:]:
+                path = os.path.join(root, name)
+                if os.path.islink(path):
+                    # Keep directory links as links; os.walk doesn't follow them
+                    os.symlink(os.readlink(path), os.path.join(target, name))
+                    dirs.remove(name)
+            for name in files:
+                path, dest = os.path.join(root, name), os.path.join(target, name)
+                if os.path.islink(path):
+                    os.symlink(os.readlink(path), dest)
+                elif os.path.isfile(path):
+                    futures.append(pool.submit(copy, path, dest))
+        return futures, directories
+
+
+def run_transfer(plan, label=None, progress=None, cancel=None, journal=True):
+    """Executes a plan from plan_moves() and returns a TransferResult."""
+    count = len(plan.moves)
+    label = label or f"Moving {count} item{'s' if count != 1 else ''}"
+    return Transfer(plan, label, progress, cancel, journal=journal).run()
+
+
+def cancel_transfer(transfer_id=None):
+    """Cancels one running transfer (all of them when None). Returns False if nothing was running."""
+    with _active_lock:
+        events = list(ACTIVE_TRANSFERS.values()) if transfer_id is None else [ACTIVE_TRANSFERS.get(transfer_id)]
+    events = [event for event in events if event is not None]
+    for event in events:
+        event.set()
+    return bool(events)
+
+
+def undo_last(progress=None, cancel=None, directory=None):
+    """
+    Moves the newest journaled batch back. Returns (TransferResult, conflicts),
+    or None when there is nothing to undo. conflicts: [(path, reason)] of
+    moves that couldn't be reverted (moved again, or the old name is taken).
+    """
+    journals = _journals(directory)
+    if not journals:
+        return None
+    path = journals[-1]
+    header, entries = _read_journal(path)
+    moves, conflicts = [], []
+    for source, destination in reversed(entries):
+        if not os.path.lexists(destination):
+            conflicts.append((Path(destination), "it is no longer there"))
+            continue
+        if os.path.lexists(source):
+            conflicts.append((Path(destination), "its old name is taken"))
+            continue
+        parent = os.path.dirname(source)
+        os.makedirs(parent, exist_ok=True)
+        cross = os.lstat(destination).st_dev != os.stat(parent).st_dev
+        moves.append(Move(Path(destination), Path(source), cross))
+
+    plan = Plan(moves, [], [], None)
+    result = run_transfer(plan, f"Undoing: {header.get('label', 'last move')}", progress, cancel, journal=False)
+    reverted = {str(dst) for _src, dst in result.moved}
+    remaining = [entry for entry in entries if entry[0] not in reverted]
+    try:
+        if remaining and result.cancelled:
+            # Keep what wasn't reverted, so "undo that" can finish the job
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(header) + "\n")
+                f.writelines(json.dumps(entry) + "\n" for entry in remaining)
+        else:
+            os.remove(path)
+    except OSError as e:
+        print(f"[FileManager] Could not update undo journal: {e}")
+    return result, conflicts
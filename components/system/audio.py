@@ -84,56 +84,21 @@ def _toggle_device(speaker, device_type="input", system_wide=False):
         
     config_key = f"{device_type}_device_name"
     
-    # Connect to PyAudio via subprocess to get a fresh, un-cached device graph
-    import subprocess
-    import sys
+    # Device list from a fresh process so the graph isn't cached
+    from core.audio_io import get_backend
     
-    script = """
-import pyaudio, json, sys, os
-sys.stderr = open(os.devnull, 'w')
-try:
-    p = pyaudio.PyAudio()
-    try: api = p.get_default_host_api_info()['index']
-    except: api = None
-    
-    try: def_in = p.get_default_input_device_info().get('name')
-    except: def_in = None
-    
-    try: def_out = p.get_default_output_device_info().get('name')
-    except: def_out = None
-    
-    ins, outs = [], []
-    for i in range(p.get_device_count()):
-        info = p.get_device_info_by_index(i)
-        if api is not None and info.get('hostApi') != api: continue
-        name = info.get('name', '')
-        if not name or 'Microsoft Sound Mapper' in name: continue
-        if info.get('maxInputChannels', 0) > 0 and name not in ins: ins.append(name)
-        if info.get('maxOutputChannels', 0) > 0 and name not in outs: outs.append(name)
-        
-    print(json.dumps({'inputs': ins, 'outputs': outs, 'default_in': def_in, 'default_out': def_out}))
-    p.terminate()
-except Exception as e:
-    print(json.dumps({'error': str(e)}))
-"""
     available_devices = []
     default_device_name = None
     
     try:
-        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=2)
-        if result.returncode == 0 and result.stdout.strip():
-            # Robust JSON parsing to ignore any ALSA/PyAudio warnings intermixed in stdout
-            import re
-            match = re.search(r'\{.*\}', result.stdout.strip(), re.DOTALL)
-            if match:
-                scanned_data = json.loads(match.group(0))
-                if 'error' not in scanned_data:
-                    if device_type == "input":
-                        available_devices = scanned_data.get('inputs', [])
-                        default_device_name = scanned_data.get('default_in')
-                    else:
-                        available_devices = scanned_data.get('outputs', [])
-                        default_device_name = scanned_data.get('default_out')
+        scanned_data = get_backend().list_devices()
+        if scanned_data:
+            if device_type == "input":
+                available_devices = scanned_data.get('inputs', [])
+                default_device_name = scanned_data.get('default_in')
+            else:
+                available_devices = scanned_data.get('outputs', [])
+                default_device_name = scanned_data.get('default_out')
     except Exception as e:
         print(f"[Audio Toggle] Error identifying devices: {e}")
             
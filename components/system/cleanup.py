@@ -1,6 +1,6 @@
 import platform
 import os
-from components.system.custom_utils import run_in_separate_terminal
+from components.system.custom_utils import run_command
 
 def clean_system(speaker=None):
     os_type = platform.system()
@@ -16,14 +16,14 @@ def clean_system(speaker=None):
                 "echo 'Clearing thumbnail cache...'; rm -rf ~/.cache/thumbnails/*; "
                 "echo 'Cleanup Complete!'"
             )
-            run_in_separate_terminal(cmd, "SYSTEM CLEANUP", os_type, speaker)
+            run_command(cmd, "SYSTEM CLEANUP", os_type, speaker)
             
     elif os_type == 'Windows':
             # Clean %TEMP% folder safely
             # Removed 'msg' command as it's not available on all editions (e.g. Home)
             # /q = quiet, /f = force, /s = subdirectories
             cmd = 'echo Cleaning temporary files... & del /q /f /s %TEMP%\\* & echo. & echo Cleanup Complete!'
-            run_in_separate_terminal(cmd, "SYSTEM CLEANUP", os_type, speaker, admin=True)
+            run_command(cmd, "SYSTEM CLEANUP", os_type, speaker, admin=True)
             
     elif os_type == 'Darwin': # MacOS
             # Clear User Caches and brew cleanup if available
@@ -32,4 +32,4 @@ def clean_system(speaker=None):
                 "if command -v brew &> /dev/null; then echo 'Running Homebrew Cleanup...'; brew cleanup; fi; "
                 "echo 'Cleanup Complete!'"
             )
-            run_in_separate_terminal(cmd, "SYSTEM CLEANUP", os_type, speaker)
+            run_command(cmd, "SYSTEM CLEANUP", os_type, speaker)
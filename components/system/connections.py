@@ -1,14 +1,24 @@
-import platform
-from components.system.custom_utils import run_in_separate_terminal
+from core.network_monitor import get_monitor
+
 
 def check_connections(speaker=None):
-    os_type = platform.system()
+    """Speaks the established connection count and the processes holding the most connections."""
+    snapshot = get_monitor().latest()
+    if snapshot is None:
+        if speaker:
+            speaker.speak("Network statistics are not available yet.")
+        return
+
+    for name, count in snapshot.connections:
+        print(f"[Connections] {count:>4}  {name}")
+
+    if not snapshot.established:
+        message = "There are no active network connections."
+    else:
+        message = f"There are {snapshot.established} active connections."
+        top = snapshot.connections[:3]
+        if top:
+            message += " Most are from " + ", ".join(f"{name} with {count}" for name, count in top) + "."
+    print(f"[Connections] {message}")
     if speaker:
-        speaker.speak("Listing active network connections.", blocking=False)
-        
-    if os_type == 'Linux':
-            run_in_separate_terminal('sudo ss -putan', "NETWORK CONNECTIONS", os_type, speaker)
-    elif os_type == 'Windows':
-            run_in_separate_terminal('netstat -ano', "NETWORK CONNECTIONS", os_type, speaker)
-    elif os_type == 'Darwin':
-            run_in_separate_terminal('netstat -an', "NETWORK CONNECTIONS", os_type, speaker)
+        speaker.speak(message)
@@ -1,18 +1,23 @@
-import platform
-import os
-from components.system.custom_utils import run_in_separate_terminal
+from core.telemetry import get_sampler
 
 def get_cpu_info(speaker=None):
-    os_type = platform.system()
+    """Speaks the CPU model, core count and current load from the telemetry cache."""
+    sampler = get_sampler()
+    info = sampler.static_info()
+    sample = sampler.latest()
+
+    cores = info.get("physical_cores") or info.get("logical_cores")
+    message = f"You have a {info['cpu_model']}"
+    if cores:
+        message += f" with {cores} cores"
+        if info.get("logical_cores") and info["logical_cores"] != cores:
+            message += f" and {info['logical_cores']} threads"
+    message += "."
+    if sample is not None:
+        message += f" Current load is {sample.cpu_percent:.0f}%."
+        top = sampler.top_apps("cpu", 1)
+        if top and top[0].cpu_percent >= 5:
+            message += f" {top[0].name} is using the most, at {top[0].cpu_percent:.0f}%."
+    print(f"[CPU] {message}")
     if speaker:
-        speaker.speak("Retrieving CPU information.", blocking=False)
-    
-    if os_type == 'Linux':
-        cmd = "lscpu"
-        run_in_separate_terminal(cmd, "CPU INFO", os_type, speaker)
-    elif os_type == 'Windows':
-        cmd = "wmic cpu get caption, deviceid, name, numberofcores, maxclockspeed, status"
-        run_in_separate_terminal(cmd, "CPU INFO", os_type, speaker)
-    elif os_type == 'Darwin':
-        cmd = "sysctl -a | grep machdep.cpu"
-        run_in_separate_terminal(cmd, "CPU INFO", os_type, speaker)
+        speaker.speak(message)
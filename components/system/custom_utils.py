@@ -1,7 +1,24 @@
 import subprocess
 import os
 import platform
-from core.runtime_path import get_app_root
+import re
+import tempfile
+
+QUICK_TIMEOUT = 60  # seconds, for status queries that should answer right away
+
+# Full-screen / interactive programs that need a real terminal, not a captured pipe
+INTERACTIVE_PROGRAMS = {
+    "htop", "top", "btop", "nano", "vim", "vi", "less", "more", "diskpart",
+    "iftop", "nload", "ssh", "nmtui", "alsamixer", "watch", "mysql", "psql",
+}
+
+# Programs that open their own window: started detached, not tracked by the command runner
+# (they would hold a runner slot until closed, and be killed with unsaved work on exit)
+GUI_PROGRAMS = {
+    "notepad", "calc", "mspaint", "regedit", "services.msc", "gpedit.msc", "taskschd.msc",
+    "eventvwr", "perfmon", "resmon", "dxdiag", "winver", "control", "mmc", "explorer",
+    "gnome-calculator", "gimp", "gedit", "nautilus", "xdg-open", "open",
+}
 
 def get_os_type():
     return platform.system()
@@ -16,15 +33,77 @@ def get_cmd_with_auto_install(command, package):
 
 def check_sudo_access(command):
     """Checks if a command can be run with sudo without a password prompt."""
-    if get_os_type() != 'Linux':
+    if get_os_type() == 'Windows':
         return True
     try:
         # sudo -n (non-interactive) returns 0 if it can run without password, 1 or other if not
         subprocess.check_call(['sudo', '-n', 'true'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         return True
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, FileNotFoundError):
         return False
 
+def _programs(command):
+    """Lower-case program names a shell command line starts ('sudo' and a trailing .exe dropped)."""
+    programs = set()
+    for part in re.split(r"&&|\|\||[;|&]", command):
+        words = [w for w in part.split() if w != "sudo" and not w.startswith("-")]
+        if words:
+            name = re.split(r"[\\/]", words[0])[-1].lower()
+            programs.add(name[:-4] if name.endswith(".exe") else name)
+    return programs
+
+def is_gui_command(command):
+    """True when the command opens an application window instead of printing output."""
+    return bool(_programs(command) & GUI_PROGRAMS)
+
+def needs_terminal(command, admin=False):
+    """True when a command can't run with captured output: interactive programs, password prompts, UAC."""
+    if admin and get_os_type() == 'Windows':
+        return True
+    if _programs(command) & INTERACTIVE_PROGRAMS:
+        return True
+    # 'sudo -n' never prompts; any other sudo does unless it is passwordless
+    return bool(re.search(r"\bsudo\s+(?!-n\b)", command)) and not check_sudo_access(command)
+
+def run_command(command, title="System Info", os_type=None, speaker=None, admin=False, timeout=None):
+    """
+    Runs a command in the background with its output captured into the
+    Command Console, and speaks a short summary when it ends. Falls back to a
+    terminal window for interactive commands and password / UAC prompts;
+    GUI programs are launched detached.
+    """
+    if is_gui_command(command) and not (admin and get_os_type() == 'Windows'):
+        launch_detached(command, speaker)
+        return None
+    if needs_terminal(command, admin):
+        run_in_separate_terminal(command, title, os_type, speaker, admin)
+        return None
+
+    from core.command_runner import get_runner, summarize
+
+    def done(result):
+        message = summarize(result)
+        if speaker and message:
+            speaker.speak(message)
+
+    return get_runner().run(command, title.title(), timeout=timeout, done=done)
+
+def launch_detached(command, speaker=None):
+    """Starts a GUI program on its own; Cortex neither waits for it nor stops it on exit."""
+    try:
+        if get_os_type() == 'Windows':
+            flags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+            subprocess.Popen(command, shell=True, creationflags=flags,
+                             stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            subprocess.Popen(command, shell=True, start_new_session=True,
+                             stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        print(f"[Command] Launched {command}")
+    except OSError as e:
+        print(f"[Command] Could not launch {command}: {e}")
+        if speaker:
+            speaker.speak("I could not open that program.")
+
 def run_in_separate_terminal(command, title="System Info", os_type=None, speaker=None, admin=False):
     """Launches a command in a new terminal window."""
     if os_type is None:
@@ -47,9 +126,10 @@ def run_in_separate_terminal(command, title="System Info", os_type=None, speaker
                 subprocess.Popen(['x-terminal-emulator', '-e', f"bash -c \"{full_cmd}\""])
                 
         elif os_type == 'Windows':
-            # Create a temporary batch file to mitigate quoting hell
-            batch_file = os.path.join(get_app_root(), "temp_cmd.bat")
-            with open(batch_file, "w") as f:
+            # Create a temporary batch file to mitigate quoting hell (unique per call, so
+            # two commands launched together don't overwrite each other's script)
+            fd, batch_file = tempfile.mkstemp(prefix="cortex_cmd_", suffix=".bat")
+            with os.fdopen(fd, "w") as f:
                 f.write("@echo off\n")
                 f.write(f"title {title}\n")
                 f.write(f"echo {title}\n")
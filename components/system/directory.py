@@ -1,5 +1,5 @@
 import platform
-from components.system.custom_utils import run_in_separate_terminal
+from components.system.custom_utils import run_command, QUICK_TIMEOUT
 
 def list_files(speaker=None):
     os_type = platform.system()
@@ -7,6 +7,6 @@ def list_files(speaker=None):
         speaker.speak("Listing files in current directory.", blocking=False)
         
     if os_type == 'Windows':
-        run_in_separate_terminal('dir', "CURRENT DIRECTORY", os_type, speaker)
+        run_command('dir', "CURRENT DIRECTORY", os_type, speaker, timeout=QUICK_TIMEOUT)
     else:
-        run_in_separate_terminal('ls -la', "CURRENT DIRECTORY", os_type, speaker)
+        run_command('ls -la', "CURRENT DIRECTORY", os_type, speaker, timeout=QUICK_TIMEOUT)
@@ -1,12 +1,16 @@
-import platform
-from components.system.custom_utils import run_in_separate_terminal
+from core.telemetry import get_sampler, format_bytes
 
 def check_disk(speaker=None):
-    os_type = platform.system()
+    """Speaks system drive usage from the telemetry cache."""
+    sample = get_sampler().latest()
+    if sample is None or not sample.disk_total:
+        if speaker:
+            speaker.speak("Disk statistics are not available yet.")
+        return
+
+    free = sample.disk_total - sample.disk_used
+    message = (f"Your system drive is {sample.disk_percent:.0f}% full, "
+               f"with {format_bytes(free)} free of {format_bytes(sample.disk_total)}.")
+    print(f"[Disk] {message}")
     if speaker:
-        speaker.speak("Checking disk storage.", blocking=False)
-        
-    if os_type == 'Windows':
-         run_in_separate_terminal('wmic logicaldisk get size,freespace,caption', "DISK STORAGE", os_type, speaker)
-    else:
-         run_in_separate_terminal('df -h .', "DISK STORAGE", os_type, speaker)
+        speaker.speak(message)
@@ -1,6 +1,6 @@
 import platform
 import os
-from components.system.custom_utils import run_in_separate_terminal
+from components.system.custom_utils import run_command, QUICK_TIMEOUT
 
 def clear_dns_cache(speaker=None):
     os_type = platform.system()
@@ -10,10 +10,10 @@ def clear_dns_cache(speaker=None):
     if os_type == 'Linux':
         # Ubuntu/Systemd
         cmd = "sudo resolvectl flush-caches"
-        run_in_separate_terminal(cmd, "CLEAR DNS", os_type, speaker)
+        run_command(cmd, "CLEAR DNS", os_type, speaker, timeout=QUICK_TIMEOUT)
     elif os_type == 'Windows':
         cmd = "ipconfig /flushdns"
-        run_in_separate_terminal(cmd, "CLEAR DNS", os_type, speaker)
+        run_command(cmd, "CLEAR DNS", os_type, speaker, timeout=QUICK_TIMEOUT)
     elif os_type == 'Darwin':
         cmd = "sudo dscacheutil -flushcache; sudo killall -HUP mDNSResponder"
-        run_in_separate_terminal(cmd, "CLEAR DNS", os_type, speaker)
+        run_command(cmd, "CLEAR DNS", os_type, speaker, timeout=QUICK_TIMEOUT)
@@ -1,5 +1,5 @@
 import platform
-from components.system.custom_utils import run_in_separate_terminal
+from components.system.custom_utils import run_command, QUICK_TIMEOUT
 
 def check_firewall(speaker=None):
     os_type = platform.system()
@@ -7,6 +7,6 @@ def check_firewall(speaker=None):
         speaker.speak("Checking firewall status.", blocking=False)
         
     if os_type == 'Linux':
-        run_in_separate_terminal('sudo ufw status verbose', "FIREWALL STATUS", os_type, speaker)
+        run_command('sudo ufw status verbose', "FIREWALL STATUS", os_type, speaker, timeout=QUICK_TIMEOUT)
     elif os_type == 'Windows':
-            run_in_separate_terminal('netsh advfirewall show allprofiles', "FIREWALL STATUS", os_type, speaker, admin=True)
+            run_command('netsh advfirewall show allprofiles', "FIREWALL STATUS", os_type, speaker, admin=True, timeout=QUICK_TIMEOUT)
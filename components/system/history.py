@@ -0,0 +1,108 @@
+import datetime
+import re
+import time
+from core.metrics_store import get_store
+from core.telemetry import format_rate
+
+# Spoken metric names -> (store metric, label); matched as whole words (plurals too),
+# so "download" never counts as "load"
+_METRIC_WORDS = (
+    (("upload",), "net_sent_rate", "upload"),
+    (("network", "traffic", "internet", "bandwidth", "download"), "net_recv_rate", "network"),
+    (("cpu", "processor", "load"), "cpu_percent", "CPU"),
+    (("memory", "ram"), "mem_percent", "memory"),
+    (("swap",), "swap_percent", "swap"),
+    (("disk", "storage", "drive"), "disk_percent", "disk usage"),
+)
+_METRIC_PATTERNS = tuple((re.compile(r"\b(?:" + "|".join(words) + r")s?\b"), metric, label)
+                         for words, metric, label in _METRIC_WORDS)
+
+# Stored in bytes per second rather than percent
+_RATE_METRICS = ("net_recv_rate", "net_sent_rate")
+
+_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400, "week": 604800}
+_NUMBER_WORDS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+                 "ten": 10, "twelve": 12, "fifteen": 15, "twenty": 20, "thirty": 30, "few": 3}
+
+_DEFAULT_RANGE = 3600
+_MAX_RANGE = 30 * 86400
+
+
+def _parse_metric(text):
+    for pattern, metric, label in _METRIC_PATTERNS:
+        if pattern.search(text):
+            return metric, label
+    return "cpu_percent", "CPU"
+
+
+def _parse_range(text):
+    """Returns (seconds, spoken description) for phrases like 'last 10 minutes' or 'today'."""
+    if "today" in text:
+        midnight = datetime.datetime.combine(datetime.date.today(), datetime.time())
+        return max(60, time.time() - midnight.timestamp()), "today"
+    match = re.search(r"(?:last|past)\s+(?:(\d+|[a-z]+)\s+)?(second|minute|hour|day|week)s?", text)
+    if not match:
+        return _DEFAULT_RANGE, "the last hour"
+    amount_word, unit = match.group(1), match.group(2)
+    if amount_word is None:
+        amount = 1
+    elif amount_word.isdigit():
+        amount = int(amount_word)
+    else:
+        amount = _NUMBER_WORDS.get(amount_word, 1)
+    seconds = min(_MAX_RANGE, amount * _UNITS[unit])
+    description = f"the last {unit}" if amount == 1 else f"the last {amount} {unit}s"
+    return seconds, description
+
+
+def _clock(ts):
+    moment = datetime.datetime.fromtimestamp(ts)
+    fmt = "%I:%M %p" if moment.date() == datetime.date.today() else "%A at %I:%M %p"
+    return moment.strftime(fmt).replace(" 0", " ").lstrip("0")
+
+
+def report_history(command, speaker=None):
+    """Answers questions about past resource usage from the metric history store."""
+    text = (command or "").lower()
+    metric, label = _parse_metric(text)
+    seconds, description = _parse_range(text)
+    store = get_store()
+
+    if "when" in text and ("fill" in text or "full" in text or "spike" in text or "jump" in text):
+        # "When did the disk fill up?" -> biggest rise in the range (default: everything kept)
+        if not re.search(r"(?:last|past)\s", text) and "today" not in text:
+            seconds, description = _MAX_RANGE, "the last 30 days"
+        rise = store.largest_increase(metric, seconds)
+        summary = store.aggregate(metric, seconds)
+        if not rise or not summary:
+            message = f"I don't have enough {label} history to tell yet."
+        else:
+            ts, delta = rise
+            if metric in _RATE_METRICS:
+                message = (f"The biggest jump in {label} over {description} was around {_clock(ts)}, "
+                           f"up {format_rate(delta)}. It went from {format_rate(summary['first'])} "
+                           f"to {format_rate(summary['last'])}.")
+            else:
+                message = (f"The biggest jump in {label} over {description} was around {_clock(ts)}, "
+                           f"up {delta:.0f} points. It went from {summary['first']:.0f}% to {summary['last']:.0f}%.")
+    else:
+        summary = store.aggregate(metric, seconds)
+        if not summary:
+            message = f"I don't have any {label} history for {description} yet."
+        elif metric == "net_sent_rate":
+            message = (f"Over {description}, uploads averaged {format_rate(summary['mean'])}, "
+                       f"peaking at {format_rate(summary['max'])} at {_clock(summary['max_ts'])}.")
+        elif metric == "net_recv_rate":
+            upload = store.aggregate("net_sent_rate", seconds)
+            message = (f"Over {description}, downloads averaged {format_rate(summary['mean'])}, "
+                       f"peaking at {format_rate(summary['max'])} at {_clock(summary['max_ts'])}.")
+            if upload:
+                message += f" Uploads averaged {format_rate(upload['mean'])}."
+        else:
+            message = (f"Over {description}, {label} averaged {summary['mean']:.0f}%, "
+                       f"ranging from {summary['min']:.0f}% to {summary['max']:.0f}%, "
+                       f"with the peak at {_clock(summary['max_ts'])}.")
+
+    print(f"[History] {message}")
+    if speaker:
+        speaker.speak(message)
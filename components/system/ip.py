@@ -1,5 +1,5 @@
 import platform
-from components.system.custom_utils import run_in_separate_terminal
+from components.system.custom_utils import run_command, QUICK_TIMEOUT
 
 def get_ip_address(speaker=None):
     os_type = platform.system()
@@ -7,6 +7,6 @@ def get_ip_address(speaker=None):
         speaker.speak("Checking IP address.", blocking=False)
         
     if os_type == 'Windows':
-        run_in_separate_terminal('ipconfig', "IP ADDRESS", os_type, speaker)
+        run_command('ipconfig', "IP ADDRESS", os_type, speaker, timeout=QUICK_TIMEOUT)
     else:
-        run_in_separate_terminal('hostname -I', "IP ADDRESS", os_type, speaker)
+        run_command('hostname -I', "IP ADDRESS", os_type, speaker, timeout=QUICK_TIMEOUT)
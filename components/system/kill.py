@@ -1,39 +1,87 @@
 from components.application.close_app import close_application
 
+VALID_CONFIRMS = ["yes", "yeah", "yep", "sure", "do it", "go ahead", "confirm"]
+
+
+def _confirmed(speaker, listener):
+    """Listens for a yes/no answer; anything but a clear yes cancels."""
+    if not listener:
+        return True
+    print("[Debug] Listening for confirmation...")
+    confirmation = listener.listen()
+    print(f"[Debug] Heard confirmation: '{confirmation}'")
+
+    # Loose matching for confirmation
+    if confirmation and any(x in confirmation.lower() for x in VALID_CONFIRMS):
+        return True
+    if speaker:
+        speaker.speak("Cancelled.")
+    return False
+
+
 def kill_process(command, speaker=None, listener=None):
     """Identifies and kills a running process based on user command with confirmation."""
     # Clean the command to get the app name
     ignore_words = ["kill", "close", "terminate", "stop", "running", "program", "application", "process", "task", "the", "please", "cortex"]
-    
+
     words = command.lower().split()
     app_name = " ".join([w for w in words if w not in ignore_words]).strip()
-    
+
     if speaker:
         if not app_name:
             speaker.speak("Which application would you like me to close?")
             return
 
         speaker.speak(f"Are you sure you want to close {app_name}?")
-    
-    if listener:
-        print("[Debug] Listening for confirmation...")
-        confirmation = listener.listen()
-        print(f"[Debug] Heard confirmation: '{confirmation}'")
-        
-        # Loose matching for confirmation
-        if not confirmation:
-            if speaker:
-                speaker.speak("Cancelled.")
-            return
-            
-        conf_lower = confirmation.lower()
-        valid_confirms = ["yes", "yeah", "yep", "sure", "do it", "go ahead", "confirm"]
-        
-        if not any(x in conf_lower for x in valid_confirms):
-                if speaker:
-                    speaker.speak("Cancelled.")
-                return
-    
+
+    if not _confirmed(speaker, listener):
+        return
+
     # Use key-value mapping and robust close logic
     # close_application expects speaker as second arg
     close_application(app_name, speaker)
+
+
+def kill_resource_hog(command, speaker=None, listener=None):
+    """Closes the application using the most memory (or CPU / disk) after confirmation."""
+    from core.process_ranker import processes_for_app, terminate
+    from core.telemetry import get_sampler, format_bytes
+
+    words = set(command.lower().split())
+    if words & {"cpu", "processor"}:
+        by = "cpu"
+    elif words & {"disk", "io", "drive"}:
+        by = "io"
+    else:
+        by = "rss"
+
+    # Keep the snapshot: its Process objects are what gets closed, not bare pids
+    snapshot = get_sampler().latest_processes()
+    top = snapshot.top_apps(by, 1, exclude_protected=True) if snapshot else []
+    if not top:
+        if speaker:
+            speaker.speak("I don't have process statistics yet.")
+        return
+    app = top[0]
+
+    if by == "cpu":
+        usage = f"{app.cpu_percent:.0f}% of the CPU"
+    elif by == "io":
+        usage = f"{format_bytes(app.io_rate)} per second of disk activity"
+    else:
+        usage = format_bytes(app.rss)
+    spread = f" across {len(app.pids)} processes" if len(app.pids) > 1 else ""
+    print(f"[Kill] Biggest {by} user: {app.name} ({usage}, pids {list(app.pids)})")
+    if speaker:
+        speaker.speak(f"{app.name} is using {usage}{spread}. Should I close it?")
+
+    if not _confirmed(speaker, listener):
+        return
+
+    gone, alive = terminate(processes_for_app(app, snapshot))
+    if alive:
+        print(f"[Kill] Could not stop pids {[p.pid for p in alive]}")
+        if speaker:
+            speaker.speak(f"I closed {len(gone)} of {app.name}'s processes, but {len(alive)} would not stop.")
+    elif speaker:
+        speaker.speak(f"Closed {app.name}.")
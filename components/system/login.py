@@ -1,5 +1,5 @@
 import platform
-from components.system.custom_utils import run_in_separate_terminal
+from components.system.custom_utils import run_command, QUICK_TIMEOUT
 
 def check_login_history(speaker=None):
     os_type = platform.system()
@@ -7,6 +7,6 @@ def check_login_history(speaker=None):
         speaker.speak("Checking login history.", blocking=False)
         
     if os_type == 'Linux' or os_type == 'Darwin':
-            run_in_separate_terminal('last', "LOGIN HISTORY", os_type, speaker)
+            run_command('last', "LOGIN HISTORY", os_type, speaker, timeout=QUICK_TIMEOUT)
     elif os_type == 'Windows':
-            run_in_separate_terminal('query user', "LOGIN HISTORY", os_type, speaker)
+            run_command('query user', "LOGIN HISTORY", os_type, speaker, timeout=QUICK_TIMEOUT)
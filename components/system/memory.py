@@ -1,14 +1,19 @@
-import platform
-from components.system.custom_utils import run_in_separate_terminal
+from core.telemetry import get_sampler, format_bytes
 
 def check_memory(speaker=None):
-    os_type = platform.system()
+    """Speaks memory usage and the biggest consumer from the telemetry cache."""
+    sampler = get_sampler()
+    sample = sampler.latest()
+    if sample is None:
+        if speaker:
+            speaker.speak("Memory statistics are not available yet.")
+        return
+
+    message = (f"Memory is at {sample.mem_percent:.0f}%, "
+               f"{format_bytes(sample.mem_used)} of {format_bytes(sample.mem_total)} used.")
+    top = sampler.top_apps("rss", 1)
+    if top:
+        message += f" Top consumer is {top[0].name} at {format_bytes(top[0].rss)}."
+    print(f"[Memory] {message}")
     if speaker:
-        speaker.speak("Checking memory usage.", blocking=False)
-        
-    if os_type == 'Linux':
-        run_in_separate_terminal('free -h', "MEMORY USAGE", os_type, speaker)
-    elif os_type == 'Darwin':
-        run_in_separate_terminal('vm_stat', "MEMORY USAGE", os_type, speaker)
-    elif os_type == 'Windows':
-        run_in_separate_terminal('systeminfo', "MEMORY USAGE", os_type, speaker)
+        speaker.speak(message)
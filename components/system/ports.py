@@ -1,12 +1,48 @@
-import platform
-from components.system.custom_utils import run_in_separate_terminal
+from core.network_monitor import get_monitor, is_local_only
+
+# Ports read out by voice; the Network Monitor window shows the rest
+_SPOKEN = 6
+
+
+def _owner(sock):
+    return f"{sock.port} ({sock.process})" if sock.process else str(sock.port)
+
 
 def check_ports(speaker=None):
-    os_type = platform.system()
-    if speaker:
-        speaker.speak("Checking open network ports.", blocking=False)
-        
-    if os_type == 'Linux':
-        run_in_separate_terminal('sudo ss -tulnp', "OPEN PORTS", os_type, speaker)
+    """Speaks the listening ports from the network monitor, plus recent changes."""
+    monitor = get_monitor()
+    snapshot = monitor.latest()
+    if snapshot is None:
+        if speaker:
+            speaker.speak("Network statistics are not available yet.")
+        return
+
+    # One entry per port: IPv4/IPv6 and TCP/UDP twins of the same service are read once
+    seen = set()
+    exposed, local = [], []
+    for sock in snapshot.listening:
+        if (sock.port, sock.process) in seen:
+            continue
+        seen.add((sock.port, sock.process))
+        (local if is_local_only(sock) else exposed).append(sock)
+
+    for sock in snapshot.listening:
+        print(f"[Ports] {sock.proto:<3} {sock.ip:>15}:{sock.port:<5} {sock.process}")
+
+    if not exposed and not local:
+        message = "No ports are listening."
     else:
-            run_in_separate_terminal('netstat -an', "OPEN PORTS", os_type, speaker)
+        message = f"{len(exposed)} ports are open to the network"
+        if exposed:
+            message += ": " + ", ".join(_owner(s) for s in exposed[:_SPOKEN])
+            if len(exposed) > _SPOKEN:
+                message += f" and {len(exposed) - _SPOKEN} more"
+        message += f". {len(local)} more only accept local connections."
+
+    events = monitor.port_events()
+    if events:
+        ts, kind, sock = events[-1]
+        message += f" Most recently, port {sock.port} was {kind} by {sock.process}."
+    print(f"[Ports] {message}")
+    if speaker:
+        speaker.speak(message)
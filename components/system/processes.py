@@ -1,16 +1,72 @@
-import platform
-from components.system.custom_utils import run_in_separate_terminal, get_cmd_with_auto_install
+from core.telemetry import get_sampler, format_bytes
+
+# Above these, a resource counts as the reason the computer feels slow
+CPU_BUSY = 75.0
+MEMORY_TIGHT = 85.0
+SWAP_TIGHT = 50.0
+IO_HEAVY = 20 * 1024 ** 2      # bytes per second for one app
+
+
+def _describe(app, by):
+    if by == "cpu":
+        return f"{app.name} at {app.cpu_percent:.0f}% CPU"
+    if by == "io":
+        return f"{app.name} at {format_bytes(app.io_rate)} per second of disk activity"
+    return f"{app.name} with {format_bytes(app.rss)}"
+
 
 def check_processes(speaker=None):
-    os_type = platform.system()
+    """Speaks the process count and the busiest applications from the telemetry cache."""
+    sampler = get_sampler()
+    snapshot = sampler.latest_processes()
+    if not snapshot:
+        if speaker:
+            speaker.speak("Process statistics are not available yet.")
+        return
+
+    busy = [app for app in snapshot.top_apps("cpu", 3) if app.cpu_percent >= 1]
+    heavy = snapshot.top_apps("rss", 1)
+
+    message = f"{snapshot.count} processes are running in {len(snapshot.apps)} applications."
+    if busy:
+        message += " Busiest: " + ", ".join(_describe(app, "cpu") for app in busy) + "."
+    if heavy:
+        message += f" {heavy[0].name} uses the most memory, {format_bytes(heavy[0].rss)}."
+    print(f"[Processes] {message}")
+    if speaker:
+        speaker.speak(message)
+
+
+def diagnose_slowdown(speaker=None):
+    """Answers 'what's slowing my computer' from the latest cached system and process samples."""
+    sampler = get_sampler()
+    sample = sampler.latest()
+    snapshot = sampler.latest_processes()
+    if sample is None or not snapshot:
+        if speaker:
+            speaker.speak("I'm still gathering system statistics. Ask me again in a few seconds.")
+        return
+
+    top_cpu = [app for app in snapshot.top_apps("cpu", 2) if app.cpu_percent >= 5]
+    top_rss = snapshot.top_apps("rss", 1)
+    top_io = snapshot.top_apps("io", 1)
+
+    findings = []
+    if sample.cpu_percent >= CPU_BUSY and top_cpu:
+        findings.append(f"The processor is busy at {sample.cpu_percent:.0f}%, mostly "
+                        + " and ".join(_describe(app, "cpu") for app in top_cpu))
+    if (sample.mem_percent >= MEMORY_TIGHT or sample.swap_percent >= SWAP_TIGHT) and top_rss:
+        findings.append(f"Memory is at {sample.mem_percent:.0f}%, the biggest user is {_describe(top_rss[0], 'rss')}")
+    if top_io and top_io[0].io_rate >= IO_HEAVY:
+        findings.append(f"{_describe(top_io[0], 'io')} is keeping the disk busy")
+
+    if findings:
+        message = ". ".join(findings) + "."
+    else:
+        message = (f"Nothing stands out. CPU is at {sample.cpu_percent:.0f}% and memory at "
+                   f"{sample.mem_percent:.0f}%.")
+        if top_cpu:
+            message += f" The busiest application is {_describe(top_cpu[0], 'cpu')}."
+    print(f"[Processes] {message}")
     if speaker:
-         speaker.speak("Opening process monitor.", blocking=False)
-
-    if os_type == 'Linux':
-        # Auto-install htop
-        cmd = get_cmd_with_auto_install('htop', 'htop')
-        run_in_separate_terminal(cmd, "PROCESS MONITOR", os_type, speaker)
-    elif os_type == 'Windows':
-            run_in_separate_terminal('tasklist', "PROCESS MONITOR", os_type, speaker)
-    elif os_type == 'Darwin':
-            run_in_separate_terminal('top', "PROCESS MONITOR", os_type, speaker)
+        speaker.speak(message)
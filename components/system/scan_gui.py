@@ -137,6 +137,75 @@ class ScanWindow(QWidget):
              
         self.close_btn.show()
 
+class BuiltinScanWindow(QWidget):
+    """Shows progress of Cortex's built-in incremental scan, streamed from the engine."""
+
+    def __init__(self, action_queue=None):
+        super().__init__()
+        self.action_queue = action_queue
+        self.setWindowTitle("Security Scan")
+        self.setGeometry(300, 300, 460, 180)
+        self.setStyleSheet(STYLESHEET)
+        self.setWindowFlags(Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.WindowCloseButtonHint)
+
+        layout = QVBoxLayout()
+        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.label = QLabel("Looking for files...")
+        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.label)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 0)
+        layout.addWidget(self.progress)
+
+        self.detail = QLabel("")
+        self.detail.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.detail)
+
+        self.button = QPushButton("Cancel")
+        self.button.clicked.connect(self.on_button)
+        layout.addWidget(self.button)
+
+        self.setLayout(layout)
+        self.finished = False
+
+    def update_progress(self, state):
+        phase = state.get("phase")
+        files, hashed, to_hash = state.get("files", 0), state.get("hashed", 0), state.get("to_hash", 0)
+        threats = state.get("threats", 0)
+
+        if phase == "walking":
+            self.label.setText("Looking for files...")
+            self.detail.setText(f"{files:,} files found")
+        elif phase == "hashing":
+            self.label.setText("Checking new and changed files...")
+            if to_hash:
+                self.progress.setRange(0, to_hash)
+                self.progress.setValue(hashed)
+            self.detail.setText(f"{hashed:,} of {to_hash:,} changed files  |  {files - to_hash:,} unchanged")
+        else:
+            self.finished = True
+            self.progress.setRange(0, 100)
+            self.progress.setValue(100)
+            if phase == "cancelled":
+                self.label.setText("Scan cancelled.")
+            elif threats:
+                self.label.setText(f"{threats} threat{'s' if threats != 1 else ''} found.")
+            else:
+                self.label.setText("No threats found.")
+            color = "#f44336" if threats else "#4caf50"
+            self.progress.setStyleSheet(f"QProgressBar::chunk {{ background-color: {color}; }}")
+            self.detail.setText(f"{files:,} files checked, {hashed:,} re-read")
+            self.button.setText("Close")
+
+    def on_button(self):
+        if not self.finished and self.action_queue:
+            self.action_queue.put(("CANCEL_SECURITY_SCAN", None))
+            self.label.setText("Cancelling...")
+            return
+        self.close()
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = ScanWindow()
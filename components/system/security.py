@@ -1,6 +1,6 @@
 import platform
 import os
-from components.system.custom_utils import run_in_separate_terminal, get_cmd_with_auto_install
+from components.system.custom_utils import run_command, get_cmd_with_auto_install
 from core.runtime_path import get_app_root
 
 import subprocess
@@ -13,7 +13,59 @@ except ImportError:
     _HAS_DEPENDENCY_MANAGER = False
     print("[Warning] Dependency manager not available for security scan")
 
-def run_security_scan(speaker=None):
+# Words that ask for the external antivirus (ClamAV / rkhunter / Defender) instead of the built-in scan
+_FULL_SCAN_WORDS = ("full", "deep", "clamav", "defender", "antivirus", "rootkit")
+
+
+def run_security_scan(speaker=None, command="", status_queue=None):
+    """
+    Built-in incremental hash scan of the home folder by default; progress is
+    streamed to the UI and the result is spoken. 'full scan' / 'deep scan'
+    still hands off to the system antivirus.
+    """
+    text = (command or "").lower()
+    if any(w in text for w in ("stop", "cancel", "abort")):
+        from core.security_scan import cancel_background_scan
+        if speaker:
+            speaker.speak("Stopping the security scan." if cancel_background_scan() else "No scan is running.")
+        return
+    if any(w in text for w in _FULL_SCAN_WORDS):
+        run_external_scan(speaker)
+        return
+
+    from core.security_scan import start_background_scan
+
+    def progress(state):
+        if status_queue:
+            status_queue.put(("SECURITY_SCAN", state))
+
+    def done(result):
+        if not speaker:
+            return
+        if result is None:
+            speaker.speak("The security scan failed. Check the log for details.")
+        elif result.cancelled:
+            speaker.speak("Security scan cancelled.")
+        elif result.threats:
+            path, name = result.threats[0]
+            more = f" and {len(result.threats) - 1} more" if len(result.threats) > 1 else ""
+            speaker.speak(f"Warning. I found {name} in {os.path.basename(path)}{more}. "
+                          f"The full list is in the log.")
+        else:
+            speaker.speak(f"Scan complete. {result.files:,} files checked in {result.elapsed:.0f} seconds, "
+                          f"no threats found.")
+
+    home = os.path.expanduser("~")
+    if start_background_scan([home], progress=progress, done=done) is None:
+        if speaker:
+            speaker.speak("A security scan is already running.")
+        return
+    if speaker:
+        speaker.speak("Scanning your home folder for known threats.", blocking=False)
+
+
+def run_external_scan(speaker=None):
+    """Hands off to the system antivirus: rkhunter / ClamAV on Linux, Defender on Windows."""
     os_type = platform.system()
     
     if speaker:
@@ -22,7 +74,7 @@ def run_security_scan(speaker=None):
     if os_type == 'Linux':
         # Check for rkhunter first (rootkit hunter)
         if os.system("which rkhunter > /dev/null 2>&1") == 0:
-            run_in_separate_terminal('sudo rkhunter --check --sk', "SECURITY SCAN", os_type, speaker)
+            run_command('sudo rkhunter --check --sk', "SECURITY SCAN", os_type, speaker)
         else:
             # Use ClamAV as fallback - ensure it's installed
             if _HAS_DEPENDENCY_MANAGER:
@@ -86,10 +138,10 @@ def run_security_scan(speaker=None):
                         return
                 
                 # Run the scan
-                run_in_separate_terminal('clamscan -r ~', "SECURITY SCAN", os_type, speaker)
+                run_command('clamscan -r ~', "SECURITY SCAN", os_type, speaker)
             else:
                 # No dependency manager - just try to run it
-                run_in_separate_terminal('clamscan -r ~', "SECURITY SCAN", os_type, speaker)
+                run_command('clamscan -r ~', "SECURITY SCAN", os_type, speaker)
             
     elif os_type == 'Windows':
         # SMART CHECK: Check SecurityCenter2 for ANY active antivirus (including 3rd party)
@@ -196,5 +248,5 @@ def run_security_scan(speaker=None):
     elif os_type == 'Darwin': 
         # MacOS placeholder
         mac_cmd = 'echo "Gatekeeper Status:"; spctl --status; echo ""; echo "System Integrity Protection:"; csrutil status'
-        run_in_separate_terminal(mac_cmd, "SECURITY STATUS", os_type, speaker)
+        run_command(mac_cmd, "SECURITY STATUS", os_type, speaker)
 
@@ -1,5 +1,5 @@
 import platform
-from components.system.custom_utils import run_in_separate_terminal
+from components.system.custom_utils import run_command, QUICK_TIMEOUT
 
 def manage_system_services(speaker=None):
     os_type = platform.system()
@@ -8,10 +8,10 @@ def manage_system_services(speaker=None):
     
     if os_type == 'Linux':
         cmd = "systemctl list-units --type=service"
-        run_in_separate_terminal(cmd, "SYSTEM SERVICES", os_type, speaker)
+        run_command(cmd, "SYSTEM SERVICES", os_type, speaker, timeout=QUICK_TIMEOUT)
     elif os_type == 'Windows':
         cmd = "net start" # or sc query
-        run_in_separate_terminal(cmd, "SYSTEM SERVICES", os_type, speaker, admin=True)
+        run_command(cmd, "SYSTEM SERVICES", os_type, speaker, admin=True, timeout=QUICK_TIMEOUT)
     elif os_type == 'Darwin':
         cmd = "launchctl list"
-        run_in_separate_terminal(cmd, "SYSTEM SERVICES", os_type, speaker)
+        run_command(cmd, "SYSTEM SERVICES", os_type, speaker, timeout=QUICK_TIMEOUT)
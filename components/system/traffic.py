@@ -1,24 +1,28 @@
-import platform
-import os
-from components.system.custom_utils import run_in_separate_terminal, get_cmd_with_auto_install
+from core.network_monitor import get_monitor
+from core.telemetry import get_sampler, format_rate
+
+# Seconds of history averaged for the answer
+_WINDOW = 10
 
 def check_network_traffic(speaker=None):
-    os_type = platform.system()
+    """Speaks current upload/download rates from the telemetry cache."""
+    sampler = get_sampler()
+    sampler.latest()
+    # Every sample in the window counts; only the sampler's priming sample (no rates yet) is skipped
+    samples = sampler.history(_WINDOW, rates_only=True) or sampler.history()[-1:]
+    if not samples:
+        if speaker:
+            speaker.speak("Network statistics are not available yet.")
+        return
+
+    down = sum(s.net_recv_rate for s in samples) / len(samples)
+    up = sum(s.net_sent_rate for s in samples) / len(samples)
+    message = f"Downloading at {format_rate(down)} and uploading at {format_rate(up)}."
+    net = get_monitor().latest()
+    busiest = [r for r in (net.interfaces if net else ())
+               if r.sent_rate + r.recv_rate > 0 and not r.name.lower().startswith(("lo", "loopback"))]
+    if len(busiest) > 1:
+        message += f" Most of it is on {busiest[0].name}."
+    print(f"[Traffic] {message}")
     if speaker:
-        speaker.speak("Checking network traffic usage.", blocking=False)
-        
-    if os_type == 'Linux':
-        # Try iftop first (needs sudo), then nload, then fallback
-        if os.system("which iftop > /dev/null 2>&1") == 0:
-                run_in_separate_terminal('sudo iftop', "NETWORK TRAFFIC", os_type, speaker)
-        elif os.system("which nload > /dev/null 2>&1") == 0:
-                run_in_separate_terminal('nload', "NETWORK TRAFFIC", os_type, speaker)
-        else:
-                # Auto install iftop
-                cmd = "echo 'Installing iftop...'; sudo apt install iftop -y; sudo iftop"
-                run_in_separate_terminal(cmd, "NETWORK TRAFFIC (Installing...)", os_type, speaker)
-                
-    elif os_type == 'Windows':
-            run_in_separate_terminal('netstat -e', "NETWORK TRAFFIC (Bytes)", os_type, speaker)
-    elif os_type == 'Darwin':
-            run_in_separate_terminal('netstat -ib', "NETWORK TRAFFIC (Stats)", os_type, speaker)
+        speaker.speak(message)
@@ -1,5 +1,5 @@
 import platform
-from components.system.custom_utils import run_in_separate_terminal
+from components.system.custom_utils import run_command
 
 def check_for_updates(speaker=None):
     os_type = platform.system()
@@ -9,7 +9,7 @@ def check_for_updates(speaker=None):
     if os_type == 'Linux':
         # Assuming apt for Debian/Ubuntu based systems
         cmd = "sudo apt update && apt list --upgradable"
-        run_in_separate_terminal(cmd, "SYSTEM UPDATES", os_type, speaker)
+        run_command(cmd, "SYSTEM UPDATES", os_type, speaker)
     elif os_type == 'Windows':
         # Requires PowerShell module PSWindowsUpdate usually, but we can try generic
         # or just open Windows Update settings?
@@ -23,7 +23,7 @@ def check_for_updates(speaker=None):
         # But we need output in terminal?
         # Let's try:
         cmd_show = "echo 'Opening Windows Update Settings...' & start ms-settings:windowsupdate"
-        run_in_separate_terminal(cmd_show, "SYSTEM UPDATES", os_type, speaker)
+        run_command(cmd_show, "SYSTEM UPDATES", os_type, speaker)
     elif os_type == 'Darwin':
         cmd = "softwareupdate -l"
-        run_in_separate_terminal(cmd, "SYSTEM UPDATES", os_type, speaker)
+        run_command(cmd, "SYSTEM UPDATES", os_type, speaker)
@@ -1,6 +1,6 @@
 import platform
 import os
-from components.system.custom_utils import run_in_separate_terminal
+from components.system.custom_utils import run_command, QUICK_TIMEOUT
 
 def get_current_user(speaker=None):
     os_type = platform.system()
@@ -15,4 +15,4 @@ def get_current_user(speaker=None):
         user = getpass.getuser()
         
     cmd = f"echo Current User: {user}; id"
-    run_in_separate_terminal(cmd, "CURRENT USER", os_type, speaker)
+    run_command(cmd, "CURRENT USER", os_type, speaker, timeout=QUICK_TIMEOUT)
@@ -1,5 +1,5 @@
 import platform
-from components.system.custom_utils import run_in_separate_terminal
+from components.system.custom_utils import run_command, QUICK_TIMEOUT
 
 def get_wifi_list(speaker=None):
     os_type = platform.system()
@@ -8,10 +8,10 @@ def get_wifi_list(speaker=None):
     
     if os_type == 'Linux':
         cmd = "nmcli dev wifi list"
-        run_in_separate_terminal(cmd, "WI-FI NETWORKS", os_type, speaker)
+        run_command(cmd, "WI-FI NETWORKS", os_type, speaker, timeout=QUICK_TIMEOUT)
     elif os_type == 'Windows':
         cmd = "netsh wlan show networks mode=bssid"
-        run_in_separate_terminal(cmd, "WI-FI NETWORKS", os_type, speaker)
+        run_command(cmd, "WI-FI NETWORKS", os_type, speaker, timeout=QUICK_TIMEOUT)
     elif os_type == 'Darwin':
         cmd = "/System/Library/PrivateFrameworks/Apple80211.framework/Versions/Current/Resources/airport -s"
-        run_in_separate_terminal(cmd, "WI-FI NETWORKS", os_type, speaker)
+        run_command(cmd, "WI-FI NETWORKS", os_type, speaker, timeout=QUICK_TIMEOUT)
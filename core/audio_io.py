@@ -0,0 +1,494 @@
+"""
+Cortex Audio I/O
+
+One interface for every place that records or plays audio (Listener, the
+TTS worker, the voice preview in Settings, device probing), so the pipeline
+can run without sound hardware and PortAudio recovery lives in one place.
+
+Backends:
+- PyAudioBackend:   real devices through PortAudio. Keeps one PyAudio
+                    instance alive and recreates it when the routing graph
+                    breaks (error -9999 after a device hot-swap).
+- WavReplayBackend: capture replays WAV files (paced like a microphone),
+                    playback is discarded. Used by the benchmarks.
+- NullBackend:      capture returns silence, playback is discarded.
+- LoopbackBackend:  whatever is played back can be captured again, all in
+                    memory. Useful for headless load and barge-in tests.
+
+The backend is picked with the CORTEX_AUDIO_BACKEND environment variable
+("pyaudio" (default), "null", "loopback", "wav:<file>"), which child
+processes such as the TTS worker inherit.
+
+Usage:
+    from core.audio_io import get_backend
+    audio = get_backend()
+    stream = audio.open_capture(rate=16000, channels=1, frames_per_buffer=1024)
+    data = stream.read(1024)
+    stream.close()
+"""
+
+import abc
+import collections
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import wave
+
+from .alsa_error import no_alsa_error
+
+SAMPLE_WIDTH = 2  # Everything in Cortex is 16-bit PCM
+
+# Seconds to let the OS audio stack settle after PortAudio is recreated
+RECOVERY_SETTLE = 1.0
+
+# Fresh-process device scan (PortAudio caches the device list per instance,
+# so a new interpreter is the only reliable way to see hot-plugged devices)
+DEVICE_PROBE_SCRIPT = """
+import pyaudio, json, sys, os
+sys.stderr = open(os.devnull, 'w')
+try:
+    p = pyaudio.PyAudio()
+    try: api = p.get_default_host_api_info()['index']
+    except: api = None
+
+    try: def_in = p.get_default_input_device_info().get('name')
+    except: def_in = None
+
+    try: def_out = p.get_default_output_device_info().get('name')
+    except: def_out = None
+
+    ins, outs = [], []
+    for i in range(p.get_device_count()):
+        info = p.get_device_info_by_index(i)
+        if api is not None and info.get('hostApi') != api: continue
+        name = info.get('name', '')
+        if not name or 'Microsoft Sound Mapper' in name: continue
+        if info.get('maxInputChannels', 0) > 0 and name not in ins: ins.append(name)
+        if info.get('maxOutputChannels', 0) > 0 and name not in outs: outs.append(name)
+
+    print(json.dumps({'inputs': ins, 'outputs': outs, 'default_in': def_in, 'default_out': def_out}))
+    p.terminate()
+except Exception as e:
+    print(json.dumps({'error': str(e)}))
+"""
+
+
+def is_device_error(error):
+    """True for PortAudio errors that mean the device graph is stale (hot-swap)."""
+    text = str(error)
+    return "-9999" in text or "Unanticipated host error" in text
+
+
+class AudioStream:
+    """Common stream interface. Capture streams implement read, playback streams write."""
+
+    def read(self, num_frames, exception_on_overflow=False):
+        raise NotImplementedError
+
+    def write(self, data):
+        raise NotImplementedError
+
+    def is_active(self):
+        return False
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class AudioBackend(abc.ABC):
+    """Base class. Subclasses provide _open_capture / _open_playback."""
+
+    name = "base"
+
+    def open_capture(self, rate=16000, channels=1, frames_per_buffer=1024, device_index=None):
+        return self._open_capture(rate, channels, frames_per_buffer, device_index)
+
+    def open_playback(self, rate=22050, channels=1, frames_per_buffer=1024, device_index=None):
+        return self._open_playback(rate, channels, frames_per_buffer, device_index)
+
+    @abc.abstractmethod
+    def _open_capture(self, rate, channels, frames_per_buffer, device_index):
+        """Returns an AudioStream whose read() yields 16-bit PCM."""
+
+    @abc.abstractmethod
+    def _open_playback(self, rate, channels, frames_per_buffer, device_index):
+        """Returns an AudioStream that accepts 16-bit PCM in write()."""
+
+    def reset(self):
+        """Drops cached device state so the next open sees the current devices."""
+
+    def recover(self, error):
+        """
+        Called when a stream fails mid-use. Returns True if the backend reset
+        itself and the caller may retry, False if the error wasn't a device error.
+        """
+        return False
+
+    def list_devices(self):
+        """Returns {'inputs', 'outputs', 'default_in', 'default_out'}, or None if the scan failed."""
+        return {"inputs": [], "outputs": [], "default_in": None, "default_out": None}
+
+    def clone(self):
+        """Returns an independent backend for use on another thread."""
+        return self
+
+    def terminate(self):
+        pass
+
+
+# ── PyAudio ──
+
+class _PyAudioStream(AudioStream):
+    def __init__(self, stream):
+        self._stream = stream
+
+    def read(self, num_frames, exception_on_overflow=False):
+        return self._stream.read(num_frames, exception_on_overflow=exception_on_overflow)
+
+    def write(self, data):
+        self._stream.write(data)
+
+    def is_active(self):
+        return self._stream.is_active()
+
+    def stop_stream(self):
+        self._stream.stop_stream()
+
+    def close(self):
+        try:
+            if self._stream.is_active():
+                self._stream.stop_stream()
+        except Exception:
+            pass
+        self._stream.close()
+
+
+class PyAudioBackend(AudioBackend):
+    name = "pyaudio"
+
+    def __init__(self):
+        self._pa = None
+        self._lock = threading.RLock()
+
+    def _instance(self):
+        with self._lock:
+            if self._pa is None:
+                import pyaudio
+                with no_alsa_error():
+                    self._pa = pyaudio.PyAudio()
+            return self._pa
+
+    def reset(self):
+        """Recreates the PortAudio instance (drops its cached device graph)."""
+        with self._lock:
+            if self._pa is not None:
+                try:
+                    self._pa.terminate()
+                except Exception:
+                    pass
+                self._pa = None
+            time.sleep(RECOVERY_SETTLE)  # Let COM objects / PulseAudio settle
+            return self._instance()
+
+    def recover(self, error):
+        if not is_device_error(error):
+            return False
+        print("[Audio] Audio device graph changed. Reinitializing PortAudio...")
+        self.reset()
+        return True
+
+    def _open(self, **kwargs):
+        """
+        Opens a stream with the shared recovery policy:
+        1. try the requested device,
+        2. on a stale graph (-9999) recreate PortAudio; on any other error
+           fall back to the OS default device,
+        3. retry once, recovering again if that fails too.
+        """
+        import pyaudio
+        kwargs.setdefault("format", pyaudio.paInt16)
+        with no_alsa_error():
+            try:
+                return _PyAudioStream(self._instance().open(**kwargs))
+            except Exception as e:
+                if is_device_error(e):
+                    self.reset()
+                else:
+                    print(f"[!] Target audio device unavailable, fallback to default: {e}")
+                kwargs.pop("input_device_index", None)
+                kwargs.pop("output_device_index", None)
+                try:
+                    return _PyAudioStream(self._instance().open(**kwargs))
+                except Exception as fallback_e:
+                    if is_device_error(fallback_e):
+                        self.reset()
+                    raise
+
+    def _open_capture(self, rate, channels, frames_per_buffer, device_index):
+        kwargs = {"channels": channels, "rate": rate, "input": True, "frames_per_buffer": frames_per_buffer}
+        # Omitting the index makes PortAudio use the OS default (Sound Mapper on Windows)
+        if device_index is not None:
+            kwargs["input_device_index"] = device_index
+        return self._open(**kwargs)
+
+    def _open_playback(self, rate, channels, frames_per_buffer, device_index):
+        kwargs = {"channels": channels, "rate": rate, "output": True, "frames_per_buffer": frames_per_buffer}
+        if device_index is not None:
+            kwargs["output_device_index"] = device_index
+        return self._open(**kwargs)
+
+    def list_devices(self):
+        # None on failure, so callers don't mistake a failed scan for "all unplugged"
+        return probe_devices()
+
+    def clone(self):
+        return PyAudioBackend()
+
+    def terminate(self):
+        with self._lock:
+            if self._pa is not None:
+                try:
+                    self._pa.terminate()
+                except Exception:
+                    pass
+                self._pa = None
+
+
+# ── In-memory backends ──
+
+class _PacedStream(AudioStream):
+    """Capture/playback stream whose reads take as long as real audio would."""
+
+    def __init__(self, source, rate, channels, realtime):
+        self.source = source
+        self.rate = rate
+        self.channels = channels
+        self.realtime = realtime
+        self.active = True
+        self._deadline = time.perf_counter()
+
+    def _pace(self, num_frames):
+        if not self.realtime:
+            return
+        self._deadline = max(self._deadline, time.perf_counter() - 0.5) + num_frames / float(self.rate)
+        delay = self._deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def read(self, num_frames, exception_on_overflow=False):
+        self._pace(num_frames)
+        return self.source._capture(num_frames * self.channels * SAMPLE_WIDTH)
+
+    def write(self, data):
+        self.source._playback(data)
+        self._pace(len(data) // (self.channels * SAMPLE_WIDTH))
+
+    def is_active(self):
+        return self.active
+
+    def stop_stream(self):
+        self.active = False
+
+    def close(self):
+        self.active = False
+
+
+class NullBackend(AudioBackend):
+    """Silence in, nothing out. Counts played bytes for load tests."""
+
+    name = "null"
+
+    def __init__(self, realtime=True):
+        self.realtime = realtime
+        self.bytes_played = 0
+
+    def _capture(self, nbytes):
+        return b"\x00" * nbytes
+
+    def _playback(self, data):
+        self.bytes_played += len(data)
+
+    def _open_capture(self, rate, channels, frames_per_buffer, device_index):
+        return _PacedStream(self, rate, channels, self.realtime)
+
+    def _open_playback(self, rate, channels, frames_per_buffer, device_index):
+        return _PacedStream(self, rate, channels, self.realtime)
+
+    def list_devices(self):
+        return {"inputs": ["Null Input"], "outputs": ["Null Output"],
+                "default_in": "Null Input", "default_out": "Null Output"}
+
+
+class WavReplayBackend(NullBackend):
+    """Capture serves the loaded WAV clip followed by silence."""
+
+    name = "wav"
+
+    def __init__(self, path=None, realtime=True, rate=16000):
+        super().__init__(realtime)
+        self.rate = rate
+        self._pcm = b""
+        self._pos = 0
+        if path:
+            self.load(path)
+
+    def load(self, path):
+        """Queues a WAV file for the next capture reads. Returns its duration in seconds."""
+        self._pcm = load_wav(path, self.rate)
+        self._pos = 0
+        return len(self._pcm) / float(SAMPLE_WIDTH * self.rate)
+
+    def _capture(self, nbytes):
+        chunk = self._pcm[self._pos:self._pos + nbytes]
+        self._pos += len(chunk)
+        if len(chunk) < nbytes:
+            chunk += b"\x00" * (nbytes - len(chunk))
+        return chunk
+
+    def list_devices(self):
+        return {"inputs": ["WAV Replay"], "outputs": ["Null Output"],
+                "default_in": "WAV Replay", "default_out": "Null Output"}
+
+
+class LoopbackBackend(NullBackend):
+    """
+    Played audio becomes capturable audio. Sample rates are not converted,
+    so play and capture at the same rate.
+    """
+
+    name = "loopback"
+
+    def __init__(self, realtime=True, max_seconds=30, rate=16000):
+        super().__init__(realtime)
+        self._buffer = collections.deque()
+        self._buffered = 0
+        self._limit = max_seconds * rate * SAMPLE_WIDTH
+        self._lock = threading.Lock()
+
+    def _playback(self, data):
+        with self._lock:
+            self.bytes_played += len(data)
+            self._buffer.append(bytes(data))
+            self._buffered += len(data)
+            # Drop the oldest audio rather than growing without bound
+            while self._buffered > self._limit and self._buffer:
+                self._buffered -= len(self._buffer.popleft())
+
+    def _capture(self, nbytes):
+        out = bytearray()
+        with self._lock:
+            while self._buffer and len(out) < nbytes:
+                chunk = self._buffer.popleft()
+                need = nbytes - len(out)
+                if len(chunk) > need:
+                    self._buffer.appendleft(chunk[need:])
+                    chunk = chunk[:need]
+                out += chunk
+                self._buffered -= len(chunk)
+        if len(out) < nbytes:
+            out += b"\x00" * (nbytes - len(out))
+        return bytes(out)
+
+    def list_devices(self):
+        return {"inputs": ["Loopback"], "outputs": ["Loopback"],
+                "default_in": "Loopback", "default_out": "Loopback"}
+
+
+# ── Helpers ──
+
+def load_wav(path, target_rate=16000):
+    """Reads a WAV file and returns mono 16-bit PCM bytes at target_rate."""
+    import numpy as np
+
+    with wave.open(path, "rb") as wf:
+        channels = wf.getnchannels()
+        width = wf.getsampwidth()
+        rate = wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+
+    if width == 2:
+        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32)
+    elif width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) * 256.0
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype=np.int32).astype(np.float32) / 65536.0
+    else:
+        raise ValueError(f"Unsupported sample width {width} in {path}")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+
+    if rate != target_rate and len(samples):
+        # Linear resampling is plenty for speech
+        duration = len(samples) / float(rate)
+        n_out = int(round(duration * target_rate))
+        x_old = np.linspace(0.0, duration, num=len(samples), endpoint=False)
+        x_new = np.linspace(0.0, duration, num=n_out, endpoint=False)
+        samples = np.interp(x_new, x_old, samples)
+
+    return np.clip(samples, -32768, 32767).astype(np.int16).tobytes()
+
+
+def probe_devices(timeout=2):
+    """
+    Lists audio devices from a fresh interpreter. Returns
+    {'inputs', 'outputs', 'default_in', 'default_out'} or None on failure.
+    """
+    try:
+        result = subprocess.run([sys.executable, "-c", DEVICE_PROBE_SCRIPT],
+                                capture_output=True, text=True, timeout=timeout)
+        if result.returncode != 0 or not result.stdout.strip():
+            return None
+        # ALSA/PyAudio warnings can end up intermixed in stdout
+        match = re.search(r'\{.*\}', result.stdout.strip(), re.DOTALL)
+        if not match:
+            return None
+        data = json.loads(match.group(0))
+        if 'error' in data:
+            return None
+        return data
+    except Exception:
+        return None
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(spec=None):
+    """Builds a backend from a spec string ("pyaudio", "null", "loopback", "wav:<file>")."""
+    spec = (spec or os.environ.get("CORTEX_AUDIO_BACKEND") or "pyaudio").strip()
+    kind, _, arg = spec.partition(":")
+    kind = kind.lower()
+    if kind == "null":
+        return NullBackend()
+    if kind == "loopback":
+        return LoopbackBackend()
+    if kind == "wav":
+        return WavReplayBackend(arg or None)
+    if kind != "pyaudio":
+        print(f"[Audio] Unknown audio backend '{spec}', using PyAudio.")
+    return PyAudioBackend()
+
+
+def get_backend():
+    """Returns the process-wide audio backend."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend()
+        return _backend
+
+
+def set_backend(backend):
+    """Replaces the process-wide audio backend (tests, benchmarks)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
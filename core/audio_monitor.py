@@ -1,10 +1,33 @@
+"""
+Cortex Audio Device Monitor
+
+Watches for audio devices being plugged in / unplugged and for default
+device swaps, then notifies the UI with AUDIO_DEVICES_CHANGED.
+
+Change detection is event driven where the OS offers it:
+- Linux + PulseAudio/PipeWire: a single long-lived `pactl subscribe`
+  process reports sink/source/card add/remove and default-device changes.
+- Linux + pyudev (optional): kernel hotplug events for the 'sound' subsystem.
+Otherwise a cheap in-process poller runs once per second (/proc/asound on
+Linux, winmm on Windows). Only macOS, or a system with none of the above,
+falls back to the fresh-interpreter PyAudio probe.
+
+Each wake-up rescans the device list once and diffs it against the
+previous snapshot, so a change reaches the UI well within a second.
+"""
+
+import os
+import platform
+import re
+import shutil
+import subprocess
 import threading
 import time
-import platform
+from core.audio_io import get_backend
 
 def _is_virtual_linux_device(name: str) -> bool:
     """Return True if *name* should be excluded from connect/disconnect monitoring on Linux.
-    
+
     On Linux, ALSA built-in sound cards (e.g. HDA Intel PCH) temporarily vanish
     from PyAudio when TTS or other apps use the device.  Only genuinely external
     devices (USB headsets, Bluetooth speakers) can actually be plugged / unplugged,
@@ -18,98 +41,292 @@ def _is_virtual_linux_device(name: str) -> bool:
         return False   # Not virtual — worth monitoring
     return True        # Everything else is excluded on Linux
 
-# Number of consecutive polls a device must be missing before reporting disconnect.
-# With a 3-second poll interval this means ~9 seconds of confirmed absence.
+# Number of consecutive scans a device must be missing before reporting disconnect.
+# Only needed for the PyAudio probe, where built-in devices flicker while in use.
 _DEBOUNCE_POLLS = 3
 
+# Events are bursty (card + sink + source arrive together): wait this long
+# after the first one and rescan once
+_SETTLE_SECONDS = 0.15
+
+# Poll intervals (seconds)
+_NATIVE_POLL_INTERVAL = 1.0    # in-process scanners
+_PROBE_POLL_INTERVAL = 3.0     # fresh-interpreter PyAudio probe
+_SAFETY_RESCAN_INTERVAL = 30.0 # event-driven mode, in case an event was missed
+
+# `pactl subscribe` lines that can change the device list or the defaults
+# (volume changes arrive as "change on sink" and are ignored)
+_PACTL_EVENT = re.compile(r"Event '(?:new|remove)' on (?:sink|source|card)|Event 'change' on server")
+
+_EXTERNAL_BUSES = ("usb", "bluetooth")
+
+
+def _pactl(*args):
+    # LC_ALL=C so field names aren't translated
+    env = dict(os.environ, LC_ALL="C")
+    result = subprocess.run(["pactl", *args], capture_output=True, text=True, timeout=2, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"pactl {args[0]} failed")
+    return result.stdout
+
+
+def _parse_pactl_list(text):
+    """Parses `pactl list sinks|sources` into [(name, description, bus)]."""
+    devices = []
+    name = description = bus = None
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not line.startswith((" ", "\t")) and stripped:
+            if name:
+                devices.append((name, description or name, bus))
+            name = description = bus = None
+        elif stripped.startswith("Name:"):
+            name = stripped[5:].strip()
+        elif stripped.startswith("Description:"):
+            description = stripped[12:].strip()
+        elif stripped.startswith("device.bus ="):
+            bus = stripped.split("=", 1)[1].strip().strip('"')
+    if name:
+        devices.append((name, description or name, bus))
+    return devices
+
+
+def _scan_pulse():
+    """Device snapshot from PulseAudio / PipeWire (pipewire-pulse)."""
+    sinks = _parse_pactl_list(_pactl("list", "sinks"))
+    sources = [d for d in _parse_pactl_list(_pactl("list", "sources")) if not d[0].endswith(".monitor")]
+    info = _pactl("info")
+    default_sink = re.search(r"^Default Sink:\s*(.+)$", info, re.MULTILINE)
+    default_source = re.search(r"^Default Source:\s*(.+)$", info, re.MULTILINE)
+    names = {name: desc for name, desc, _ in sinks + sources}
+    return {
+        # Built-in cards are excluded for the same reason as with PyAudio: only
+        # USB / Bluetooth devices can really come and go
+        "inputs": [desc for _, desc, bus in sources if bus in _EXTERNAL_BUSES],
+        "outputs": [desc for _, desc, bus in sinks if bus in _EXTERNAL_BUSES],
+        "default_in": names.get(default_source.group(1).strip()) if default_source else None,
+        "default_out": names.get(default_sink.group(1).strip()) if default_sink else None,
+    }
+
+
+def _scan_proc_asound():
+    """Device snapshot from /proc/asound (ALSA, no subprocess)."""
+    cards = {}
+    with open("/proc/asound/cards", "r") as f:
+        for line in f:
+            # " 1 [Device         ]: USB-Audio - USB Audio Device"
+            match = re.match(r"\s*(\d+)\s+\[[^\]]*\]:\s*(\S+)\s+-\s+(.+)$", line)
+            if match:
+                cards[match.group(1)] = (match.group(2), match.group(3).strip())
+    inputs, outputs = [], []
+    for index, (driver, name) in cards.items():
+        if driver != "USB-Audio" and _is_virtual_linux_device(name):
+            continue
+        card_dir = f"/proc/asound/card{index}"
+        try:
+            entries = os.listdir(card_dir)
+        except OSError:
+            continue
+        if any(e.startswith("pcm") and e.endswith("c") for e in entries):
+            inputs.append(name)
+        if any(e.startswith("pcm") and e.endswith("p") for e in entries):
+            outputs.append(name)
+    return {"inputs": inputs, "outputs": outputs, "default_in": None, "default_out": None}
+
+
+def _scan_winmm():
+    """Device snapshot from the Windows multimedia API (in-process, sees hotplug)."""
+    import ctypes
+    from ctypes import wintypes
+
+    class WAVEINCAPSW(ctypes.Structure):
+        _fields_ = [("wMid", wintypes.WORD), ("wPid", wintypes.WORD), ("vDriverVersion", wintypes.UINT),
+                    ("szPname", wintypes.WCHAR * 32), ("dwFormats", wintypes.DWORD),
+                    ("wChannels", wintypes.WORD), ("wReserved1", wintypes.WORD)]
+
+    class WAVEOUTCAPSW(ctypes.Structure):
+        _fields_ = [("wMid", wintypes.WORD), ("wPid", wintypes.WORD), ("vDriverVersion", wintypes.UINT),
+                    ("szPname", wintypes.WCHAR * 32), ("dwFormats", wintypes.DWORD),
+                    ("wChannels", wintypes.WORD), ("wReserved1", wintypes.WORD), ("dwSupport", wintypes.DWORD)]
+
+    winmm = ctypes.windll.winmm
+    inputs, outputs = [], []
+    for i in range(winmm.waveInGetNumDevs()):
+        caps = WAVEINCAPSW()
+        if winmm.waveInGetDevCapsW(i, ctypes.byref(caps), ctypes.sizeof(caps)) == 0:
+            inputs.append(caps.szPname)
+    for i in range(winmm.waveOutGetNumDevs()):
+        caps = WAVEOUTCAPSW()
+        if winmm.waveOutGetDevCapsW(i, ctypes.byref(caps), ctypes.sizeof(caps)) == 0:
+            outputs.append(caps.szPname)
+    # Ask the wave mapper which device it currently prefers (the OS default)
+    WAVE_MAPPER = wintypes.UINT(-1 & 0xFFFFFFFF)
+    DRVM_MAPPER_PREFERRED_GET = 0x2015
+    default_in = default_out = None
+    dev_id, flags = wintypes.DWORD(), wintypes.DWORD()
+    if winmm.waveInMessage(WAVE_MAPPER, DRVM_MAPPER_PREFERRED_GET, ctypes.byref(dev_id), ctypes.byref(flags)) == 0:
+        if dev_id.value < len(inputs):
+            default_in = inputs[dev_id.value]
+    if winmm.waveOutMessage(WAVE_MAPPER, DRVM_MAPPER_PREFERRED_GET, ctypes.byref(dev_id), ctypes.byref(flags)) == 0:
+        if dev_id.value < len(outputs):
+            default_out = outputs[dev_id.value]
+    return {"inputs": inputs, "outputs": outputs, "default_in": default_in, "default_out": default_out}
+
+
 class AudioDeviceMonitor(threading.Thread):
     def __init__(self, tts_queue, status_queue, on_change_callback=None):
         super().__init__()
         self.tts_queue = tts_queue
         self.status_queue = status_queue
         self.on_change_callback = on_change_callback
+        self.audio = get_backend()
         self.running = True
         self.daemon = True
-        
+
         self.current_inputs = set()
         self.current_outputs = set()
         self.current_default_in = None
         self.current_default_out = None
-        
+
         # Tracks devices that have disappeared but haven't been confirmed gone yet.
         # Key: (device_type, device_name)  Value: consecutive-miss count
         self._pending_removals: dict[tuple[str, str], int] = {}
-        
-        # Initial snapshot to prevent spamming on startup
-        self._poll_devices(initial=True)
+
+        # Set by event sources; the monitor thread sleeps on it
+        self._wake = threading.Event()
+        self._event_proc = None
+        self._udev_observer = None
+        self._scanner = None
+        self._scanner_name = None
+        self._debounce = 1
+        self._poll_interval = _NATIVE_POLL_INTERVAL
+
+    # ── Scanners ──
+
+    def _select_scanner(self):
+        """Picks the cheapest scanner that works on this machine."""
+        os_type = platform.system()
+        candidates = []
+        if os_type == "Linux":
+            if shutil.which("pactl"):
+                candidates.append(("pulse", _scan_pulse))
+            if os.path.exists("/proc/asound/cards"):
+                candidates.append(("alsa", _scan_proc_asound))
+        elif os_type == "Windows":
+            candidates.append(("winmm", _scan_winmm))
+
+        for name, scanner in candidates:
+            try:
+                scanner()
+                self._scanner, self._scanner_name = scanner, name
+                self._debounce = 1
+                self._poll_interval = _NATIVE_POLL_INTERVAL
+                return
+            except Exception as e:
+                print(f"[Audio Monitor] {name} scanner unavailable: {e}")
+
+        # Last resort: the PyAudio probe in a fresh interpreter (slow, flickers)
+        self._scanner, self._scanner_name = self.audio.list_devices, "pyaudio-probe"
+        self._debounce = _DEBOUNCE_POLLS
+        self._poll_interval = _PROBE_POLL_INTERVAL
+
+    # ── Event sources ──
+
+    def _start_event_source(self):
+        """Starts a hotplug event source. Returns its name, or None to fall back to polling."""
+        if platform.system() != "Linux":
+            return None
+
+        if self._scanner_name == "pulse":
+            try:
+                self._event_proc = subprocess.Popen(
+                    ["pactl", "subscribe"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                    text=True, env=dict(os.environ, LC_ALL="C")
+                )
+                threading.Thread(target=self._read_pactl_events, name="AudioHotplugPulse", daemon=True).start()
+                return "pactl subscribe"
+            except Exception as e:
+                print(f"[Audio Monitor] pactl subscribe failed: {e}")
+                self._event_proc = None
+
+        try:
+            import pyudev
+            context = pyudev.Context()
+            udev_monitor = pyudev.Monitor.from_netlink(context)
+            udev_monitor.filter_by(subsystem="sound")
+            observer = pyudev.MonitorObserver(udev_monitor, callback=lambda device: self._wake.set(),
+                                              name="AudioHotplugUdev")
+            observer.daemon = True
+            observer.start()
+            self._udev_observer = observer
+            return "udev"
+        except ImportError:
+            pass
+        except Exception as e:
+            print(f"[Audio Monitor] udev monitor failed: {e}")
+        return None
+
+    def _read_pactl_events(self):
+        proc = self._event_proc
+        try:
+            for line in proc.stdout:
+                if not self.running:
+                    break
+                if _PACTL_EVENT.search(line):
+                    self._wake.set()
+        except Exception:
+            pass
+        if self.running:
+            # Sound server restarted or pactl died: keep going by polling
+            print("[Audio Monitor] Hotplug event stream ended. Falling back to polling.")
+            self._event_proc = None
+            self._wake.set()
+
+    # ── Diffing ──
 
     def _poll_devices(self, initial=False):
-        import subprocess
-        import sys
-        import json
-
-        script = """
-import pyaudio, json, sys, os
-sys.stderr = open(os.devnull, 'w')
-try:
-    p = pyaudio.PyAudio()
-    try: api = p.get_default_host_api_info()['index']
-    except: api = None
-    
-    try: def_in = p.get_default_input_device_info().get('name')
-    except: def_in = None
-    
-    try: def_out = p.get_default_output_device_info().get('name')
-    except: def_out = None
-    
-    ins, outs = [], []
-    for i in range(p.get_device_count()):
-        info = p.get_device_info_by_index(i)
-        if api is not None and info.get('hostApi') != api: continue
-        name = info.get('name', '')
-        if not name or 'Microsoft Sound Mapper' in name: continue
-        if info.get('maxInputChannels', 0) > 0: ins.append(name)
-        if info.get('maxOutputChannels', 0) > 0: outs.append(name)
-        
-    print(json.dumps({'inputs': ins, 'outputs': outs, 'default_in': def_in, 'default_out': def_out}))
-    p.terminate()
-except Exception as e:
-    print(json.dumps({'error': str(e)}))
-"""
         try:
-            result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=2)
-            if result.returncode != 0 or not result.stdout.strip():
+            data = self._scanner()
+            if not data:
                 return
-                
-            data = json.loads(result.stdout.strip())
-            if 'error' in data: return
-            
-            new_inputs = set(d for d in data.get('inputs', []) if not _is_virtual_linux_device(d))
-            new_outputs = set(d for d in data.get('outputs', []) if not _is_virtual_linux_device(d))
+
+            new_inputs = set(data.get('inputs', []))
+            new_outputs = set(data.get('outputs', []))
+            if self._scanner_name == "pyaudio-probe":
+                # Native scanners already exclude built-in devices
+                new_inputs = set(d for d in new_inputs if not _is_virtual_linux_device(d))
+                new_outputs = set(d for d in new_outputs if not _is_virtual_linux_device(d))
             new_def_in = data.get('default_in')
             new_def_out = data.get('default_out')
-            
+
             if not initial:
                 changed_any = False
                 if self._check_diff(self.current_inputs, new_inputs, "Microphone"): changed_any = True
                 if self._check_diff(self.current_outputs, new_outputs, "Speaker"): changed_any = True
-                
+
                 # Check for default device swaps (e.g. 3.5mm jack rerouting without new PyAudio endpoint)
+                default_swapped = False
                 if self.current_default_in and new_def_in and self.current_default_in != new_def_in:
                     if new_def_in not in (new_inputs - self.current_inputs):
                         msg = f"Swapped active Microphone to {new_def_in}"
                         print(f"[System] {msg}")
-                        changed_any = True
-                        
+                        default_swapped = True
+
                 if self.current_default_out and new_def_out and self.current_default_out != new_def_out:
                     if new_def_out not in (new_outputs - self.current_outputs):
                         msg = f"Swapped active Speaker to {new_def_out}"
                         print(f"[System] {msg}")
-                        changed_any = True
-                
+                        default_swapped = True
+
+                if default_swapped:
+                    # _check_diff already notified the UI if the device list changed
+                    if not changed_any and self.status_queue:
+                        self.status_queue.put(("AUDIO_DEVICES_CHANGED", None))
+                    changed_any = True
+
                 if changed_any and self.on_change_callback:
                     self.on_change_callback()
-                
+
             # Keep pending-removal devices in the "current" sets so they
             # don't trigger a false "New connected" when they reappear.
             pending_inputs = {name for (dt, name) in self._pending_removals if dt == "Microphone"}
@@ -126,13 +343,13 @@ except Exception as e:
         added = new_set - old_set
         removed = old_set - new_set
         changed = False
-        
+
         # --- Handle devices that reappeared (cancel pending removal) ---
         for device in list(self._pending_removals):
             dt, name = device
             if dt == device_type and name in new_set:
                 del self._pending_removals[device]
-        
+
         # --- Handle newly added devices ---
         for device in added:
             key = (device_type, device)
@@ -144,33 +361,65 @@ except Exception as e:
                 msg = f"New {device_type} connected: {device}"
                 print(f"[System] {msg}")
                 changed = True
-                    
-        # --- Handle removed devices (debounced) ---
+
+        # --- Handle removed devices (debounced for scanners that flicker) ---
         for device in removed:
             key = (device_type, device)
             count = self._pending_removals.get(key, 0) + 1
-            if count >= _DEBOUNCE_POLLS:
+            if count >= self._debounce:
                 # Confirmed gone — report it
                 msg = f"{device_type} disconnected: {device}"
                 print(f"[System] {msg}")
-                del self._pending_removals[key]
+                self._pending_removals.pop(key, None)
                 changed = True
             else:
                 # Not confirmed yet — keep it in the "current" set so it isn't
                 # reported as added when it comes back next poll
                 self._pending_removals[key] = count
-                    
+
         # Notify UI to refresh dropdowns only on confirmed changes
         if changed and self.status_queue:
             self.status_queue.put(("AUDIO_DEVICES_CHANGED", None))
-            
+
         return changed
 
+    # ── Thread ──
+
     def run(self):
-        print("[System] Real-time audio hardware monitor started.")
+        # Initial snapshot to prevent spamming on startup. Taken here rather than
+        # in __init__ so the first scan doesn't delay the first "Listening".
+        self._select_scanner()
+        self._poll_devices(initial=True)
+        source = self._start_event_source()
+        if source:
+            print(f"[System] Real-time audio hardware monitor started ({source} events, {self._scanner_name} scan).")
+        else:
+            print(f"[System] Real-time audio hardware monitor started ({self._scanner_name} scan every {self._poll_interval:g}s).")
+
         while self.running:
-            time.sleep(3) # Poll every 3 seconds
+            event_driven = self._event_proc is not None or self._udev_observer is not None
+            if event_driven and not self._pending_removals:
+                timeout = _SAFETY_RESCAN_INTERVAL
+            else:
+                timeout = self._poll_interval
+            if self._wake.wait(timeout):
+                # Let the rest of the burst arrive, then scan once
+                time.sleep(_SETTLE_SECONDS)
+                self._wake.clear()
+            if not self.running:
+                break
             self._poll_devices()
 
     def stop(self):
         self.running = False
+        self._wake.set()
+        if self._event_proc is not None:
+            try:
+                self._event_proc.terminate()
+            except Exception:
+                pass
+        if self._udev_observer is not None:
+            try:
+                self._udev_observer.stop()
+            except Exception:
+                pass
@@ -0,0 +1,321 @@
+"""
+Cortex Command Runner
+
+Runs shell commands inside the engine process and captures their output,
+instead of opening a terminal emulator (gnome-terminal, konsole, xterm,
+cmd) for every command.
+
+- One asyncio loop on a daemon thread drives every subprocess. A semaphore
+  caps how many run at once; extra jobs queue in order.
+- stdout and stderr are read as a single stream, so the order of lines is
+  kept. Output is decoded incrementally and sent to the sink (the UI
+  status queue) in batches at most every OUTPUT_INTERVAL seconds, where
+  the Command Console shows it live.
+- Every job can have a timeout and can be cancelled. The whole process
+  group is killed, so children spawned by the shell go too. shutdown()
+  does this for every job when the engine stops.
+- A CommandResult with the exit code and the (tail of the) output is
+  passed to the job's `done` callback. summarize() turns it into a
+  sentence for the speaker.
+
+Usage:
+    from core.command_runner import get_runner, summarize
+    runner = get_runner()
+    job = runner.run("ping -c 4 example.com", "Ping", timeout=30,
+                     done=lambda result: speaker.speak(summarize(result)))
+    runner.cancel(job)
+"""
+
+import asyncio
+import codecs
+import collections
+import itertools
+import os
+import signal
+import subprocess
+import threading
+import time
+
+DEFAULT_CONCURRENCY = 4
+OUTPUT_INTERVAL = 0.1           # seconds between output batches sent to the sink
+MAX_OUTPUT_CHARS = 64 * 1024    # output kept per job for the result (the tail)
+KILL_GRACE = 2.0                # seconds between SIGTERM and SIGKILL
+_READ_SIZE = 4096
+
+CommandResult = collections.namedtuple("CommandResult", [
+    "job_id", "title", "command", "status", "returncode", "output", "elapsed",
+])
+# status: "ok", "failed" (non-zero exit), "timeout", "cancelled" or "error" (could not start)
+
+
+class _Job:
+    def __init__(self, job_id, command, title, timeout, done):
+        self.id = job_id
+        self.command = command
+        self.title = title
+        self.timeout = timeout
+        self.done = done
+        self.task = None
+        self.proc = None
+        self.output = []
+        self.output_len = 0
+        self.pending = []
+        self.flush_handle = None
+        self.last_flush = 0.0
+
+
+class CommandRunner:
+    def __init__(self, max_concurrent=DEFAULT_CONCURRENCY, sink=None):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.sink = sink
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._semaphore = None
+        self._encoding = "oem" if os.name == "nt" else "utf-8"
+
+    # ── Loop ──
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+
+                def run():
+                    loop = asyncio.new_event_loop()
+                    asyncio.set_event_loop(loop)
+                    self._semaphore = asyncio.Semaphore(self.max_concurrent)
+                    self._loop = loop
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=run, name="CommandRunner", daemon=True).start()
+                ready.wait()
+        return self._loop
+
+    def _emit(self, event):
+        if self.sink is not None:
+            try:
+                self.sink.put(("COMMAND_OUTPUT", event))
+            except Exception as e:
+                print(f"[Command] Could not forward output: {e}")
+
+    # ── Public API ──
+
+    def run(self, command, title=None, timeout=None, done=None):
+        """Queues a shell command. Returns its job id; `done(CommandResult)` runs on the runner thread."""
+        loop = self._ensure_loop()
+        job = _Job(next(self._ids), command, title or command, timeout, done)
+        with self._lock:
+            self._jobs[job.id] = job
+
+        def start():
+            job.task = loop.create_task(self._run_job(job))
+
+        loop.call_soon_threadsafe(start)
+        return job.id
+
+    def cancel(self, job_id=None):
+        """Cancels one job (or all of them when job_id is None). Returns False if nothing was running."""
+        with self._lock:
+            jobs = list(self._jobs.values()) if job_id is None else [self._jobs.get(job_id)]
+        jobs = [job for job in jobs if job is not None]
+        if not jobs or self._loop is None:
+            return False
+
+        def cancel_tasks():
+            for job in jobs:
+                if job.task is not None:
+                    job.task.cancel()
+
+        self._loop.call_soon_threadsafe(cancel_tasks)
+        return True
+
+    def shutdown(self, timeout=KILL_GRACE + 1.0):
+        """
+        Cancels every job and waits (up to `timeout`) until their process groups are gone.
+        Anything still alive after that is killed directly, since the runner's loop thread
+        is a daemon and will not outlive the engine.
+        """
+        with self._lock:
+            jobs = list(self._jobs.values())
+        if not jobs:
+            return
+        print(f"[Command] Stopping {len(jobs)} running command(s)...")
+        self.cancel()
+        deadline = time.time() + timeout
+        while self.running() and time.time() < deadline:
+            time.sleep(0.05)
+        for job in jobs:
+            if job.proc is not None and job.proc.returncode is None:
+                try:
+                    _kill_tree(job.proc.pid)
+                except (ProcessLookupError, PermissionError):
+                    pass
+
+    def running(self):
+        """[(job_id, title)] of queued and running jobs."""
+        with self._lock:
+            return [(job.id, job.title) for job in self._jobs.values()]
+
+    # ── Jobs ──
+
+    async def _run_job(self, job):
+        started = time.time()
+        status, returncode = "error", None
+        self._emit({"job": job.id, "event": "queued", "title": job.title, "command": job.command})
+        try:
+            async with self._semaphore:
+                started = time.time()
+                self._emit({"job": job.id, "event": "started"})
+                print(f"[Command] #{job.id} {job.title}: {job.command}")
+                try:
+                    job.proc = await asyncio.create_subprocess_shell(
+                        job.command,
+                        stdin=subprocess.DEVNULL,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.STDOUT,
+                        # Own process group, so cancelling also stops what the shell started
+                        start_new_session=(os.name != "nt"),
+                    )
+                except OSError as e:
+                    self._append(job, f"Could not start: {e}\n")
+                else:
+                    try:
+                        await asyncio.wait_for(self._pump(job), job.timeout)
+                        returncode = await job.proc.wait()
+                        status = "ok" if returncode == 0 else "failed"
+                    except asyncio.TimeoutError:
+                        status = "timeout"
+                        returncode = await self._kill(job)
+                        self._append(job, f"\nTimed out after {job.timeout:g} seconds.\n")
+        except asyncio.CancelledError:
+            status = "cancelled"
+            if job.proc is not None and job.proc.returncode is None:
+                returncode = await self._kill(job)
+            self._append(job, "\nCancelled.\n")
+        except Exception as e:
+            print(f"[Command] #{job.id} error: {e}")
+            self._append(job, f"\nError: {e}\n")
+        finally:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+
+        self._flush(job)
+        elapsed = time.time() - started
+        result = CommandResult(job.id, job.title, job.command, status, returncode, "".join(job.output), elapsed)
+        self._emit({"job": job.id, "event": "finished", "status": status, "returncode": returncode,
+                    "elapsed": elapsed})
+        print(f"[Command] #{job.id} {job.title}: {status} (exit {returncode}, {elapsed:.1f}s)")
+        if job.done:
+            try:
+                job.done(result)
+            except Exception as e:
+                print(f"[Command] Completion callback error: {e}")
+
+    async def _pump(self, job):
+        decoder = codecs.getincrementaldecoder(self._encoding)(errors="replace")
+        stream = job.proc.stdout
+        while True:
+            chunk = await stream.read(_READ_SIZE)
+            if not chunk:
+                break
+            text = decoder.decode(chunk)
+            if text:
+                self._append(job, text)
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            self._append(job, tail)
+
+    def _append(self, job, text):
+        text = text.replace("\r\n", "\n")
+        job.output.append(text)
+        job.output_len += len(text)
+        while job.output_len > MAX_OUTPUT_CHARS and len(job.output) > 1:
+            job.output_len -= len(job.output.pop(0))
+        job.pending.append(text)
+
+        # Batch output: at most one message per OUTPUT_INTERVAL per job
+        now = time.time()
+        if now - job.last_flush >= OUTPUT_INTERVAL:
+            self._flush(job)
+        elif job.flush_handle is None:
+            job.flush_handle = asyncio.get_running_loop().call_later(
+                OUTPUT_INTERVAL - (now - job.last_flush), self._flush, job)
+
+    def _flush(self, job):
+        if job.flush_handle is not None:
+            job.flush_handle.cancel()
+            job.flush_handle = None
+        job.last_flush = time.time()
+        if job.pending:
+            text = "".join(job.pending)
+            job.pending = []
+            self._emit({"job": job.id, "event": "output", "text": text})
+
+    async def _kill(self, job):
+        proc = job.proc
+        if proc.returncode is not None:
+            return proc.returncode
+        try:
+            _kill_tree(proc.pid, signal.SIGTERM)
+            try:
+                return await asyncio.wait_for(proc.wait(), KILL_GRACE)
+            except asyncio.TimeoutError:
+                if os.name != "nt":
+                    os.killpg(proc.pid, signal.SIGKILL)
+                return await proc.wait()
+        except (ProcessLookupError, PermissionError):
+            return await proc.wait()
+
+
+def _kill_tree(pid, sig=None):
+    """Sends `sig` (default SIGKILL) to a job's process group; kills its whole tree on Windows."""
+    if os.name == "nt":
+        # /T takes the whole tree down, like killpg does on POSIX
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        os.killpg(pid, sig or signal.SIGKILL)
+
+
+def summarize(result, max_spoken=120):
+    """One or two sentences about a CommandResult, for the speaker ('' when there is nothing to say)."""
+    lines = [line.strip() for line in result.output.splitlines() if line.strip()]
+    if result.status == "ok":
+        if len(lines) == 1 and len(lines[0]) <= max_spoken:
+            return f"{result.title}: {lines[0]}"
+        if lines:
+            return f"{result.title} finished. {len(lines)} lines of output are in the command console."
+        return ""
+    if result.status == "timeout":
+        return f"{result.title} took too long and was stopped."
+    if result.status == "cancelled":
+        return f"{result.title} was cancelled."
+    message = f"{result.title} failed"
+    if result.returncode is not None:
+        message += f" with exit code {result.returncode}"
+    if lines and len(lines[-1]) <= max_spoken:
+        message += f". {lines[-1]}"
+    return message + "."
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def start_runner(max_concurrent=DEFAULT_CONCURRENCY, sink=None):
+    """Creates the process-wide runner (no-op if it exists; a new sink replaces the old one)."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = CommandRunner(max_concurrent, sink)
+        elif sink is not None:
+            _runner.sink = sink
+        return _runner
+
+
+def get_runner():
+    """Returns the process-wide runner, creating it with defaults if needed."""
+    return _runner or start_runner()
@@ -4,9 +4,9 @@ from .engines.general import GeneralEngine
 from .engines.system import SystemEngine
 from .engines.file_manager import FileManagerEngine
 from .engines.application import ApplicationEngine
-from .engines.workspace import WorkspaceEngine
-from .engines.automation import AutomationEngine
 from .nlu import NeuralIntentModel
+from .startup import StartupOrchestrator, LazyEngine
+from . import tracing
 import platform
 import sys
 import os
@@ -26,34 +26,64 @@ class CortexEngine:
         self.action_queue = action_queue
         self.reset_event = reset_event
         self.shutdown_event = shutdown_event
-        self.speaker = Speaker(status_queue)
-        self.listener = Listener(status_queue, is_speaking_flag=self.speaker.is_speaking_flag, reset_event=reset_event, shutdown_event=shutdown_event)
-        
-        # Load User Config
-        self.user_config = self._load_user_config()
-        
-        # Sub-Engines
-        self.general_engine = GeneralEngine(self.speaker, self.user_config)
-        self.system_engine = SystemEngine(self.speaker, self.listener, self.status_queue)
-        self.file_manager = FileManagerEngine(self.speaker, self.status_queue)
-        self.application_engine = ApplicationEngine(self.speaker)
-        self.workspace_engine = WorkspaceEngine(self.speaker, self.status_queue)
-        self.automation_engine = AutomationEngine(self.speaker, self.status_queue)
+        # Latency tracing: spans from this process are forwarded to the UI over the status bus
+        self.tracer = tracing.configure("engine", sink=status_queue)
         
-        # Static Engine (Database-Driven)
-        from .engines.static import StaticCommandEngine
-        self.static_engine = StaticCommandEngine(self.speaker, self.listener)
+        # Speaker forks the TTS worker process, so it must exist before any
+        # startup threads are running (forking a multi-threaded process is unsafe).
+        self.speaker = Speaker(status_queue)
+
+        # ── Task Runtime (bounded pools for intent work; running tasks are listed in the status window) ──
+        # Created before the engines that submit to it; its threads only start with the first task.
+        from .task_runtime import start_runtime
+        self.tasks = start_runtime(sink=status_queue)
         
         # Internal State
         self.dictation_active = False
         self.is_on_hold = False  # [NEW] Hold/Wake state
+        self._interrupt_listening = threading.Event()
+        
+        # ── Parallel Startup ──
+        # Whisper load + noise calibration and NLU training are the slow parts
+        # and don't depend on each other, so they are built concurrently.
+        self.startup = StartupOrchestrator()
+        startup_trace = self.tracer.begin_command("startup")
+        self.startup.add("user_config", self._load_user_config)
+        self.startup.add("listener", lambda: Listener(status_queue, is_speaking_flag=self.speaker.is_speaking_flag, reset_event=reset_event, shutdown_event=shutdown_event))
+        self.startup.add("nlu", NeuralIntentModel)
+        self.startup.add("general_engine", lambda r: GeneralEngine(self.speaker, r["user_config"]), requires=["user_config"])
+        self.startup.add("system_engine", lambda r: SystemEngine(self.speaker, r["listener"], self.status_queue), requires=["listener"])
+        self.startup.add("file_manager", lambda: FileManagerEngine(self.speaker, self.status_queue))
+        self.startup.add("application_engine", lambda: ApplicationEngine(self.speaker))
+        self.startup.add("static_engine", lambda r: self._build_static_engine(r["listener"]), requires=["listener"])
+        built = self.startup.run()
+        
+        self.user_config = built["user_config"]
+        self.listener = built["listener"]
+        self.nlu = built["nlu"]
+        
+        # Sub-Engines
+        self.general_engine = built["general_engine"]
+        self.system_engine = built["system_engine"]
+        self.file_manager = built["file_manager"]
+        self.application_engine = built["application_engine"]
+        
+        # Rarely used engines are only built when one of their intents arrives
+        # (AutomationEngine alone pulls in pyautogui and pywinctl at import time).
+        self.workspace_engine = LazyEngine("workspace", self._build_workspace_engine,
+                                           claims=lambda tag: tag.startswith("workspace_"))
+        self.automation_engine = LazyEngine("automation", self._build_automation_engine,
+                                            claims=self._is_automation_intent)
         
-        # NLU Model
-        self.nlu = NeuralIntentModel()
+        # Static Engine (Database-Driven)
+        self.static_engine = built["static_engine"]
         
         # [NEW] Inject NLU Vocabulary into Hearing (Context Injection)
         vocab_str = self.nlu.get_vocabulary_phrase()
         self.listener.update_keywords(vocab_str)
+        
+        self.startup.print_trace()
+        self.tracer.end_command(startup_trace)
 
         # ── [NEW] Start Action Queue Listener ──
         self.running = True
@@ -63,8 +93,32 @@ class CortexEngine:
             
         # ── Start Audio Device Monitor ──
         from .audio_monitor import AudioDeviceMonitor
-        self.audio_monitor = AudioDeviceMonitor(self.speaker.tts_queue, self.status_queue)
+        # Device swaps make the TTS worker reopen its output on the next utterance
+        self.audio_monitor = AudioDeviceMonitor(self.speaker.tts_queue, self.status_queue,
+                                                on_change_callback=self.speaker.reopen_audio)
         self.audio_monitor.start()
+
+        # ── Start System Telemetry Sampler (answers system questions from cache) ──
+        from .telemetry import start_sampler
+        self.telemetry = start_sampler(
+            interval=self.user_config.get('telemetry_interval', 2.0),
+            process_interval=self.user_config.get('telemetry_process_interval', 5.0),
+        )
+        # Every sample also goes into the on-disk history (1 s / 1 min / 15 min rollups)
+        from .metrics_store import get_store
+        self.metric_store = get_store()
+        self.telemetry.listeners.append(self.metric_store.add_sample)
+
+        # ── Command Runner (captured shell commands, output streamed to the Command Console) ──
+        from .command_runner import start_runner
+        self.command_runner = start_runner(
+            max_concurrent=self.user_config.get('command_concurrency', 4),
+            sink=self.status_queue,
+        )
+
+        # ── Intent Scheduler (compound commands: "open chrome and spotify then snap chrome left") ──
+        from .intent_scheduler import IntentScheduler
+        self.intent_scheduler = IntentScheduler(self.execute_intent)
         
         # Tag to Human Readable Name Mapping for Confirmations
         self.intent_names = {
@@ -82,16 +136,21 @@ class CortexEngine:
             'check_firewall': "Check firewall status",
             'console_clear': "Clear the console",
             'check_connections': "Check network connections",
+            'network_monitor': "Open the live network monitor",
             'system_processes': "Monitor system processes",
+            'system_history': "Check resource usage history",
+            'system_slowdown': "Find what is slowing the computer",
             'login_history': "Check login history",
             'network_traffic': "Monitor network traffic",
             'internet_speed': "Run an internet speed test",
             'system_cleanup': "Perform system cleanup",
             'kill_process': "Terminate a process",
+            'kill_resource_hog': "Close the biggest resource hog",
             'file_create_folder': "Create a new folder",
             'file_create_file': "Create a new file",
             'file_move': "Move files",
             'file_move_here': "Paste files here",
+            'file_undo': "Undo the last file move",
             'file_search': "Search for a file",
             'app_open': "Open an application",
             'app_close': "Close an application",
@@ -124,6 +183,27 @@ class CortexEngine:
             'stop_speaking': "Stop Speaking",
         }
 
+    # Intents served by AutomationEngine (kept here so routing never has to load it)
+    AUTOMATION_INTENTS = {
+        'dictation_mode', 'note_take', 'timer_set', 'run_workflow', 'list_automations',
+        'run_automation_by_number', 'run_automation_by_name',
+    }
+
+    def _is_automation_intent(self, tag):
+        return tag in self.AUTOMATION_INTENTS or tag.startswith(('window_', 'clipboard_'))
+
+    def _build_static_engine(self, listener):
+        from .engines.static import StaticCommandEngine
+        return StaticCommandEngine(self.speaker, listener)
+
+    def _build_workspace_engine(self):
+        from .engines.workspace import WorkspaceEngine
+        return WorkspaceEngine(self.speaker, self.status_queue)
+
+    def _build_automation_engine(self):
+        from .engines.automation import AutomationEngine
+        return AutomationEngine(self.speaker, self.status_queue)
+
     def get_confirmation_message(self, tag, command):
         """Generates a refined confirmation message with parameters if available."""
         # Mapping for parametric intents
@@ -218,6 +298,17 @@ class CortexEngine:
                     elif cmd == "UPDATE_NAME":
                         self.user_config['name'] = data
                         print(f"[Engine] User Name synced live: {data}")
+                    elif cmd == "CANCEL_SECURITY_SCAN":
+                        from core.security_scan import cancel_background_scan
+                        cancel_background_scan()
+                    elif cmd == "CANCEL_FILE_OPERATION":
+                        if hasattr(self, 'file_manager'):
+                            self.file_manager.cancel_transfer(data)
+                    elif cmd == "CANCEL_COMMAND":
+                        from core.command_runner import get_runner
+                        get_runner().cancel(data)
+                    elif cmd == "CANCEL_TASK":
+                        self.tasks.cancel(data)
                     elif cmd == "AUTOMATION_DIALOG_STATE":
                         self.automation_dialog_active = data
                         print(f"[Engine] Automation Dialog Active: {self.automation_dialog_active}")
@@ -230,10 +321,19 @@ class CortexEngine:
     # [NEW] Background Interrupt Thread for mid-speech interruption
     # ─────────────────────────────────────────────────────────────
     def _start_interrupt_listener(self):
-        """Launch a one-shot background thread that listens for stop-speaking keywords
-        while the assistant is speaking. Returns immediately."""
-        t = threading.Thread(target=self._interrupt_listen_thread, daemon=True)
-        t.start()
+        """Launch a one-shot background task that listens for stop-speaking keywords
+        while the assistant is speaking. Returns immediately; at most one listens at a time."""
+        if self._interrupt_listening.is_set():
+            return
+        self._interrupt_listening.set()
+
+        def listen():
+            try:
+                self._interrupt_listen_thread()
+            finally:
+                self._interrupt_listening.clear()
+
+        self.tasks.submit(listen, name="Interrupt listener", listed=False)
 
     def _interrupt_listen_thread(self):
         """Worker thread: listens for 'stop talking' ONLY while is_speaking_flag is True.
@@ -264,6 +364,10 @@ class CortexEngine:
 
     def execute_intent(self, tag, command):
         """Helper to route intent to the correct engine."""
+        with self.tracer.span("engine.execute_intent", tag=tag):
+            return self._route_intent(tag, command)
+
+    def _route_intent(self, tag, command):
         self._log(f"Executing: {tag}")
 
         # Check Global/System exits first
@@ -335,11 +439,16 @@ class CortexEngine:
                 print("[Engine] Shutdown signal received. Exiting...")
                 return "EXIT"
 
+            # Each listen opens a new command trace (closing the previous one)
+            trace_id = self.tracer.begin_command()
+            
             # listen() blocks safely now. Pass is_on_hold so UI knows not to show "Listening"
             command = self.listener.listen(timeout=None, is_on_hold=self.is_on_hold) 
             
             if not command:
+                self.tracer.cancel_command(trace_id)
                 continue
+            self.tracer.label_command(trace_id, command)
 
             command = command.lower()
 
@@ -399,6 +508,51 @@ class CortexEngine:
             # Log User Speech
             self._log(f"User: {command}")
             
+            # --- CONTEXT DETECTION FOR LONG SPEECH ---
+            # If the user said a lot of words, they might not be talking to us
+            # Ask for confirmation before acting (before compound commands too,
+            # so parts of overheard speech are never scheduled unconfirmed)
+            word_count = len(command.split())
+            context_confirmed = False
+            
+            if word_count > 12:  # Long utterance threshold
+                print(f"Long utterance detected ({word_count} words). Asking for context confirmation.")
+                self.speaker.speak("Are you talking with me?")
+                
+                context_response = self.listener.listen(timeout=5)
+                if context_response:
+                    context_response = context_response.lower()
+                    print(f"Context response: {context_response}")
+                    
+                    # Check if user confirms they were talking to the assistant
+                    affirmatives = ["yes", "yeah", "yup", "sure", "of course", "definitely"]
+                    if not any(word in context_response for word in affirmatives):
+                        print("User was not talking to assistant. Ignoring command.")
+                        self.speaker.speak("Understood. I will ignore that.")
+                        continue
+                    else:
+                        context_confirmed = True
+                        print("Context confirmed. User was talking to assistant.")
+                else:
+                    print("No context response. Ignoring command.")
+                    continue
+            
+            # --- COMPOUND COMMANDS ---
+            # Several commands in one utterance are predicted in one batch and
+            # scheduled together; anything unclear falls through to the single-intent path.
+            if not getattr(self, 'automation_dialog_active', False):
+                from .intent_scheduler import split_utterance
+                segments = split_utterance(command)
+                steps = self.intent_scheduler.plan(segments, self.nlu.predict_batch) if len(segments) > 1 else None
+                if steps:
+                    self._log(f"Compound: {len(steps)} commands")
+                    try:
+                        self.intent_scheduler.run(steps)
+                    finally:
+                        if self.status_queue:
+                            self.status_queue.put(("IDLE", None))
+                    continue
+
             tag, confidence = self.nlu.predict(command)
             
             # Debug decision
@@ -430,34 +584,6 @@ class CortexEngine:
                     command = normalised   # pass normalised cmd so engine sees digits
                     self._log("Context Override → run_automation_by_number")
             
-            # --- CONTEXT DETECTION FOR LONG SPEECH ---
-            # If the user said a lot of words, they might not be talking to us
-            # Ask for confirmation before acting
-            word_count = len(command.split())
-            context_confirmed = False
-            
-            if word_count > 12:  # Long utterance threshold
-                print(f"Long utterance detected ({word_count} words). Asking for context confirmation.")
-                self.speaker.speak("Are you talking with me?")
-                
-                context_response = self.listener.listen(timeout=5)
-                if context_response:
-                    context_response = context_response.lower()
-                    print(f"Context response: {context_response}")
-                    
-                    # Check if user confirms they were talking to the assistant
-                    affirmatives = ["yes", "yeah", "yup", "sure", "of course", "definitely"]
-                    if not any(word in context_response for word in affirmatives):
-                        print("User was not talking to assistant. Ignoring command.")
-                        self.speaker.speak("Understood. I will ignore that.")
-                        continue
-                    else:
-                        context_confirmed = True
-                        print("Context confirmed. User was talking to assistant.")
-                else:
-                    print("No context response. Ignoring command.")
-                    continue
-            
             # --- CONFIDENCE LOGIC ---
             res = None
             try:
@@ -562,6 +688,23 @@ class CortexEngine:
     def shutdown(self):
         """Cleanly shutdown the engine and subsystems."""
         print("[System] Shutting down...")
+        self.tracer.end_command()
+        if getattr(self, 'tasks', None):
+            # Drop queued intent work and ask running tasks (file moves, searches) to stop
+            self.tasks.shutdown()
+        if getattr(self, 'audio_monitor', None):
+            self.audio_monitor.stop()
+        if getattr(self, 'telemetry', None):
+            self.telemetry.stop()
+        if getattr(self, 'metric_store', None):
+            self.metric_store.close()
+        from .network_monitor import stop_monitor
+        stop_monitor()
+        from .location_tracker import stop_tracker
+        stop_tracker()
+        if getattr(self, 'command_runner', None):
+            # Cancel running commands and kill their process groups (shell children included)
+            self.command_runner.shutdown()
         if self.speaker:
             self.speaker.terminate()
         if self.listener:
@@ -1,5 +1,5 @@
 from components.application import open_application, close_application
-import threading
+from core.task_runtime import get_runtime
 
 class ApplicationEngine:
     def __init__(self, speaker):
@@ -16,7 +16,7 @@ class ApplicationEngine:
             # heuristic: remove "open", "launch", "application", "please"
             app_name = self._extract_app_name(command, ["open", "launch", "start", "run", "application", "app"])
             if app_name:
-                threading.Thread(target=self._open_app, args=(app_name,)).start()
+                get_runtime().submit(self._open_app, app_name, name=f"Open {app_name}")
             else:
                 self.speaker.speak("Which application would you like me to open?")
             return True
@@ -24,7 +24,7 @@ class ApplicationEngine:
         elif intent == 'app_close':
             app_name = self._extract_app_name(command, ["close", "quit", "exit", "terminate", "kill", "application", "app"])
             if app_name:
-                threading.Thread(target=self._close_app, args=(app_name,)).start()
+                get_runtime().submit(self._close_app, app_name, name=f"Close {app_name}")
             else:
                 self.speaker.speak("Which application would you like me to close?")
             return True
@@ -83,8 +83,8 @@ class AutomationEngine:
             # Priority: If command contains a name, run that. Otherwise run primary.
             if self._try_run_by_name(command):
                 return True
-            import threading
-            threading.Thread(target=self.execute_workflow, daemon=True).start()
+            from core.task_runtime import get_runtime, BACKGROUND
+            get_runtime().submit(self.execute_workflow, name="Automation", lane=BACKGROUND)
             return True
             
         if tag == 'list_automations':
@@ -151,8 +151,9 @@ class AutomationEngine:
             if 0 <= idx < len(names):
                 name = names[idx]
                 ran.append(name)
-                import threading
-                threading.Thread(target=self.execute_workflow, kwargs={'workflow_name': name}, daemon=True).start()
+                from core.task_runtime import get_runtime, BACKGROUND
+                get_runtime().submit(self.execute_workflow, workflow_name=name,
+                                     name=f"Automation {name}", lane=BACKGROUND)
             else:
                 self.speaker.speak(f"Automation number {n_str} does not exist.")
 
@@ -203,8 +204,9 @@ class AutomationEngine:
             matched_lower = matches[0]
             matched_name = next(n for n in names if n.lower() == matched_lower)
             print(f"[Automation] Found name match: '{name_query}' → '{matched_name}'")
-            import threading
-            threading.Thread(target=self.execute_workflow, kwargs={'workflow_name': matched_name}, daemon=True).start()
+            from core.task_runtime import get_runtime, BACKGROUND
+            get_runtime().submit(self.execute_workflow, workflow_name=matched_name,
+                                 name=f"Automation {matched_name}", lane=BACKGROUND)
             return True
         else:
             self.speaker.speak(f"I couldn't find an automation named {name_query}, sir.")
@@ -1028,17 +1030,21 @@ class AutomationEngine:
             print(f"[Automation] Condition Evaluation Error: {e}")
             return False
 
-    def execute_workflow(self, workflow_name=None, _visited=None, _depth=0):
+    def execute_workflow(self, workflow_name=None, _visited=None, _depth=0, _run=None, source=None):
         """
         Executes the saved workflow JSON.
         _visited: set of automation names/paths already in the call chain (cycle detection)
         _depth: recursion depth guard (max 10 levels)
+        _run: RunRecorder of the calling workflow (sub-automations share their caller's run)
+        source: who started the run ("manager", ...), kept in the run journal
         """
         import json, os, time
 
         MAX_DEPTH = 10
         if _depth > MAX_DEPTH:
             print(f"[Automation] Max sub-automation depth ({MAX_DEPTH}) reached. Stopping.")
+            if _run is not None:
+                _run.set_status("failed", f"Max sub-automation depth ({MAX_DEPTH}) reached")
             self.speaker.speak("Maximum automation depth reached. Stopping.")
             self._wait_for_speaker()
             return
@@ -1086,39 +1092,33 @@ class AutomationEngine:
         if canonical in _visited:
             display_name = os.path.splitext(os.path.basename(workflow_path))[0]
             print(f"[Automation] Circular reference detected: {display_name}. Stopping.")
+            if _run is not None:
+                _run.set_status("failed", f"Circular reference: {display_name}")
             self.speaker.speak(f"Circular automation reference detected. Skipping {display_name}.")
             self._wait_for_speaker()
             return
         _visited = _visited | {canonical}  # immutable copy so siblings are not affected
 
+        # Run journal: per-node timing and outcome, shown in the Automation Manager's history
+        wf_label = os.path.splitext(os.path.basename(workflow_path))[0]
+        if _run is None:
+            from core.run_journal import get_journal
+            run = get_journal().start_run(wf_label, source=source)
+        else:
+            run = _run
+        span = None
 
         try:
-            with open(workflow_path, 'r') as f:
-                data = json.load(f)
-                
-            nodes = {n['id']: n for n in data['nodes']}
-            # Build Adjacency Map: from_id -> {port_tag: [to_ids]}
-            edges = {} 
-            for conn in data['connections']:
-                f_id = conn['from']
-                t_id = conn['to']
-                tag = conn.get('from_port') # None, "true", or "false"
-                
-                if f_id not in edges:
-                    edges[f_id] = {}
-                if tag not in edges[f_id]:
-                    edges[f_id][tag] = []
-                edges[f_id][tag].append(t_id)
-                
-            # Find Start Node
-            current_id = None
-            for nid, node in nodes.items():
-                if node['type'] == 'Start':
-                    current_id = nid
-                    break
+            # Parsed once per file version; launch plans of its nodes are cached with it
+            from core.workflow_cache import load_workflow, launch
+            workflow = load_workflow(workflow_path)
+            nodes = workflow.nodes
+            edges = workflow.edges
+            current_id = workflow.start_id
             
             if not current_id:
                 print("[Automation] No Start node found.")
+                run.set_status("failed", f"No Start node in {wf_label}")
                 return
                 
             print("[Automation] Starting Workflow Execution...")
@@ -1129,7 +1129,12 @@ class AutomationEngine:
             steps = 0
             MAX_STEPS = 100 # Safety limit for loops
             
+            from core.task_runtime import cancelled
             while queue and steps < MAX_STEPS:
+                if cancelled():
+                    print("[Automation] Workflow cancelled.")
+                    run.set_status("cancelled")
+                    break
                 current_id = queue.pop(0)
                 steps += 1
                 
@@ -1142,6 +1147,8 @@ class AutomationEngine:
                 # Execute Logic
                 node_data = node.get('data', {})
                 val = node_data.get('value', '').strip()
+                span = run.node(current_id, node_type, depth=_depth,
+                                workflow=wf_label if _depth else None, label=val)
                 
                 # Branching Logic
                 branch_result = None
@@ -1165,37 +1172,19 @@ class AutomationEngine:
                 elif node_type == 'System Command':
                     if val:
                         self.speaker.speak(f"Running command: {val}")
-                        wf_os = platform.system()
                         try:
-                            # 1. Check if it's a directory
-                            if os.path.isdir(val):
-                                if wf_os == "Windows":
-                                    os.startfile(val)
-                                elif wf_os == "Darwin":
-                                    subprocess.Popen(["open", val])
-                                else:  # Linux
-                                    subprocess.Popen(["xdg-open", val])
+                            # Folder -> file manager; anything else runs in a NEW terminal WINDOW
+                            plan = workflow.plan(current_id, node_type, val, find_terminal=self._find_linux_terminal)
+                            launch(plan)
+                            if plan.kind == "folder":
                                 self.speaker.speak("Opening folder.")
-                            else:
-                                # 2. Try executing as a command in a NEW WINDOW
-                                if wf_os == "Windows":
-                                    cmd_str = f'start cmd /k "{val}"'
-                                    subprocess.Popen(cmd_str, shell=True)
-                                elif wf_os == "Darwin":
-                                    # Open Terminal.app and run the command
-                                    apple_script = f'tell application "Terminal" to do script "{val}"'
-                                    subprocess.Popen(["osascript", "-e", apple_script])
-                                else:  # Linux
-                                    terminal = self._find_linux_terminal()
-                                    if terminal:
-                                        subprocess.Popen([terminal, "-e", "bash", "-c", f'{val}; exec bash'])
-                                    else:
-                                        # Fallback: run in background
-                                        subprocess.Popen(val, shell=True)
                         except Exception as e:
+                            workflow.forget(current_id)
                             print(f"[Automation] Command Error: {e}")
+                            span.fail(e)
                             self.speaker.speak("I could not run that command.")
                     else:
+                        span.fail("No command provided")
                         self.speaker.speak("No command provided for system node.")
                         
                 elif node_type == 'Press Hotkey':
@@ -1220,6 +1209,7 @@ class AutomationEngine:
                         pyautogui.write(val, interval=0.02)
                     elif not pyautogui:
                         print("[Automation] Cannot type text: pyautogui missing.")
+                        span.fail("pyautogui missing")
                         
                 elif node_type == 'Notify':
                     try:
@@ -1232,6 +1222,7 @@ class AutomationEngine:
                         )
                     except ImportError:
                         print("[Automation] python module 'plyer' not installed. Cannot show notification.")
+                        span.fail("plyer not installed")
                         
                 elif node_type == 'Play Sound':
                     try:
@@ -1252,61 +1243,32 @@ class AutomationEngine:
                                 subprocess.Popen(['aplay', val])
                     except Exception as e:
                         print(f"[Automation] Play Sound Error: {e}")
+                        span.fail(e)
                         
                 elif node_type == 'Open Target':
                     if val:
-                        # --- Sub-Automation: runs inline, blocks until complete ---
-                        if val.startswith("automations://"):
+                        plan = workflow.plan(current_id, node_type, val,
+                                             data_dir=os.path.join(get_app_root(), 'data', 'automations'))
+                        # --- Sub-automation: runs inline, blocks until complete ---
+                        if plan.kind == "automation":
                             sub_name = val[len("automations://"):]
-                            sub_file = os.path.join(
-                                get_app_root(), 'data', 'automations', f"{sub_name}.json"
-                            )
-                            if os.path.exists(sub_file):
+                            if os.path.exists(plan.target):
                                 print(f"[Automation] Running sub-automation: {sub_name}")
-                                self.execute_workflow(sub_file, _visited=_visited, _depth=_depth + 1)  # BLOCKING recursive call
+                                self.execute_workflow(plan.target, _visited=_visited, _depth=_depth + 1, _run=run)  # BLOCKING recursive call
 
                             else:
                                 print(f"[Automation] Sub-automation not found: {sub_name}")
+                                span.fail(f"Sub-automation not found: {sub_name}")
                                 self.speaker.speak(f"I could not find the automation named {sub_name}.")
                                 self._wait_for_speaker()
                         else:
+                            # App, UWP app, file or folder, resolved on the first run
                             try:
-                                wf_os = platform.system()
-                                if wf_os == "Windows":
-                                    # Detect UWP AUMID (contains '!' and no backslash = UWP app ID from Get-StartApps)
-                                    is_uwp = "!" in val and not os.path.exists(val)
-                                    if is_uwp:
-                                        # Launch UWP via shell:AppsFolder
-                                        subprocess.Popen(
-                                            ["explorer", f"shell:AppsFolder\\{val}"],
-                                            shell=False
-                                        )
-                                    else:
-                                        os.startfile(val)
-
-                                elif wf_os == "Darwin":
-                                    # 'open' handles .app bundles, files, folders
-                                    subprocess.Popen(["open", val])
-                                else:
-                                    # Linux: .desktop executables need to be run directly
-                                    if val.endswith(".desktop"):
-                                        exec_cmd = None
-                                        try:
-                                            with open(val, encoding="utf-8", errors="ignore") as _f:
-                                                for _line in _f:
-                                                    if _line.startswith("Exec="):
-                                                        exec_cmd = _line.strip().split("=", 1)[1].split()[0]
-                                                        break
-                                        except: pass
-                                        if exec_cmd:
-                                            subprocess.Popen([exec_cmd])
-                                        else:
-                                            subprocess.Popen(["xdg-open", val])
-                                    else:
-                                        subprocess.Popen(["xdg-open", val])
-
+                                launch(plan)
                             except Exception as e:
+                                workflow.forget(current_id)
                                 print(f"[Automation] Target Open Error: {e}")
+                                span.fail(e)
                                 self.speaker.speak("I could not open the target.")
                                 self._wait_for_speaker()
 
@@ -1319,6 +1281,8 @@ class AutomationEngine:
                 out_ports = edges.get(current_id, {})
                 next_targets = []
                 
+                span.end()
+
                 if node_type == 'If Condition':
                     tag = "true" if branch_result else "false"
                     next_targets = out_ports.get(tag, [])
@@ -1334,10 +1298,19 @@ class AutomationEngine:
                 # Small yield for UI responsiveness if needed (though running in thread/process usually)
                 time.sleep(0.1) 
 
+            if queue and steps >= MAX_STEPS:
+                print(f"[Automation] Step limit ({MAX_STEPS}) reached. Stopping.")
+                run.set_status("stopped", f"Step limit ({MAX_STEPS}) reached")
                 
         except Exception as e:
             print(f"[Automation] Execution Error: {e}")
+            if span is not None:
+                span.end(error=e)
+            run.set_status("failed", e)
             self.speaker.speak("Error executing workflow.")
+        finally:
+            if _run is None:
+                run.finish()
 
     def _find_linux_terminal(self):
         """Find an available terminal emulator on Linux."""
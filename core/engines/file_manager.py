@@ -12,8 +12,11 @@ from pathlib import Path
 from components.file_manager.active_location import get_active_location
 from components.file_manager.detection import get_selected_files_from_file_manager
 from components.file_manager.search import background_search
-from components.file_manager.move_files import move_files, move_here, extract_name
+from components.file_manager.move_files import move_files, move_here, undo_move, extract_name
+from components.file_manager.transfer import cancel_transfer
 from components.file_manager.create_item import create_item
+from core.location_tracker import start_tracker
+from core.task_runtime import get_runtime, BACKGROUND
 
 class FileManagerEngine:
     def __init__(self, speaker, status_queue=None):
@@ -21,22 +24,31 @@ class FileManagerEngine:
         self.status_queue = status_queue
         self.desktop_path = Path.home() / "Desktop"
         self.selected_items = []
+        # Follows the active window / file manager folder in the background
+        self.location_tracker = start_tracker()
 
     def handle_intent(self, intent, command):
         """
         Routes the intent to the appropriate handler.
         """
         if intent == 'file_create_folder':
-            threading.Thread(target=self._create_folder, args=(command,)).start()
+            get_runtime().submit(self._create_folder, command, name="Create folder")
             return True
         elif intent == 'file_create_file':
-            threading.Thread(target=self._create_file, args=(command,)).start()
+            get_runtime().submit(self._create_file, command, name="Create file")
             return True
         elif intent == 'file_move':
-            threading.Thread(target=self._move_files, args=(command,)).start()
+            # Only selects the files; nothing to stop mid-way
+            get_runtime().submit(self._move_files, command, name="Move files")
             return True
         elif intent == 'file_move_here':
-            threading.Thread(target=self._move_here, args=(command,)).start()
+            # Each transfer gets its own cancel event, so cancelling this task leaves other moves running
+            cancel = threading.Event()
+            get_runtime().submit(self._move_here, command, cancel, name="Move here", on_cancel=cancel.set)
+            return True
+        elif intent == 'file_undo':
+            cancel = threading.Event()
+            get_runtime().submit(self._undo_move, command, cancel, name="Undo move", on_cancel=cancel.set)
             return True
         elif intent == 'file_search':
             # Extract query
@@ -52,7 +64,8 @@ class FileManagerEngine:
             if not query:
                 return False
                 
-            threading.Thread(target=self._background_search, args=(query,)).start()
+            get_runtime().submit(self._background_search, query, name=f"Search {query}", lane=BACKGROUND,
+                                 on_cancel=lambda: self.cancel_search(query))
             return True
         elif intent == 'file_search_cancel':
             # Extract query if they said "cancel search for X"
@@ -67,7 +80,11 @@ class FileManagerEngine:
             active = list(search_mod.ACTIVE_SEARCHES)
             
             if not active:
-                self.speaker.speak("There are no active searches to cancel.")
+                # "cancel" / "stop" also covers a running file move
+                if cancel_transfer():
+                    self.speaker.speak("Cancelling the file move.")
+                else:
+                    self.speaker.speak("There are no active searches to cancel.")
             elif query and query in active:
                 self.cancel_search(query)
             elif len(active) == 1:
@@ -98,8 +115,21 @@ class FileManagerEngine:
     def _move_files(self, command):
         move_files(command, self)
 
-    def _move_here(self, command):
-        move_here(command, self)
+    def _move_here(self, command, cancel=None):
+        move_here(command, self, cancel)
+
+    def _undo_move(self, command, cancel=None):
+        undo_move(command, self, cancel)
+
+    def report_transfer(self, state):
+        """Forwards file transfer progress to the status window."""
+        if self.status_queue:
+            self.status_queue.put(("FILE_OPERATION", state))
+
+    def cancel_transfer(self, transfer_id):
+        """Stops a running file move (from the status window)."""
+        if cancel_transfer(transfer_id):
+            self.speaker.speak("Cancelling the file move.")
 
     def _background_search(self, query):
         if self.status_queue:
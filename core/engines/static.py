@@ -2,7 +2,6 @@ import json
 import os
 import platform
 import difflib
-import subprocess
 from core.runtime_path import get_app_root
 
 class StaticCommandEngine:
@@ -80,26 +79,11 @@ class StaticCommandEngine:
              
         return False
 
-    def _run_in_terminal(self, command, title, os_type):
-        """Executes the command in a new terminal window."""
+    def _run_command(self, command, title):
+        """Runs the command with captured output (Command Console); interactive ones get a terminal, GUI programs run detached."""
         try:
-            if os_type == 'windows':
-                subprocess.Popen(f'start "{title}" cmd /k "{command}"', shell=True)
-            elif os_type == 'linux':
-                terminals = ['gnome-terminal', 'konsole', 'xterm']
-                for term in terminals:
-                    try:
-                        if term == 'gnome-terminal':
-                            subprocess.Popen([term, '--', 'bash', '-c', f'{command}; exec bash'])
-                        elif term == 'konsole':
-                             subprocess.Popen([term, '-e', 'bash', '-c', f'{command}; exec bash'])
-                        else:
-                            subprocess.Popen([term, '-e', f'{command}; bash'])
-                        break
-                    except FileNotFoundError:
-                        continue
-            elif os_type == 'macos':
-                subprocess.Popen(['osascript', '-e', f'tell application "Terminal" to do script "{command}"'])
+            from components.system.custom_utils import run_command
+            run_command(command, title, speaker=self.speaker)
         except Exception as e:
             print(f"[Static] Execution Error: {e}")
             self.speaker.speak("I encountered an error executing that command.")
@@ -156,6 +140,6 @@ class StaticCommandEngine:
                  print(f"[Static] Executing: {key}")
                  
             self.speaker.speak(f"Executing {key.replace('_', ' ')}.")
-            self._run_in_terminal(cmd, f"Task: {key.replace('_', ' ').title()}", self.os_type)
+            self._run_command(cmd, key.replace('_', ' '))
             return True
         return False
@@ -4,13 +4,23 @@ import subprocess
 import sys
 from core.runtime_path import get_app_root
 
-# Import new system components
-from components.system import (
-    wifi, apps, update, cpu, temperature, user, compression, services, dns,
-    info, console, ip, memory, disk, directory, security, ports, firewall,
-    connections, processes, login, traffic, cleanup, kill,
-    uptime, battery, recycle_bin, screenshot, audio, wifi_password, hidden_files, awake, dark_mode,
-    tools, power, volume
+from core.startup import lazy_import
+
+# System components are imported lazily: each module only loads the first time
+# one of its intents runs, instead of ~35 modules at engine import time.
+def _lazy_components(*names):
+    return tuple(lazy_import(f"components.system.{name}") for name in names)
+
+(wifi, apps, update, cpu, temperature, user, compression, services, dns,
+ info, console, ip, memory, disk, directory, security, ports, firewall,
+ connections, processes, login, traffic, cleanup, kill,
+ uptime, battery, recycle_bin, screenshot, audio, wifi_password, hidden_files, awake, dark_mode,
+ tools, power, volume, history) = _lazy_components(
+    "wifi", "apps", "update", "cpu", "temperature", "user", "compression", "services", "dns",
+    "info", "console", "ip", "memory", "disk", "directory", "security", "ports", "firewall",
+    "connections", "processes", "login", "traffic", "cleanup", "kill",
+    "uptime", "battery", "recycle_bin", "screenshot", "audio", "wifi_password", "hidden_files", "awake", "dark_mode",
+    "tools", "power", "volume", "history"
 )
 
 class SystemEngine:
@@ -40,7 +50,7 @@ class SystemEngine:
             directory.list_files(self.speaker)
             return True
         elif tag == 'system_scan':
-            security.run_security_scan(self.speaker)
+            security.run_security_scan(self.speaker, command, self.status_queue)
             return True
         elif tag == 'scan_drivers':
             self.speaker.speak("Opening Driver Manager.")
@@ -58,6 +68,13 @@ class SystemEngine:
         elif tag == 'check_connections':
             connections.check_connections(self.speaker)
             return True
+        elif tag == 'network_monitor':
+            self.speaker.speak("Opening the network monitor.")
+            if self.status_queue:
+                self.status_queue.put(("NETWORK_MONITOR", None))
+            else:
+                subprocess.Popen([sys.executable, "-m", "core.ui.network_window"])
+            return True
 
         elif tag == 'system_ip':
             ip.get_ip_address(self.speaker)
@@ -75,12 +92,24 @@ class SystemEngine:
         #     # speedtest.check_internet_speed(self.speaker)
         #     self.speaker.speak("Speed test module is currently unavailable.")
         #     return True
+        elif tag == 'system_history':
+            history.report_history(command, self.speaker)
+            return True
+        elif tag == 'system_processes':
+            processes.check_processes(self.speaker)
+            return True
+        elif tag == 'system_slowdown':
+            processes.diagnose_slowdown(self.speaker)
+            return True
         elif tag == 'system_cleanup':
             cleanup.clean_system(self.speaker)
             return True
         elif tag == 'kill_process':
             kill.kill_process(command, self.speaker, self.listener)
             return True
+        elif tag == 'kill_resource_hog':
+            kill.kill_resource_hog(command, self.speaker, self.listener)
+            return True
             
         # New System Functions
         elif tag == 'wifi_list':
@@ -251,11 +280,11 @@ class SystemEngine:
             return True
         elif tag == 'system_services':
             self.speaker.speak("Opening System Services Manager.")
-            gui_script = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "core", "ui", "services_window.py")
-            
             try:
                 if os.name == 'nt':
-                     subprocess.Popen([sys.executable, gui_script], creationflags=subprocess.CREATE_NO_WINDOW)
+                     # Run as a module so the window can import core.ui.table_models
+                     subprocess.Popen([sys.executable, "-m", "core.ui.services_window"], cwd=get_app_root(),
+                                      creationflags=subprocess.CREATE_NO_WINDOW)
                 else:
                      # Fallback for Linux/macOS
                      services.manage_system_services(self.speaker)
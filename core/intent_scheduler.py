@@ -0,0 +1,261 @@
+"""
+Cortex Intent Scheduler
+
+Compound utterances ("open chrome and spotify and snap chrome left") are
+split into sub-commands and run as a small dependency graph. The whole
+request then takes about as long as its slowest step, not the sum of all
+steps.
+
+- split_utterance() splits on conjunctions ("and", "then", "after that",
+  commas), but only where the next part starts with a command verb.
+  "open chrome and spotify" repeats the verb ("open spotify").
+  "search for salt and pepper" stays one command.
+- All parts are predicted in one NLU batch (NeuralIntentModel.predict_batch).
+  A compound is only run when every part is understood with high
+  confidence; otherwise the engine treats the utterance as a single command.
+- Independent steps (app launches, searches, status queries) start
+  together. Window operations wait until the app they target has a window,
+  because app_open returns as soon as the launch is started. They also run
+  one after another, since they all act on the focused window. "then" makes
+  a step wait for the previous one. Anything not known to be safe runs as a
+  barrier: alone, after everything before it.
+
+Usage:
+    scheduler = IntentScheduler(engine.execute_intent)
+    segments = split_utterance("open chrome and spotify then snap chrome left")
+    steps = scheduler.plan(segments, engine.nlu.predict_batch)
+    if steps:
+        scheduler.run(steps)
+"""
+
+import collections
+import concurrent.futures
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+COMPOUND_CONFIDENCE = 0.85      # every part must be at least this certain
+READY_TIMEOUT = 15.0            # seconds a dependent step waits for an app window
+READY_POLL = 0.25
+READY_SETTLE = 0.5              # after the window shows up, let it take focus
+MAX_PARALLEL = 4
+
+# Verbs that start a new sub-command after a conjunction
+COMMAND_VERBS = {
+    "open", "launch", "start", "run", "close", "quit", "kill", "snap", "move", "minimize",
+    "maximize", "restore", "switch", "search", "find", "play", "pause", "resume", "mute",
+    "unmute", "set", "turn", "increase", "decrease", "lock", "take", "show", "check",
+    "create", "copy", "delete", "rename", "tell", "what", "what's", "whats", "clear", "empty",
+}
+# Verbs that carry over to a bare object: "open chrome and spotify"
+LIST_VERBS = {"open", "launch", "start", "close", "quit", "kill"}
+_FILLER = {"please", "also", "now", "and"}
+_SEQUENTIAL = {"then", "and then", "after that"}
+_SPLIT = re.compile(r"\s*(,|\band then\b|\bafter that\b|\bthen\b|\band\b)\s*")
+
+# Safe to run at the same time as other steps
+CONCURRENT_TAGS = {
+    "app_open", "app_close", "file_search", "time", "date", "system_ip", "system_memory",
+    "system_disk", "system_info", "cpu_info", "system_uptime", "check_battery", "system_temp",
+    "current_user", "check_ports", "check_firewall", "check_connections", "network_traffic",
+    "network_monitor", "internet_speed", "wifi_list", "system_processes", "system_slowdown",
+    "open_task_manager", "open_control_panel", "open_terminal", "open_device_manager",
+    "scan_drivers", "system_services", "list_apps", "workspace_launch",
+}
+# Never part of a compound: they change how the engine listens or end the session
+EXCLUSIVE_TAGS = {
+    "exit", "dictation_mode", "hold_listening", "resume_listening", "stop_speaking", "change_name",
+}
+
+Segment = collections.namedtuple("Segment", ["text", "after_previous"])
+
+
+def _words(text):
+    return text.split()
+
+
+def _verb(text):
+    """First word that isn't filler ('please open x' -> 'open')."""
+    for word in _words(text):
+        if word not in _FILLER:
+            return word
+    return ""
+
+
+def split_utterance(text):
+    """[Segment(text, after_previous)]; a single segment when nothing should be split."""
+    text = " ".join((text or "").lower().split())
+    parts = _SPLIT.split(text)
+    segments = []
+    verb = ""
+    for i in range(0, len(parts), 2):
+        part = parts[i].strip()
+        sep = parts[i - 1].strip() if i else ""
+        if not part:
+            continue
+        first = _verb(part)
+        if not segments:
+            segments.append([part, False])
+            verb = first
+        elif first in COMMAND_VERBS:
+            segments.append([part, sep in _SEQUENTIAL])
+            verb = first
+        elif verb in LIST_VERBS and len(_words(part)) <= 3:
+            segments.append([f"{verb} {part}", sep in _SEQUENTIAL])
+        else:
+            # Not a new command: glue it back ("search for salt and pepper")
+            joiner = ", " if sep == "," else f" {sep} "
+            segments[-1][0] += joiner + part
+    return [Segment(t, after) for t, after in segments]
+
+
+class Step:
+    def __init__(self, index, text, tag, confidence, target=None):
+        self.index = index
+        self.text = text
+        self.tag = tag
+        self.confidence = confidence
+        self.target = target        # app opened or acted on by this step
+        self.after = []             # indices of steps that must be ready first
+        self.ready = threading.Event()
+        self.result = None
+
+    def __repr__(self):
+        return f"Step({self.index}, {self.tag!r}, {self.text!r}, after={self.after})"
+
+
+def _window_titles():
+    """Open window titles (lowercase), or None when no window listing is available."""
+    try:
+        import pywinctl
+        return [t.lower() for t in pywinctl.getAllTitles() if t]
+    except Exception:
+        pass
+    if shutil.which("wmctrl"):
+        try:
+            out = subprocess.run(["wmctrl", "-l"], capture_output=True, text=True, timeout=2).stdout
+            return [line.split(None, 3)[-1].lower() for line in out.splitlines() if line.strip()]
+        except (OSError, subprocess.SubprocessError):
+            pass
+    return None
+
+
+def wait_for_app(name, timeout=READY_TIMEOUT):
+    """Blocks until `name` has a window (or, without a window list, a process). Returns True if it did."""
+    name = (name or "").lower().strip()
+    if not name:
+        return True
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        titles = _window_titles()
+        if titles is not None:
+            found = any(name in title for title in titles)
+        else:
+            from core.process_ranker import find_processes
+            found = bool(find_processes(name, include_cmdline=False))
+        if found:
+            time.sleep(READY_SETTLE)
+            return True
+        time.sleep(READY_POLL)
+    return False
+
+
+class IntentScheduler:
+    def __init__(self, execute, max_parallel=MAX_PARALLEL, ready_timeout=READY_TIMEOUT):
+        self.execute = execute
+        self.max_parallel = max_parallel
+        self.ready_timeout = ready_timeout
+
+    # ── Planning ──
+
+    def plan(self, segments, predict_batch):
+        """
+        Predicts every segment in one batch and wires up dependencies.
+        Returns the steps, or None when the utterance shouldn't run as a compound.
+        """
+        if len(segments) < 2:
+            return None
+
+        # "snap chrome left": predict "snap left", remember chrome as the target
+        opened = []
+        texts, targets = [], []
+        for seg in segments:
+            verb = _verb(seg.text)
+            if verb in LIST_VERBS:
+                target = " ".join(w for w in _words(seg.text) if w != verb and w not in _FILLER)
+                texts.append(seg.text)
+                targets.append(target)
+                opened.append(target)
+                continue
+            target = next((app for app in opened if app and re.search(rf"\b{re.escape(app)}\b", seg.text)), None)
+            texts.append(" ".join(re.sub(rf"\b{re.escape(target)}\b", " ", seg.text).split()) if target else seg.text)
+            targets.append(target)
+
+        predictions = predict_batch(texts)
+        steps = []
+        for i, (seg, text, target, (tag, confidence)) in enumerate(zip(segments, texts, targets, predictions)):
+            if tag is None or confidence < COMPOUND_CONFIDENCE or tag in EXCLUSIVE_TAGS:
+                print(f"[Scheduler] Not a compound: '{seg.text}' -> {tag} ({confidence:.2f})")
+                return None
+            # Window ops keep the full text so engines can still see the app name
+            steps.append(Step(i, seg.text if tag.startswith("window_") else text, tag, confidence, target))
+
+        last_barrier = None
+        last_window = None
+        last_open = None
+        for step, seg in zip(steps, segments):
+            previous = steps[:step.index]
+            if step.tag.startswith("window_"):
+                opener = next((s for s in reversed(previous) if s.tag == "app_open" and s.target == step.target), None)
+                opener = opener or (last_open if step.target is None else None)
+                step.after += [s.index for s in (opener, last_window) if s is not None]
+                last_window = step
+            elif step.tag not in CONCURRENT_TAGS:
+                # Barrier: everything before it, and everything after waits for it
+                step.after += [s.index for s in previous]
+            if seg.after_previous and previous:
+                step.after.append(previous[-1].index)
+            if last_barrier is not None:
+                step.after.append(last_barrier.index)
+            if step.tag not in CONCURRENT_TAGS and not step.tag.startswith("window_"):
+                last_barrier = step
+            if step.tag == "app_open":
+                last_open = step
+            step.after = sorted(set(step.after))
+        return steps
+
+    # ── Execution ──
+
+    def _run_step(self, step, steps):
+        for index in step.after:
+            dependency = steps[index]
+            if not dependency.ready.wait(self.ready_timeout + 5):
+                print(f"[Scheduler] '{step.text}' stopped waiting for '{dependency.text}'")
+        started = time.time()
+        try:
+            step.result = self.execute(step.tag, step.text)
+        except Exception as e:
+            print(f"[Scheduler] '{step.text}' failed: {e}")
+            step.result = False
+        finally:
+            # app_open only starts the launch; dependents need its window
+            if step.tag == "app_open" and step.target and any(step.index in s.after for s in steps):
+                if not wait_for_app(step.target, self.ready_timeout):
+                    print(f"[Scheduler] No window for '{step.target}' after {self.ready_timeout:.0f}s")
+            step.ready.set()
+        print(f"[Scheduler] {step.tag} ready after {time.time() - started:.1f}s")
+        return step.result
+
+    def run(self, steps):
+        """Runs the steps; returns their results in order once all are done."""
+        started = time.time()
+        print(f"[Scheduler] Running {len(steps)} steps: {steps}")
+        workers = min(self.max_parallel, len(steps))
+        with concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix="IntentStep") as pool:
+            # Submitted in order, so a step's dependencies always hold a worker before it does
+            futures = [pool.submit(self._run_step, step, steps) for step in steps]
+            results = [f.result() for f in futures]
+        print(f"[Scheduler] Compound finished in {time.time() - started:.1f}s")
+        return results
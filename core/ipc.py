@@ -0,0 +1,283 @@
+"""
+Cortex Message Bus
+
+Binary IPC channel used between the engine, the TTS worker and the UI process.
+It replaces the plain multiprocessing.Queue objects that carried pickled
+(status, data) tuples.
+
+- Messages are framed as a 2-byte header (message type, payload kind)
+  followed by a compact payload, so common messages like ("IDLE", None)
+  travel as just two bytes.
+- put() never blocks the caller: frames are handed to a per-process feeder
+  thread, which coalesces bursts before writing them to the pipe. Control
+  messages (EXIT, ...) are written inline, and whatever is still buffered
+  is written by close() / flush() and at process exit, so shutdown
+  messages are never lost with the daemon feeder.
+- drain() returns everything that is waiting in one batch, with
+  high-frequency messages (state changes, search counts) coalesced.
+- fileno() exposes the read end so the UI can wake up through a
+  QSocketNotifier instead of polling on a timer (not available on Windows).
+
+Usage:
+    from core.ipc import MessageBus
+    status_queue = MessageBus()
+    status_queue.put(("LISTENING", None))
+    for status, data in status_queue.drain():
+        ...
+"""
+
+import collections
+import multiprocessing
+import os
+import pickle
+import platform
+import queue
+import struct
+import threading
+import time
+from multiprocessing import util
+
+# Message type codes. Index in this tuple is the code on the wire, so only
+# ever APPEND new names to keep old and new processes compatible.
+MESSAGE_TYPES = (
+    None,  # 0 = untyped, name travels inside the payload
+    "EXIT", "IDLE", "LISTENING", "THINKING", "SPEAKING", "PROCESSING",
+    "LOG", "SEARCHING", "SEARCH_COUNT", "FILE_SEARCH_GUI", "FILE_SEARCH_RESULTS",
+    "SHOW_CANCEL_DIALOG", "COPY_TO_CLIPBOARD", "UPDATE_THEME", "SET_GUI_VISIBLE",
+    "AUTOMATION_LIST", "PRIMARY_UPDATED", "WORKSPACE_EDITOR", "WORKSPACE_SELECTOR",
+    "AUDIO_DEVICES_CHANGED", "CANCEL_SEARCH", "UPDATE_NAME", "AUTOMATION_DIALOG_STATE",
+    "TRACE", "NETWORK_MONITOR", "SECURITY_SCAN", "CANCEL_SECURITY_SCAN",
+    "COMMAND_OUTPUT", "CANCEL_COMMAND", "FILE_OPERATION", "CANCEL_FILE_OPERATION",
+    "TASKS", "CANCEL_TASK",
+)
+_TYPE_CODES = {name: code for code, name in enumerate(MESSAGE_TYPES) if name}
+
+# Written before put() returns (with everything queued ahead of them), never left to the feeder
+CONTROL_MESSAGES = frozenset(["EXIT", "SET_GUI_VISIBLE", "UPDATE_THEME"])
+
+# Overlay states: only the most recent one matters to the UI
+STATE_MESSAGES = frozenset(["IDLE", "LISTENING", "THINKING", "SPEAKING", "PROCESSING"])
+
+# Payload kinds
+_P_NONE, _P_STR, _P_TRUE, _P_FALSE, _P_PICKLE = range(5)
+
+_HEADER = struct.Struct("!BB")
+
+
+def encode_message(status, data=None):
+    """Encode a (status, data) pair into a single binary frame."""
+    code = _TYPE_CODES.get(status, 0)
+    if code == 0:
+        # Unknown message type: carry the name along with the data
+        return _HEADER.pack(0, _P_PICKLE) + pickle.dumps((status, data), pickle.HIGHEST_PROTOCOL)
+    if data is None:
+        return _HEADER.pack(code, _P_NONE)
+    if data is True:
+        return _HEADER.pack(code, _P_TRUE)
+    if data is False:
+        return _HEADER.pack(code, _P_FALSE)
+    if type(data) is str:
+        return _HEADER.pack(code, _P_STR) + data.encode("utf-8")
+    return _HEADER.pack(code, _P_PICKLE) + pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+
+
+def decode_message(frame):
+    """Decode a binary frame back into a (status, data) pair."""
+    code, kind = _HEADER.unpack_from(frame)
+    payload = frame[_HEADER.size:]
+    if code == 0:
+        return pickle.loads(payload)
+    status = MESSAGE_TYPES[code] if code < len(MESSAGE_TYPES) else None
+    if kind == _P_NONE:
+        data = None
+    elif kind == _P_TRUE:
+        data = True
+    elif kind == _P_FALSE:
+        data = False
+    elif kind == _P_STR:
+        data = bytes(payload).decode("utf-8")
+    else:
+        data = pickle.loads(payload)
+    return status, data
+
+
+def _coalesce_key(status, data):
+    """Returns a key for messages where only the latest value matters, else None."""
+    if status in STATE_MESSAGES:
+        return "STATE"
+    if status == "SEARCH_COUNT" and isinstance(data, tuple) and data:
+        return ("SEARCH_COUNT", data[0])
+    if status == "SECURITY_SCAN":
+        return "SECURITY_SCAN"
+    if status == "FILE_OPERATION" and isinstance(data, dict):
+        return ("FILE_OPERATION", data.get("op"))
+    if status == "TASKS":
+        return "TASKS"
+    return None
+
+
+def coalesce(messages):
+    """
+    Collapses superseded messages in a batch while preserving ordering.
+    A coalesced message keeps the position of its LAST occurrence, so it is
+    still delivered after anything that was queued before it.
+    """
+    if len(messages) < 2:
+        return list(messages)
+    last_index = {}
+    for i, (status, data) in enumerate(messages):
+        key = _coalesce_key(status, data)
+        if key is not None:
+            last_index[key] = i
+    if not last_index:
+        return list(messages)
+    result = []
+    for i, (status, data) in enumerate(messages):
+        key = _coalesce_key(status, data)
+        if key is None or last_index[key] == i:
+            result.append((status, data))
+    return result
+
+
+def _normalize(msg):
+    if isinstance(msg, tuple) and len(msg) == 2:
+        return msg
+    return msg, None
+
+
+class MessageBus:
+    """
+    Multi-producer / single-consumer message channel between processes.
+    Drop-in replacement for the multiprocessing.Queue API used across Cortex
+    (put, get, get_nowait, empty), plus batched drain() and fileno().
+    """
+
+    # Upper bound of frames read per drain() call so one burst can't stall the UI
+    MAX_BATCH = 512
+
+    def __init__(self):
+        self._reader, self._writer = multiprocessing.Pipe(duplex=False)
+        self._wlock = multiprocessing.Lock()
+        self._rlock = multiprocessing.Lock()
+        self._reset_local_state()
+
+    def _reset_local_state(self):
+        # Per-process feeder state (threads don't survive fork/spawn)
+        self._pid = os.getpid()
+        self._buffer = collections.deque()
+        self._notempty = threading.Condition(threading.Lock())
+        self._send_lock = threading.Lock()     # keeps batches in order between the feeder and flush()
+        self._feeder = None
+        # Runs at interpreter exit and when a multiprocessing child finishes
+        util.Finalize(self, MessageBus.flush, args=(self,), exitpriority=10)
+
+    def __getstate__(self):
+        return (self._reader, self._writer, self._wlock, self._rlock)
+
+    def __setstate__(self, state):
+        self._reader, self._writer, self._wlock, self._rlock = state
+        self._reset_local_state()
+
+    # ── Producer side ──
+
+    def put(self, msg, block=True, timeout=None):
+        """Queues a message for delivery. Never blocks on the pipe (control messages are sent inline)."""
+        if self._pid != os.getpid():
+            # Inherited through fork: the parent's feeder thread doesn't exist here
+            self._reset_local_state()
+        msg = _normalize(msg)
+        with self._notempty:
+            if self._feeder is None:
+                self._feeder = threading.Thread(target=self._feed, name="MessageBusFeeder", daemon=True)
+                self._feeder.start()
+            self._buffer.append(msg)
+            self._notempty.notify()
+        if msg[0] in CONTROL_MESSAGES:
+            self.flush()
+
+    put_nowait = put
+
+    def flush(self):
+        """Writes everything buffered in this process to the pipe now."""
+        if self._pid != os.getpid():
+            return
+        self._send_pending()
+
+    close = flush
+
+    def _send_pending(self):
+        """Writes the buffered messages as one coalesced batch. False once the reader is gone."""
+        with self._send_lock:
+            with self._notempty:
+                batch = list(self._buffer)
+                self._buffer.clear()
+            if not batch:
+                return True
+            try:
+                frames = [encode_message(status, data) for status, data in coalesce(batch)]
+                with self._wlock:
+                    for frame in frames:
+                        self._writer.send_bytes(frame)
+            except (OSError, EOFError):
+                # Reader side is gone (UI closed); nothing left to deliver to
+                return False
+            except Exception as e:
+                print(f"[IPC] Feeder error: {e}")
+            return True
+
+    def _feed(self):
+        while True:
+            with self._notempty:
+                while not self._buffer:
+                    self._notempty.wait()
+            if not self._send_pending():
+                return
+
+    # ── Consumer side ──
+
+    def fileno(self):
+        """File descriptor of the read end, for event-driven wakeups. None on Windows."""
+        if platform.system() == "Windows":
+            return None
+        return self._reader.fileno()
+
+    def empty(self):
+        return not self._reader.poll()
+
+    def get(self, block=True, timeout=None):
+        """Returns the next (status, data) message, like Queue.get."""
+        if not block:
+            timeout = 0
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._rlock:
+            while True:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not self._reader.poll(remaining):
+                    raise queue.Empty
+                try:
+                    return decode_message(self._reader.recv_bytes())
+                except Exception as e:
+                    # Skip a corrupt frame rather than killing the consumer loop
+                    print(f"[IPC] Dropped undecodable frame: {e}")
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise queue.Empty
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def drain(self, max_messages=None):
+        """
+        Reads every message currently waiting (up to max_messages) without
+        blocking and returns them coalesced, in order.
+        """
+        limit = max_messages or self.MAX_BATCH
+        messages = []
+        with self._rlock:
+            while len(messages) < limit and self._reader.poll():
+                try:
+                    messages.append(decode_message(self._reader.recv_bytes()))
+                except (OSError, EOFError):
+                    break
+                except Exception as e:
+                    print(f"[IPC] Dropped undecodable frame: {e}")
+        return coalesce(messages)
@@ -0,0 +1,188 @@
+"""
+Cortex Knowledge Index
+
+One in-memory search index over everything Cortex can do: the intents in
+data/intents/*.json and the shell commands in data/terminal_commands.json.
+The Knowledge Hub searches it while the user types.
+
+- load_intent_files() is the one reader of the intent JSON files. The NLU
+  trains from the same loader.
+- Every function (intent or terminal command) is one Entry. Its tag,
+  patterns and responses are tokenized once into an inverted index
+  (token -> {entry id: best field weight}). A hit in the tag ranks above
+  a hit in a trigger phrase, which ranks above a hit in a response.
+- A query matches the entries that contain every query word. The last
+  word, the one still being typed, also matches as a prefix; prefixes are
+  looked up with bisect in the sorted vocabulary. If no entry has every
+  word, a substring scan over each entry's precomputed text still finds
+  fragments ("shot" in "screenshot").
+- get_index() builds the index once per process. It rebuilds only when
+  one of the data files changed (checked by mtime on each call).
+
+Usage:
+    index = get_index()
+    for entry in index.search("screen sh", category="system"):
+        print(entry.tag, entry.patterns[:3])
+"""
+
+import bisect
+import collections
+import glob
+import json
+import os
+import re
+import threading
+import time
+
+from core.runtime_path import get_app_root
+
+TAG_WEIGHT = 3
+PATTERN_WEIGHT = 2
+RESPONSE_WEIGHT = 1
+PREFIX_FACTOR = 0.5     # a prefix hit counts half as much as the whole word
+TERMINAL_RESPONSE = "[Terminal Command] Executes system shell operation."
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# kind: "intent" or "terminal"; commands: {os: shell command} for terminal entries
+Entry = collections.namedtuple("Entry", ["id", "category", "tag", "kind", "patterns", "responses", "commands", "text"])
+
+
+def tokenize(text):
+    return _WORD.findall(str(text).lower())
+
+
+def load_intent_files(data_dir):
+    """{category (file name without .json): [intent dicts]}, files in name order."""
+    categories = {}
+    for file_path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        category = os.path.splitext(os.path.basename(file_path))[0]
+        try:
+            with open(file_path, 'r') as f:
+                data = json.load(f)
+            categories[category] = data.get('intents', [])
+        except Exception as e:
+            print(f"[Error] Intent load {file_path}: {e}")
+    return categories
+
+
+def load_terminal_commands(path):
+    """{category: {command key: {"patterns", "cmd", ...}}} from terminal_commands.json."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"[Error] Terminal load: {e}")
+        return {}
+
+
+class KnowledgeIndex:
+    def __init__(self, intents_by_category, terminal_commands=None):
+        self.entries = []
+        self.categories = collections.OrderedDict()    # category -> [entry ids], catalog order
+        for category, intents in intents_by_category.items():
+            for intent in intents:
+                self._add(category, intent.get('tag', ''), "intent", intent.get('patterns', []),
+                          intent.get('responses', []), None)
+        for category, commands in (terminal_commands or {}).items():
+            for key, data in commands.items():
+                self._add(category, key.replace('_', ' ').title(), "terminal", data.get('patterns', []),
+                          [TERMINAL_RESPONSE], data.get('cmd'))
+
+        postings = collections.defaultdict(dict)
+        for entry in self.entries:
+            for weight, texts in ((TAG_WEIGHT, [entry.tag]), (PATTERN_WEIGHT, entry.patterns),
+                                  (RESPONSE_WEIGHT, entry.responses)):
+                for text in texts:
+                    for token in tokenize(text):
+                        if postings[token].get(entry.id, 0) < weight:
+                            postings[token][entry.id] = weight
+        self._postings = dict(postings)
+        self._vocabulary = sorted(self._postings)
+
+    def _add(self, category, tag, kind, patterns, responses, commands):
+        text = "\n".join([tag.lower()] + [p.lower() for p in patterns] + [r.lower() for r in responses])
+        entry = Entry(len(self.entries), category, tag, kind, list(patterns), list(responses), commands, text)
+        self.entries.append(entry)
+        self.categories.setdefault(category, []).append(entry.id)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _hits(self, word, prefix):
+        hits = dict(self._postings.get(word, {}))
+        if prefix:
+            start = bisect.bisect_left(self._vocabulary, word)
+            for token in self._vocabulary[start:]:
+                if not token.startswith(word):
+                    break
+                for entry_id, weight in self._postings[token].items():
+                    weight *= PREFIX_FACTOR
+                    if hits.get(entry_id, 0) < weight:
+                        hits[entry_id] = weight
+        return hits
+
+    def search(self, query, category=None, limit=None):
+        """Entries matching `query` (best first), optionally within one category. An empty query lists them all."""
+        allowed = None if category is None else set(self.categories.get(category, []))
+        words = tokenize(query)
+        if not words:
+            ids = list(self.categories.get(category, [])) if category is not None else [e.id for e in self.entries]
+            return [self.entries[i] for i in ids[:limit]]
+
+        scores = None
+        for i, word in enumerate(words):
+            hits = self._hits(word, prefix=(i == len(words) - 1))
+            if scores is None:
+                scores = hits
+            else:
+                scores = {entry_id: scores[entry_id] + weight for entry_id, weight in hits.items() if entry_id in scores}
+            if not scores:
+                break
+        if allowed is not None and scores:
+            scores = {entry_id: score for entry_id, score in scores.items() if entry_id in allowed}
+
+        if not scores:
+            needle = " ".join(str(query).lower().split())
+            candidates = self.entries if allowed is None else [self.entries[i] for i in sorted(allowed)]
+            scores = {e.id: 1 for e in candidates if needle in e.text}
+
+        ranked = sorted(scores, key=lambda entry_id: (-scores[entry_id], self.entries[entry_id].tag.lower()))
+        return [self.entries[i] for i in ranked[:limit]]
+
+
+_index = None
+_index_signature = None
+_index_lock = threading.Lock()
+
+
+def _data_paths():
+    root = get_app_root()
+    return os.path.join(root, 'data', 'intents'), os.path.join(root, 'data', 'terminal_commands.json')
+
+
+def _signature(intents_dir, terminal_file):
+    paths = sorted(glob.glob(os.path.join(intents_dir, "*.json"))) + [terminal_file]
+    signature = []
+    for path in paths:
+        try:
+            signature.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            signature.append((path, None))
+    return tuple(signature)
+
+
+def get_index():
+    """The process-wide index, rebuilt only when an intent or command file changed."""
+    global _index, _index_signature
+    intents_dir, terminal_file = _data_paths()
+    signature = _signature(intents_dir, terminal_file)
+    with _index_lock:
+        if _index is None or signature != _index_signature:
+            started = time.time()
+            _index = KnowledgeIndex(load_intent_files(intents_dir), load_terminal_commands(terminal_file))
+            _index_signature = signature
+            print(f"[Knowledge] Indexed {len(_index)} functions in {(time.time() - started) * 1000:.0f} ms")
+        return _index
@@ -1,6 +1,5 @@
 try:
     import json
-    import pyaudio
 
     import os
     import wave
@@ -9,13 +8,19 @@ try:
     import threading
     from faster_whisper import WhisperModel
     from .alsa_error import no_alsa_error
+    from .audio_io import get_backend
+    from .tracing import get_tracer, now_ns
 except ImportError as e:
     print(f"\n[CRITICAL] Missing Dependency: {e.name}")
     print(f"Please run: pip install -r requirements.txt\n")
     raise e
 
 class Listener:
-    def __init__(self, status_queue=None, is_speaking_flag=None, reset_event=None, shutdown_event=None):
+    def __init__(self, status_queue=None, is_speaking_flag=None, reset_event=None, shutdown_event=None, audio_backend=None):
+        """
+        :param audio_backend: Optional core.audio_io backend (e.g. WAV replay in benchmarks).
+                              Defaults to the process-wide backend (PyAudio unless overridden).
+        """
         self.status_queue = status_queue
         self.is_speaking_flag = is_speaking_flag
         self.reset_event = reset_event
@@ -24,7 +29,8 @@ class Listener:
         # small.en is ~461MB, base.en is ~142MB
         self.model_size = "base.en"
         self.model = None
-        self.p = None
+        self.audio = None
+        self._interrupt_audio = None
         
         print(f"[System] Loading Whisper Model ({self.model_size})...")
         print("[System] This should take just a few seconds...")
@@ -58,7 +64,7 @@ class Listener:
                         local_files_only=False
                     )
                 
-                self.p = pyaudio.PyAudio()
+                self.audio = audio_backend if audio_backend is not None else get_backend()
             
             print("[✓] Whisper Model loaded successfully!")
             
@@ -73,7 +79,6 @@ class Listener:
 
         self.THRESHOLD = 1000  # Default, adjusted by calibration
         self.CHUNK = 1024
-        self.FORMAT = pyaudio.paInt16
         self.CHANNELS = 1
         self.RATE = 16000
         self.SILENCE_LIMIT = 1.2 # Seconds of silence to stop recording
@@ -88,46 +93,16 @@ class Listener:
         self.dynamic_keywords = keywords_str
         print(f"[System] Speech Recognition Vocabulary Updated ({len(keywords_str)} chars).")
 
-    def _get_input_stream_kwargs(self):
-        """Returns keyword arguments for opening the PyAudio stream. 
-        Omitting 'input_device_index' forces PyAudio to use the OS Default via Sound Mapper."""
-        return {
-            'format': self.FORMAT,
-            'channels': self.CHANNELS,
-            'rate': self.RATE,
-            'input': True,
-            'frames_per_buffer': self.CHUNK
-        }
+    def _open_input_stream(self):
+        """Opens a capture stream on the OS default input. Device recovery
+        (fallback to default, PortAudio re-init after hot-swap) is handled by the backend."""
+        return self.audio.open_capture(rate=self.RATE, channels=self.CHANNELS, frames_per_buffer=self.CHUNK)
 
     def calibrate_noise(self):
         """Measures ambient noise level to set dynamic threshold."""
         print("Calibrating background noise... (Please stay quiet)")
         try:
-            kwargs = self._get_input_stream_kwargs()
-            with no_alsa_error():
-                try:
-                    stream = self.p.open(**kwargs)
-                except Exception as e:
-                    if "-9999" in str(e):
-                        # PortAudio instance is corrupted by a hot-swap. Recreate entirely.
-                        self.p.terminate()
-                        self.p = pyaudio.PyAudio()
-                    else:
-                        print(f"[!] Target input device unavailable, fallback to default: {e}")
-                        
-                    if 'input_device_index' in kwargs:
-                        del kwargs['input_device_index']
-                        
-                    try:
-                        stream = self.p.open(**kwargs)
-                    except Exception as fallback_e:
-                        if "-9999" in str(fallback_e):
-                            # Ultimate fallback: PyAudio is completely dead, reboot it
-                            self.p.terminate()
-                            self.p = pyaudio.PyAudio()
-                        return
-            
-            stream.start_stream()
+            stream = self._open_input_stream()
             
             # Discard initial "pop" chunks
             for _ in range(5):
@@ -177,30 +152,11 @@ class Listener:
                         self.is_speaking_flag.value = False
                         break
             
-            kwargs = self._get_input_stream_kwargs()
-            with no_alsa_error():
-                try:
-                    stream = self.p.open(**kwargs)
-                except Exception as e:
-                    if "-9999" in str(e):
-                        # PortAudio routing graph broken by hot-swap. Re-initialize natively.
-                        self.p.terminate()
-                        self.p = pyaudio.PyAudio()
-                        time.sleep(1) # Let COM objects settle
-                    else:
-                        print(f"[!] Target input device unavailable, fallback to default: {e}")
-                        
-                    if 'input_device_index' in kwargs:
-                        del kwargs['input_device_index']
-                        
-                    try:
-                        stream = self.p.open(**kwargs)
-                    except Exception as fallback_e:
-                        if "-9999" in str(fallback_e):
-                            self.p.terminate()
-                            self.p = pyaudio.PyAudio()
-                            time.sleep(1)
-                        return ""
+            try:
+                stream = self._open_input_stream()
+            except Exception as e:
+                print(f"[!] Could not open microphone: {e}")
+                return ""
             
             print("Listening...", end="", flush=True)
             if self.status_queue:
@@ -250,6 +206,7 @@ class Listener:
                 if not started:
                     if rms > self.THRESHOLD:
                         started = True
+                        speech_start_ns = now_ns()
                         print("\rListening... (Speech detected)", end="", flush=True)
                         if self.status_queue:
                              self.status_queue.put(("PROCESSING", None))
@@ -271,6 +228,9 @@ class Listener:
             
             stream.stop_stream()
             stream.close()
+            tracer = get_tracer()
+            tracer.record("asr.capture", speech_start_ns, now_ns(),
+                          audio_sec=round(len(frames) * self.CHUNK / self.RATE, 2))
 
             # Process in-memory
             # Convert raw bytes to numpy array (float32, normalized)
@@ -289,17 +249,19 @@ class Listener:
             # IMPORTANT: Add common app names for better app launch recognition
             prompt_text = f"Commands: {self.dynamic_keywords}, left, right, up, down, snap left, snap right, move left, move right, window left, window right, WhatsApp, Chrome, Firefox, Notepad, Discord, Spotify, Visual Studio Code, Excel, Word, PowerPoint, system monitor, assistant, open, close, minimize, maximize"
             
-            segments, info = self.model.transcribe(
-                audio_np, 
-                beam_size=5, # Accuracy > Speed
-                temperature=0, 
-                language="en",
-                initial_prompt=prompt_text
-            )
-            
-            full_text = ""
-            for segment in segments:
-                full_text += segment.text
+            with tracer.span("asr.decode"):
+                segments, info = self.model.transcribe(
+                    audio_np, 
+                    beam_size=5, # Accuracy > Speed
+                    temperature=0, 
+                    language="en",
+                    initial_prompt=prompt_text
+                )
+                
+                # segments is lazy: decoding happens while iterating
+                full_text = ""
+                for segment in segments:
+                    full_text += segment.text
             
             full_text = full_text.strip().lower()
 
@@ -359,10 +321,8 @@ class Listener:
         except KeyboardInterrupt:
             return "exit"
         except OSError as e:
-            if "-9999" in str(e):
-                # Silently catch PyAudio stream disconnection and reset
-                pass
-            else:
+            # Stream disconnected by a device hot-swap: the backend re-initializes itself
+            if not self.audio.recover(e):
                 print(f"\n[System] Audio stream error: {e}")
             return ""
         except Exception as e:
@@ -371,7 +331,6 @@ class Listener:
         finally:
             try:
                 if 'stream' in locals() and stream.is_active():
-                    stream.stop_stream()
                     stream.close()
             except: pass
 
@@ -379,28 +338,24 @@ class Listener:
         """
         A SEPARATE lightweight listener used exclusively by the interrupt thread.
         KEY DIFFERENCES from listen():
-          - Opens its OWN PyAudio instance so it doesn't conflict with self.p
+          - Uses its OWN audio backend instance so it doesn't conflict with self.audio
           - Does NOT wait for is_speaking_flag (that's exactly the point)
           - Hard timeout so it doesn't block forever
           - Only transcribes short bursts, not full commands
         Returns the transcript string, or empty string on timeout/no speech.
         """
-        p_int = None
         stream_int = None
         try:
-            with no_alsa_error():
-                p_int = pyaudio.PyAudio()
-                try:
-                    stream_int = p_int.open(
-                        format=self.FORMAT,
-                        channels=self.CHANNELS,
-                        rate=self.RATE,
-                        input=True,
-                        frames_per_buffer=self.CHUNK
-                    )
-                except Exception as e:
-                    print(f"[Interrupt Listener] Could not open audio stream: {e}")
-                    return ""
+            # Kept between calls so PortAudio isn't re-initialized on every utterance
+            if self._interrupt_audio is None:
+                self._interrupt_audio = self.audio.clone()
+            try:
+                stream_int = self._interrupt_audio.open_capture(
+                    rate=self.RATE, channels=self.CHANNELS, frames_per_buffer=self.CHUNK
+                )
+            except Exception as e:
+                print(f"[Interrupt Listener] Could not open audio stream: {e}")
+                return ""
 
             frames = []
             started = False
@@ -465,20 +420,18 @@ class Listener:
             return ""
         finally:
             try:
-                if stream_int and stream_int.is_active():
-                    stream_int.stop_stream()
+                if stream_int:
                     stream_int.close()
             except: pass
-            try:
-                if p_int:
-                    p_int.terminate()
-            except: pass
 
     def terminate(self):
         """Clean resource release."""
-        if self.p:
-            self.p.terminate()
-            self.p = None
+        if self._interrupt_audio is not None and self._interrupt_audio is not self.audio:
+            self._interrupt_audio.terminate()
+        self._interrupt_audio = None
+        if self.audio:
+            self.audio.terminate()
+            self.audio = None
 
 if __name__ == "__main__":
     l = Listener()
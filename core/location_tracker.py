@@ -0,0 +1,542 @@
+"""
+Cortex Location Tracker
+
+Keeps the active window and the folder open in the file manager in memory.
+File commands ("create a folder here", "move these here") can then read
+them at once. Before this, every command probed each file manager with
+gdbus, qdbus, xprop or PowerShell.
+
+- Linux: one session-bus connection (jeepney, optional) stays open while
+  the engine runs. Nautilus publishes its open folders on
+  org.freedesktop.FileManager1 (OpenWindowsWithLocations). The tracker
+  subscribes to its PropertiesChanged signal, so the cache follows every
+  navigation. Neither Nautilus nor Dolphin broadcasts selection changes,
+  so Dolphin's URL and the selection are asked for over the same
+  connection, only when a command needs them.
+- The active window comes from event streams, not one-off probes:
+  the Hyprland event socket (.socket2), or on X11 a long-lived
+  `xprop -spy` on the root window (focus) and on the focused window
+  (title).
+- Windows: a WinEvent hook reports foreground and title changes.
+  Explorer's folder and selection are read in-process through
+  Shell.Application (pywin32), not from a PowerShell child.
+
+Anything the tracker can't answer comes back as None. The callers then
+fall back to the old probes.
+
+Usage:
+    from core.location_tracker import start_tracker, get_tracker
+    start_tracker()
+    tracker = get_tracker()
+    tracker.location()       # Path of the file-manager folder in view, or None
+    tracker.window_title()   # title of the active window, or None if focus isn't tracked
+    tracker.selection()      # [Path] selected in the file manager, or None
+    stop_tracker()           # engine shutdown
+"""
+
+import collections
+import json
+import os
+import platform
+import queue
+import re
+import shutil
+import socket
+import subprocess
+import threading
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+FILE_MANAGER1 = "org.freedesktop.FileManager1"
+FILE_MANAGER1_PATH = "/org/freedesktop/FileManager1"
+DBUS_TIMEOUT = 1.0
+STOP_TIMEOUT = 1.0          # seconds to wait for an xprop child after terminate()
+# Their folder only shows in the window title; active_location parses it
+TITLE_FILE_MANAGERS = ("thunar", "nemo", "pcmanfm", "caja")
+
+# app: WM_CLASS / Hyprland class / Win32 window class
+# handle: X11 window id, Hyprland address or HWND
+ActiveWindow = collections.namedtuple("ActiveWindow", ["title", "app", "handle"])
+
+
+def _uri_to_path(uri):
+    if not isinstance(uri, str) or not uri.startswith("file://"):
+        return None
+    return Path(unquote(urlparse(uri).path))
+
+
+def _file_uris(value):
+    """Every file:// string in a D-Bus reply body (lists, structs and variants included)."""
+    if isinstance(value, str):
+        return [value] if value.startswith("file://") else []
+    if isinstance(value, (list, tuple)):
+        return [uri for item in value for uri in _file_uris(item)]
+    if isinstance(value, dict):
+        return [uri for item in value.values() for uri in _file_uris(item)]
+    return []
+
+
+def _nautilus_folder(windows, recent, title=None):
+    """Folder of the Nautilus window whose title matches, else of the window that navigated last."""
+    order = ([recent] if recent in windows else []) + [w for w in windows if w != recent]
+    folders = [path for w in order for path in map(_uri_to_path, windows[w][:1]) if path]
+    if title:
+        for path in folders:
+            if path.name == title or (title == "Home" and path == Path.home()):
+                if path.is_dir():
+                    return path
+    return next((path for path in folders if path.is_dir()), None)
+
+
+# ── Windows Explorer (pywin32, optional) ──
+
+def _shell_windows():
+    import pythoncom
+    import win32com.client
+    pythoncom.CoInitialize()    # per calling thread; repeat calls are harmless
+    return win32com.client.Dispatch("Shell.Application").Windows()
+
+
+def _explorer_folder(hwnd):
+    try:
+        for window in _shell_windows():
+            if int(window.HWND) == hwnd:
+                return Path(window.Document.Folder.Self.Path)
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"[LocationTracker] Explorer folder lookup failed: {e}")
+    return None
+
+
+def _explorer_selection(hwnd=None):
+    """[Path] selected in the Explorer window `hwnd` (every window when None); None without pywin32."""
+    try:
+        paths = []
+        for window in _shell_windows():
+            try:
+                if hwnd is not None and int(window.HWND) != hwnd:
+                    continue
+                paths += [Path(item.Path) for item in window.Document.SelectedItems()]
+            except Exception:
+                continue    # not an Explorer window (e.g. Internet Explorer)
+        return [path for path in dict.fromkeys(paths) if path.exists()]
+    except ImportError:
+        return None
+    except Exception as e:
+        print(f"[LocationTracker] Explorer selection failed: {e}")
+        return None
+
+
+def _win32_window(hwnd):
+    import ctypes
+    if not hwnd:
+        return None
+    user32 = ctypes.windll.user32
+    title = ctypes.create_unicode_buffer(user32.GetWindowTextLengthW(hwnd) + 1)
+    user32.GetWindowTextW(hwnd, title, len(title))
+    cls = ctypes.create_unicode_buffer(256)
+    user32.GetClassNameW(hwnd, cls, len(cls))
+    return ActiveWindow(title.value, cls.value, int(hwnd))
+
+
+def _xprop_string(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return value
+
+
+class LocationTracker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0            # bumped on every window / folder change
+        self._window = None
+        self._nautilus = {}          # window object path -> [uri per tab]
+        self._nautilus_recent = None # window that navigated last
+        self._last_explorer = None   # HWND of the last focused Explorer window
+        self._cached = (-1, None)    # (version, answer) of the last location()
+        self._router = None
+        self._stop = threading.Event()
+        self._procs = []
+        self._sockets = []
+        self._win32_thread = None
+        self._x11_active = None
+        self._x11_spy = None         # `xprop -spy` on the focused window
+        self.watching_windows = False
+        self.watching_dbus = False
+
+    # ── Lifecycle ──
+
+    def start(self):
+        system = platform.system()
+        if system == "Linux":
+            self._spawn(self._dbus_loop, "LocationTracker-DBus")
+            if os.environ.get("HYPRLAND_INSTANCE_SIGNATURE"):
+                self._spawn(self._watch_hyprland, "LocationTracker-Hyprland")
+            elif os.environ.get("DISPLAY") and shutil.which("xprop"):
+                self._spawn(self._watch_x11, "LocationTracker-X11")
+        elif system == "Windows":
+            self._spawn(self._watch_win32, "LocationTracker-Win32")
+        return self
+
+    def _spawn(self, target, name):
+        def run():
+            try:
+                target()
+            except Exception as e:
+                print(f"[LocationTracker] {name} stopped: {e}")
+        threading.Thread(target=run, name=name, daemon=True).start()
+
+    def stop(self):
+        """Ends the xprop children, the Hyprland socket, the session bus connection and the WinEvent hooks."""
+        self._stop.set()
+        self.watching_windows = False
+        procs = self._procs + ([self._x11_spy] if self._x11_spy is not None else [])
+        for proc in procs:
+            if proc.poll() is None:
+                proc.terminate()
+        for proc in procs:
+            try:
+                proc.wait(timeout=STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        for sock in self._sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        if self._win32_thread is not None:
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(self._win32_thread, 0x0012, 0, 0)   # WM_QUIT
+        if self._router is not None:
+            try:
+                self._router.close()
+            except Exception:
+                pass
+            self._router = None
+            self.watching_dbus = False
+
+    # ── Queries ──
+
+    def window_title(self):
+        """Title of the active window ('' for none), or None when focus isn't being tracked."""
+        if not self.watching_windows:
+            return None
+        window = self._window
+        return window.title if window else ""
+
+    def location(self):
+        """Folder open in the file manager the user is looking at, or None if unknown."""
+        with self._lock:
+            version, answer = self._cached
+            if version == self._version:
+                return answer if answer is None or answer.is_dir() else None
+            version = self._version
+            window, nautilus, recent = self._window, dict(self._nautilus), self._nautilus_recent
+        path, cacheable = self._resolve(window, nautilus, recent)
+        if cacheable:
+            with self._lock:
+                self._cached = (version, path)
+        return path
+
+    def _resolve(self, window, nautilus, recent):
+        """(folder or None, whether it stays valid until the next change event)."""
+        app = (window.app or "").lower() if window else ""
+        if os.name == "nt":
+            if window and window.app == "CabinetWClass":
+                return _explorer_folder(window.handle), True
+            return None, True
+        if any(name in app for name in TITLE_FILE_MANAGERS):
+            return None, True
+        if "dolphin" in app:
+            # Dolphin doesn't signal navigation; the title change is the only hint
+            return self._dolphin_folder(), self.watching_windows
+        if nautilus:
+            # The focused Nautilus window, or (as the old probe did) the last one used
+            return _nautilus_folder(nautilus, recent, window.title if "nautilus" in app else None), True
+        if window is None or not app:
+            return self._dolphin_folder(), False
+        return None, True
+
+    def selection(self):
+        """
+        [Path] selected in the file manager, asked in-process. [] when the file
+        managers answered with nothing selected; None when they can't be asked
+        here (no D-Bus connection / no pywin32), so the caller should probe.
+        """
+        if os.name == "nt":
+            return _explorer_selection(self._last_explorer)
+        if self._router is None:
+            return None
+        uris = []
+        for name in self._dolphin_names():
+            uris += _file_uris(self._call(name, "/dolphin/Dolphin_1", "org.kde.dolphin.MainWindow", "selectedUrls"))
+        if not uris and self._has_owner("org.gnome.Nautilus"):
+            uris += _file_uris(self._call("org.gnome.Nautilus", "/org/gnome/Nautilus",
+                                          "org.gnome.Nautilus.FileOperations", "GetSelection"))
+        paths = [path for path in map(_uri_to_path, dict.fromkeys(uris)) if path and path.exists()]
+        return paths
+
+    # ── D-Bus ──
+
+    def _call(self, bus_name, path, interface, method, signature=None, body=()):
+        """Method call over the shared connection; the reply body, or None on any error."""
+        router = self._router
+        if router is None:
+            return None
+        from jeepney import DBusAddress, new_method_call
+        from jeepney.wrappers import unwrap_msg
+        try:
+            msg = new_method_call(DBusAddress(path, bus_name=bus_name, interface=interface), method, signature, body)
+            return unwrap_msg(router.send_and_get_reply(msg, timeout=DBUS_TIMEOUT))
+        except Exception:
+            return None
+
+    def _bus(self, method, signature=None, body=()):
+        return self._call("org.freedesktop.DBus", "/org/freedesktop/DBus", "org.freedesktop.DBus",
+                          method, signature, body)
+
+    def _has_owner(self, name):
+        # Checked first so a Get doesn't D-Bus-activate a file manager that isn't running
+        reply = self._bus("NameHasOwner", "s", (name,))
+        return bool(reply and reply[0])
+
+    def _dolphin_names(self):
+        reply = self._bus("ListNames")
+        return [name for name in (reply[0] if reply else []) if name.startswith("org.kde.dolphin")]
+
+    def _dolphin_folder(self):
+        for name in self._dolphin_names():
+            for uri in _file_uris(self._call(name, "/dolphin/Dolphin_1", "org.kde.dolphin.MainWindow", "currentUrl")):
+                path = _uri_to_path(uri)
+                if path and path.is_dir():
+                    return path
+        return None
+
+    def _set_nautilus(self, windows):
+        windows = {str(w): [str(uri) for uri in uris] for w, uris in (windows or {}).items()}
+        with self._lock:
+            moved = [w for w, uris in windows.items() if self._nautilus.get(w) != uris]
+            if moved:
+                self._nautilus_recent = moved[0]
+            elif self._nautilus_recent not in windows:
+                self._nautilus_recent = None
+            self._nautilus = windows
+            self._version += 1
+
+    def _refresh_nautilus(self):
+        if not self._has_owner(FILE_MANAGER1):
+            self._set_nautilus({})
+            return
+        reply = self._call(FILE_MANAGER1, FILE_MANAGER1_PATH, "org.freedesktop.DBus.Properties", "Get",
+                           "ss", (FILE_MANAGER1, "OpenWindowsWithLocations"))
+        if reply:
+            self._set_nautilus(reply[0][1])     # variant: (signature, value)
+
+    def _dbus_loop(self):
+        try:
+            from jeepney import MatchRule
+            from jeepney.io.threading import DBusRouter, open_dbus_connection
+        except ImportError:
+            print("[LocationTracker] jeepney not installed; file managers are probed per command "
+                  "(pip install jeepney)")
+            return
+        try:
+            router = DBusRouter(open_dbus_connection(bus="SESSION"))
+        except Exception as e:
+            print(f"[LocationTracker] No session bus: {e}")
+            return
+
+        rule = MatchRule(type="signal", interface="org.freedesktop.DBus.Properties",
+                         member="PropertiesChanged", path=FILE_MANAGER1_PATH)
+        events = queue.Queue()
+        with router.filter(rule, queue=events):
+            self._router = router
+            self._bus("AddMatch", "s", (rule.serialise(),))
+            self._refresh_nautilus()
+            self.watching_dbus = True
+            print("[LocationTracker] Listening for file manager changes on the session bus")
+            while not self._stop.is_set():
+                try:
+                    msg = events.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                interface, changed, invalidated = msg.body
+                if interface != FILE_MANAGER1:
+                    continue
+                if "OpenWindowsWithLocations" in changed:
+                    self._set_nautilus(changed["OpenWindowsWithLocations"][1])
+                elif "OpenWindowsWithLocations" in invalidated:
+                    self._refresh_nautilus()
+
+    # ── Active window ──
+
+    def _set_window(self, window):
+        with self._lock:
+            if window != self._window:
+                self._window = window
+                self._version += 1
+                if window is not None and window.app == "CabinetWClass":
+                    self._last_explorer = window.handle
+
+    def _watch_hyprland(self):
+        signature = os.environ["HYPRLAND_INSTANCE_SIGNATURE"]
+        candidates = [os.path.join(os.environ.get("XDG_RUNTIME_DIR", "/tmp"), "hypr", signature, ".socket2.sock"),
+                      os.path.join("/tmp", "hypr", signature, ".socket2.sock")]
+        path = next((p for p in candidates if os.path.exists(p)), None)
+        if path is None:
+            print("[LocationTracker] Hyprland event socket not found")
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+        self._sockets.append(sock)
+
+        try:
+            info = json.loads(subprocess.check_output(["hyprctl", "activewindow", "-j"],
+                                                      stderr=subprocess.DEVNULL, timeout=2) or b"{}")
+            if info.get("address"):
+                self._set_window(ActiveWindow(info.get("title", ""), info.get("class", ""),
+                                              info["address"].removeprefix("0x")))
+        except (OSError, subprocess.SubprocessError, ValueError):
+            pass
+        self.watching_windows = True
+
+        with sock, sock.makefile("r", encoding="utf-8", errors="replace") as events:
+            for line in events:
+                event, _, data = line.rstrip("\n").partition(">>")
+                window = self._window
+                if event == "activewindow":
+                    app, _, title = data.partition(",")
+                    self._set_window(ActiveWindow(title, app, None) if app or title else None)
+                elif event == "activewindowv2" and window is not None:
+                    self._set_window(window._replace(handle=data))
+                elif event == "windowtitlev2" and window is not None:
+                    address, _, title = data.partition(",")
+                    if address == window.handle:
+                        self._set_window(window._replace(title=title))
+        self.watching_windows = False
+
+    def _watch_x11(self):
+        root = subprocess.Popen(["xprop", "-root", "-spy", "_NET_ACTIVE_WINDOW"], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True, errors="replace")
+        self._procs.append(root)
+        self.watching_windows = True
+        spy = None
+        for line in root.stdout:
+            if "window id #" not in line:
+                continue
+            window_id = line.rsplit("#", 1)[1].split(",")[0].strip()
+            if window_id == self._x11_active:
+                continue
+            self._x11_active = window_id
+            if spy is not None:
+                spy.terminate()
+                spy.wait()
+                spy = None
+            if window_id in ("0x0", "0") or self._stop.is_set():
+                self._set_window(None)
+            else:
+                spy = self._spy_x11_window(window_id)
+            self._x11_spy = spy
+        if spy is not None and spy.poll() is None:
+            spy.terminate()
+            spy.wait()
+        self._x11_spy = None
+        self.watching_windows = False
+
+    def _spy_x11_window(self, window_id):
+        """Follows the focused window's title and class with `xprop -spy` until focus moves on."""
+        try:
+            proc = subprocess.Popen(["xprop", "-id", window_id, "-spy", "_NET_WM_NAME", "WM_CLASS"],
+                                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, errors="replace")
+        except OSError:
+            return None
+
+        def read():
+            title, app = "", ""
+            for line in proc.stdout:
+                key, sep, value = line.partition(" = ")
+                if not sep:
+                    continue
+                if key.startswith("_NET_WM_NAME"):
+                    title = _xprop_string(value)
+                elif key.startswith("WM_CLASS"):
+                    names = re.findall(r'"((?:[^"\\]|\\.)*)"', value)
+                    app = names[-1] if names else ""
+                if self._x11_active == window_id:
+                    self._set_window(ActiveWindow(title, app, window_id))
+            proc.wait()
+
+        threading.Thread(target=read, name="LocationTracker-X11Window", daemon=True).start()
+        return proc
+
+    def _watch_win32(self):
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        EVENT_SYSTEM_FOREGROUND = 0x0003
+        EVENT_OBJECT_NAMECHANGE = 0x800C
+        OBJID_WINDOW = 0
+        WINEVENT_OUTOFCONTEXT = 0x0000
+        WINEVENT_SKIPOWNPROCESS = 0x0002
+
+        WinEventProc = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND, wintypes.LONG,
+                                          wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+        user32.SetWinEventHook.argtypes = [wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WinEventProc,
+                                           wintypes.DWORD, wintypes.DWORD, wintypes.DWORD]
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.GetForegroundWindow.restype = wintypes.HWND
+
+        def on_event(hook, event, hwnd, id_object, id_child, thread, timestamp):
+            if id_object != OBJID_WINDOW or not hwnd:
+                return
+            # Title changes of background windows don't matter
+            if event == EVENT_OBJECT_NAMECHANGE and hwnd != user32.GetForegroundWindow():
+                return
+            self._set_window(_win32_window(hwnd))
+
+        callback = WinEventProc(on_event)   # must outlive the hooks
+        flags = WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+        hooks = [user32.SetWinEventHook(event, event, None, callback, 0, 0, flags)
+                 for event in (EVENT_SYSTEM_FOREGROUND, EVENT_OBJECT_NAMECHANGE)]
+        self._win32_thread = ctypes.windll.kernel32.GetCurrentThreadId()
+        self._set_window(_win32_window(user32.GetForegroundWindow()))
+        self.watching_windows = True
+
+        msg = wintypes.MSG()
+        while not self._stop.is_set() and user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        for hook in hooks:
+            user32.UnhookWinEvent(hook)
+        self.watching_windows = False
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def start_tracker():
+    """Creates and starts the process-wide tracker (no-op if it is already running)."""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = LocationTracker().start()
+        return _tracker
+
+
+def get_tracker():
+    """The running tracker, or None if start_tracker() was never called."""
+    return _tracker
+
+
+def stop_tracker():
+    """Stops the process-wide tracker, if one was started."""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is not None:
+            _tracker.stop()
+            _tracker = None
@@ -0,0 +1,248 @@
+"""
+Cortex Metric History Store
+
+Keeps telemetry history at three resolutions so questions like "what was my
+CPU like over the last hour?" or "when did the disk fill up?" can be
+answered, by voice or in the Hub window.
+
+- Tiers: 1 s buckets for 1 hour, 1 min buckets for 1 day, 15 min buckets
+  for 30 days. Every sample is folded into all three tiers as it arrives
+  (count / mean / min / max per bucket), so no rollup job is needed.
+- Each tier is a fixed-size NumPy ring buffer memory-mapped to a file in
+  data/telemetry/. Footprint is fixed at about 1.3 MB no matter how long
+  Cortex runs, and history survives restarts.
+- A bucket's slot is (bucket start // step) % slots, and every row stores
+  its own bucket start. Readers need no shared head pointer, so another
+  process (the Hub window) can open the files read-only and query them.
+
+Usage:
+    store = MetricStore()                       # writer (engine)
+    store.add(time.time(), {"cpu_percent": 12.5, ...})
+    store.aggregate("cpu_percent", 3600)        # {"mean", "min", "max", "last", ...}
+
+    reader = MetricStore(readonly=True)         # reader (UI process)
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+
+from core.runtime_path import get_app_root
+
+# Metrics kept in history (must match telemetry.Sample field names)
+METRICS = ("cpu_percent", "mem_percent", "swap_percent", "disk_percent", "net_sent_rate", "net_recv_rate")
+
+# (name, bucket seconds, slots)
+TIERS = (
+    ("1s", 1, 3600),         # 1 hour
+    ("1m", 60, 1440),        # 1 day
+    ("15m", 900, 2880),      # 30 days
+)
+
+# Row layout: [bucket_start, count, mean * M, min * M, max * M]
+_M = len(METRICS)
+_COLS = 2 + 3 * _M
+_TS, _COUNT = 0, 1
+_MEAN, _MIN, _MAX = 2, 2 + _M, 2 + 2 * _M
+
+_FILE_VERSION = 1
+
+# Writes are flushed to disk at most this often (the OS also flushes on its own)
+FLUSH_INTERVAL = 60.0
+
+
+def default_store_dir():
+    return os.path.join(get_app_root(), "data", "telemetry")
+
+
+class _Tier:
+    def __init__(self, name, step, slots, directory, readonly):
+        self.name = name
+        self.step = step
+        self.slots = slots
+        self.path = os.path.join(directory, f"metrics_v{_FILE_VERSION}_{name}.bin")
+        self.readonly = readonly
+        shape = (slots, _COLS)
+        if readonly:
+            self.data = np.zeros(shape, dtype=np.float64)
+            self._map_readonly()
+            return
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fresh = not os.path.exists(self.path) or os.path.getsize(self.path) != slots * _COLS * 8
+            self.data = np.memmap(self.path, dtype=np.float64, mode="w+" if fresh else "r+", shape=shape)
+        except OSError as e:
+            # Read-only install dir etc.: keep history in memory only
+            print(f"[Metrics] Could not open {self.path} ({e}); history will not persist.")
+            self.data = np.zeros(shape, dtype=np.float64)
+
+    def _map_readonly(self):
+        # The writer may not have created the file yet; try again on the next query
+        if os.path.exists(self.path) and os.path.getsize(self.path) == self.slots * _COLS * 8:
+            self.data = np.memmap(self.path, dtype=np.float64, mode="r", shape=(self.slots, _COLS))
+
+    @property
+    def span(self):
+        return self.step * self.slots
+
+    def add(self, ts, values):
+        bucket = float(int(ts // self.step) * self.step)
+        row = self.data[int(bucket // self.step) % self.slots]
+        if row[_TS] != bucket:
+            # Slot still holds an older lap of the ring: start a fresh bucket
+            row[_TS] = bucket
+            row[_COUNT] = 0
+            row[_MEAN:_MIN] = 0.0
+            row[_MIN:_MAX] = np.inf
+            row[_MAX:] = -np.inf
+        count = row[_COUNT] + 1
+        row[_COUNT] = count
+        row[_MEAN:_MIN] += (values - row[_MEAN:_MIN]) / count
+        np.minimum(row[_MIN:_MAX], values, out=row[_MIN:_MAX])
+        np.maximum(row[_MAX:], values, out=row[_MAX:])
+
+    def rows(self, start, end):
+        """Rows whose bucket lies in [start, end], sorted by time."""
+        if self.readonly and not isinstance(self.data, np.memmap):
+            self._map_readonly()
+        ts = self.data[:, _TS]
+        mask = (self.data[:, _COUNT] > 0) & (ts >= start - self.step) & (ts <= end)
+        rows = np.array(self.data[mask])
+        return rows[np.argsort(rows[:, _TS])]
+
+    def flush(self):
+        if not self.readonly and isinstance(self.data, np.memmap):
+            self.data.flush()
+
+
+class MetricStore:
+    def __init__(self, directory=None, readonly=False):
+        self.directory = directory or default_store_dir()
+        self.readonly = readonly
+        self.tiers = [_Tier(name, step, slots, self.directory, readonly) for name, step, slots in TIERS]
+        self._lock = threading.Lock()
+        self._last_flush = time.time()
+
+    # ── Writing ──
+
+    def add(self, ts, values):
+        """Folds one sample ({metric: value}, or a telemetry Sample) into every tier."""
+        if self.readonly:
+            raise RuntimeError("MetricStore was opened read-only")
+        if not isinstance(values, dict):
+            values = values._asdict()
+        vector = np.array([float(values.get(m, 0.0) or 0.0) for m in METRICS], dtype=np.float64)
+        with self._lock:
+            for tier in self.tiers:
+                tier.add(ts, vector)
+            if ts - self._last_flush >= FLUSH_INTERVAL:
+                self.flush()
+
+    def add_sample(self, sample):
+        """Telemetry listener: store.add_sample(sampler sample)."""
+        self.add(sample.ts, sample)
+
+    def flush(self):
+        for tier in self.tiers:
+            tier.flush()
+        self._last_flush = time.time()
+
+    def close(self):
+        if not self.readonly:
+            with self._lock:
+                self.flush()
+
+    # ── Queries ──
+
+    def _tier_for(self, seconds, resolution=None):
+        if resolution:
+            for tier in self.tiers:
+                if tier.name == resolution:
+                    return tier
+            raise ValueError(f"Unknown resolution '{resolution}'")
+        # Finest tier that still covers the whole range
+        for tier in self.tiers:
+            if tier.span >= seconds:
+                return tier
+        return self.tiers[-1]
+
+    def query(self, metric, seconds, resolution=None, end=None):
+        """
+        Returns the series for the last `seconds` as a dict of NumPy arrays:
+        {"ts", "mean", "min", "max", "count", "resolution"}.
+        """
+        index = METRICS.index(metric)
+        end = end if end is not None else time.time()
+        tier = self._tier_for(seconds, resolution)
+        rows = tier.rows(end - seconds, end)
+        return {
+            "ts": rows[:, _TS],
+            "mean": rows[:, _MEAN + index],
+            "min": rows[:, _MIN + index],
+            "max": rows[:, _MAX + index],
+            "count": rows[:, _COUNT],
+            "resolution": tier.name,
+        }
+
+    def aggregate(self, metric, seconds, end=None):
+        """
+        Summary of a metric over the last `seconds`: sample-weighted mean,
+        min, max (with the time of the peak), first and last bucket means.
+        Returns None when there is no history for the range.
+        """
+        series = self.query(metric, seconds, end=end)
+        if not len(series["ts"]):
+            return None
+        weights = series["count"]
+        peak = int(np.argmax(series["max"]))
+        return {
+            "mean": float(np.average(series["mean"], weights=weights)),
+            "min": float(np.min(series["min"])),
+            "max": float(series["max"][peak]),
+            "max_ts": float(series["ts"][peak]),
+            "first": float(series["mean"][0]),
+            "last": float(series["mean"][-1]),
+            "start_ts": float(series["ts"][0]),
+            "samples": int(np.sum(weights)),
+            "resolution": series["resolution"],
+        }
+
+    def largest_increase(self, metric, seconds, end=None):
+        """
+        Finds the bucket where the metric rose the most compared to the
+        previous bucket. Returns (bucket start, increase) or None.
+        """
+        series = self.query(metric, seconds, end=end)
+        if len(series["ts"]) < 2:
+            return None
+        deltas = np.diff(series["mean"])
+        index = int(np.argmax(deltas))
+        if deltas[index] <= 0:
+            return None
+        return float(series["ts"][index + 1]), float(deltas[index])
+
+    def first_crossing(self, metric, threshold, seconds, end=None):
+        """Start of the first bucket in range whose max reached threshold, or None."""
+        series = self.query(metric, seconds, end=end)
+        hits = np.nonzero(series["max"] >= threshold)[0]
+        if not len(hits):
+            return None
+        return float(series["ts"][hits[0]])
+
+    def footprint_bytes(self):
+        return sum(tier.data.nbytes for tier in self.tiers)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Returns the process-wide writable store (engine side)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MetricStore()
+        return _store
@@ -0,0 +1,331 @@
+"""
+Cortex Network Monitor
+
+In-process replacement for iftop / nload / ss / netstat. Samples psutil
+network counters and sockets once a second, with no sudo, no terminal and
+no package installs.
+
+- Per-interface upload/download rates come from net_io_counters(pernic=True)
+  deltas between ticks.
+- Listening ports are tracked as a set of (proto, ip, port) keys. On Linux
+  the set is read straight from /proc/net/{tcp,udp}[6], which is cheap
+  enough for every tick. The expensive socket -> process attribution
+  (psutil.net_connections) only runs when that set changes or every
+  `connection_interval` seconds. Opened/closed ports are kept as events.
+- Established connections are counted per process on the same slower
+  cadence.
+- Sockets of other users' processes show up without a pid unless Cortex runs
+  elevated; they are counted as "other users" instead of asking for sudo.
+- The shared monitor behind get_monitor() stops itself once nobody has
+  asked for a snapshot for IDLE_TIMEOUT seconds; the next query starts a
+  new one. stop_monitor() stops it at shutdown.
+
+Usage:
+    from core.network_monitor import get_monitor
+    monitor = get_monitor()             # starts the thread on first use
+    snap = monitor.latest()             # also keeps it from idling out
+    snap.interfaces, snap.listening, snap.connections
+    monitor.port_events()               # [(ts, "opened"/"closed", ListenSocket)]
+    stop_monitor()                      # engine shutdown
+"""
+
+import collections
+import platform
+import socket
+import threading
+import time
+
+import psutil
+
+DEFAULT_INTERVAL = 1.0              # seconds between ticks
+DEFAULT_CONNECTION_INTERVAL = 5.0   # seconds between full socket -> process scans
+PORT_EVENTS = 50                    # opened/closed port events kept
+IDLE_TIMEOUT = 120.0                # seconds without queries before the shared monitor stops
+
+InterfaceRate = collections.namedtuple("InterfaceRate", ["name", "sent_rate", "recv_rate", "is_up"])
+ListenSocket = collections.namedtuple("ListenSocket", ["proto", "ip", "port", "pid", "process"])
+NetSnapshot = collections.namedtuple("NetSnapshot", [
+    "ts", "interfaces", "sent_rate", "recv_rate", "listening", "connections", "established",
+])
+
+OTHER_USERS = "other users"
+
+_PROC_NET = (("tcp", "/proc/net/tcp"), ("tcp", "/proc/net/tcp6"), ("udp", "/proc/net/udp"), ("udp", "/proc/net/udp6"))
+_TCP_LISTEN = "0A"
+_UDP_UNCONNECTED = "07"
+
+
+def _proc_addr(text):
+    """'0100007F:0035' (as printed in /proc/net) -> ('127.0.0.1', 53)."""
+    host, port = text.split(":")
+    raw = bytes.fromhex(host)
+    if len(raw) == 4:
+        ip = socket.inet_ntop(socket.AF_INET, raw[::-1])
+    else:
+        ip = socket.inet_ntop(socket.AF_INET6, b"".join(raw[i:i + 4][::-1] for i in range(0, 16, 4)))
+    return ip, int(port, 16)
+
+
+def _listening_keys_proc():
+    """Listening (proto, ip, port) keys from /proc/net, or None if unavailable."""
+    keys = set()
+    try:
+        for proto, path in _PROC_NET:
+            try:
+                with open(path, "r") as f:
+                    next(f, None)
+                    for line in f:
+                        fields = line.split()
+                        if len(fields) < 4:
+                            continue
+                        state = fields[3]
+                        if (proto == "tcp" and state == _TCP_LISTEN) or (proto == "udp" and state == _UDP_UNCONNECTED):
+                            ip, port = _proc_addr(fields[1])
+                            keys.add((proto, ip, port))
+            except FileNotFoundError:
+                continue    # no IPv6
+    except (OSError, ValueError):
+        return None
+    return keys
+
+
+def _socket_proto(conn):
+    return "udp" if conn.type == socket.SOCK_DGRAM else "tcp"
+
+
+def _inet_connections():
+    """
+    All inet sockets as (pid, conn). Falls back to a per-process scan where the
+    system-wide call needs root (macOS); that only sees our own processes.
+    """
+    try:
+        return [(c.pid, c) for c in psutil.net_connections(kind="inet")]
+    except psutil.AccessDenied:
+        pass
+    result = []
+    for proc in psutil.process_iter():
+        try:
+            getter = getattr(proc, "net_connections", None) or proc.connections
+            result.extend((proc.pid, c) for c in getter(kind="inet"))
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    return result
+
+
+class NetworkMonitor(threading.Thread):
+    def __init__(self, interval=DEFAULT_INTERVAL, connection_interval=DEFAULT_CONNECTION_INTERVAL, idle_timeout=None):
+        super().__init__(name="NetworkMonitor", daemon=True)
+        self.interval = max(0.25, float(interval))
+        self.connection_interval = max(self.interval, float(connection_interval))
+        self.idle_timeout = idle_timeout    # None: run until stop()
+        self._last_query = time.time()
+        self.running = True
+        self.listeners = []     # callables(NetSnapshot), called from the monitor thread
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._wake = threading.Event()
+        self._latest = None
+        self._events = collections.deque(maxlen=PORT_EVENTS)
+        self._last_nic = None
+        self._nic_up = {}
+        self._listening = {}            # (proto, ip, port) -> ListenSocket
+        self._listening_keys = None
+        self._failed_keys = None        # fast-path keys that triggered the last failed scan
+        self._connections = ()
+        self._established = 0
+        self._last_full = 0.0
+        self._names = {}                # pid -> process name, from the last full scan
+        self._fast_keys = _listening_keys_proc if platform.system() == "Linux" else None
+
+    # ── Sampling ──
+
+    def _process_name(self, pid, names):
+        """Process name for a pid, reusing names from the previous scan."""
+        if pid is None:
+            return OTHER_USERS
+        name = names.get(pid) or self._names.get(pid)
+        if name is None:
+            try:
+                name = psutil.Process(pid).name()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                name = f"pid {pid}"
+        names[pid] = name
+        return name
+
+    def _sample_interfaces(self, now):
+        counters = psutil.net_io_counters(pernic=True)
+        rates = []
+        if self._last_nic is not None:
+            last_ts, last = self._last_nic
+            elapsed = max(1e-6, now - last_ts)
+            for name, c in counters.items():
+                prev = last.get(name)
+                if prev is None:
+                    continue
+                sent = max(0, c.bytes_sent - prev.bytes_sent) / elapsed
+                recv = max(0, c.bytes_recv - prev.bytes_recv) / elapsed
+                rates.append(InterfaceRate(name, sent, recv, self._nic_up.get(name, True)))
+        self._last_nic = (now, counters)
+        rates.sort(key=lambda r: r.sent_rate + r.recv_rate, reverse=True)
+        return rates
+
+    def _scan_connections(self, now):
+        """Full socket scan: listening sockets with owners, established counts per process."""
+        listening = {}
+        per_process = collections.Counter()
+        established = 0
+        names = {}
+        for pid, conn in _inet_connections():
+            proto = _socket_proto(conn)
+            if conn.status == psutil.CONN_LISTEN or (proto == "udp" and not conn.raddr):
+                key = (proto, conn.laddr.ip, conn.laddr.port)
+                if key not in listening or listening[key].pid is None:
+                    listening[key] = ListenSocket(proto, conn.laddr.ip, conn.laddr.port, pid, self._process_name(pid, names))
+            elif conn.status == psutil.CONN_ESTABLISHED:
+                established += 1
+                per_process[self._process_name(pid, names)] += 1
+
+        try:
+            self._nic_up = {name: stats.isup for name, stats in psutil.net_if_stats().items()}
+        except Exception:
+            pass
+        # Only pids still holding sockets keep their cached name
+        self._names = names
+
+        self._apply_listening(listening, now)
+        self._connections = tuple(per_process.most_common())
+        self._established = established
+        self._last_full = now
+
+    def _apply_listening(self, listening, now):
+        previous = self._listening
+        if self._listening_keys is not None:
+            for key in listening.keys() - previous.keys():
+                self._port_event(now, "opened", listening[key])
+            for key in previous.keys() - listening.keys():
+                self._port_event(now, "closed", previous[key])
+        self._listening = listening
+        self._listening_keys = set(listening)
+
+    def _port_event(self, now, kind, sock):
+        with self._lock:
+            self._events.append((now, kind, sock))
+        print(f"[Network] Port {sock.port}/{sock.proto} {kind} ({sock.process}, {sock.ip})")
+
+    def sample_now(self):
+        """Runs one tick synchronously and returns the new NetSnapshot."""
+        now = time.time()
+        interfaces = self._sample_interfaces(now)
+
+        keys = self._fast_keys() if self._fast_keys is not None else None
+        full_due = now - self._last_full >= self.connection_interval
+        if not full_due and keys is not None:
+            # After a failed scan, the same port set waits for the next interval instead of rescanning every tick
+            full_due = keys != self._listening_keys and keys != self._failed_keys
+        if full_due:
+            try:
+                self._scan_connections(now)
+                self._failed_keys = None
+            except Exception as e:
+                print(f"[Network] Connection scan error: {e}")
+                self._last_full = now
+                self._failed_keys = keys
+
+        listening = tuple(sorted(self._listening.values(), key=lambda s: (s.port, s.proto, s.ip)))
+        snapshot = NetSnapshot(
+            now, tuple(interfaces),
+            sum(r.sent_rate for r in interfaces), sum(r.recv_rate for r in interfaces),
+            listening, self._connections, self._established,
+        )
+        with self._lock:
+            self._latest = snapshot
+        for listener in list(self.listeners):
+            try:
+                listener(snapshot)
+            except Exception as e:
+                print(f"[Network] Listener error: {e}")
+        return snapshot
+
+    def run(self):
+        # First tick only primes the counters; rates need two samples
+        try:
+            self.sample_now()
+        except Exception as e:
+            print(f"[Network] Sampling error: {e}")
+        while self.running:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if not self.running:
+                break
+            if self.idle_timeout is not None and time.time() - self._last_query > self.idle_timeout:
+                print(f"[Network] No queries for {self.idle_timeout:g}s; monitor stopped")
+                self.running = False
+                break
+            try:
+                self.sample_now()
+                self._ready.set()
+            except Exception as e:
+                print(f"[Network] Sampling error: {e}")
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+
+    # ── Queries ──
+
+    def wait_ready(self, timeout=3.0):
+        return self._ready.wait(timeout)
+
+    def latest(self, wait=True):
+        """Most recent NetSnapshot (waits for the first rates right after start, unless wait=False)."""
+        self._last_query = time.time()
+        if wait and not self._ready.is_set():
+            self.wait_ready()
+        with self._lock:
+            return self._latest
+
+    def port_events(self, since=None):
+        """Opened/closed listening ports as (ts, kind, ListenSocket), oldest first."""
+        self._last_query = time.time()
+        with self._lock:
+            events = list(self._events)
+        if since is None:
+            return events
+        return [e for e in events if e[0] >= since]
+
+
+def is_local_only(sock):
+    """True for sockets bound to loopback, which other machines can't reach."""
+    return sock.ip.startswith("127.") or sock.ip == "::1"
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def start_monitor(interval=DEFAULT_INTERVAL, connection_interval=DEFAULT_CONNECTION_INTERVAL,
+                  idle_timeout=IDLE_TIMEOUT):
+    """Starts the process-wide monitor (no-op if it is already running; restarts one that idled out)."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None or not _monitor.running:
+            _monitor = NetworkMonitor(interval, connection_interval, idle_timeout)
+            _monitor.start()
+        return _monitor
+
+
+def get_monitor():
+    """Returns the process-wide monitor, starting it with defaults if needed."""
+    monitor = _monitor
+    if monitor is not None and monitor.running:
+        return monitor
+    return start_monitor()
+
+
+def stop_monitor():
+    """Stops the process-wide monitor, if one was started."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is not None:
+            _monitor.stop()
+            _monitor = None
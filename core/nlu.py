@@ -1,11 +1,11 @@
-import json
 import os
 import pickle
-import glob
 import numpy as np
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.linear_model import LogisticRegression
 from difflib import SequenceMatcher
+from core.tracing import get_tracer
+from core.knowledge_index import load_intent_files
 
 class NeuralIntentModel:
     def __init__(self, data_dir="data/intents", model_file="data/model.pkl"):
@@ -43,20 +43,14 @@ class NeuralIntentModel:
             print(f"Error: {self.data_dir} directory not found.")
             return
 
-        # Iterate over all .json files in data/intents/
-        json_files = glob.glob(os.path.join(self.data_dir, "*.json"))
+        # All .json files in data/intents/ (same loader as the Knowledge Hub's index)
+        intent_data = load_intent_files(self.data_dir)
         
-        if not json_files:
+        if not intent_data:
              print(f"Warning: No JSON files found in {self.data_dir}")
 
-        for file_path in json_files:
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    if 'intents' in data:
-                        self.training_data['intents'].extend(data['intents'])
-            except Exception as e:
-                print(f"Error loading {file_path}: {e}")
+        for intents in intent_data.values():
+            self.training_data['intents'].extend(intents)
 
         # Process loaded intents
         for intent in self.training_data['intents']:
@@ -105,7 +99,7 @@ class NeuralIntentModel:
                     suffix = match.group(2)
                     self.template_patterns.append((self.tags[i], prefix, suffix))
                 
-        print(f"NLU: Loaded {len(self.intents)} intents from {len(json_files)} files.")
+        print(f"NLU: Loaded {len(self.intents)} intents from {len(intent_data)} files.")
 
     def train(self):
         print("Training NLU Model...")
@@ -125,10 +119,59 @@ class NeuralIntentModel:
         """
         Returns (Intent, Probability)
         """
+        tracer = get_tracer()
+        with tracer.span("nlu.predict") as span_args:
+            tag, confidence = self._predict(text, tracer.stages("nlu"))
+            span_args["tag"] = tag
+            return tag, confidence
+
+    def predict_batch(self, texts):
+        """
+        [(Intent, Probability)] for several utterances (e.g. the parts of a
+        compound command). Rule stages run per text; whatever falls through
+        to the classifier is vectorized and scored in a single call.
+        """
+        tracer = get_tracer()
+        with tracer.span("nlu.predict_batch", count=len(texts)):
+            stages = tracer.stages("nlu")
+            results = [None] * len(texts)
+            pending = []        # (index, lowercased text, valid intents)
+            for i, text in enumerate(texts):
+                if not text:
+                    results[i] = (None, 0.0)
+                    continue
+                tag, confidence, valid_intents = self._match_rules(text.lower(), stages)
+                if tag is not None:
+                    results[i] = (tag, confidence)
+                else:
+                    pending.append((i, text.lower(), valid_intents))
+            if pending:
+                scored = self._classify([t for _, t, _ in pending], [v for _, _, v in pending])
+                for (i, _, _), result in zip(pending, scored):
+                    results[i] = result
+                stages.mark("classifier")
+            return results
+
+    def _predict(self, text, stages):
         if not text:
             return None, 0.0
         
         text = text.lower()
+        tag, confidence, valid_intents = self._match_rules(text, stages)
+        if tag is not None:
+            return tag, confidence
+
+        # --- 3. ML Classifier Fallback ---
+        result = self._classify([text], [valid_intents])[0]
+        stages.mark("classifier")
+        return result
+
+    def _match_rules(self, text, stages):
+        """
+        Rule stages (carrier phrases, anchors, keywords, templates, fuzzy).
+        Returns (tag, confidence, valid_intents); tag is None when the
+        classifier has to decide among valid_intents.
+        """
         
         # --- -1. Strict Carrier Phrase Matching (Highest Priority) ---
         # If the input strictly starts with a defined carrier phrase for an intent,
@@ -151,9 +194,10 @@ class NeuralIntentModel:
                         max_carrier_len = len(phrase)
                         best_carrier_tag = tag
                         
+        stages.mark("carrier_phrase")
         if best_carrier_tag:
              print(f"NLU: Carrier Phrase Match '{best_carrier_tag}' (Length: {max_carrier_len})")
-             return best_carrier_tag, 1.0
+             return best_carrier_tag, 1.0, None
 
         # --- 0. Anchor Filtering (Domain Guard) ---
         # Checks if ALL keywords for a specific intent are present in the text.
@@ -180,6 +224,8 @@ class NeuralIntentModel:
                     if not has_anchor:
                         valid_intents.discard(tag)
         
+        stages.mark("anchors")
+
         # --- 0.5. Automation Domain Guard (Highest Priority for Automation Commands) ---
         # If the text contains "automation" or "workflow" AND an action verb, it ALWAYS routes
         # to run_workflow — no exceptions. The engine then decides if it's named or generic.
@@ -188,7 +234,7 @@ class NeuralIntentModel:
         text_words = set(text.split())
         if text_words & _auto_words and text_words & _action_words:
             print("NLU: Automation Domain Guard → 'run_workflow'")
-            return "run_workflow", 1.0
+            return "run_workflow", 1.0, None
         
         
         # --- 1. Keyword Boosting (Dynamic Logic) ---
@@ -215,9 +261,10 @@ class NeuralIntentModel:
                          max_keyword_len = k_len
                          best_keyword_match_tag = tag
         
+        stages.mark("keywords")
         if best_keyword_match_tag:
              print(f"NLU: Keyword Boost '{best_keyword_match_tag}' (Length: {max_keyword_len})")
-             return best_keyword_match_tag, 1.0
+             return best_keyword_match_tag, 1.0, None
 
         # --- 1.5. Template Pattern Matching ---
         # Patterns like "open {app_name}" are matched structurally:
@@ -245,9 +292,10 @@ class NeuralIntentModel:
                         max_template_len = match_len
                         best_template_tag = tag
         
+        stages.mark("templates")
         if best_template_tag:
             print(f"NLU: Template Match '{best_template_tag}' (Prefix Length: {max_template_len})")
-            return best_template_tag, 1.0
+            return best_template_tag, 1.0, None
         
         # --- 2. Fuzzy Matching (Closest Match) ---
         best_match_tag = None
@@ -269,13 +317,22 @@ class NeuralIntentModel:
                 # Check validity
                 if best_match_tag in valid_intents:
                     print(f"NLU: Fuzzy Match '{text}' -> '{best_match_pattern}' ({best_match_tag}) Score: {best_match_score:.2f}")
-                    return best_match_tag, 1.0
+                    return best_match_tag, 1.0, None
 
-        # --- 3. ML Classifier Fallback ---
+        stages.mark("fuzzy")
+        return None, 0.0, valid_intents
+
+
+    def _classify(self, texts, valid_sets):
+        """Classifier fallback for several texts at once, honouring each text's anchor guard."""
         try:
-            X_input = self.vectorizer.transform([text])
-            probs = self.classifier.predict_proba(X_input)[0]
-            
+            X_input = self.vectorizer.transform(texts)
+            all_probs = self.classifier.predict_proba(X_input)
+        except:
+            return [(None, 0.0)] * len(texts)
+
+        results = []
+        for probs, valid_intents in zip(all_probs, valid_sets):
             # Enforce Semantic Guard (Anchors) on ML results
             # Set probability of invalid intents to 0
             for i, tag in enumerate(self.classifier.classes_):
@@ -284,14 +341,12 @@ class NeuralIntentModel:
             
             # Re-normalize or just take max? Just max is fine.
             if np.sum(probs) == 0:
-                return None, 0.0
+                results.append((None, 0.0))
+                continue
                 
             max_index = np.argmax(probs)
-            confidence = probs[max_index]
-            predicted_tag = self.classifier.classes_[max_index]
-            return predicted_tag, confidence
-        except:
-            return None, 0.0
+            results.append((self.classifier.classes_[max_index], probs[max_index]))
+        return results
 
     def get_vocabulary_phrase(self):
         """
@@ -0,0 +1,349 @@
+"""
+Cortex Process Ranker
+
+In-process replacement for htop / tasklist / pkill / taskkill. Ranks running
+processes and whole applications by CPU, memory (RSS) and disk IO, and
+closes them through psutil.
+
+- psutil.Process objects are cached by pid, so CPU% and IO rates are cheap
+  deltas since the previous sample instead of a fresh 0.1 s measurement.
+- Processes are grouped into applications by walking the parent tree:
+  a child that shares its parent's install directory (or macOS .app bundle)
+  belongs to the parent's app, so Chrome's 40 renderer/GPU/utility
+  processes are ranked as one "Chrome".
+- A sample is an immutable RankSnapshot; top-N lists are computed once per
+  snapshot and then served from memory.
+
+CPU% is normalised to the whole machine (0-100), like the system load.
+
+Usage:
+    ranker = ProcessRanker()
+    snapshot = ranker.sample()           # call periodically (telemetry does)
+    snapshot.top_apps("rss", 3)          # [AppStat(name, cpu_percent, rss, io_rate, pids), ...]
+    closed, alive = terminate(find_processes("chrome"))
+"""
+
+import collections
+import os
+import time
+
+import psutil
+
+ProcessStat = collections.namedtuple("ProcessStat", [
+    "pid", "ppid", "name", "app", "cpu_percent", "rss", "io_rate",
+])
+
+AppStat = collections.namedtuple("AppStat", ["name", "cpu_percent", "rss", "io_rate", "pids"])
+
+RANK_KEYS = ("cpu", "rss", "io")
+
+_HAS_IO = hasattr(psutil.Process, "io_counters")
+_ATTRS = ["name", "ppid", "exe", "memory_info"] + (["io_counters"] if _HAS_IO else [])
+
+# Executables living here are generic tools; sharing a directory says nothing about the app
+_SYSTEM_DIRS = {
+    "/bin", "/sbin", "/usr/bin", "/usr/sbin", "/usr/local/bin", "/usr/libexec", "/usr/lib/systemd",
+    "c:\\windows", "c:\\windows\\system32", "c:\\windows\\syswow64",
+}
+
+# Never offered as a "hog" and never closed by name: killing these takes the session down
+PROTECTED_NAMES = {
+    "system", "system idle process", "registry", "smss.exe", "csrss.exe", "wininit.exe", "winlogon.exe",
+    "services.exe", "lsass.exe", "svchost.exe", "dwm.exe", "explorer.exe", "fontdrvhost.exe", "memory compression",
+    "systemd", "init", "kthreadd", "xorg", "xwayland", "gnome-shell", "plasmashell", "kwin_x11", "kwin_wayland",
+    "gdm", "sddm", "lightdm", "pulseaudio", "pipewire", "dbus-daemon", "sshd",
+    "kernel_task", "launchd", "windowserver", "loginwindow", "dock", "finder",
+}
+
+_HELPER_SUFFIXES = (" helper", "-helper", "_helper", " renderer", " gpu process")
+
+
+def app_name(process_name):
+    """Friendly application name for a process name ('chrome.exe' -> 'Chrome')."""
+    name = process_name or "unknown"
+    if name.lower().endswith(".exe"):
+        name = name[:-4]
+    lowered = name.lower()
+    for suffix in _HELPER_SUFFIXES:
+        index = lowered.find(suffix)
+        if index > 0:
+            name = name[:index]
+            break
+    return name[:1].upper() + name[1:]
+
+
+def _bundle(exe):
+    """Install location shared by an app's processes, or None for system tools."""
+    if not exe:
+        return None
+    marker = exe.find(".app/")
+    if marker != -1:
+        return exe[:marker + 4]
+    directory = os.path.dirname(exe)
+    if directory.lower().rstrip("\\/") in _SYSTEM_DIRS:
+        return None
+    return directory
+
+
+def _bundle_name(bundle):
+    if bundle and bundle.endswith(".app"):
+        return os.path.basename(bundle)[:-4]
+    return None
+
+
+class _Tracked:
+    """Per-pid state kept between samples."""
+    __slots__ = ("proc", "name", "ppid", "bundle", "app", "io_total", "io_ts")
+
+    def __init__(self, proc, name, ppid, exe):
+        self.proc = proc
+        self.name = name
+        self.ppid = ppid
+        self.bundle = _bundle(exe)
+        self.app = None
+        self.io_total = None
+        self.io_ts = 0.0
+
+
+class RankSnapshot:
+    def __init__(self, ts, processes, apps, procs=None):
+        self.ts = ts
+        self.processes = processes      # [ProcessStat]
+        self.apps = apps                # {app name: AppStat}
+        self.procs = procs or {}        # pid -> the psutil.Process sampled (knows its create time)
+        self._top = {}
+
+    @property
+    def count(self):
+        return len(self.processes)
+
+    def _ranked(self, items, by, kind):
+        if by not in RANK_KEYS:
+            raise ValueError(f"Unknown rank key '{by}'")
+        key = (kind, by)
+        ranked = self._top.get(key)
+        if ranked is None:
+            field = {"cpu": "cpu_percent", "rss": "rss", "io": "io_rate"}[by]
+            ranked = sorted(items, key=lambda item: getattr(item, field), reverse=True)
+            self._top[key] = ranked
+        return ranked
+
+    def top_processes(self, by="rss", n=5):
+        """Top n ProcessStat by 'cpu', 'rss' or 'io'."""
+        return self._ranked(self.processes, by, "process")[:n]
+
+    def top_apps(self, by="rss", n=5, exclude_protected=False):
+        """Top n AppStat (processes grouped per application) by 'cpu', 'rss' or 'io'."""
+        ranked = self._ranked(self.apps.values(), by, "app")
+        if exclude_protected:
+            ranked = [app for app in ranked if not is_protected(app)]
+        return ranked[:n]
+
+
+def is_protected(app):
+    """True for session-critical apps and for Cortex itself."""
+    if app.name.lower() in PROTECTED_NAMES or f"{app.name.lower()}.exe" in PROTECTED_NAMES:
+        return True
+    own = os.getpid()
+    return own in app.pids or os.getppid() in app.pids
+
+
+class ProcessRanker:
+    def __init__(self):
+        self._tracked = {}      # pid -> _Tracked
+        self._cpu_count = psutil.cpu_count() or 1
+
+    @staticmethod
+    def _same_app(child, parent):
+        if child.bundle is not None and child.bundle == parent.bundle:
+            return True
+        return app_name(child.name) == app_name(parent.name)
+
+    def _resolve_app(self, entry):
+        """App name for a process: inherit the parent's app while it is the same program."""
+        chain = []
+        node = entry
+        while node.app is None:
+            chain.append(node)
+            parent = self._tracked.get(node.ppid)
+            if parent is None or parent in chain or not self._same_app(node, parent):
+                break
+            node = parent
+        app = node.app or _bundle_name(node.bundle) or app_name(node.name)
+        for item in chain:
+            item.app = app
+        return app
+
+    def sample(self):
+        """Takes one pass over all processes and returns a RankSnapshot."""
+        now = time.time()
+        seen = set()
+        fresh = []
+        for proc in psutil.process_iter(_ATTRS):
+            pid = proc.pid
+            seen.add(pid)
+            info = proc.info
+            entry = self._tracked.get(pid)
+            if entry is None:
+                entry = _Tracked(proc, info.get("name") or "", info.get("ppid") or 0, info.get("exe"))
+                self._tracked[pid] = entry
+                # First sight: prime cpu_percent, which reports 0.0 until the next call
+                try:
+                    proc.cpu_percent(None)
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    pass
+                cpu = 0.0
+            else:
+                try:
+                    cpu = entry.proc.cpu_percent(None) / self._cpu_count
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    cpu = 0.0
+
+            io_rate = 0.0
+            counters = info.get("io_counters")
+            if counters is not None:
+                total = counters.read_bytes + counters.write_bytes
+                if entry.io_total is not None:
+                    io_rate = max(0, total - entry.io_total) / max(1e-6, now - entry.io_ts)
+                entry.io_total, entry.io_ts = total, now
+
+            mem_info = info.get("memory_info")
+            fresh.append((entry, pid, cpu, mem_info.rss if mem_info else 0, io_rate))
+
+        # Forget processes that exited (their pids may be reused)
+        for pid in list(self._tracked):
+            if pid not in seen:
+                del self._tracked[pid]
+
+        processes = []
+        totals = {}
+        procs = {}
+        for entry, pid, cpu, rss, io_rate in fresh:
+            procs[pid] = entry.proc
+            app = self._resolve_app(entry)
+            processes.append(ProcessStat(pid, entry.ppid, entry.name, app, cpu, rss, io_rate))
+            app_cpu, app_rss, app_io, pids = totals.get(app, (0.0, 0, 0.0, ()))
+            totals[app] = (app_cpu + cpu, app_rss + rss, app_io + io_rate, pids + (pid,))
+        apps = {name: AppStat(name, *values) for name, values in totals.items()}
+        return RankSnapshot(now, processes, apps, procs)
+
+
+# ── Closing ──
+
+def _matches(target, name, exe):
+    name = (name or "").lower()
+    stem = name[:-4] if name.endswith(".exe") else name
+    if target in (name, stem):
+        return True
+    return bool(exe) and os.path.splitext(os.path.basename(exe))[0].lower() == target
+
+
+def _cortex_tree():
+    """
+    Pids of Cortex itself: its root process, every process under it (UI,
+    TTS, workers) and the processes above it (the shell or terminal that
+    started it). None of them is ever closed by name.
+    """
+    me = psutil.Process()
+    pids = {me.pid}
+    root = me
+    try:
+        exe = me.exe()
+        parents = me.parents()
+        pids.update(p.pid for p in parents)
+        # Spawned workers run the same executable; the topmost one is the Cortex root
+        for parent in parents:
+            try:
+                if parent.exe() != exe:
+                    break
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                break
+            root = parent
+        pids.update(p.pid for p in root.children(recursive=True))
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        pass
+    return pids
+
+
+def find_processes(target, include_cmdline=True):
+    """
+    psutil.Process list for an app name ('chrome', 'notepad.exe'), plus all of
+    their child processes. Falls back to a command-line substring match (what
+    `pkill -f` did) only when no process name matches. Cortex's own process
+    tree is never included.
+    """
+    target = (target or "").strip().lower()
+    if not target:
+        return []
+    own = _cortex_tree()
+    by_name, by_cmdline = [], []
+    for proc in psutil.process_iter(["name", "exe", "cmdline"]):
+        info = proc.info
+        if (info.get("name") or "").lower() in PROTECTED_NAMES or proc.pid in own:
+            continue
+        if _matches(target, info.get("name"), info.get("exe")):
+            by_name.append(proc)
+        elif include_cmdline and len(target) >= 4:
+            cmdline = " ".join(info.get("cmdline") or []).lower()
+            if target in cmdline:
+                by_cmdline.append(proc)
+    # Decided after the full scan, so the result doesn't depend on process order
+    found = by_name or by_cmdline
+    pids = {p.pid for p in found}
+    for proc in list(found):
+        try:
+            for child in proc.children(recursive=True):
+                if child.pid not in pids and child.pid not in own:
+                    pids.add(child.pid)
+                    found.append(child)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return found
+
+
+def processes_for_app(app, snapshot):
+    """
+    psutil.Process objects for an AppStat of `snapshot`, skipping ones that
+    exited. The snapshot's own Process objects are used, and a pid now
+    held by another process (different create time or name) is left out,
+    so a reused pid is never closed.
+    """
+    names = {stat.pid: stat.name for stat in snapshot.processes}
+    procs = []
+    for pid in app.pids:
+        proc = snapshot.procs.get(pid)
+        if proc is None:
+            continue
+        try:
+            # is_running() compares the create time recorded when the pid was sampled
+            if proc.is_running() and proc.name() == names.get(pid, proc.name()):
+                procs.append(proc)
+            else:
+                print(f"[Kill] Skipping pid {pid}: it now belongs to another process")
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            pass
+    return procs
+
+
+def terminate(procs, timeout=3.0):
+    """
+    Asks processes to exit (SIGTERM / TerminateProcess), then kills whatever
+    is still running after `timeout` seconds. Returns (gone, alive) lists.
+    """
+    if not procs:
+        return [], []
+    for proc in procs:
+        try:
+            proc.terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    gone, alive = psutil.wait_procs(procs, timeout=timeout)
+    if alive:
+        for proc in alive:
+            try:
+                proc.kill()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        more_gone, alive = psutil.wait_procs(alive, timeout=1.0)
+        gone += more_gone
+    return gone, alive
@@ -0,0 +1,281 @@
+"""
+Cortex Automation Run Journal
+
+Records every automation run: when each node started and ended, whether
+it worked, and what went wrong. The Automation Manager reads it back to
+show a timeline per run, so slow steps (an Open Target that takes 4 s to
+launch) and failing runs can be found after the fact.
+
+- Append-only JSON lines in data/automation_runs/runs.jsonl, with short
+  keys to keep lines small. A run is written as it happens: one "run"
+  line, one "node" line per finished node, one "end" line. A run whose
+  process died has no "end" line and reads back as "interrupted".
+- When the file passes MAX_BYTES it is rotated (runs.jsonl ->
+  runs.1.jsonl -> ...). Only KEEP_FILES files are kept, so the journal
+  never grows past about MAX_BYTES * KEEP_FILES.
+- Lines are appended with one write each. The engine and the UI process
+  (the Manager's Run button) can both record runs into the same file, so
+  appending, rotating and reading hold an OS file lock on runs.lock; a
+  rotation in one process can't drop or split the other's lines.
+- Sub-automations are part of their caller's run. Their nodes are recorded
+  one level deeper (depth), inside the span of the Open Target node that
+  started them, which is what the timeline draws as a flame graph.
+
+Usage:
+    run = get_journal().start_run("Morning Routine")
+    span = run.node("n3", "Open Target", depth=0, label="firefox")
+    ...
+    span.fail("Could not open the target")    # optional
+    span.end()
+    run.finish()                                # status from set_status(), "ok" otherwise
+
+    for r in load_runs(workflow="Morning Routine", limit=20):
+        print(r.id, r.status, duration(r), slowest(r))
+"""
+
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+import uuid
+
+from core.runtime_path import get_app_root
+
+MAX_BYTES = 512 * 1024
+KEEP_FILES = 4                  # runs.jsonl plus three rotated files
+MAX_LABEL = 80                  # characters of a node's value kept as its label
+
+# status: "ok", "failed", "cancelled", "stopped" (step limit) or "interrupted" (no end line)
+Run = collections.namedtuple("Run", [
+    "id", "workflow", "started", "ended", "status", "error", "source", "nodes",
+])
+NodeSpan = collections.namedtuple("NodeSpan", [
+    "node", "type", "label", "depth", "workflow", "start", "end", "ok", "error",
+])
+
+
+def journal_dir():
+    return os.path.join(get_app_root(), "data", "automation_runs")
+
+
+@contextlib.contextmanager
+def _locked(path):
+    """Exclusive lock on `path` shared by every process that writes the journal."""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)   # retries for ~10 s, then raises
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def duration(run):
+    """Seconds from start to end (to the last node for interrupted runs)."""
+    end = run.ended or max((n.end for n in run.nodes), default=run.started)
+    return max(0.0, end - run.started)
+
+
+def slowest(run):
+    """The NodeSpan that took longest, or None."""
+    # Open Target nodes that ran a sub-automation contain its nodes; only count leaf work
+    leaves = [n for n in run.nodes if not any(
+        c.depth == n.depth + 1 and n.start <= c.start and c.end <= n.end for c in run.nodes)]
+    return max(leaves, key=lambda n: n.end - n.start, default=None)
+
+
+class _Span:
+    def __init__(self, run, node_id, node_type, depth, workflow, label):
+        self.run = run
+        self.node_id = node_id
+        self.node_type = node_type
+        self.depth = depth
+        self.workflow = workflow
+        self.label = (label or "")[:MAX_LABEL]
+        self.start = time.time()
+        self.error = None
+        self.ended = False
+
+    def fail(self, error):
+        """Marks the node as failed (the first error is kept)."""
+        if self.error is None:
+            self.error = str(error) or "error"
+
+    def end(self, error=None):
+        """Writes the node's line. Later calls do nothing."""
+        if error is not None:
+            self.fail(error)
+        if self.ended:
+            return
+        self.ended = True
+        record = {"ev": "node", "run": self.run.id, "node": self.node_id, "type": self.node_type,
+                  "d": self.depth, "t0": round(self.start, 3), "t1": round(time.time(), 3),
+                  "ok": self.error is None}
+        if self.label:
+            record["label"] = self.label
+        if self.workflow:
+            record["wf"] = self.workflow
+        if self.error is not None:
+            record["err"] = self.error
+            # The workflow goes on after a failed step, but the run counts as failed
+            self.run.set_status("failed", f"{self.node_type}: {self.error}")
+        self.run.journal.append(record)
+
+
+class RunRecorder:
+    """One run being recorded. Shared by the workflow and its sub-automations."""
+
+    def __init__(self, journal, workflow, source=None):
+        self.journal = journal
+        self.id = uuid.uuid4().hex[:12]
+        self.workflow = workflow
+        self.started = time.time()
+        self.status = "ok"
+        self.error = None
+        record = {"ev": "run", "run": self.id, "wf": workflow, "t": round(self.started, 3)}
+        if source:
+            record["src"] = source
+        journal.append(record)
+
+    def node(self, node_id, node_type, depth=0, workflow=None, label=None):
+        """Starts timing a node. Call end() on the result when it is done."""
+        return _Span(self, node_id, node_type, depth, workflow, label)
+
+    def set_status(self, status, error=None):
+        """Records how the run ended; the first non-"ok" status wins."""
+        if self.status == "ok" and status != "ok":
+            self.status = status
+            self.error = str(error) if error is not None else None
+
+    def finish(self):
+        elapsed = time.time() - self.started
+        record = {"ev": "end", "run": self.id, "t": round(time.time(), 3), "status": self.status}
+        if self.error:
+            record["err"] = self.error
+        self.journal.append(record)
+        print(f"[Automation] Run {self.id} ({self.workflow}) {self.status} in {elapsed:.2f}s")
+
+
+class RunJournal:
+    def __init__(self, directory=None):
+        self.directory = directory or journal_dir()
+        self.path = os.path.join(self.directory, "runs.jsonl")
+        self.lock_path = os.path.join(self.directory, "runs.lock")
+        self._lock = threading.Lock()
+
+    def start_run(self, workflow, source=None):
+        return RunRecorder(self, workflow, source)
+
+    def append(self, record):
+        line = json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with _locked(self.lock_path):
+                    self._rotate_if_full()
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(line)
+            except OSError as e:
+                print(f"[Automation] Could not write run journal: {e}")
+
+    def _rotate_if_full(self):
+        try:
+            if os.path.getsize(self.path) < MAX_BYTES:
+                return
+        except OSError:
+            return
+        for i in range(KEEP_FILES - 1, 0, -1):
+            older = self._file(i)
+            newer = self._file(i - 1)
+            if os.path.exists(newer):
+                os.replace(newer, older)
+
+    def _file(self, generation):
+        return self.path if generation == 0 else os.path.join(self.directory, f"runs.{generation}.jsonl")
+
+    def files(self):
+        """Journal files, oldest first."""
+        return [p for p in (self._file(i) for i in range(KEEP_FILES - 1, -1, -1)) if os.path.exists(p)]
+
+    def load_runs(self, workflow=None, limit=None):
+        """[Run] newest first, optionally only runs of one workflow (sub-automations included)."""
+        runs = collections.OrderedDict()    # run id -> dict, in start order
+        contents = []
+        try:
+            # Read every file under the lock, so a rotation can't move lines between two reads
+            with self._lock, _locked(self.lock_path):
+                for path in self.files():
+                    try:
+                        with open(path, "r", encoding="utf-8") as f:
+                            contents.append(f.readlines())
+                    except OSError:
+                        continue
+        except OSError:
+            return []       # no journal directory yet
+        for lines in contents:
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue        # a line cut short by a crash
+                run_id = record.get("run")
+                ev = record.get("ev")
+                if ev == "run":
+                    runs[run_id] = {"id": run_id, "workflow": record.get("wf"), "started": record.get("t", 0.0),
+                                    "ended": None, "status": "interrupted", "error": None,
+                                    "source": record.get("src"), "nodes": []}
+                    continue
+                run = runs.get(run_id)
+                if run is None:
+                    continue        # its "run" line was rotated away
+                if ev == "node":
+                    run["nodes"].append(NodeSpan(record.get("node"), record.get("type", "?"), record.get("label", ""),
+                                                 record.get("d", 0), record.get("wf"), record.get("t0", 0.0),
+                                                 record.get("t1", 0.0), record.get("ok", True), record.get("err")))
+                elif ev == "end":
+                    run["ended"] = record.get("t")
+                    run["status"] = record.get("status", "ok")
+                    run["error"] = record.get("err")
+
+        result = []
+        for run in reversed(runs.values()):
+            if workflow is not None and run["workflow"] != workflow:
+                continue
+            result.append(Run(**run))
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal():
+    """The process-wide journal."""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = RunJournal()
+        return _journal
+
+
+def load_runs(workflow=None, limit=None):
+    return get_journal().load_runs(workflow, limit)
@@ -0,0 +1,321 @@
+"""
+Cortex Incremental Security Scan
+
+Built-in file scan that needs no ClamAV, no sudo and no terminal. Files are
+identified by SHA-256 and checked against local hash signature databases.
+
+- A persistent (path, size, mtime) -> sha256 cache (SQLite, in
+  data/security/) means unchanged files are never read again. A repeat scan
+  of a home directory costs one directory walk plus hashing of whatever
+  changed since last time.
+- Changed files are hashed in parallel in a process pool (spawned, so the
+  engine's threads are never forked). Small batches are hashed in-thread,
+  where starting workers would cost more than the hashing itself.
+- Signatures: every *.txt file in data/security/signatures/ ("<sha256> name"
+  per line) plus ClamAV SHA-256 hash databases (*.hsb, "sha256:size:name")
+  dropped in the same folder. data/security/allowlist.txt silences false
+  positives. Cached hashes are re-checked on every scan, so a new signature
+  also applies to files that did not change.
+- Progress is reported through a callback as dicts, which the engine
+  forwards to the UI.
+
+Usage:
+    scanner = IncrementalScanner()
+    result = scanner.scan([os.path.expanduser("~")], progress=print)
+    result.threats      # [(path, signature name)]
+"""
+
+import collections
+import concurrent.futures
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+
+from core.runtime_path import get_app_root
+
+MAX_FILE_SIZE = 100 * 1024 * 1024      # larger files are skipped (clamscan's default limit)
+DEFAULT_EXCLUDES = {".git", "__pycache__"}
+HASH_BATCH = 64                         # files per worker task
+IN_THREAD_LIMIT = 200                   # fewer changed files than this: no process pool
+PROGRESS_INTERVAL = 0.2                 # seconds between progress callbacks
+_READ_SIZE = 1024 * 1024
+
+ScanResult = collections.namedtuple("ScanResult", [
+    "files", "hashed", "cached", "skipped", "errors", "threats", "elapsed", "cancelled",
+])
+
+
+def security_dir():
+    return os.path.join(get_app_root(), "data", "security")
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_READ_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_batch(paths):
+    """Worker: [(path, sha256 or None)] (None when the file could not be read)."""
+    results = []
+    for path in paths:
+        try:
+            results.append((path, sha256_file(path)))
+        except OSError:
+            results.append((path, None))
+    return results
+
+
+def load_signatures(directory=None):
+    """{sha256: name} from *.txt ('hash name') and ClamAV *.hsb ('hash:size:name') files."""
+    directory = directory or os.path.join(security_dir(), "signatures")
+    signatures = {}
+    if not os.path.isdir(directory):
+        return signatures
+    for entry in sorted(os.listdir(directory)):
+        path = os.path.join(directory, entry)
+        ext = os.path.splitext(entry)[1].lower()
+        if ext not in (".txt", ".hsb"):
+            continue
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    if ext == ".hsb":
+                        parts = line.split(":")
+                        digest, name = parts[0], parts[2] if len(parts) > 2 else entry
+                    else:
+                        digest, _, name = line.partition(" ")
+                    digest = digest.lower()
+                    if len(digest) == 64:
+                        signatures[digest] = name.strip() or entry
+        except OSError as e:
+            print(f"[Security] Could not read signatures from {path}: {e}")
+    return signatures
+
+
+def load_allowlist(path=None):
+    path = path or os.path.join(security_dir(), "allowlist.txt")
+    allowed = set()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                digest = line.split("#", 1)[0].strip().lower()
+                if len(digest) == 64:
+                    allowed.add(digest)
+    except FileNotFoundError:
+        pass
+    return allowed
+
+
+class HashCache:
+    """Persistent (path, size, mtime_ns) -> sha256 map."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(security_dir(), "hash_cache.db")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute("CREATE TABLE IF NOT EXISTS files ("
+                        "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT)")
+
+    def load(self, roots):
+        """{path: (size, mtime_ns, sha256)} for everything cached under the given roots."""
+        entries = {}
+        for root in roots:
+            prefix = os.path.join(root, "")
+            rows = self.db.execute(
+                "SELECT path, size, mtime_ns, sha256 FROM files WHERE path >= ? AND path < ?",
+                (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)))
+            for path, size, mtime_ns, digest in rows:
+                entries[path] = (size, mtime_ns, digest)
+        return entries
+
+    def update(self, changed, removed):
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", changed)
+            self.db.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in removed))
+
+    def close(self):
+        self.db.close()
+
+
+class IncrementalScanner:
+    def __init__(self, cache_path=None, signature_dir=None, workers=None,
+                 max_file_size=MAX_FILE_SIZE, excludes=DEFAULT_EXCLUDES):
+        self.cache_path = cache_path
+        self.signature_dir = signature_dir
+        self.workers = workers or max(1, min(8, (os.cpu_count() or 2) - 1))
+        self.max_file_size = max_file_size
+        self.excludes = set(excludes)
+
+    def _walk(self, roots, cancel):
+        """Yields (path, size, mtime_ns) for regular files, without following symlinks."""
+        stack = list(roots)
+        while stack:
+            if cancel is not None and cancel.is_set():
+                return
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in self.excludes:
+                                    stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                st = entry.stat(follow_symlinks=False)
+                                yield entry.path, st.st_size, st.st_mtime_ns
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+    def _hash_changed(self, paths, report, cancel):
+        """Yields (path, sha256 or None) for every changed file."""
+        if len(paths) < IN_THREAD_LIMIT or self.workers == 1:
+            for i in range(0, len(paths), HASH_BATCH):
+                if cancel is not None and cancel.is_set():
+                    return
+                yield from _hash_batch(paths[i:i + HASH_BATCH])
+                report()
+            return
+
+        context = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(self.workers, mp_context=context) as pool:
+            futures = [pool.submit(_hash_batch, paths[i:i + HASH_BATCH]) for i in range(0, len(paths), HASH_BATCH)]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    if cancel is not None and cancel.is_set():
+                        break
+                    yield from future.result()
+                    report()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def scan(self, roots, progress=None, cancel=None):
+        """
+        Scans the given directories. `progress(dict)` receives
+        {"phase", "files", "hashed", "to_hash", "threats"} at most every
+        PROGRESS_INTERVAL seconds, and once more when done.
+        """
+        started = time.time()
+        roots = [os.path.abspath(os.path.expanduser(r)) for r in roots]
+        signatures = load_signatures(self.signature_dir)
+        allowlist = load_allowlist()
+        cache = HashCache(self.cache_path)
+        state = {"phase": "walking", "files": 0, "hashed": 0, "to_hash": 0, "threats": 0}
+        last_report = [0.0]
+
+        def report(force=False):
+            now = time.time()
+            if progress and (force or now - last_report[0] >= PROGRESS_INTERVAL):
+                last_report[0] = now
+                progress(dict(state))
+
+        try:
+            cached = cache.load(roots)
+            digests = {}            # path -> sha256, for every file seen
+            stale = []              # (path, size, mtime_ns) to re-hash
+            skipped = 0
+            for path, size, mtime_ns in self._walk(roots, cancel):
+                state["files"] += 1
+                if size > self.max_file_size:
+                    skipped += 1
+                    continue
+                hit = cached.get(path)
+                if hit and hit[0] == size and hit[1] == mtime_ns:
+                    digests[path] = hit[2]
+                else:
+                    stale.append((path, size, mtime_ns))
+                report()
+
+            state["phase"] = "hashing"
+            state["to_hash"] = len(stale)
+            report(force=True)
+            meta = {path: (size, mtime_ns) for path, size, mtime_ns in stale}
+            changed, errors = [], 0
+
+            def on_batch():
+                state["hashed"] = len(changed) + errors
+                report()
+
+            for path, digest in self._hash_changed([p for p, _, _ in stale], on_batch, cancel):
+                if digest is None:
+                    errors += 1
+                    continue
+                digests[path] = digest
+                size, mtime_ns = meta[path]
+                changed.append((path, size, mtime_ns, digest))
+
+            threats = []
+            for path, digest in digests.items():
+                name = signatures.get(digest)
+                if name and digest not in allowlist:
+                    threats.append((path, name))
+                    print(f"[Security] Threat: {name} -> {path}")
+            state["threats"] = len(threats)
+
+            cancelled = cancel is not None and cancel.is_set()
+            # A cancelled walk did not see every file, so nothing may be pruned
+            removed = [] if cancelled else [p for p in cached if p not in digests]
+            cache.update(changed, removed)
+        finally:
+            cache.close()
+
+        state["phase"] = "cancelled" if cancelled else "done"
+        state["hashed"] = len(changed) + errors
+        report(force=True)
+        result = ScanResult(state["files"], len(changed), len(digests) - len(changed), skipped,
+                            errors, threats, time.time() - started, cancelled)
+        print(f"[Security] Scanned {result.files} files in {result.elapsed:.1f}s "
+              f"({result.hashed} hashed, {result.cached} from cache, {len(threats)} threats)")
+        return result
+
+
+_active_cancel = None
+_active_lock = threading.Lock()
+
+
+def start_background_scan(roots, progress=None, done=None):
+    """
+    Runs a scan on a daemon thread; `done(ScanResult or None)` is called at the
+    end. Returns the cancel Event, or None if a scan is already running.
+    """
+    global _active_cancel
+    with _active_lock:
+        if _active_cancel is not None:
+            return None
+        _active_cancel = cancel = threading.Event()
+
+    def run():
+        global _active_cancel
+        result = None
+        try:
+            result = IncrementalScanner().scan(roots, progress=progress, cancel=cancel)
+        except Exception as e:
+            print(f"[Security] Scan failed: {e}")
+        finally:
+            with _active_lock:
+                _active_cancel = None
+        if done:
+            done(result)
+
+    threading.Thread(target=run, name="SecurityScan", daemon=True).start()
+    return cancel
+
+
+def cancel_background_scan():
+    """Stops the running background scan. Returns False if none was running."""
+    with _active_lock:
+        if _active_cancel is None:
+            return False
+        _active_cancel.set()
+        return True
@@ -1,15 +1,18 @@
 import subprocess
 import os
 from core.runtime_path import get_app_root
+from core import tracing
 import platform
 import multiprocessing
 import time
 import queue
 
-def run_tts_loop(tts_queue, os_type, piper_path=None, model_path=None, is_speaking_flag=None, status_queue=None, stop_event=None):
+def run_tts_loop(tts_queue, os_type, piper_path=None, model_path=None, is_speaking_flag=None, status_queue=None, stop_event=None, reopen_event=None):
     """
     Persistent Worker function to run TTS in a separate process.
     Initializes the engine ONCE and then waits for messages.
+    reopen_event is set by the engine when audio devices change; the playback
+    backend is reopened before the next utterance.
     """
     import os
     import json
@@ -38,6 +41,9 @@ def run_tts_loop(tts_queue, os_type, piper_path=None, model_path=None, is_speaki
         return None
 
     print("[OK] TTS Worker Started Ready")
+    
+    # TTS spans are tagged with the command ID that travels with each utterance
+    tracer = tracing.configure("tts", sink=status_queue)
 
     config_path = os.path.join(get_app_root(), 'data', 'user_config.json')
     
@@ -45,6 +51,25 @@ def run_tts_loop(tts_queue, os_type, piper_path=None, model_path=None, is_speaki
     if not os.path.exists(piper_path):
         piper_path = None
 
+    # Playback backend is created once per worker (not per utterance)
+    from core.audio_io import get_backend
+    audio = get_backend()
+
+    def reopen_backend(reason):
+        print(f"[Audio] {reason}; reopening the playback backend")
+        try:
+            audio.reset()
+        except Exception as e:
+            print(f"[Audio] Could not reopen the playback backend: {e}")
+
+    def open_stream():
+        """22050 Hz mono playback stream; the backend is reopened and the open retried once on failure."""
+        try:
+            return audio.open_playback(rate=22050, channels=1)
+        except Exception as e:
+            reopen_backend(f"Could not open playback ({e})")
+            return audio.open_playback(rate=22050, channels=1)
+
     while True:
         try:
             # Get item from queue
@@ -53,7 +78,25 @@ def run_tts_loop(tts_queue, os_type, piper_path=None, model_path=None, is_speaki
             if item is None: # Exit signal
                 break
                 
-            text = item
+            # Items are (text, command_id, enqueued_ns); plain strings are still accepted
+            if isinstance(item, tuple):
+                text, trace_cmd, enqueued_ns = item
+            else:
+                text, trace_cmd, enqueued_ns = item, None, None
+            dequeued_ns = tracing.now_ns()
+            if reopen_event is not None and reopen_event.is_set():
+                reopen_event.clear()
+                reopen_backend("Audio devices changed")
+            if trace_cmd and enqueued_ns:
+                tracer.record("tts.queue_wait", enqueued_ns, dequeued_ns, cmd=trace_cmd)
+            first_audio_recorded = False
+            
+            def mark_first_audio(*_args):
+                nonlocal first_audio_recorded
+                if trace_cmd and not first_audio_recorded:
+                    first_audio_recorded = True
+                    tracer.record("tts.first_audio", dequeued_ns, tracing.now_ns(), cmd=trace_cmd,
+                                  engine="piper" if use_piper else "pyttsx3")
             
             # Load Config PER UTTERANCE
             voice_rate = 175
@@ -90,8 +133,6 @@ def run_tts_loop(tts_queue, os_type, piper_path=None, model_path=None, is_speaki
                     length_scale = max(0.5, min(2.0, length_scale))
                     
                     try:
-                        import pyaudio
-                        from core.alsa_error import no_alsa_error
                         import subprocess # Ensure subprocess is available for Piper playback
 
                         # Start Piper Process
@@ -102,17 +143,13 @@ def run_tts_loop(tts_queue, os_type, piper_path=None, model_path=None, is_speaki
                             stderr=subprocess.DEVNULL
                         )
 
-                        # Initialize PyAudio (suppress ALSA errors)
-                        with no_alsa_error():
-                            p = pyaudio.PyAudio()
-                            
-                            kwargs = {
-                                'format': pyaudio.paInt16,
-                                'channels': 1,
-                                'rate': 22050, # standard for Piper
-                                'output': True
-                            }
-                            stream = p.open(**kwargs)
+                        # 22050 Hz mono is standard for Piper
+                        try:
+                            stream = open_stream()
+                        except Exception:
+                            piper_proc.kill()
+                            piper_proc.wait()
+                            raise
 
                         # Write text to Piper's stdin
                         piper_proc.stdin.write(text.encode('utf-8'))
@@ -121,6 +158,7 @@ def run_tts_loop(tts_queue, os_type, piper_path=None, model_path=None, is_speaki
                         # Read and stream Piper's stdout to PyAudio
                         chunk_size = 1024
                         interrupted = False
+                        reopened = False
                         while True:
                             # Check stop event mid-stream
                             if stop_event and stop_event.is_set():
@@ -138,15 +176,34 @@ def run_tts_loop(tts_queue, os_type, piper_path=None, model_path=None, is_speaki
                                 
                             try:
                                 stream.write(data)
+                                mark_first_audio()
                             except Exception as e:
-                                # Writing failed (maybe stream was closed by interrupt)
-                                interrupted = True
-                                break
+                                if (stop_event and stop_event.is_set()) or reopened:
+                                    # Stream closed by an interrupt, or it failed again after reopening
+                                    audio.recover(e)
+                                    interrupted = True
+                                    break
+                                # Output device went away or was swapped: reopen once and resend the chunk
+                                reopened = True
+                                try:
+                                    stream.close()
+                                except Exception:
+                                    pass
+                                reopen_backend(f"Playback failed ({e})")
+                                try:
+                                    stream = audio.open_playback(rate=22050, channels=1)
+                                    stream.write(data)
+                                    mark_first_audio()
+                                except Exception as retry_e:
+                                    print(f"[!] Playback still failing after reopen: {retry_e}")
+                                    interrupted = True
+                                    break
                         
                         # Cleanup resources
-                        stream.stop_stream()
-                        stream.close()
-                        p.terminate()
+                        try:
+                            stream.close()
+                        except Exception:
+                            pass
                         # Terminate piper and discard remaining audio if interrupted
                         try:
                             piper_proc.kill()
@@ -183,6 +240,10 @@ def run_tts_loop(tts_queue, os_type, piper_path=None, model_path=None, is_speaki
                             # Be less verbose about config errors to avoid spam
                             pass
 
+                        try:
+                            engine.connect('started-utterance', mark_first_audio)
+                        except Exception:
+                            pass
                         engine.say(text)
                         engine.runAndWait()
                         
@@ -194,6 +255,9 @@ def run_tts_loop(tts_queue, os_type, piper_path=None, model_path=None, is_speaki
                         print(f"[!] pyttsx3 Loop Error: {e}")
             
             finally:
+                if trace_cmd:
+                    tracer.record("tts.playback", dequeued_ns, tracing.now_ns(), cmd=trace_cmd, chars=len(text))
+                
                 # UI STATUS UPDATE
                 if status_queue:
                     status_queue.put(("IDLE", None))
@@ -238,12 +302,14 @@ class Speaker:
             
         # Event to interrupt TTS mid-sentence
         self.stop_event = multiprocessing.Event()
+        # Event asking the worker to reopen its playback backend (audio devices changed)
+        self.reopen_event = multiprocessing.Event()
         
         # Start Persistent Worker
         self.tts_queue = multiprocessing.Queue()
         self.worker_process = multiprocessing.Process(
             target=run_tts_loop, 
-            args=(self.tts_queue, self.os_type, self.piper_path, self.model_path, self.is_speaking_flag, self.status_queue, self.stop_event)
+            args=(self.tts_queue, self.os_type, self.piper_path, self.model_path, self.is_speaking_flag, self.status_queue, self.stop_event, self.reopen_event)
         )
         self.worker_process.daemon = True # Kill when main process dies
         self.worker_process.start()
@@ -299,8 +365,8 @@ class Speaker:
         # where Listener starts before Worker picks up the item.
         self.is_speaking_flag.value = True
              
-        # Put in queue
-        self.tts_queue.put(text)
+        # Put in queue, tagged with the current command so the worker's spans correlate
+        self.tts_queue.put((text, tracing.get_tracer().current_command(), tracing.now_ns()))
         
         # REMOVED: Immediate IDLE update. 
         # We rely on the worker process to set IDLE when done.
@@ -321,6 +387,10 @@ class Speaker:
         self.stop_event.clear()
         self.is_speaking_flag.value = False
 
+    def reopen_audio(self):
+        """Makes the TTS worker reopen its playback backend before the next utterance."""
+        self.reopen_event.set()
+
     def terminate(self):
         self.tts_queue.put(None)
         self.worker_process.join()
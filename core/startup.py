@@ -0,0 +1,201 @@
+"""
+Cortex Startup Orchestrator
+
+Builds the engine's subsystems in parallel and defers rarely used ones until
+first use. Time-to-first-"Listening" is what users notice at login, so the
+slow pieces (Whisper load + noise calibration, NLU training) must overlap
+instead of running back to back.
+
+- StartupOrchestrator: runs named build steps on a thread pool, respecting
+  declared dependencies, and records a timing trace per subsystem.
+- LazyEngine: stands in for a sub-engine and only builds it the first time
+  an intent it claims is routed to it.
+- lazy_import: returns a module that is only executed on first attribute access.
+
+Usage:
+    startup = StartupOrchestrator()
+    startup.add("nlu", NeuralIntentModel)
+    startup.add("static_engine", lambda r: StaticCommandEngine(speaker, r["listener"]), requires=["listener"])
+    results = startup.run()
+    startup.print_trace()
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from core.tracing import get_tracer
+
+
+class StartupOrchestrator:
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.tasks = {}   # name -> (builder, requires)
+        self.order = []
+        self.trace = []   # [(name, start_offset, end_offset, thread_name, ok)]
+        self.t0 = None
+        self.total = 0.0
+
+    def add(self, name, builder, requires=None):
+        """
+        Registers a build step. Steps without requirements are called with no
+        arguments; steps with requirements receive the results dict so far.
+        """
+        self.tasks[name] = (builder, list(requires or []))
+        self.order.append(name)
+
+    def _run_one(self, name, builder, requires, results):
+        start_ns = time.perf_counter_ns()
+        ok = False
+        try:
+            value = builder(results) if requires else builder()
+            ok = True
+            return value
+        finally:
+            end_ns = time.perf_counter_ns()
+            self.trace.append((name, start_ns / 1e9 - self.t0, end_ns / 1e9 - self.t0,
+                               threading.current_thread().name, ok))
+            # Also lands in the latency tracer when a "startup" command is open
+            get_tracer().record(f"startup.{name}", start_ns, end_ns, ok=ok)
+
+    def run(self):
+        """Runs all steps and returns {name: result}. Re-raises the first failure."""
+        self.t0 = time.perf_counter()
+        results = {}
+        pending = list(self.order)
+        running = {}
+
+        for name in pending:
+            for dep in self.tasks[name][1]:
+                if dep not in self.tasks:
+                    raise ValueError(f"Startup step '{name}' requires unknown step '{dep}'")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Startup") as pool:
+            while pending or running:
+                # Launch every step whose dependencies are satisfied
+                for name in list(pending):
+                    builder, requires = self.tasks[name]
+                    if all(dep in results for dep in requires):
+                        pending.remove(name)
+                        running[pool.submit(self._run_one, name, builder, requires, results)] = name
+
+                if not running:
+                    raise RuntimeError(f"Startup dependency cycle between: {', '.join(pending)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        # Fail fast like the old serial constructor did
+                        for other in running:
+                            other.cancel()
+                        self.total = time.perf_counter() - self.t0
+                        self.print_trace()
+                        raise error
+                    results[name] = future.result()
+
+        self.total = time.perf_counter() - self.t0
+        return results
+
+    def print_trace(self):
+        """Prints one line per subsystem with its start/end offsets."""
+        if not self.trace:
+            return
+        width = max(len(name) for name, *_ in self.trace)
+        print("[Startup] Subsystem timing:")
+        serial = 0.0
+        for name, start, end, thread_name, ok in sorted(self.trace, key=lambda t: t[1]):
+            serial += end - start
+            status = "" if ok else "  FAILED"
+            print(f"[Startup]   {name.ljust(width)}  {start:6.2f}s -> {end:6.2f}s  ({end - start:5.2f}s) [{thread_name}]{status}")
+        print(f"[Startup] Ready in {self.total:.2f}s (serial would be {serial:.2f}s)")
+
+    def get_trace(self):
+        """Returns the trace as a list of dicts (for logging / UI)."""
+        return [
+            {"name": name, "start": start, "end": end, "thread": thread_name, "ok": ok}
+            for name, start, end, thread_name, ok in self.trace
+        ]
+
+
+class LazyEngine:
+    """
+    Placeholder for a sub-engine that is only constructed when an intent it
+    claims is routed to it. 'claims' is a predicate on the intent tag, so
+    routing can skip this engine without importing or building it.
+    """
+
+    def __init__(self, name, factory, claims):
+        self.name = name
+        self._factory = factory
+        self._claims = claims
+        self._engine = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._engine is not None
+
+    def get(self):
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    start = time.perf_counter()
+                    self._engine = self._factory()
+                    print(f"[Startup] Deferred engine '{self.name}' loaded on first use ({time.perf_counter() - start:.2f}s)")
+        return self._engine
+
+    def handle_intent(self, tag, command=""):
+        if not tag or not self._claims(tag):
+            return False
+        return self.get().handle_intent(tag, command)
+
+    def __getattr__(self, attr):
+        # Anything other than routing goes straight to the real engine
+        return getattr(self.get(), attr)
+
+
+class _LazyModule(types.ModuleType):
+    """
+    Stands in for a module until an attribute is first read. The real import
+    happens once, under a lock, so threads that touch the module together
+    don't both execute its body.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self._lazy_lock = threading.Lock()
+        self._lazy_module = None
+
+    def __getattr__(self, attr):
+        module = self._lazy_module
+        if module is None:
+            with self._lazy_lock:
+                if self._lazy_module is None:
+                    self._lazy_module = importlib.import_module(self.__name__)
+                module = self._lazy_module
+        return getattr(module, attr)
+
+
+_lazy_modules = {}
+_lazy_lock = threading.Lock()
+
+
+def lazy_import(name):
+    """
+    Returns module 'name' without executing it; the module body runs on first
+    attribute access (from whichever thread gets there first, exactly once).
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    with _lazy_lock:
+        module = _lazy_modules.get(name)
+        if module is None:
+            if importlib.util.find_spec(name) is None:
+                return importlib.import_module(name)    # raises ModuleNotFoundError now, not on first use
+            module = _lazy_modules[name] = _LazyModule(name)
+        return module
@@ -3,9 +3,21 @@ import subprocess
 import os
 import sys
 
+from core.system.inventory import Inventory, apps_fingerprint
+
 class AppsManager:
     def __init__(self):
         self.os_type = platform.system()
+        # Persisted scan result; re-scanned only when the package database changes
+        self.inventory = Inventory("apps", self.get_installed_apps, apps_fingerprint)
+
+    def get_cached_apps(self):
+        """Apps from the last scan (instant), or None if there was none yet."""
+        return self.inventory.cached()
+
+    def refresh_apps(self, force=False):
+        """Returns (apps, diff); only re-scans if the package database changed or force=True."""
+        return self.inventory.refresh(force)
 
     def get_installed_apps(self):
         """
@@ -27,6 +39,8 @@ class AppsManager:
         elif self.os_type == 'Darwin':
             apps = self._get_mac_apps()
         
+        if apps is None:
+            return None     # every package manager failed; Inventory keeps the last scan
         # Sort by name
         apps.sort(key=lambda x: x.get('name', '').lower())
         return apps
@@ -124,6 +138,7 @@ class AppsManager:
         import shutil
         
         apps = []
+        failed = False
         
         # Strategy 1: dpkg (Debian/Ubuntu/Mint)
         if shutil.which("dpkg-query"):
@@ -166,6 +181,7 @@ class AppsManager:
                     return apps
             except (subprocess.TimeoutExpired, Exception) as e:
                 print(f"[AppsManager] dpkg-query failed: {e}")
+                failed = True
         
         # Strategy 2: rpm (Fedora/RHEL/openSUSE)
         if shutil.which("rpm"):
@@ -212,6 +228,7 @@ class AppsManager:
                     return apps
             except (subprocess.TimeoutExpired, Exception) as e:
                 print(f"[AppsManager] rpm failed: {e}")
+                failed = True
         
         # Strategy 3: pacman (Arch/Manjaro)
         if shutil.which("pacman"):
@@ -239,8 +256,10 @@ class AppsManager:
                     return apps
             except (subprocess.TimeoutExpired, Exception) as e:
                 print(f"[AppsManager] pacman failed: {e}")
+                failed = True
         
-        return apps
+        # None (not []) when a package manager was there but could not be queried
+        return None if failed else apps
 
     def _get_mac_apps(self):
         """
@@ -5,9 +5,22 @@ import os
 import sys
 import shutil
 
+from core.system.inventory import Inventory, drivers_fingerprint
+
 class DriverManager:
     def __init__(self):
         self.os_type = platform.system()
+        # Persisted scan result; re-scanned only when the driver store / loaded modules change
+        self.inventory = Inventory("drivers", self.get_drivers, drivers_fingerprint,
+                                   key=lambda d: (d.get("name"), d.get("id")))
+
+    def get_cached_drivers(self):
+        """Drivers from the last scan (instant), or None if there was none yet."""
+        return self.inventory.cached()
+
+    def refresh_drivers(self, force=False):
+        """Returns (drivers, diff); only re-scans if drivers changed or force=True."""
+        return self.inventory.refresh(force)
 
     def get_drivers(self):
         """Returns a list of drivers/modules."""
@@ -177,10 +190,9 @@ class DriverManager:
     def _get_linux_drivers(self):
         drivers = []
         try:
-            # lsmod
-            result = subprocess.run(["lsmod"], capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.splitlines()[1:]:
+            # /proc/modules is what lsmod prints, without spawning it
+            with open("/proc/modules", "r") as f:
+                for line in f:
                     parts = line.split()
                     if parts:
                         drivers.append({
@@ -0,0 +1,244 @@
+"""
+Cortex Package & Driver Inventory
+
+Persistent, diffable cache in front of the slow inventory scans (dpkg-query /
+rpm / pacman / the Uninstall registry keys for apps, Win32_PnPSignedDriver /
+kernel modules for drivers).
+
+- The last result is stored in data/inventory/<name>.json, so the Apps and
+  Driver windows can show it instantly on open.
+- Before re-scanning, a cheap fingerprint is compared with the stored one:
+  package database mtimes (dpkg status, rpm db, pacman local), registry
+  key last-write times, driver store / kernel module state. The full scan
+  only runs when the fingerprint moved, or when forced.
+- When a scan does run, the new list is diffed against the previous one by
+  key: added, removed and changed (version) entries are kept alongside the
+  cache.
+- A scan that fails (the loader raises or returns None) or comes back
+  empty never replaces a non-empty cache; the old entry is kept and the
+  next refresh tries again.
+
+Usage:
+    inv = Inventory("apps", AppsManager().get_installed_apps, apps_fingerprint)
+    items = inv.cached()                  # instant, may be None on first run
+    items, diff = inv.refresh()           # re-scans only if something changed
+    inv.refresh_async(lambda items, diff: ...)
+"""
+
+import json
+import os
+import platform
+import threading
+import time
+import zlib
+
+from core.runtime_path import get_app_root
+
+_FORMAT_VERSION = 1
+
+
+def inventory_dir():
+    return os.path.join(get_app_root(), "data", "inventory")
+
+
+def _mtimes(paths):
+    """(path, mtime_ns) for paths that exist; missing paths are simply left out."""
+    stamps = []
+    for path in paths:
+        try:
+            stamps.append([path, os.stat(path).st_mtime_ns])
+        except OSError:
+            continue
+    return stamps
+
+
+def _registry_stamps(keys):
+    """(key, subkey count, newest last-write time among the key and its subkeys) per registry key."""
+    import winreg
+    stamps = []
+    for root, path in keys:
+        try:
+            with winreg.OpenKey(root, path) as key:
+                count, _, newest = winreg.QueryInfoKey(key)
+                # Values changed in place (e.g. DisplayVersion on upgrade) only touch the subkey
+                for i in range(count):
+                    try:
+                        with winreg.OpenKey(key, winreg.EnumKey(key, i)) as sub:
+                            newest = max(newest, winreg.QueryInfoKey(sub)[2])
+                    except OSError:
+                        continue
+                stamps.append([f"{root}\\{path}", count, newest])
+        except OSError:
+            continue
+    return stamps
+
+
+def apps_fingerprint():
+    system = platform.system()
+    if system == "Linux":
+        return _mtimes(["/var/lib/dpkg/status", "/var/lib/rpm/rpmdb.sqlite", "/var/lib/rpm/Packages",
+                        "/var/lib/pacman/local"])
+    if system == "Windows":
+        import winreg
+        uninstall = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"
+        uninstall_wow = r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
+        return _registry_stamps([
+            (winreg.HKEY_LOCAL_MACHINE, uninstall), (winreg.HKEY_LOCAL_MACHINE, uninstall_wow),
+            (winreg.HKEY_CURRENT_USER, uninstall), (winreg.HKEY_CURRENT_USER, uninstall_wow),
+        ])
+    if system == "Darwin":
+        return _mtimes(["/Applications", os.path.expanduser("~/Applications")])
+    return []
+
+
+def drivers_fingerprint():
+    system = platform.system()
+    if system == "Linux":
+        # Loaded modules only; names are enough (sizes/use counts change all the time)
+        try:
+            with open("/proc/modules", "rb") as f:
+                names = b"\n".join(sorted(line.split(b" ", 1)[0] for line in f))
+            return [["/proc/modules", zlib.crc32(names)]]
+        except OSError:
+            return []
+    if system == "Windows":
+        windir = os.environ.get("SystemRoot", r"C:\Windows")
+        return _mtimes([os.path.join(windir, "INF"),
+                        os.path.join(windir, "System32", "DriverStore", "FileRepository")])
+    if system == "Darwin":
+        return _mtimes(["/Library/Extensions", "/System/Library/Extensions"])
+    return []
+
+
+def diff_items(old, new, key, version="version"):
+    """{"added": [...], "removed": [...], "changed": [[name, old, new], ...]} between two item lists."""
+    before = {key(item): item for item in old}
+    after = {key(item): item for item in new}
+    changed = []
+    for k in before.keys() & after.keys():
+        if before[k].get(version) != after[k].get(version):
+            changed.append([after[k].get("name", str(k)), before[k].get(version), after[k].get(version)])
+    return {
+        "added": sorted(after[k].get("name", str(k)) for k in after.keys() - before.keys()),
+        "removed": sorted(before[k].get("name", str(k)) for k in before.keys() - after.keys()),
+        "changed": sorted(changed),
+    }
+
+
+def describe_diff(diff):
+    """'3 added, 1 removed, 2 updated' (empty string when nothing changed)."""
+    if not diff:
+        return ""
+    parts = []
+    for label, field in (("added", "added"), ("removed", "removed"), ("updated", "changed")):
+        if diff.get(field):
+            parts.append(f"{len(diff[field])} {label}")
+    return ", ".join(parts)
+
+
+class Inventory:
+    def __init__(self, name, loader, fingerprint, key=None, directory=None):
+        self.name = name
+        self.loader = loader
+        self.fingerprint = fingerprint
+        self.key = key or (lambda item: item.get("name"))
+        self.path = os.path.join(directory or inventory_dir(), f"{name}.json")
+        self._lock = threading.Lock()
+        self._state = None
+
+    # ── Persistence ──
+
+    def _load(self):
+        if self._state is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                if state.get("version") == _FORMAT_VERSION:
+                    self._state = state
+            except (OSError, ValueError):
+                pass
+        return self._state
+
+    def _save(self, state):
+        self._state = state
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[Inventory] Could not save {self.path}: {e}")
+
+    # ── Queries ──
+
+    def cached(self):
+        """Items from the last scan (instant), or None if there never was one."""
+        state = self._load()
+        return state["items"] if state else None
+
+    def last_scan(self):
+        """Time of the last full scan, or None."""
+        state = self._load()
+        return state["scanned"] if state else None
+
+    def last_diff(self):
+        """Diff recorded by the last scan that found changes ("since" = the scan it compares to), or None."""
+        state = self._load()
+        return state.get("diff") if state else None
+
+    def refresh(self, force=False):
+        """
+        Re-scans if the fingerprint changed (or force=True). Returns (items, diff):
+        diff is None when nothing was re-scanned, else the changes since the previous scan.
+        """
+        with self._lock:
+            state = self._load()
+            try:
+                fingerprint = self.fingerprint()
+            except Exception as e:
+                print(f"[Inventory] {self.name} fingerprint failed: {e}")
+                fingerprint = None
+            if state and not force and fingerprint and fingerprint == state.get("fingerprint"):
+                return state["items"], None
+
+            started = time.time()
+            try:
+                items = self.loader()
+            except Exception as e:
+                print(f"[Inventory] {self.name} scan failed: {e}")
+                items = None
+            # A failed scan (None) or one that suddenly finds nothing must not wipe a good cache
+            if items is None or (not items and state and state["items"]):
+                if state:
+                    print(f"[Inventory] {self.name}: scan {'came back empty' if items is not None else 'failed'};"
+                          f" keeping {len(state['items'])} cached items")
+                    return state["items"], None
+                return items or [], None
+            diff = None
+            if state:
+                diff = diff_items(state["items"], items, self.key)
+                diff["since"] = state["scanned"]
+            self._save({
+                "version": _FORMAT_VERSION,
+                "fingerprint": fingerprint,
+                "scanned": time.time(),
+                "items": items,
+                # Keep the last non-empty diff so "what changed" survives a no-op rescan
+                "diff": diff if describe_diff(diff) else (state or {}).get("diff"),
+            })
+            print(f"[Inventory] {self.name}: {len(items)} items scanned in {time.time() - started:.1f}s"
+                  + (f" ({describe_diff(diff)})" if describe_diff(diff) else ""))
+            return items, diff
+
+    def refresh_async(self, callback, force=False):
+        """refresh() on a daemon thread; callback(items, diff) runs on that thread."""
+        def run():
+            try:
+                items, diff = self.refresh(force)
+            except Exception as e:
+                print(f"[Inventory] {self.name} refresh failed: {e}")
+                items, diff = self.cached() or [], None
+            callback(items, diff)
+        threading.Thread(target=run, name=f"Inventory-{self.name}", daemon=True).start()
+
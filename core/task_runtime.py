@@ -0,0 +1,286 @@
+"""
+Cortex Task Runtime
+
+Runs the engine's intent work (file operations, searches, app launches,
+automations) on bounded worker pools. It replaces the old approach of one
+new thread per intent.
+
+- One asyncio loop on a daemon thread schedules every task. Each lane has
+  its own thread pool and a semaphore of the same size, so a lane never
+  runs more tasks than it has workers. Extra tasks wait in submission
+  order.
+- Lanes: "interactive" for work the user is waiting on (create, move,
+  open, close) and "background" for long jobs (drive searches,
+  automations). A full background lane never delays an interactive
+  command. "cpu" runs picklable functions in a spawned process pool, for
+  CPU-bound work that would otherwise hold the GIL.
+- Every task has an id and can be cancelled. A queued task is dropped. A
+  running task is asked to stop: cancelled() turns True inside it, and
+  its on_cancel hook runs (e.g. the search's own cancel flag). Threads are
+  never killed.
+- Queued and running tasks are sent to the sink (the UI status queue) as
+  "TASKS" snapshots, at most every TASKS_INTERVAL seconds. The status
+  window lists them with a cancel action each.
+
+Usage:
+    from core.task_runtime import get_runtime, cancelled, BACKGROUND
+    runtime = get_runtime()
+    task_id = runtime.submit(move_here, command, engine, name="Move here")
+    runtime.submit(background_search, query, speaker, name=f"Search {query}",
+                   lane=BACKGROUND, on_cancel=lambda: cancel_search(query))
+    runtime.cancel(task_id)
+
+    # inside a long-running task
+    if cancelled():
+        return
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+CPU = "cpu"
+
+DEFAULT_WORKERS = {
+    INTERACTIVE: 4,
+    BACKGROUND: 2,
+    CPU: max(1, (os.cpu_count() or 2) // 2),
+}
+TASKS_INTERVAL = 0.25       # seconds between task snapshots sent to the sink
+SHUTDOWN_GRACE = 2.0        # seconds shutdown() waits for cancelled tasks to return
+
+TaskInfo = collections.namedtuple("TaskInfo", ["id", "name", "lane", "state", "elapsed"])
+# state: "queued" or "running"; finished tasks are dropped from the table
+
+_local = threading.local()
+
+
+def cancelled():
+    """True when the task running on this thread has been asked to stop."""
+    task = getattr(_local, "task", None)
+    return task is not None and task.cancel_event.is_set()
+
+
+def current_task():
+    """Id of the task running on this thread, or None outside the runtime."""
+    task = getattr(_local, "task", None)
+    return task.id if task is not None else None
+
+
+class _Task:
+    def __init__(self, task_id, fn, args, kwargs, name, lane, on_cancel, listed):
+        self.id = task_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.name = name
+        self.lane = lane
+        self.on_cancel = on_cancel
+        self.listed = listed
+        self.state = "queued"
+        self.created = time.time()
+        self.started = None
+        self.cancel_event = threading.Event()
+        self.aio_task = None
+
+
+class TaskRuntime:
+    def __init__(self, workers=None, sink=None):
+        self.workers = dict(DEFAULT_WORKERS)
+        self.workers.update({lane: max(1, int(n)) for lane, n in (workers or {}).items()})
+        self.sink = sink
+        self._tasks = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._semaphores = {}
+        self._pools = {}
+        self._emit_handle = None
+        self._last_emit = 0.0
+
+    # ── Loop ──
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+
+                def run():
+                    loop = asyncio.new_event_loop()
+                    asyncio.set_event_loop(loop)
+                    self._semaphores = {lane: asyncio.Semaphore(n) for lane, n in self.workers.items()}
+                    self._loop = loop
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=run, name="TaskRuntime", daemon=True).start()
+                ready.wait()
+        return self._loop
+
+    def _pool(self, lane):
+        """Worker pool of a lane, created on first use (the process pool is costly to start)."""
+        pool = self._pools.get(lane)
+        if pool is None:
+            if lane == CPU:
+                # spawn: the engine process is multi-threaded, forking it is unsafe
+                pool = concurrent.futures.ProcessPoolExecutor(
+                    self.workers[CPU], mp_context=multiprocessing.get_context("spawn"))
+            else:
+                pool = concurrent.futures.ThreadPoolExecutor(
+                    self.workers[lane], thread_name_prefix=f"Task-{lane}")
+            self._pools[lane] = pool
+        return pool
+
+    # ── Public API ──
+
+    def submit(self, fn, *args, name=None, lane=INTERACTIVE, on_cancel=None, listed=True, **kwargs):
+        """
+        Queues fn(*args, **kwargs) on a lane. Returns the task id.
+        on_cancel() runs when a started task is cancelled; listed=False keeps
+        housekeeping tasks out of the status window.
+        """
+        if lane not in self.workers:
+            raise ValueError(f"Unknown task lane: {lane}")
+        loop = self._ensure_loop()
+        name = name or getattr(fn, "__name__", "task")
+        task = _Task(next(self._ids), fn, args, kwargs, name, lane, on_cancel, listed)
+        with self._lock:
+            self._tasks[task.id] = task
+
+        def start():
+            task.aio_task = loop.create_task(self._run_task(task))
+            self._changed()
+
+        loop.call_soon_threadsafe(start)
+        return task.id
+
+    def cancel(self, task_id=None):
+        """Cancels one task (or every task when task_id is None). Returns False if none was found."""
+        with self._lock:
+            tasks = list(self._tasks.values()) if task_id is None else [self._tasks.get(task_id)]
+        tasks = [task for task in tasks if task is not None]
+        if not tasks or self._loop is None:
+            return False
+
+        def cancel_tasks():
+            for task in tasks:
+                task.cancel_event.set()
+                if task.state == "queued":
+                    if task.aio_task is not None:
+                        task.aio_task.cancel()
+                elif task.on_cancel is not None:
+                    try:
+                        task.on_cancel()
+                    except Exception as e:
+                        print(f"[Tasks] Cancel hook of '{task.name}' failed: {e}")
+
+        self._loop.call_soon_threadsafe(cancel_tasks)
+        return True
+
+    def tasks(self, lane=None, listed_only=False):
+        """[TaskInfo] of queued and running tasks, oldest first."""
+        now = time.time()
+        with self._lock:
+            tasks = list(self._tasks.values())
+        return [TaskInfo(t.id, t.name, t.lane, t.state, now - (t.started or t.created))
+                for t in tasks if (lane is None or t.lane == lane) and (t.listed or not listed_only)]
+
+    def shutdown(self, timeout=SHUTDOWN_GRACE):
+        """
+        Cancels everything, gives running tasks up to `timeout` seconds to
+        notice (their on_cancel hooks run), then stops the pools.
+        """
+        if self.cancel():
+            deadline = time.time() + timeout
+            while self.tasks() and time.time() < deadline:
+                time.sleep(0.05)
+            remaining = self.tasks()
+            if remaining:
+                print(f"[Tasks] {len(remaining)} task(s) still running at shutdown: "
+                      + ", ".join(t.name for t in remaining))
+        for pool in list(self._pools.values()):
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # ── Tasks ──
+
+    def _call(self, task):
+        """Runs on a pool thread."""
+        _local.task = task
+        try:
+            return task.fn(*task.args, **task.kwargs)
+        except Exception as e:
+            print(f"[Tasks] '{task.name}' failed: {e}")
+        finally:
+            _local.task = None
+
+    async def _run_task(self, task):
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._semaphores[task.lane]:
+                # From here on the task holds a worker. cancel() no longer cancels this
+                # coroutine, or the lane would run more tasks than it has workers
+                task.state = "running"
+                task.started = time.time()
+                self._changed()
+                if task.lane == CPU:
+                    call = functools.partial(task.fn, *task.args, **task.kwargs)
+                    await loop.run_in_executor(self._pool(CPU), call)
+                else:
+                    await loop.run_in_executor(self._pool(task.lane), self._call, task)
+        except asyncio.CancelledError:
+            print(f"[Tasks] '{task.name}' cancelled before it started")
+        except Exception as e:
+            print(f"[Tasks] '{task.name}' failed: {e}")
+        finally:
+            with self._lock:
+                self._tasks.pop(task.id, None)
+            self._changed()
+
+    # ── Snapshots ──
+
+    def _changed(self):
+        """Sends a snapshot now, or once TASKS_INTERVAL has passed since the last one."""
+        if self.sink is None or self._emit_handle is not None:
+            return
+        wait = self._last_emit + TASKS_INTERVAL - time.monotonic()
+        if wait <= 0:
+            self._emit()
+        else:
+            self._emit_handle = self._loop.call_later(wait, self._emit)
+
+    def _emit(self):
+        self._emit_handle = None
+        self._last_emit = time.monotonic()
+        snapshot = [info._asdict() for info in self.tasks(listed_only=True)]
+        try:
+            self.sink.put(("TASKS", snapshot))
+        except Exception as e:
+            print(f"[Tasks] Could not send the task list: {e}")
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def start_runtime(workers=None, sink=None):
+    """Creates the process-wide runtime (no-op if it exists; a new sink replaces the old one)."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = TaskRuntime(workers, sink)
+        elif sink is not None:
+            _runtime.sink = sink
+        return _runtime
+
+
+def get_runtime():
+    """Returns the process-wide runtime, creating it with defaults if needed."""
+    return _runtime or start_runtime()
@@ -0,0 +1,263 @@
+"""
+Cortex System Telemetry
+
+Background psutil sampler that keeps a short history of system metrics so
+system questions ("how much memory am I using?") can be answered by voice
+straight from the last sample, without opening a terminal or forking tools
+like free, df, lscpu or htop.
+
+- System metrics (CPU, memory, disk, network rates) are sampled every
+  `interval` seconds into a fixed-size ring buffer.
+- Per-process stats are sampled every `process_interval` seconds by a
+  ProcessRanker (core/process_ranker.py), which caches Process objects so
+  CPU% and IO rates are cheap deltas and groups processes per application.
+- Static facts (CPU model, core count, OS, boot time) are collected once.
+
+Usage:
+    from core.telemetry import get_sampler
+    sampler = get_sampler()          # starts the thread on first use
+    sample = sampler.latest()
+    print(sample.mem_percent, sampler.top_apps("rss", 3))
+"""
+
+import collections
+import os
+import platform
+import threading
+import time
+
+import psutil
+
+from core.process_ranker import ProcessRanker
+
+DEFAULT_INTERVAL = 2.0           # seconds between system samples
+DEFAULT_PROCESS_INTERVAL = 5.0   # seconds between process samples
+DEFAULT_HISTORY = 1800           # system samples kept (1 hour at 2 s)
+PROCESS_HISTORY = 12             # process snapshots kept (full RankSnapshots)
+
+Sample = collections.namedtuple("Sample", [
+    "ts", "cpu_percent", "mem_percent", "mem_used", "mem_total",
+    "swap_percent", "disk_percent", "disk_used", "disk_total",
+    "net_sent_rate", "net_recv_rate",
+])
+
+
+def _root_disk():
+    if platform.system() == "Windows":
+        return os.environ.get("SystemDrive", "C:") + "\\"
+    return "/"
+
+
+def format_bytes(value):
+    """Speakable size: '3.1 GB', '512 MB'."""
+    gb = value / (1024 ** 3)
+    if gb >= 1:
+        return f"{gb:.1f} GB"
+    return f"{value / (1024 ** 2):.0f} MB"
+
+
+def format_rate(bytes_per_sec):
+    """Speakable network rate in bits per second."""
+    bits = bytes_per_sec * 8
+    if bits >= 1e9:
+        return f"{bits / 1e9:.1f} gigabits per second"
+    if bits >= 1e6:
+        return f"{bits / 1e6:.1f} megabits per second"
+    return f"{bits / 1e3:.0f} kilobits per second"
+
+
+class TelemetrySampler(threading.Thread):
+    def __init__(self, interval=DEFAULT_INTERVAL, process_interval=DEFAULT_PROCESS_INTERVAL,
+                 history=DEFAULT_HISTORY):
+        super().__init__(name="TelemetrySampler", daemon=True)
+        self.interval = max(0.5, float(interval))
+        self.process_interval = max(self.interval, float(process_interval))
+        self.samples = collections.deque(maxlen=history)
+        self.process_samples = collections.deque(maxlen=PROCESS_HISTORY)
+        self.running = True
+        self.listeners = []     # callables(sample), called from the sampler thread
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._wake = threading.Event()
+        self.ranker = ProcessRanker()
+        self._last_net = None
+        self._priming_ts = None     # ts of the sample taken before any network counters existed
+        self._last_process_ts = 0.0
+        self._static = None
+        self._disk_path = _root_disk()
+
+    # ── Sampling ──
+
+    def _sample_system(self):
+        now = time.time()
+        mem = psutil.virtual_memory()
+        try:
+            swap_percent = psutil.swap_memory().percent
+        except Exception:
+            swap_percent = 0.0
+        try:
+            disk = psutil.disk_usage(self._disk_path)
+            disk_percent, disk_used, disk_total = disk.percent, disk.used, disk.total
+        except Exception:
+            disk_percent = disk_used = disk_total = 0
+
+        sent_rate = recv_rate = 0.0
+        try:
+            net = psutil.net_io_counters()
+            if self._last_net is not None:
+                last_ts, last = self._last_net
+                elapsed = max(1e-6, now - last_ts)
+                sent_rate = max(0, net.bytes_sent - last.bytes_sent) / elapsed
+                recv_rate = max(0, net.bytes_recv - last.bytes_recv) / elapsed
+            else:
+                self._priming_ts = now
+            self._last_net = (now, net)
+        except Exception:
+            pass
+
+        return Sample(now, psutil.cpu_percent(None), mem.percent, mem.used, mem.total,
+                      swap_percent, disk_percent, disk_used, disk_total, sent_rate, recv_rate)
+
+    def sample_now(self):
+        """Takes one sample synchronously (also used for the very first sample)."""
+        sample = self._sample_system()
+        with self._lock:
+            self.samples.append(sample)
+        if time.time() - self._last_process_ts >= self.process_interval:
+            try:
+                snapshot = self.ranker.sample()
+                with self._lock:
+                    self.process_samples.append(snapshot)
+                self._last_process_ts = snapshot.ts
+            except Exception as e:
+                print(f"[Telemetry] Process sampling error: {e}")
+        for listener in list(self.listeners):
+            try:
+                listener(sample)
+            except Exception as e:
+                print(f"[Telemetry] Listener error: {e}")
+        return sample
+
+    def run(self):
+        # Prime the CPU counters so the first real sample isn't 0.0
+        psutil.cpu_percent(None)
+        try:
+            self.ranker.sample()
+        except Exception:
+            pass
+        self._wake.wait(min(1.0, self.interval))
+        while self.running:
+            try:
+                self.sample_now()
+                self._ready.set()
+            except Exception as e:
+                print(f"[Telemetry] Sampling error: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+
+    # ── Queries ──
+
+    def wait_ready(self, timeout=3.0):
+        """Blocks until the first sample exists (only matters right after startup)."""
+        return self._ready.wait(timeout)
+
+    def latest(self):
+        """Most recent system Sample, or None before the first one."""
+        if not self._ready.is_set():
+            self.wait_ready()
+        with self._lock:
+            return self.samples[-1] if self.samples else None
+
+    def history(self, seconds=None, rates_only=False):
+        """
+        System samples from the last `seconds` (all kept samples if None).
+        rates_only leaves out the first sample, whose network rates are 0 only
+        because there was no earlier reading to diff against.
+        """
+        with self._lock:
+            samples = list(self.samples)
+        if rates_only:
+            samples = [s for s in samples if s.ts != self._priming_ts]
+        if seconds is None:
+            return samples
+        cutoff = time.time() - seconds
+        return [s for s in samples if s.ts >= cutoff]
+
+    def latest_processes(self):
+        """Latest process RankSnapshot, or None before the first one."""
+        if not self._ready.is_set():
+            self.wait_ready()
+        with self._lock:
+            return self.process_samples[-1] if self.process_samples else None
+
+    def top_processes(self, by="rss", n=5):
+        """Top n ProcessStat by 'cpu', 'rss' or 'io' from the latest process snapshot."""
+        snapshot = self.latest_processes()
+        return snapshot.top_processes(by, n) if snapshot else []
+
+    def top_apps(self, by="rss", n=5, exclude_protected=False):
+        """Top n AppStat (name, cpu_percent, rss, io_rate, pids), processes grouped per app."""
+        snapshot = self.latest_processes()
+        return snapshot.top_apps(by, n, exclude_protected) if snapshot else []
+
+    def static_info(self):
+        """Facts that don't change while running, collected once."""
+        if self._static is None:
+            uname = platform.uname()
+            try:
+                freq = psutil.cpu_freq()
+                max_mhz = (freq.max or freq.current) if freq else None
+            except Exception:
+                max_mhz = None
+            self._static = {
+                "os": f"{uname.system} {uname.release}",
+                "hostname": uname.node,
+                "machine": uname.machine,
+                "cpu_model": _cpu_model() or uname.processor or uname.machine,
+                "physical_cores": psutil.cpu_count(logical=False),
+                "logical_cores": psutil.cpu_count(logical=True),
+                "max_mhz": max_mhz,
+                "boot_time": psutil.boot_time(),
+            }
+        return self._static
+
+
+def _cpu_model():
+    """CPU brand string without spawning lscpu / wmic / sysctl."""
+    system = platform.system()
+    try:
+        if system == "Linux":
+            with open("/proc/cpuinfo", "r") as f:
+                for line in f:
+                    if line.lower().startswith(("model name", "hardware")):
+                        return line.split(":", 1)[1].strip()
+        elif system == "Windows":
+            import winreg
+            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"HARDWARE\DESCRIPTION\System\CentralProcessor\0")
+            return winreg.QueryValueEx(key, "ProcessorNameString")[0].strip()
+    except Exception:
+        pass
+    return platform.processor()
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def start_sampler(interval=DEFAULT_INTERVAL, process_interval=DEFAULT_PROCESS_INTERVAL):
+    """Starts the process-wide sampler (no-op if it is already running)."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = TelemetrySampler(interval, process_interval)
+            _sampler.start()
+        return _sampler
+
+
+def get_sampler():
+    """Returns the process-wide sampler, starting it with defaults if needed."""
+    return _sampler or start_sampler()
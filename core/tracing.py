@@ -0,0 +1,266 @@
+"""
+Cortex Latency Tracing
+
+Lightweight span recorder used to see where time goes in a voice command:
+capture, VAD, Whisper decode, NLU stages, intent routing and TTS
+time-to-first-audio.
+
+- Spans carry monotonic timestamps (time.perf_counter_ns, which is
+  system-wide on Linux, Windows and macOS) so spans recorded by the engine,
+  the TTS worker and the UI process line up on one timeline.
+- Spans are grouped by a command ID. The engine opens a command before each
+  listen, and the ID travels with every Speaker.speak() to the TTS worker.
+- Each process keeps a ring buffer of recent command traces. Engine and TTS
+  spans are forwarded to the UI process over the status bus as "TRACE" messages.
+- Traces can be exported in Chrome trace JSON (chrome://tracing, Perfetto).
+
+Usage:
+    from core.tracing import get_tracer
+    tracer = get_tracer()
+    with tracer.span("nlu.predict", text=command):
+        ...
+"""
+
+import collections
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Number of command traces kept per process
+DEFAULT_CAPACITY = 64
+
+# Stage groups shown in the latency panel: column title -> span name prefixes
+SUMMARY_STAGES = (
+    ("ASR", ("asr.capture", "asr.decode")),
+    ("NLU", ("nlu.predict",)),
+    ("Route", ("engine.execute_intent",)),
+    ("TTS 1st audio", ("tts.first_audio",)),
+)
+
+
+def now_ns():
+    return time.perf_counter_ns()
+
+
+class Tracer:
+    def __init__(self, process_name="main", sink=None, capacity=DEFAULT_CAPACITY):
+        self.process_name = process_name
+        self.sink = sink
+        self.capacity = capacity
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._current = None           # command ID new spans attach to by default
+        self._open = {}                # cmd_id -> trace being recorded in this process
+        self._traces = collections.OrderedDict()  # cmd_id -> finished/ingested trace (ring buffer)
+        self.version = 0               # bumped whenever the ring buffer changes
+
+    def configure(self, process_name, sink=None):
+        """Names this process on the timeline and sets where finished spans are sent."""
+        self.process_name = process_name
+        self.sink = sink
+        self.pid = os.getpid()
+
+    # ── Commands ──
+
+    def begin_command(self, label=""):
+        """
+        Opens a new command trace and makes it current. A still-open previous
+        command is considered finished and flushed.
+        """
+        with self._lock:
+            previous = self._current
+        if previous is not None:
+            self.end_command(previous)
+        cmd_id = f"{self.pid}-{next(self._ids)}"
+        with self._lock:
+            self._open[cmd_id] = self._new_trace(cmd_id, label)
+            self._current = cmd_id
+        return cmd_id
+
+    def label_command(self, cmd_id, label):
+        with self._lock:
+            trace = self._open.get(cmd_id)
+            if trace is not None:
+                trace["label"] = label
+
+    def current_command(self):
+        return self._current
+
+    def cancel_command(self, cmd_id=None):
+        """Drops a command that turned out to be nothing (e.g. listen returned no speech)."""
+        with self._lock:
+            cmd_id = cmd_id or self._current
+            self._open.pop(cmd_id, None)
+            if self._current == cmd_id:
+                self._current = None
+
+    def end_command(self, cmd_id=None):
+        """Closes a command, stores it in the ring buffer and forwards it to the sink."""
+        with self._lock:
+            cmd_id = cmd_id or self._current
+            trace = self._open.pop(cmd_id, None)
+            if self._current == cmd_id:
+                self._current = None
+        if trace is None or not trace["spans"]:
+            return
+        self._store(trace)
+        self._emit(trace)
+
+    # ── Spans ──
+
+    @contextmanager
+    def span(self, name, cmd=None, **args):
+        start = now_ns()
+        try:
+            yield args
+        finally:
+            self.record(name, start, now_ns(), cmd=cmd, **args)
+
+    def record(self, name, start_ns, end_ns, cmd=None, **args):
+        """Records a finished span. Spans outside of any command are dropped."""
+        cmd = cmd or self._current
+        if cmd is None:
+            return
+        span = {
+            "name": name,
+            "start": start_ns,
+            "end": end_ns,
+            "pid": self.pid,
+            "proc": self.process_name,
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            trace = self._open.get(cmd)
+            if trace is not None:
+                trace["spans"].append(span)
+                return
+        # Command isn't open here (e.g. TTS worker): forward right away
+        trace = self._new_trace(cmd, "")
+        trace["spans"].append(span)
+        self._store(trace)
+        self._emit(trace)
+
+    def stages(self, prefix, cmd=None):
+        """Returns a StageTimer for code with several sequential stages and early returns."""
+        return StageTimer(self, prefix, cmd)
+
+    # ── Ring buffer ──
+
+    def _new_trace(self, cmd_id, label):
+        return {"id": cmd_id, "label": label, "spans": []}
+
+    def _store(self, trace):
+        with self._lock:
+            existing = self._traces.get(trace["id"])
+            if existing is None:
+                existing = self._new_trace(trace["id"], trace.get("label", ""))
+                self._traces[trace["id"]] = existing
+                while len(self._traces) > self.capacity:
+                    self._traces.popitem(last=False)
+            if trace.get("label"):
+                existing["label"] = trace["label"]
+            existing["spans"].extend(trace["spans"])
+            self.version += 1
+
+    def _emit(self, trace):
+        if self.sink is None:
+            return
+        try:
+            self.sink.put(("TRACE", trace))
+        except Exception:
+            pass
+
+    def ingest(self, trace):
+        """Merges a trace forwarded from another process (UI side)."""
+        if isinstance(trace, dict) and trace.get("id"):
+            self._store(trace)
+
+    def recent(self, limit=None):
+        """Returns copies of the most recent traces, newest first."""
+        with self._lock:
+            traces = list(self._traces.values())
+        traces.reverse()
+        if limit:
+            traces = traces[:limit]
+        return [{"id": t["id"], "label": t["label"], "spans": list(t["spans"])} for t in traces]
+
+    # ── Reporting ──
+
+    @staticmethod
+    def summarize(trace):
+        """
+        Reduces a trace to per-stage milliseconds (see SUMMARY_STAGES) plus the
+        total wall time from the first span start to the last span end.
+        """
+        spans = trace["spans"]
+        summary = {"id": trace["id"], "label": trace["label"], "total_ms": 0.0}
+        if not spans:
+            return summary
+        for title, prefixes in SUMMARY_STAGES:
+            ms = sum((s["end"] - s["start"]) for s in spans if s["name"] in prefixes) / 1e6
+            summary[title] = ms if any(s["name"] in prefixes for s in spans) else None
+        summary["total_ms"] = (max(s["end"] for s in spans) - min(s["start"] for s in spans)) / 1e6
+        return summary
+
+    def export_chrome_trace(self, path, traces=None):
+        """Writes traces (default: the whole ring buffer) as Chrome trace JSON."""
+        traces = traces if traces is not None else self.recent()
+        events = []
+        processes = {}
+        for trace in traces:
+            for s in trace["spans"]:
+                processes[s["pid"]] = s["proc"]
+                args = dict(s["args"])
+                args["command_id"] = trace["id"]
+                if trace["label"]:
+                    args["command"] = trace["label"]
+                events.append({
+                    "name": s["name"],
+                    "cat": s["name"].split(".", 1)[0],
+                    "ph": "X",
+                    "ts": s["start"] / 1000.0,
+                    "dur": (s["end"] - s["start"]) / 1000.0,
+                    "pid": s["pid"],
+                    "tid": s["tid"],
+                    "args": args,
+                })
+        for pid, proc in processes.items():
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": proc}})
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+
+class StageTimer:
+    """Records consecutive stages as spans named '<prefix>.<stage>'."""
+
+    def __init__(self, tracer, prefix, cmd=None):
+        self.tracer = tracer
+        self.prefix = prefix
+        self.cmd = cmd
+        self.last = now_ns()
+
+    def mark(self, stage, **args):
+        now = now_ns()
+        self.tracer.record(f"{self.prefix}.{stage}", self.last, now, cmd=self.cmd, **args)
+        self.last = now
+
+
+_tracer = Tracer()
+
+
+def get_tracer():
+    """Returns the process-wide tracer."""
+    return _tracer
+
+
+def configure(process_name, sink=None):
+    _tracer.configure(process_name, sink)
+    return _tracer
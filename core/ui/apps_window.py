@@ -1,24 +1,37 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QTableWidget, QTableWidgetItem, 
-                             QHeaderView, QAbstractItemView, QLineEdit, QApplication,
-                             QMessageBox, QFrame)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize
-from PyQt6.QtGui import QIcon, QFont, QColor, QBrush
+                             QPushButton, QTableView, 
+                             QHeaderView, QLineEdit, QApplication,
+                             QMessageBox)
+from PyQt6.QtCore import QThread, pyqtSignal
 import sys
+import time
 
 # Import backend
 from core.system.apps_manager import AppsManager
+from core.system.inventory import describe_diff
+from core.ui.table_models import (RecordTableModel, SearchFilterProxy, ButtonDelegate, Column,
+                                  connect_search, configure_view, size_sort_key, RIGHT)
+
+
+def can_uninstall(app):
+    return bool(app.get("uninstall_string") or app.get("quiet_uninstall_string"))
+
+
+def can_repair(app):
+    return bool(app.get("modify_path") or ("MsiExec.exe" in app.get("uninstall_string", "")))
 
 class AppScanWorker(QThread):
-    finished = pyqtSignal(list)
+    finished = pyqtSignal(list, object)
     
-    def __init__(self, apps_manager):
+    def __init__(self, apps_manager, force=False):
         super().__init__()
         self.am = apps_manager
+        self.force = force
         
     def run(self):
-        apps = self.am.get_installed_apps()
-        self.finished.emit(apps)
+        # Re-scans only if the package database changed (or on an explicit refresh)
+        apps, diff = self.am.refresh_apps(self.force)
+        self.finished.emit(apps, diff)
 
 class AppActionWorker(QThread):
     finished = pyqtSignal(bool, str)
@@ -44,9 +57,19 @@ class AppsWindow(QWidget):
         self.am = AppsManager()
         self.all_apps = []
         self.initUI()
+        self.show_cached()
         self.scan_apps()
 
     def initUI(self):
+        self.model = RecordTableModel([
+            Column("Name", "name"),
+            Column("Version", "version"),
+            Column("Size", "size", align=RIGHT, sort=lambda a: size_sort_key(a.get("size"))),
+            Column("Uninstall", None),
+            Column("Repair", None),
+        ], search_keys=("name",))
+        self.proxy = SearchFilterProxy(self.model)
+
         self.setWindowTitle("Installed Applications Manager")
         self.setGeometry(100, 100, 1000, 700)
         self.setStyleSheet("""
@@ -55,13 +78,13 @@ class AppsWindow(QWidget):
                 color: #ffffff;
                 font-family: 'Segoe UI', sans-serif;
             }
-            QTableWidget {
+            QTableView {
                 background-color: #252526;
                 gridline-color: #3e3e42;
                 border: none;
                 border-radius: 8px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 5px;
             }
             QHeaderView::section {
@@ -124,7 +147,7 @@ class AppsWindow(QWidget):
         header_layout.addStretch()
         
         self.refresh_btn = QPushButton("Refresh List")
-        self.refresh_btn.clicked.connect(self.scan_apps)
+        self.refresh_btn.clicked.connect(lambda: self.scan_apps(force=True))
         self.refresh_btn.setFixedWidth(120)
         header_layout.addWidget(self.refresh_btn)
         
@@ -135,7 +158,8 @@ class AppsWindow(QWidget):
         search_label = QLabel("Search:")
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Type to filter applications...")
-        self.search_input.textChanged.connect(self.filter_apps)
+        # Debounced: the proxy filters once typing pauses
+        connect_search(self.search_input, self.proxy)
         
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.search_input)
@@ -146,23 +170,27 @@ class AppsWindow(QWidget):
         self.status_label.setStyleSheet("color: #aaaaaa; font-style: italic;")
         layout.addWidget(self.status_label)
 
-        # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Name", "Version", "Size", "Uninstall", "Repair"])
-        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed)
-        self.table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.Fixed)
+        # Table: model/view, so only the visible rows are ever rendered
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        # Fixed widths: ResizeToContents would measure every row
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed)
+        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Fixed)
+        self.table.setColumnWidth(1, 160)
+        self.table.setColumnWidth(2, 100)
         self.table.setColumnWidth(3, 120)
         self.table.setColumnWidth(4, 120)
-        
-        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.table.verticalHeader().setDefaultSectionSize(45)
-        self.table.verticalHeader().setVisible(False)
+        self.table.setItemDelegateForColumn(3, ButtonDelegate(
+            lambda a: "Uninstall" if can_uninstall(a) else None,
+            lambda a: self.perform_action("uninstall", a), self.table, color=lambda a: "#d83b01"))
+        self.table.setItemDelegateForColumn(4, ButtonDelegate(
+            lambda a: "Repair" if can_repair(a) else None,
+            lambda a: self.perform_action("repair", a), self.table, color=lambda a: "#107c10"))
+        configure_view(self.table)
         self.table.setShowGrid(False)
         self.table.setAlternatingRowColors(True)
         self.table.setStyleSheet("alternate-background-color: #2d2d30;")
@@ -170,62 +198,45 @@ class AppsWindow(QWidget):
         layout.addWidget(self.table)
         self.setLayout(layout)
 
-    def scan_apps(self):
-        self.status_label.setText("Scanning installed applications... This may take a moment.")
+    def show_cached(self):
+        """Shows the last scan immediately while the background check runs."""
+        cached = self.am.get_cached_apps()
+        if cached:
+            self.all_apps = cached
+            self.display_apps(cached)
+
+    def scan_apps(self, force=False):
+        if self.all_apps and not force:
+            self.status_label.setText(f"{len(self.all_apps)} applications (cached). Checking for changes...")
+        else:
+            self.status_label.setText("Scanning installed applications... This may take a moment.")
         self.refresh_btn.setEnabled(False)
-        self.table.setRowCount(0)
         
-        self.worker = AppScanWorker(self.am)
+        self.worker = AppScanWorker(self.am, force)
         self.worker.finished.connect(self.on_scan_finished)
         self.worker.start()
 
-    def on_scan_finished(self, apps):
-        self.all_apps = apps
-        self.display_apps(apps)
-        self.status_label.setText(f"Scan complete. Found {len(apps)} applications.")
+    def on_scan_finished(self, apps, diff):
+        if diff is not None or apps != self.all_apps:
+            self.all_apps = apps
+            self.display_apps(apps)
         self.refresh_btn.setEnabled(True)
 
-    def filter_apps(self, text):
-        filtered = [app for app in self.all_apps if text.lower() in app['name'].lower()]
-        self.display_apps(filtered)
+        scanned = self.am.inventory.last_scan()
+        when = time.strftime("%H:%M", time.localtime(scanned)) if scanned else "now"
+        status = f"Found {len(apps)} applications (scanned {when})."
+        last = self.am.inventory.last_diff()
+        if describe_diff(last):
+            since = time.strftime("%b %d %H:%M", time.localtime(last["since"]))
+            status += f" Since {since}: {describe_diff(last)}."
+            self.status_label.setToolTip("\n".join(
+                [f"+ {name}" for name in last["added"]] +
+                [f"- {name}" for name in last["removed"]] +
+                [f"~ {name}: {old} -> {new}" for name, old, new in last["changed"]]))
+        self.status_label.setText(status)
 
     def display_apps(self, apps):
-        self.table.setRowCount(len(apps))
-        for i, app in enumerate(apps):
-            # Name
-            self.table.setItem(i, 0, QTableWidgetItem(app["name"]))
-            
-            # Version
-            self.table.setItem(i, 1, QTableWidgetItem(app.get("version", "-")))
-            
-            # Size
-            size_item = QTableWidgetItem(app.get("size", "-"))
-            size_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            self.table.setItem(i, 2, size_item)
-            
-            # Uninstall Button
-            if app.get("uninstall_string") or app.get("quiet_uninstall_string"):
-                btn_uninstall = QPushButton("Uninstall")
-                btn_uninstall.setStyleSheet("""
-                    QPushButton { background-color: #d83b01; }
-                    QPushButton:hover { background-color: #ea4a1f; }
-                """)
-                btn_uninstall.clicked.connect(lambda checked, a=app: self.perform_action("uninstall", a))
-                self.table.setCellWidget(i, 3, btn_uninstall)
-            else:
-                self.table.setItem(i, 3, QTableWidgetItem("-"))
-
-            # Repair Button
-            if app.get("modify_path") or ("MsiExec.exe" in app.get("uninstall_string", "")):
-                btn_repair = QPushButton("Repair")
-                btn_repair.setStyleSheet("""
-                    QPushButton { background-color: #107c10; }
-                    QPushButton:hover { background-color: #1a8a1a; }
-                """)
-                btn_repair.clicked.connect(lambda checked, a=app: self.perform_action("repair", a))
-                self.table.setCellWidget(i, 4, btn_repair)
-            else:
-                self.table.setItem(i, 4, QTableWidgetItem("-"))
+        self.model.set_records(apps)
 
     def perform_action(self, action, app_data):
         confirm = QMessageBox.question(
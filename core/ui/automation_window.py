@@ -2,13 +2,19 @@
                              QLabel, QPushButton, QFrame, QSplitter, QListWidget,
                              QGraphicsView, QGraphicsScene, QGraphicsItem, QGraphicsPathItem,
                              QInputDialog, QMenu, QMessageBox, QComboBox, QDialog)
-from PyQt6.QtCore import Qt, QRectF, QPointF, QMimeData
+from PyQt6.QtCore import Qt, QRectF, QPointF, QMimeData, QTimer, pyqtSignal
 from PyQt6.QtGui import QBrush, QPen, QColor, QPainter, QPainterPath, QDrag, QPainterPathStroker
 from .styles import get_stylesheet, THEME_COLORS
 import os
 import json
 from core.runtime_path import get_app_root
 
+# Level of detail (view scale) below which the canvas draws less:
+# no shadows or value previews, then bare shapes and hairline wires
+LOD_DETAIL = 0.6
+LOD_OUTLINE = 0.35
+VALIDATE_DELAY_MS = 150     # validation runs once edits pause
+
 # --- 0. Custom List Widget to ensure clean Mime Data ---
 class NodeList(QListWidget):
     def mousePressEvent(self, event):
@@ -48,6 +54,8 @@ class ConnectionPath(QGraphicsPathItem):
         pen.setCapStyle(Qt.PenCapStyle.RoundCap)
         self.setPen(pen)
         self.setFlags(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
+        self._ends = None   # (start, end) the current path was built for
+        self._shape = None  # hit-test outline, built on first use after a path change
         self.update_path()
         
     def update_pos(self, pos):
@@ -57,6 +65,12 @@ class ConnectionPath(QGraphicsPathItem):
     def update_path(self):
         start = self.start_port.scenePos()
         end = self.end_port.scenePos() if self.end_port else self.cur_pos
+        # A wire between two nodes dragged together is notified by both; build it once
+        ends = (start.x(), start.y(), end.x(), end.y())
+        if ends == self._ends:
+            return
+        self._ends = ends
+        self._shape = None
         
         path = QPainterPath()
         path.moveTo(start)
@@ -72,10 +86,22 @@ class ConnectionPath(QGraphicsPathItem):
 
     def shape(self):
         # Improve hit testing for thin lines
-        path = self.path()
-        stroker = QPainterPathStroker()
-        stroker.setWidth(10) # 10px clickable width
-        return stroker.createStroke(path)
+        if self._shape is None:
+            stroker = QPainterPathStroker()
+            stroker.setWidth(10) # 10px clickable width
+            self._shape = stroker.createStroke(self.path())
+        return self._shape
+
+    def paint(self, painter, option, widget=None):
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < LOD_OUTLINE:
+            # Zoomed far out: hairline, no antialiasing
+            pen = QPen(self.pen().color(), 0)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+            painter.setPen(pen)
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawPath(self.path())
+            return
+        super().paint(painter, option, widget)
 
 # --- 2. Port Item (Input/Output Dots) ---
 class PortItem(QGraphicsItem):
@@ -143,8 +169,9 @@ class NodeItem(QGraphicsItem):
         self.setPos(x, y)
         self.setFlags(QGraphicsItem.GraphicsItemFlag.ItemIsMovable | 
                       QGraphicsItem.GraphicsItemFlag.ItemIsSelectable |
-                      QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges |
-                      QGraphicsItem.GraphicsItemFlag.ItemSendsScenePositionChanges)
+                      QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
+        # Painted once per zoom level and reused while dragging; update() refreshes it
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
         
         # Determine Color
         if text == "Start": self.color = QColor("#39FF14")
@@ -225,21 +252,40 @@ class NodeItem(QGraphicsItem):
         
     def paint(self, painter, option, widget):
         rect = self.boundingRect()
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        
+        if lod < LOD_OUTLINE:
+            # Zoomed far out: just the colored shape, so large graphs stay readable and cheap
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(self.color)
+            if self.text == "If Condition":
+                path = QPainterPath()
+                path.moveTo(75, 0)
+                path.lineTo(150, 40)
+                path.lineTo(75, 80)
+                path.lineTo(0, 40)
+                path.closeSubpath()
+                painter.drawPath(path)
+            else:
+                painter.drawRect(rect)
+            return
+        
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # Shadow
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(QColor(0, 0, 0, 50))
-        if self.text == "If Condition":
-            path = QPainterPath()
-            path.moveTo(75, 0)
-            path.lineTo(150, 40)
-            path.lineTo(75, 80)
-            path.lineTo(0, 40)
-            path.closeSubpath()
-            painter.drawPath(path.translated(2, 2))
-        else:
-            painter.drawRoundedRect(rect.adjusted(2, 2, 2, 2), 8, 8)
+        if lod >= LOD_DETAIL:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(0, 0, 0, 50))
+            if self.text == "If Condition":
+                path = QPainterPath()
+                path.moveTo(75, 0)
+                path.lineTo(150, 40)
+                path.lineTo(75, 80)
+                path.lineTo(0, 40)
+                path.closeSubpath()
+                painter.drawPath(path.translated(2, 2))
+            else:
+                painter.drawRoundedRect(rect.adjusted(2, 2, 2, 2), 8, 8)
         
         # Body
         painter.setPen(QPen(self.color, 2))
@@ -270,7 +316,7 @@ class NodeItem(QGraphicsItem):
             painter.drawText(QRectF(0, 0, 150, 20), Qt.AlignmentFlag.AlignCenter, self.text)
 
         # Property Preview
-        if self.properties.get("value"):
+        if self.properties.get("value") and lod >= LOD_DETAIL:
             painter.setPen(Qt.GlobalColor.white)
             font = painter.font()
             font.setPointSize(8)
@@ -287,6 +333,57 @@ class NodeItem(QGraphicsItem):
              if self.out_false: self.out_false.update_connections()
         return super().itemChange(change, value)
 
+class GraphScene(QGraphicsScene):
+    """
+    Canvas scene that keeps the workflow graph (nodes and finished wires) up
+    to date as items come and go, so validation never has to walk
+    scene.items(). Moving a node doesn't change the graph and emits nothing.
+    """
+    graphChanged = pyqtSignal()
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.nodes = {}         # NodeItem -> None, in the order they were added
+        self.wires = set()      # finished ConnectionPaths
+
+    def addItem(self, item):
+        super().addItem(item)
+        if isinstance(item, NodeItem):
+            self.nodes[item] = None
+            self.graphChanged.emit()
+        elif isinstance(item, ConnectionPath) and item.end_port is not None:
+            self.connection_completed(item)
+
+    def removeItem(self, item):
+        changed = self.nodes.pop(item, False) is None
+        if item in self.wires:
+            self.wires.discard(item)
+            changed = True
+        super().removeItem(item)
+        if changed:
+            self.graphChanged.emit()
+
+    def clear(self):
+        super().clear()
+        self.nodes.clear()
+        self.wires.clear()
+        self.graphChanged.emit()
+
+    def connection_completed(self, conn):
+        """A wire got both ends (dropped on an input port, or loaded from a file)."""
+        self.wires.add(conn)
+        self.graphChanged.emit()
+
+    def adjacency(self):
+        """{node: {port tag: [next nodes]}} built from the wire set."""
+        adj = {node: {} for node in self.nodes}
+        for conn in self.wires:
+            src = conn.start_port.parent_node
+            if src in adj:
+                adj[src].setdefault(conn.start_port.tag, []).append(conn.end_port.parent_node)
+        return adj
+
+
 class ZoomableView(QGraphicsView):
     def wheelEvent(self, event):
         if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
@@ -370,6 +467,8 @@ class FlowView(ZoomableView):
                 self.temp_line.end_port = item
                 item.add_connection(self.temp_line) # <--- Fix: Register connection with input port
                 self.temp_line.update_path()
+                if isinstance(self.scene(), GraphScene):
+                    self.scene().connection_completed(self.temp_line)
                 self.temp_line = None
             else:
                 self.scene().removeItem(self.temp_line)
@@ -475,7 +574,7 @@ class AutomationWindow(QMainWindow):
         splitter.addWidget(tools)
         
         # Canvas
-        self.scene = QGraphicsScene()
+        self.scene = GraphScene()
         self.scene.setSceneRect(0, 0, 5000, 5000)
         self.view = FlowView(self.scene)
         splitter.addWidget(self.view)
@@ -523,8 +622,14 @@ class AutomationWindow(QMainWindow):
         
         # Load and Initialize Workflows
         self.init_workflows()
-        # Re-validate the canvas whenever nodes are added/removed
-        self.scene.changed.connect(self._on_scene_changed)
+        # Re-validate once edits pause, and only when nodes or wires were added/removed
+        # (scene.changed also fires for every repaint while dragging)
+        self._validate_timer = QTimer(self)
+        self._validate_timer.setSingleShot(True)
+        self._validate_timer.setInterval(VALIDATE_DELAY_MS)
+        self._validate_timer.timeout.connect(self._on_scene_changed)
+        self.scene.graphChanged.connect(self._validate_timer.start)
+        self._on_scene_changed()
 
     def init_workflows(self):
         import json, glob
@@ -756,29 +861,19 @@ class AutomationWindow(QMainWindow):
         QMessageBox.information(self, "Neural Sync Help", msg)
 
     def _on_scene_changed(self, _=None):
-        """Called whenever the scene changes — re-runs live validation."""
+        """Called once graph edits pause — re-runs live validation."""
         self.validate_canvas(save_blocked=False)
 
     def validate_canvas(self, save_blocked=True):
         """
-        DFS from Start. Every possible output path must terminate at an End node.
+        Walks the graph from Start. Every possible output path must terminate at an End node.
         - Regular nodes: must have exactly one outgoing connection.
         - If Condition: must have BOTH 'true' and 'false' outgoing connections.
+        Each reachable node is checked once (a node's issues only depend on its own
+        outputs), so this is linear in the reachable part of the graph.
         Returns True if fully valid, False otherwise.
         """
-        # Collect nodes and connections
-        all_nodes = []
-        conn_list = []  # (src_node, tag, dst_node)
-        for item in self.scene.items():
-            if isinstance(item, NodeItem):
-                all_nodes.append(item)
-            elif isinstance(item, ConnectionPath):
-                if item.start_port and item.end_port:
-                    conn_list.append((
-                        item.start_port.parent_node,
-                        item.start_port.tag,  # None, "true", or "false"
-                        item.end_port.parent_node
-                    ))
+        all_nodes = list(self.scene.nodes)
 
         def _set_error(msg):
             self.lbl_validation.setText(f"⚠ {msg}")
@@ -797,44 +892,48 @@ class AutomationWindow(QMainWindow):
         if "End" not in types_present:
             _set_error("Missing END node"); return False
 
-        # Build adjacency: node -> {tag: [dst_nodes]}
-        adj = {n: {} for n in all_nodes}
-        for (src, tag, dst) in conn_list:
-            if src in adj:
-                adj[src].setdefault(tag, []).append(dst)
+        # Adjacency: node -> {tag: [dst_nodes]}, kept current by the scene
+        adj = self.scene.adjacency()
 
-        # DFS traversal
+        # Depth-first, in the same order as a recursive walk: each step is either
+        # an issue to record or a node to visit
         start_node = next(n for n in all_nodes if n.text == "Start")
         open_issues = []
-
-        def dfs(node, visited):
+        visited = set()
+        stack = [("visit", start_node)]
+        while stack:
+            kind, value = stack.pop()
+            if kind == "issue":
+                open_issues.append(value)
+                continue
+            node = value
             if node in visited:
-                return  # Cycle — skip, engine handles this
-            visited = visited | {node}
+                continue  # Cycle or shared branch — already checked
+            visited.add(node)
 
             if node.text == "End":
-                return  # ✅ Path closed
+                continue  # ✅ Path closed
 
+            steps = []
             if node.text == "If Condition":
                 true_next  = adj.get(node, {}).get("true",  [])
                 false_next = adj.get(node, {}).get("false", [])
                 if not true_next:
-                    open_issues.append("IF True (green) branch has no connection")
+                    steps.append(("issue", "IF True (green) branch has no connection"))
                 else:
-                    for n in true_next: dfs(n, visited)
+                    steps.extend(("visit", n) for n in true_next)
                 if not false_next:
-                    open_issues.append("IF False (red) branch has no connection")
+                    steps.append(("issue", "IF False (red) branch has no connection"))
                 else:
-                    for n in false_next: dfs(n, visited)
+                    steps.extend(("visit", n) for n in false_next)
             else:
                 # Regular node — follow None-tagged outgoing wire
                 next_nodes = adj.get(node, {}).get(None, [])
                 if not next_nodes:
-                    open_issues.append(f"'{node.text}' output is not connected")
+                    steps.append(("issue", f"'{node.text}' output is not connected"))
                 else:
-                    for n in next_nodes: dfs(n, visited)
-
-        dfs(start_node, set())
+                    steps.extend(("visit", n) for n in next_nodes)
+            stack.extend(reversed(steps))
 
         if open_issues:
             unique = list(dict.fromkeys(open_issues))
@@ -1316,6 +1415,7 @@ class AutomationListDialog(QDialog):
         self._edit_mode      = False          # track if inline editor is active
         self._edit_scene     = None
         self._edit_view      = None
+        self._history_mode   = False          # run history shown instead of the preview
 
         # â”€â”€ Root horizontal layout â”€â”€
         root_h = QHBoxLayout(self)
@@ -1410,13 +1510,19 @@ class AutomationListDialog(QDialog):
         rp_layout.addWidget(self.preview_view, stretch=1)
 
         # Inline editor (FlowView â€” hidden until Edit is clicked)
-        self._edit_scene = QGraphicsScene()
+        self._edit_scene = GraphScene()
         self._edit_scene.setSceneRect(0, 0, 5000, 5000)
         self._edit_view  = FlowView(self._edit_scene)
         self._edit_view.setStyleSheet("background: #0e0e0e; border: 1px solid #232323; border-radius: 6px;")
         self._edit_view.setVisible(False)
         rp_layout.addWidget(self._edit_view, stretch=1)
 
+        # Run history (recorded runs + timeline — hidden until History is clicked)
+        from .run_history import RunHistoryPanel
+        self.history_panel = RunHistoryPanel(accent=self.accent)
+        self.history_panel.setVisible(False)
+        rp_layout.addWidget(self.history_panel, stretch=1)
+
         # Action buttons row
         actions = QHBoxLayout()
         actions.setSpacing(6)
@@ -1441,6 +1547,11 @@ class AutomationListDialog(QDialog):
         self.btn_save.setVisible(False)
         self.btn_save.clicked.connect(self.on_save_inline)
 
+        self.btn_history = QPushButton("History")
+        self.btn_history.setEnabled(False)
+        self.btn_history.setToolTip("Past runs and per-step timing")
+        self.btn_history.clicked.connect(self.on_toggle_history)
+
         self.btn_delete = QPushButton("Delete")
         self.btn_delete.setEnabled(False)
         self.btn_delete.setStyleSheet(
@@ -1453,6 +1564,7 @@ class AutomationListDialog(QDialog):
         actions.addWidget(self.btn_set_primary)
         actions.addWidget(self.btn_edit)
         actions.addWidget(self.btn_save)
+        actions.addWidget(self.btn_history)
         actions.addStretch()
         actions.addWidget(self.btn_delete)
         rp_layout.addLayout(actions)
@@ -1472,6 +1584,7 @@ class AutomationListDialog(QDialog):
             self.resize(self.EXPANDED_W, self.height())
 
     def close_right_panel(self):
+        self._exit_history_mode()
         self._exit_edit_mode()
         self.right_panel.setVisible(False)
         self.resize(self.COMPACT_W, self.height())
@@ -1573,11 +1686,14 @@ class AutomationListDialog(QDialog):
         self.btn_set_primary.setEnabled(name != self.current_primary)
         self.btn_run.setEnabled(True)
         self.btn_edit.setEnabled(True)
+        self.btn_history.setEnabled(True)
         self.btn_delete.setEnabled(True)
 
         # Exit edit mode for previous selection before showing preview
         self._exit_edit_mode()
         self._load_preview(name)
+        if self._history_mode:
+            self.history_panel.show_workflow(name)
         self._show_right_panel()
 
     def on_run_selected(self):
@@ -1596,7 +1712,7 @@ class AutomationListDialog(QDialog):
         def _run():
             try:
                 engine = AutomationEngine(speaker=_StubSpeaker())
-                engine.execute_workflow(workflow_name=self.selected_name)
+                engine.execute_workflow(workflow_name=self.selected_name, source="manager")
             except Exception as e:
                 print(f"[AutomationListDialog] Run error: {e}")
 
@@ -1662,6 +1778,7 @@ class AutomationListDialog(QDialog):
     def _enter_edit_mode(self):
         """Switch right panel from read-only preview to interactive FlowView."""
         if not self.selected_name: return
+        self._exit_history_mode()
         self._edit_mode = True
         self.btn_edit.setText("Cancel Edit")
         self.btn_save.setVisible(True)
@@ -1702,7 +1819,31 @@ class AutomationListDialog(QDialog):
         self.btn_edit.setText("Edit")
         self.btn_save.setVisible(False)
         self._edit_view.setVisible(False)
-        self.preview_view.setVisible(True)
+        self.preview_view.setVisible(not self._history_mode)
+
+    def on_toggle_history(self):
+        if self._history_mode:
+            self._exit_history_mode()
+        else:
+            self._enter_history_mode()
+
+    def _enter_history_mode(self):
+        """Show the recorded runs of the selected automation instead of its preview."""
+        if not self.selected_name: return
+        self._exit_edit_mode()
+        self._history_mode = True
+        self.btn_history.setText("Preview")
+        self.preview_view.setVisible(False)
+        self.history_panel.show_workflow(self.selected_name)
+        self.history_panel.setVisible(True)
+
+    def _exit_history_mode(self):
+        if not self._history_mode: return
+        self._history_mode = False
+        self.btn_history.setText("History")
+        self.history_panel.setVisible(False)
+        if not self._edit_mode:
+            self.preview_view.setVisible(True)
 
     def on_save_inline(self):
         """Serialize the inline edit scene and save to disk."""
@@ -0,0 +1,162 @@
+import os
+import json
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget,
+                             QListWidgetItem, QPlainTextEdit, QPushButton, QSplitter)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont, QTextCursor
+from .styles import get_stylesheet
+from core.runtime_path import get_app_root
+
+MAX_JOB_CHARS = 1024 * 1024     # output kept per job in the console
+MAX_JOBS = 50                   # finished jobs kept in the list
+
+_STATUS_LABELS = {
+    "queued": "queued", "running": "running", "ok": "done", "failed": "failed",
+    "timeout": "timed out", "cancelled": "cancelled", "error": "error",
+}
+
+
+class CommandConsole(QWidget):
+    """One reusable window for the output of every command run by core.command_runner."""
+
+    def __init__(self, action_queue=None):
+        super().__init__()
+        self.action_queue = action_queue
+        self.jobs = {}          # job id -> {"title", "command", "status", "chunks", "size", "item"}
+        self.setWindowTitle("Cortex - Command Console")
+        self.setGeometry(180, 180, 900, 550)
+
+        config_path = os.path.join(get_app_root(), 'data', 'user_config.json')
+        theme = "Neon Green"
+        if os.path.exists(config_path):
+            try:
+                with open(config_path, 'r') as f:
+                    theme = json.load(f).get("theme", "Neon Green")
+            except: pass
+        self.setStyleSheet(get_stylesheet(theme))
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        header = QLabel("Command Console")
+        header.setObjectName("Header")
+        layout.addWidget(header)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.job_list = QListWidget()
+        self.job_list.currentItemChanged.connect(self.show_selected)
+        splitter.addWidget(self.job_list)
+
+        self.output = QPlainTextEdit()
+        self.output.setReadOnly(True)
+        self.output.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.output.setMaximumBlockCount(20000)
+        font = QFont("Monospace")
+        font.setStyleHint(QFont.StyleHint.TypeWriter)
+        self.output.setFont(font)
+        splitter.addWidget(self.output)
+        splitter.setSizes([250, 650])
+        layout.addWidget(splitter, stretch=1)
+
+        buttons = QHBoxLayout()
+        self.lbl_command = QLabel("")
+        self.lbl_command.setWordWrap(True)
+        buttons.addWidget(self.lbl_command, stretch=1)
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.clicked.connect(self.cancel_selected)
+        buttons.addWidget(self.btn_cancel)
+        btn_clear = QPushButton("Clear Finished")
+        btn_clear.clicked.connect(self.clear_finished)
+        buttons.addWidget(btn_clear)
+        layout.addLayout(buttons)
+
+    # ── Events from the engine ──
+
+    def handle_event(self, event):
+        job_id = event.get("job")
+        kind = event.get("event")
+        if kind == "queued":
+            item = QListWidgetItem()
+            item.setData(Qt.ItemDataRole.UserRole, job_id)
+            self.job_list.insertItem(0, item)
+            self.jobs[job_id] = {"title": event.get("title", ""), "command": event.get("command", ""),
+                                 "status": "queued", "chunks": [], "size": 0, "item": item}
+            self._label(job_id)
+            self._trim_jobs()
+            # Follow the newest command unless the user is reading a still-running one
+            current = self._current_job()
+            if current is None or current["status"] not in ("queued", "running"):
+                self.job_list.setCurrentItem(item)
+            return
+
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        if kind == "started":
+            job["status"] = "running"
+        elif kind == "output":
+            self._append(job_id, event.get("text", ""))
+        elif kind == "finished":
+            job["status"] = event.get("status", "ok")
+            footer = f"\n[{_STATUS_LABELS.get(job['status'], job['status'])}"
+            if event.get("returncode") is not None:
+                footer += f", exit code {event['returncode']}"
+            footer += f", {event.get('elapsed', 0):.1f}s]\n"
+            self._append(job_id, footer)
+        self._label(job_id)
+        self._update_buttons()
+
+    def _append(self, job_id, text):
+        job = self.jobs[job_id]
+        job["chunks"].append(text)
+        job["size"] += len(text)
+        while job["size"] > MAX_JOB_CHARS and len(job["chunks"]) > 1:
+            job["size"] -= len(job["chunks"].pop(0))
+        if self._current_id() == job_id:
+            cursor = self.output.textCursor()
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText(text)
+            self.output.ensureCursorVisible()
+
+    def _label(self, job_id):
+        job = self.jobs[job_id]
+        job["item"].setText(f"{job['title']}  ({_STATUS_LABELS.get(job['status'], job['status'])})")
+
+    def _trim_jobs(self):
+        finished = [jid for jid, job in self.jobs.items() if job["status"] not in ("queued", "running")]
+        for jid in finished[:max(0, len(self.jobs) - MAX_JOBS)]:
+            self._remove(jid)
+
+    def _remove(self, job_id):
+        job = self.jobs.pop(job_id)
+        self.job_list.takeItem(self.job_list.row(job["item"]))
+
+    # ── Selection / actions ──
+
+    def _current_id(self):
+        item = self.job_list.currentItem()
+        return item.data(Qt.ItemDataRole.UserRole) if item else None
+
+    def _current_job(self):
+        return self.jobs.get(self._current_id())
+
+    def show_selected(self, *args):
+        job = self._current_job()
+        self.output.setPlainText("".join(job["chunks"]) if job else "")
+        self.output.moveCursor(QTextCursor.MoveOperation.End)
+        self.lbl_command.setText(f"$ {job['command']}" if job else "")
+        self._update_buttons()
+
+    def _update_buttons(self):
+        job = self._current_job()
+        self.btn_cancel.setEnabled(bool(job and job["status"] in ("queued", "running")))
+
+    def cancel_selected(self):
+        job_id = self._current_id()
+        if job_id is not None and self.action_queue:
+            self.action_queue.put(("CANCEL_COMMAND", job_id))
+
+    def clear_finished(self):
+        for job_id in [jid for jid, job in self.jobs.items() if job["status"] not in ("queued", "running")]:
+            self._remove(job_id)
+        self.show_selected()
@@ -1,15 +1,17 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QTableWidget, QTableWidgetItem, 
-                             QHeaderView, QAbstractItemView, QFrame, QScrollArea,
-                             QSizePolicy, QApplication)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize, QTimer, QRect
-from PyQt6.QtGui import QIcon, QFont, QColor, QBrush, QPainter, QPen
+                             QPushButton, QTableView, QLineEdit,
+                             QHeaderView, QApplication)
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QRect
+from PyQt6.QtGui import QColor, QPainter, QPen
 import sys
-import os
 import platform
+import time
 
 # Import backend
 from core.system.drivers import DriverManager
+from core.system.inventory import describe_diff
+from core.ui.table_models import (RecordTableModel, SearchFilterProxy, ButtonDelegate, Column,
+                                  connect_search, configure_view)
 
 class LoadingButton(QPushButton):
     """A button that shows a rolling spinner when in loading state."""
@@ -61,41 +63,68 @@ class LoadingButton(QPushButton):
             # Draw a 270 degree arc that rotates
             painter.drawArc(rect, self.angle * 16, 270 * 16)
 
+def has_update(item):
+    return item["status"] == "Update Available"
+
+
+def status_color(item):
+    return "#ffaa00" if has_update(item) else "#00cc66"
+
+
+def action_label(item):
+    """Text of the Action cell button: update progress for winget packages, web search for drivers."""
+    if has_update(item) and item["update_method"] == "winget":
+        return {"loading": "Updating...", "success": "Success", "failed": "Failed"}.get(item.get("action_state"), "Update")
+    if item["update_method"] == "manual":
+        return "Search Info"
+    return None
+
+
+def action_color(item):
+    if item["update_method"] == "manual":
+        return "#444444"
+    return {"loading": "#555555", "success": "#00cc66", "failed": "#d83b01"}.get(item.get("action_state"), "#0078d4")
+
+
+def build_rows(drivers, updates):
+    """Table rows: available software updates first, then installed drivers."""
+    final_list = []
+    for update in updates:
+        final_list.append({
+            "name": update["name"],
+            "version": f"{update['current_version']} -> {update['new_version']}",
+            "manufacturer": "N/A",
+            "type": "Software Update",
+            "status": "Update Available",
+            "id": update["id"],
+            "update_method": "winget"
+        })
+        
+    for driver in drivers:
+        final_list.append({
+            "name": driver["name"],
+            "version": driver["version"],
+            "manufacturer": driver["manufacturer"],
+            "type": driver["type"],
+            "status": "Up to Date",
+            "id": driver["id"],
+            "update_method": "manual"
+        })
+    return final_list
+
 class DriverScanWorker(QThread):
-    finished = pyqtSignal(list)
+    finished = pyqtSignal(list, object)
     
-    def __init__(self, driver_manager):
+    def __init__(self, driver_manager, force=False):
         super().__init__()
         self.dm = driver_manager
+        self.force = force
         
     def run(self):
-        drivers = self.dm.get_drivers()
+        # Driver list comes from the inventory cache unless drivers changed; updates are always checked
+        drivers, diff = self.dm.refresh_drivers(self.force)
         updates = self.dm.check_updates()
-        
-        final_list = []
-        for update in updates:
-            final_list.append({
-                "name": update["name"],
-                "version": f"{update['current_version']} -> {update['new_version']}",
-                "manufacturer": "N/A",
-                "type": "Software Update",
-                "status": "Update Available",
-                "id": update["id"],
-                "update_method": "winget"
-            })
-            
-        for driver in drivers:
-            final_list.append({
-                "name": driver["name"],
-                "version": driver["version"],
-                "manufacturer": driver["manufacturer"],
-                "type": driver["type"],
-                "status": "Up to Date",
-                "id": driver["id"],
-                "update_method": "manual"
-            })
-            
-        self.finished.emit(final_list)
+        self.finished.emit(build_rows(drivers, updates), diff)
 
 class UpdateWorker(QThread):
     finished = pyqtSignal(bool, str)
@@ -113,21 +142,32 @@ class DriverWindow(QWidget):
     def __init__(self):
         super().__init__()
         self.dm = DriverManager()
-        self.update_buttons = {} # Store buttons to access them later
         self.initUI()
+        self.show_cached()
         self.scan_drivers()
 
     def initUI(self):
+        self.model = RecordTableModel([
+            Column("Name", "name"),
+            Column("Version / Details", "version"),
+            Column("Manufacturer", "manufacturer"),
+            Column("Status", "status", color=status_color, bold=has_update,
+                   sort=lambda item: (not has_update(item), item["status"])),
+            Column("Action", None),
+        ], search_keys=("name", "manufacturer", "type", "version"))
+        self.proxy = SearchFilterProxy(self.model)
+
         self.setWindowTitle("System Component & Driver Manager")
         self.setGeometry(100, 100, 1000, 650)
         self.setStyleSheet("""
             QWidget { background-color: #1e1e1e; color: #ffffff; font-family: 'Segoe UI', sans-serif; }
-            QTableWidget { background-color: #252526; gridline-color: #3e3e42; border: none; border-radius: 8px; }
-            QTableWidget::item { padding: 5px; }
+            QTableView { background-color: #252526; gridline-color: #3e3e42; border: none; border-radius: 8px; }
+            QTableView::item { padding: 5px; }
             QHeaderView::section { background-color: #333337; padding: 5px; border: none; color: #cccccc; font-weight: bold; }
             QPushButton { background-color: #0078d4; color: white; border: none; padding: 4px 10px; min-height: 25px; border-radius: 4px; font-weight: bold; }
             QPushButton:hover { background-color: #1084d9; }
             QPushButton:disabled { background-color: #333333; color: #888888; }
+            QLineEdit { background-color: #333337; color: #ffffff; border: 1px solid #3e3e42; border-radius: 4px; padding: 6px; font-size: 14px; }
             QLabel { font-size: 14px; }
         """)
 
@@ -150,33 +190,41 @@ class DriverWindow(QWidget):
         header_layout.addWidget(self.update_all_btn)
 
         self.scan_btn = QPushButton("Scan for Updates")
-        self.scan_btn.clicked.connect(self.scan_drivers)
+        self.scan_btn.clicked.connect(lambda: self.scan_drivers(force=True))
         self.scan_btn.setFixedWidth(150)
         header_layout.addWidget(self.scan_btn)
         
         layout.addLayout(header_layout)
 
+        # Search Bar
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Type to filter drivers and components...")
+        connect_search(self.search_input, self.proxy)
+        layout.addWidget(self.search_input)
+
         # Status Label
         self.status_label = QLabel("Ready")
         self.status_label.setStyleSheet("color: #aaaaaa; font-style: italic;")
         layout.addWidget(self.status_label)
 
-        # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Name", "Version / Details", "Manufacturer", "Status", "Action"])
+        # Table: model/view, so only the visible rows are ever rendered
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        # Fixed widths: ResizeToContents would measure every row
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Interactive)
         header.setSectionResizeMode(4, QHeaderView.ResizeMode.Fixed)
-        self.table.verticalHeader().setDefaultSectionSize(45)
+        self.table.setColumnWidth(1, 200)
+        self.table.setColumnWidth(2, 180)
+        self.table.setColumnWidth(3, 130)
         self.table.setColumnWidth(4, 150)
-        
-        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.table.verticalHeader().setVisible(False)
+        self.table.setItemDelegateForColumn(4, ButtonDelegate(action_label, self.on_action_clicked,
+                                                              self.table, color=action_color))
+        # Status first: available updates on top, scan order otherwise
+        configure_view(self.table, sort_column=3)
         self.table.setShowGrid(False)
         self.table.setAlternatingRowColors(True)
         self.table.setStyleSheet("alternate-background-color: #2d2d30;")
@@ -184,54 +232,57 @@ class DriverWindow(QWidget):
         layout.addWidget(self.table)
         self.setLayout(layout)
 
-    def scan_drivers(self):
-        self.status_label.setText("Scanning system... This may take a moment.")
+    def show_cached(self):
+        """Shows the last driver scan immediately; update checks fill in when the worker finishes."""
+        cached = self.dm.get_cached_drivers()
+        if cached:
+            self.populate(build_rows(cached, []))
+
+    def scan_drivers(self, force=False):
+        if self.model.rowCount() and not force:
+            self.status_label.setText("Showing cached drivers. Checking for changes and updates...")
+        else:
+            self.status_label.setText("Scanning system... This may take a moment.")
         self.scan_btn.setEnabled(False)
         self.update_all_btn.setEnabled(False)
-        self.table.setRowCount(0)
-        self.update_buttons = {}
         
-        self.worker = DriverScanWorker(self.dm)
+        self.worker = DriverScanWorker(self.dm, force)
         self.worker.finished.connect(self.on_scan_finished)
         self.worker.start()
 
-    def on_scan_finished(self, items):
-        self.status_label.setText(f"Scan complete. Found {len(items)} items.")
+    def on_scan_finished(self, items, diff):
+        status = f"Scan complete. Found {len(items)} items."
+        last = self.dm.inventory.last_diff()
+        if describe_diff(last):
+            since = time.strftime("%b %d %H:%M", time.localtime(last["since"]))
+            status += f" Drivers changed since {since}: {describe_diff(last)}."
+        self.status_label.setText(status)
         self.scan_btn.setEnabled(True)
-        self.table.setRowCount(len(items))
-        
-        has_updates = False
-        for i, item in enumerate(items):
-            self.table.setItem(i, 0, QTableWidgetItem(item["name"]))
-            self.table.setItem(i, 1, QTableWidgetItem(item["version"]))
-            self.table.setItem(i, 2, QTableWidgetItem(item.get("manufacturer", "")))
-            
-            status_item = QTableWidgetItem(item["status"])
-            if item["status"] == "Update Available":
-                status_item.setForeground(QBrush(QColor("#ffaa00")))
-                status_item.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
-                has_updates = True
-            else:
-                status_item.setForeground(QBrush(QColor("#00cc66")))
-            self.table.setItem(i, 3, status_item)
-            
-            if item["status"] == "Update Available" and item["update_method"] == "winget":
-                btn = LoadingButton("Update")
-                btn.setObjectName("ActionBtn")
-                self.update_buttons[item["id"]] = btn
-                btn.clicked.connect(lambda checked, pkg_id=item["id"]: self.perform_update(pkg_id))
-                self.table.setCellWidget(i, 4, btn)
-            elif item["update_method"] == "manual":
-                btn = QPushButton("Search Info")
-                btn.setStyleSheet("background-color: #444444;")
-                btn.clicked.connect(lambda checked, name=item["name"]: self.search_driver(name))
-                self.table.setCellWidget(i, 4, btn)
-        
-        self.update_all_btn.setEnabled(has_updates)
+        self.populate(items)
+
+    def populate(self, items):
+        self.model.set_records(items)
+        self.update_all_btn.setEnabled(bool(self.pending_updates()))
+
+    def pending_updates(self):
+        """Package ids of winget updates that have not been installed from this window yet."""
+        return [item["id"] for item in self.model.records()
+                if has_update(item) and item["update_method"] == "winget" and not item.get("action_state")]
+
+    def _set_action_state(self, package_id, state):
+        row = self.model.find_row(lambda item: item["id"] == package_id and has_update(item))
+        if row >= 0:
+            self.model.record(row)["action_state"] = state
+            self.model.record_changed(row)
+
+    def on_action_clicked(self, item):
+        if item["update_method"] == "manual":
+            self.search_driver(item["name"])
+        elif item.get("action_state") in (None, "failed"):
+            self.perform_update(item["id"])
 
     def perform_update(self, package_id):
-        if package_id in self.update_buttons:
-            self.update_buttons[package_id].start_loading()
+        self._set_action_state(package_id, "loading")
         
         self.status_label.setText(f"Updating {package_id}...")
         worker = UpdateWorker(self.dm, package_id)
@@ -242,18 +293,12 @@ class DriverWindow(QWidget):
         self.active_workers.append(worker)
 
     def on_update_finished(self, success, package_id):
-        if package_id in self.update_buttons:
-            btn = self.update_buttons[package_id]
-            btn.stop_loading("Success" if success else "Failed")
-            if success:
-                btn.setStyleSheet("background-color: #00cc66;") # Green success
-            else:
-                btn.setStyleSheet("background-color: #d83b01;") # Red fail
+        self._set_action_state(package_id, "success" if success else "failed")
         
         self.status_label.setText(f"Finished update for {package_id}: {'Success' if success else 'Failed'}")
 
     def perform_all_updates(self):
-        pkg_ids = list(self.update_buttons.keys())
+        pkg_ids = self.pending_updates()
         if not pkg_ids: return
         
         self.update_all_btn.start_loading()
@@ -1,14 +1,20 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QProgressBar, QFrame, QGridLayout)
+                             QLabel, QProgressBar, QFrame, QGridLayout,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QPushButton,
+                             QListView, QComboBox, QLineEdit)
 from PyQt6.QtCore import QTimer, Qt
 import psutil
 import json
 import os
+import time
 from .styles import get_stylesheet
 from core.runtime_path import get_app_root
+from core.tracing import get_tracer, SUMMARY_STAGES
+from .log_model import ActivityLogModel, LEVELS
+from .table_models import connect_search
 
 class HubWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, log_model=None):
         super().__init__()
         self.setWindowTitle("Cortex Hub - System Dashboard")
         self.setGeometry(100, 100, 900, 600)
@@ -71,12 +77,54 @@ class HubWindow(QMainWindow):
         vitals_layout.addWidget(self.lbl_bat, 2, 1)
         vitals_layout.addWidget(self.bar_bat, 3, 1)
         
+        # History (read-only view of the engine's metric store)
+        self.lbl_history = QLabel("Last hour: collecting history...")
+        vitals_layout.addWidget(self.lbl_history, 4, 0, 1, 2)
+        self.metric_store = None
+        self._history_updated = 0.0
+        
         main_layout.addWidget(vitals_frame)
         
-        # 3. Console / Activity Log Placeholder
+        # 3. Command Latency (live, from the tracer ring buffer)
+        latency_header_layout = QHBoxLayout()
+        latency_header = QLabel("Command Latency")
+        latency_header.setObjectName("SubHeader")
+        latency_header_layout.addWidget(latency_header)
+        latency_header_layout.addStretch()
+        self.btn_export_trace = QPushButton("Export Chrome Trace")
+        self.btn_export_trace.clicked.connect(self.export_trace)
+        latency_header_layout.addWidget(self.btn_export_trace)
+        main_layout.addLayout(latency_header_layout)
+        
+        self.latency_columns = ["Command"] + [title for title, _ in SUMMARY_STAGES] + ["Total"]
+        self.latency_table = QTableWidget(0, len(self.latency_columns))
+        self.latency_table.setHorizontalHeaderLabels([c if c == "Command" else f"{c} (ms)" for c in self.latency_columns])
+        self.latency_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.latency_table.verticalHeader().setVisible(False)
+        self.latency_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.latency_table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.latency_table.setMinimumHeight(160)
+        main_layout.addWidget(self.latency_table)
+        self._latency_version = -1
+        
+        # 4. Activity Log (ring buffer owned by the status window, so it outlives this window)
+        log_header_layout = QHBoxLayout()
         log_header = QLabel("Activity Log")
         log_header.setObjectName("SubHeader")
-        main_layout.addWidget(log_header)
+        log_header_layout.addWidget(log_header)
+        log_header_layout.addStretch()
+        self.cmb_log_level = QComboBox()
+        self.cmb_log_level.addItems([level.title() + ("+" if level != "error" else "") for level in LEVELS])
+        self.cmb_log_level.currentIndexChanged.connect(self.apply_log_filter)
+        log_header_layout.addWidget(self.cmb_log_level)
+        self.cmb_log_subsystem = QComboBox()
+        self.cmb_log_subsystem.addItem("All sources")
+        self.cmb_log_subsystem.currentIndexChanged.connect(self.apply_log_filter)
+        log_header_layout.addWidget(self.cmb_log_subsystem)
+        self.txt_log_filter = QLineEdit()
+        self.txt_log_filter.setPlaceholderText("Filter...")
+        log_header_layout.addWidget(self.txt_log_filter)
+        main_layout.addLayout(log_header_layout)
         
         self.log_frame = QFrame()
         self.log_frame.setObjectName("Card")
@@ -84,11 +132,24 @@ class HubWindow(QMainWindow):
         log_layout = QVBoxLayout()
         self.log_frame.setLayout(log_layout)
         
-        from PyQt6.QtWidgets import QPlainTextEdit
-        self.log_text = QPlainTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setStyleSheet("background-color: #252526; color: #00ff00; border: none; font-family: Consolas;")
-        log_layout.addWidget(self.log_text)
+        self.log_model = log_model if log_model is not None else ActivityLogModel(parent=self)
+        self.log_view = QListView()
+        self.log_view.setModel(self.log_model)
+        self.log_view.setUniformItemSizes(True)     # rows are single lines: no per-row size queries
+        self.log_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.log_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.log_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.log_view.setTextElideMode(Qt.TextElideMode.ElideRight)
+        self.log_view.setStyleSheet("background-color: #252526; color: #00ff00; border: none; font-family: Consolas;")
+        log_layout.addWidget(self.log_view)
+        self._log_follow = True
+        self.log_view.verticalScrollBar().valueChanged.connect(self._on_log_scrolled)
+        self.log_model.rowsInserted.connect(self._on_log_rows_inserted)
+        self.log_model.modelReset.connect(self._on_log_filtered)
+        connect_search(self.txt_log_filter, self.log_model)
+        self.log_model.subsystemsChanged.connect(self._refresh_log_subsystems)
+        self._refresh_log_subsystems()
+        self.log_view.scrollToBottom()
         
         main_layout.addWidget(self.log_frame)
         
@@ -101,12 +162,95 @@ class HubWindow(QMainWindow):
         self.update_stats()
 
     def add_log_entry(self, message):
-        self.log_text.appendPlainText(message)
-        # Scroll to bottom
-        sb = self.log_text.verticalScrollBar()
-        sb.setValue(sb.maximum())
+        self.log_model.append(message)
+
+    def _on_log_scrolled(self, value):
+        # Follow new lines only while the user is at the bottom of the log
+        self._log_follow = value >= self.log_view.verticalScrollBar().maximum() - 2
+
+    def _on_log_rows_inserted(self, *args):
+        if self._log_follow and self.isVisible():
+            self.log_view.scrollToBottom()
+
+    def _refresh_log_subsystems(self):
+        current = self.cmb_log_subsystem.currentText()
+        self.cmb_log_subsystem.blockSignals(True)
+        self.cmb_log_subsystem.clear()
+        self.cmb_log_subsystem.addItem("All sources")
+        self.cmb_log_subsystem.addItems(sorted(self.log_model.subsystems))
+        index = self.cmb_log_subsystem.findText(current)
+        self.cmb_log_subsystem.setCurrentIndex(max(0, index))
+        self.cmb_log_subsystem.blockSignals(False)
+
+    def _on_log_filtered(self):
+        self._log_follow = True
+        self.log_view.scrollToBottom()
+
+    def apply_log_filter(self, *args):
+        subsystem = self.cmb_log_subsystem.currentText()
+        self.log_model.set_filter(
+            level=LEVELS[max(0, self.cmb_log_level.currentIndex())],
+            subsystem=None if self.cmb_log_subsystem.currentIndex() <= 0 else subsystem,
+            text=self.txt_log_filter.text(),
+        )
+
+    def update_latency_panel(self):
+        """Refreshes the latency table when new traces have arrived."""
+        tracer = get_tracer()
+        if tracer.version == self._latency_version:
+            return
+        self._latency_version = tracer.version
+        
+        traces = tracer.recent(limit=15)
+        self.latency_table.setRowCount(len(traces))
+        for row, trace in enumerate(traces):
+            summary = tracer.summarize(trace)
+            values = [summary["label"] or summary["id"]]
+            for title, _ in SUMMARY_STAGES:
+                ms = summary.get(title)
+                values.append("-" if ms is None else f"{ms:.0f}")
+            values.append(f"{summary['total_ms']:.0f}")
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col > 0:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.latency_table.setItem(row, col, item)
+
+    def export_trace(self):
+        path = os.path.join(get_app_root(), 'data', 'logs', f"cortex_trace_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        try:
+            get_tracer().export_chrome_trace(path)
+            self.add_log_entry(f"[Trace] Exported to {path} (open in chrome://tracing or ui.perfetto.dev)")
+        except Exception as e:
+            self.add_log_entry(f"[Trace] Export failed: {e}")
+
+    def update_history(self):
+        """Refreshes the last-hour summary from the metric store (every 10 s)."""
+        now = time.time()
+        if now - self._history_updated < 10:
+            return
+        self._history_updated = now
+        try:
+            if self.metric_store is None:
+                from core.metrics_store import MetricStore
+                self.metric_store = MetricStore(readonly=True)
+            cpu = self.metric_store.aggregate("cpu_percent", 3600)
+            mem = self.metric_store.aggregate("mem_percent", 3600)
+        except Exception as e:
+            self.lbl_history.setText(f"Last hour: history unavailable ({e})")
+            return
+        if not cpu or not mem:
+            return
+        peak = time.strftime("%H:%M", time.localtime(cpu["max_ts"]))
+        self.lbl_history.setText(
+            f"Last hour: CPU avg {cpu['mean']:.0f}% (peak {cpu['max']:.0f}% at {peak})  |  "
+            f"Memory avg {mem['mean']:.0f}% (peak {mem['max']:.0f}%)"
+        )
 
     def update_stats(self):
+        self.update_latency_panel()
+        self.update_history()
+        
         # CPU
         cpu_percent = psutil.cpu_percent()
         self.lbl_cpu.setText(f"CPU Usage: {cpu_percent}%")
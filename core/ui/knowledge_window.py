@@ -1,12 +1,19 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QLineEdit, QScrollArea, QFrame, 
-                             QGridLayout, QPushButton, QStackedWidget, QSizePolicy)
+                             QGridLayout, QPushButton, QStackedWidget, QSizePolicy,
+                             QTableView, QTextBrowser, QSplitter, QHeaderView, QAbstractItemView)
 from PyQt6.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, QRect
 from PyQt6.QtGui import QColor, QFont, QIcon, QPalette
 from .styles import get_stylesheet, THEME_COLORS
+from .table_models import RecordTableModel, Column, connect_search, RIGHT
+import html
 import json
 import os
+import platform
 from core.runtime_path import get_app_root
+from core.knowledge_index import get_index
+
+_OS_KEYS = {"Windows": "windows", "Linux": "linux", "Darwin": "macos"}
 
 # --- 1. Custom UI Components ---
 
@@ -58,132 +65,6 @@ class ClickableCard(QFrame):
         if self.callback: self.callback()
         super().mousePressEvent(event)
 
-class FunctionCard(QFrame):
-    """Smaller card for individual intents/functions with expand logic."""
-    def __init__(self, tag, data, accent="#39FF14"):
-        super().__init__()
-        self.tag = tag
-        self.data = data
-        self.accent = accent
-        self.expanded = False
-        self.setCursor(Qt.CursorShape.PointingHandCursor)
-        
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: #2a2a2a;
-                border: 1px solid #444;
-                border-radius: 10px;
-                padding: 5px;
-            }}
-            QFrame:hover {{
-                border: 1px solid {accent};
-                background-color: #333;
-            }}
-        """)
-        
-        self.main_layout = QVBoxLayout(self)
-        self.main_layout.setContentsMargins(10, 10, 10, 10)
-        self.main_layout.setSpacing(5)
-
-        # Header Row
-        header = QWidget()
-        h_layout = QHBoxLayout(header)
-        h_layout.setContentsMargins(0, 0, 0, 0)
-        
-        icon = QLabel("⚙️")
-        icon.setFixedWidth(25)
-        h_layout.addWidget(icon)
-        
-        label = QLabel(tag)
-        label.setStyleSheet("color: #eee; font-size: 14px; font-weight: bold; border:none;")
-        h_layout.addWidget(label)
-        
-        self.arrow = QLabel("▼" if self.expanded else "▶")
-        self.arrow.setStyleSheet(f"color: {accent}; font-weight: bold; border:none;")
-        self.arrow.setAlignment(Qt.AlignmentFlag.AlignRight)
-        h_layout.addWidget(self.arrow)
-        
-        self.main_layout.addWidget(header)
-
-        # Hidden Detail Area
-        self.details = QWidget()
-        self.details.setVisible(False)
-        d_layout = QVBoxLayout(self.details)
-        d_layout.setContentsMargins(30, 5, 10, 5)
-        
-        patterns = data.get('patterns', [])
-        if patterns:
-            p_label = QLabel("<b>Triggers:</b>")
-            p_label.setStyleSheet("color: #888; border:none;")
-            d_layout.addWidget(p_label)
-            
-            # Sub-container for extra patterns
-            self.p_container = QWidget()
-            pc_layout = QVBoxLayout(self.p_container)
-            pc_layout.setContentsMargins(0, 0, 0, 0)
-            pc_layout.setSpacing(2)
-            
-            for i, p in enumerate(patterns):
-                pl = QLabel(f"• {p}")
-                pl.setStyleSheet("color: #ccc; font-size: 11px; border:none;")
-                pl.setWordWrap(True)
-                pc_layout.addWidget(pl)
-                if i >= 5: pl.setVisible(False) # Hide extras
-            
-            d_layout.addWidget(self.p_container)
-            
-            if len(patterns) > 5:
-                self.btn_more = QPushButton(f"+ {len(patterns)-5} more...")
-                self.btn_more.setCursor(Qt.CursorShape.PointingHandCursor)
-                self.btn_more.setStyleSheet(f"""
-                    QPushButton {{
-                        color: {accent};
-                        border: 1px solid #444;
-                        border-radius: 5px;
-                        padding: 2px 10px;
-                        font-size: 10px;
-                        text-align: left;
-                    }}
-                    QPushButton:hover {{ background: #444; }}
-                """)
-                self.btn_more.clicked.connect(self.reveal_all_patterns)
-                d_layout.addWidget(self.btn_more)
-
-        responses = data.get('responses', [])
-        if responses:
-            r_label = QLabel("<br><b>Sample Response:</b>")
-            r_label.setStyleSheet("color: #888; border:none;")
-            d_layout.addWidget(r_label)
-            rl = QLabel(responses[0])
-            rl.setStyleSheet("color: #aaa; font-size: 11px; font-style: italic; border:none;")
-            rl.setWordWrap(True)
-            d_layout.addWidget(rl)
-
-        self.main_layout.addWidget(self.details)
-
-    def reveal_all_patterns(self):
-        """Show all hidden pattern labels."""
-        layout = self.p_container.layout()
-        for i in range(layout.count()):
-            layout.itemAt(i).widget().setVisible(True)
-        self.btn_more.setVisible(False)
-
-    def mousePressEvent(self, event):
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.toggle_expand()
-        super().mousePressEvent(event)
-
-    def toggle_expand(self):
-        self.expanded = not self.expanded
-        self.details.setVisible(self.expanded)
-        self.arrow.setText("▼" if self.expanded else "▶")
-        # Update styling to highlight expanded state
-        if self.expanded:
-            self.setStyleSheet(f"QFrame {{ background-color: #333; border: 1.5px solid {self.accent}; border-radius: 10px; padding: 5px; }}")
-        else:
-            self.setStyleSheet(f"QFrame {{ background-color: #2a2a2a; border: 1px solid #444; border-radius: 10px; padding: 5px; }}")
-
-
 # --- 2. Main Window ---
 
 class KnowledgeWindow(QMainWindow):
@@ -231,7 +112,6 @@ class KnowledgeWindow(QMainWindow):
             }
             QLineEdit:focus { border: 1.5px solid #555; }
         """)
-        self.search_bar.textChanged.connect(self.handle_search)
         h_layout.addWidget(self.search_bar)
         
         self.btn_back = QPushButton("← Back")
@@ -258,58 +138,61 @@ class KnowledgeWindow(QMainWindow):
         self.hub_scroll.setWidget(self.hub_content)
         self.stack.addWidget(self.hub_scroll)
         
-        # Page: Category Detail
-        self.detail_scroll = QScrollArea()
-        self.detail_scroll.setWidgetResizable(True)
-        self.detail_scroll.setStyleSheet("background: transparent; border: none;")
-        self.detail_content = QWidget()
-        self.detail_layout = QVBoxLayout(self.detail_content)
-        self.detail_layout.setContentsMargins(40, 20, 40, 40)
-        self.detail_scroll.setWidget(self.detail_content)
-        self.stack.addWidget(self.detail_scroll)
+        # Page: Function list (one category, or search results across all of them).
+        # A table view only builds the rows on screen, so it stays fast for thousands of functions.
+        self.detail_page = QWidget()
+        detail_layout = QVBoxLayout(self.detail_page)
+        detail_layout.setContentsMargins(40, 20, 40, 40)
+        
+        self.detail_title = QLabel()
+        self.detail_title.setStyleSheet("font-size: 24px; font-weight: bold; margin-bottom: 5px;")
+        detail_layout.addWidget(self.detail_title)
+        
+        self.detail_desc = QLabel()
+        self.detail_desc.setStyleSheet("color: #888; margin-bottom: 20px;")
+        detail_layout.addWidget(self.detail_desc)
+        
+        self.function_model = RecordTableModel([
+            Column("Function", "tag"),
+            Column("Category", lambda r: r["category"].replace('_', ' ').capitalize()),
+            Column("Triggers", lambda r: len(r["patterns"]), align=RIGHT),
+            Column("Example", lambda r: r["patterns"][0] if r["patterns"] else ""),
+        ], search_keys=())
+        self.function_table = QTableView()
+        self.function_table.setModel(self.function_model)
+        self.function_table.verticalHeader().setVisible(False)
+        self.function_table.verticalHeader().setDefaultSectionSize(32)
+        self.function_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.function_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.function_table.setColumnWidth(0, 220)
+        self.function_table.setWordWrap(False)
+        self.function_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.function_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.function_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.function_table.selectionModel().currentRowChanged.connect(self.show_function)
+        
+        self.function_details = QTextBrowser()
+        self.function_details.setStyleSheet("background: #1e1e1e; border: 1px solid #333; border-radius: 10px; color: #ccc;")
+        
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        splitter.addWidget(self.function_table)
+        splitter.addWidget(self.function_details)
+        splitter.setSizes([600, 340])
+        detail_layout.addWidget(splitter, stretch=1)
+        self.stack.addWidget(self.detail_page)
 
-        # Metadata Cache
-        self.all_intents = {} # {category: [intents]}
+        # Search index over intents + terminal commands (built once per process, shared with reopenings)
+        self.index = None
+        self.records = []       # one record dict per index entry, by entry id
+        self.current_category = None # None on the search results page
+        connect_search(self.search_bar, self)
         self.load_data()
 
     def load_data(self):
-        intents_dir = os.path.join(get_app_root(), 'data', 'intents')
-        terminal_file = os.path.join(get_app_root(), 'data', 'terminal_commands.json')
-        
-        # 1. Load Intent Files
-        if os.path.exists(intents_dir):
-            files = sorted([f for f in os.listdir(intents_dir) if f.endswith('.json')])
-            for filename in files:
-                cat_key = filename.replace('.json', '')
-                try:
-                    with open(os.path.join(intents_dir, filename), 'r') as f:
-                        data = json.load(f)
-                    self.all_intents[cat_key] = data.get('intents', [])
-                except Exception as e: print(f"[Error] Intent load {filename}: {e}")
-
-        # 2. Load Terminal Commands & Merge
-        if os.path.exists(terminal_file):
-            try:
-                with open(terminal_file, 'r') as f:
-                    term_data = json.load(f)
-                
-                for cat_key, commands in term_data.items():
-                    # Transform to intent format
-                    intent_style_list = []
-                    for cmd_key, cmd_data in commands.items():
-                        intent_style_list.append({
-                            "tag": cmd_key.replace('_', ' ').title(),
-                            "patterns": cmd_data.get('patterns', []),
-                            "responses": ["[Terminal Command] Executes system shell operation."]
-                        })
-                    
-                    if cat_key in self.all_intents:
-                        self.all_intents[cat_key].extend(intent_style_list)
-                    else:
-                        self.all_intents[cat_key] = intent_style_list
-            except Exception as e: print(f"[Error] Terminal load: {e}")
+        self.index = get_index()
+        self.records = [entry._asdict() for entry in self.index.entries]
 
-        # 3. Create Hub Tiles
+        # Create Hub Tiles
         icon_map = {
             "automation": "⚡", "system": "🖥️", "media": "🎵", "general": "💬",
             "files": "📁", "apps": "🚀", "browser": "🌐", "window": "🪟", "workspace": "🏢",
@@ -318,15 +201,15 @@ class KnowledgeWindow(QMainWindow):
         }
         
         row, col = 0, 0
-        categories = sorted(self.all_intents.keys())
+        categories = sorted(self.index.categories.keys())
         for cat_key in categories:
-            intents = self.all_intents[cat_key]
-            if not intents: continue
+            entry_ids = self.index.categories[cat_key]
+            if not entry_ids: continue
             
             cat_name = cat_key.replace('_', ' ').capitalize()
             icon = icon_map.get(cat_key, "📦")
             
-            tile = ClickableCard(cat_name, f"{len(intents)} Functions", icon, self.accent_color, 
+            tile = ClickableCard(cat_name, f"{len(entry_ids)} Functions", icon, self.accent_color, 
                                  lambda c=cat_key: self.show_category(c))
             self.hub_grid.addWidget(tile, row, col)
             
@@ -335,66 +218,75 @@ class KnowledgeWindow(QMainWindow):
                 col = 0
                 row += 1
 
+    def _show_functions(self, query=""):
+        """Fills the function table from the index (ranked when there is a query)."""
+        entries = self.index.search(query, category=self.current_category)
+        self.function_model.set_records([self.records[entry.id] for entry in entries])
+        if entries:
+            self.function_table.selectRow(0)
+        else:
+            self.function_details.setHtml("<p style='color: #888;'>No matching functions.</p>")
+        return len(entries)
+
     def show_category(self, cat_key):
-        """Transition to detailed list for a category."""
-        # Clear previous safely
-        while self.detail_layout.count():
-            child = self.detail_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-            
-        intents = self.all_intents.get(cat_key, [])
+        """Transition to the function list for a category."""
+        self.current_category = cat_key
         cat_name = cat_key.capitalize()
         
-        # Add Title & Summary
-        title = QLabel(f"<span style='color: {self.accent_color};'>{cat_name}</span> Environment")
-        title.setStyleSheet("font-size: 24px; font-weight: bold; margin-bottom: 5px;")
-        self.detail_layout.addWidget(title)
-        
-        desc = QLabel(f"Managed tools and automation for {cat_key} operations.")
-        desc.setStyleSheet("color: #888; margin-bottom: 20px;")
-        self.detail_layout.addWidget(desc)
-        
-        # Add Function List (Full width to avoid stretching neighbors)
-        list_container = QWidget()
-        list_layout = QVBoxLayout(list_container)
-        list_layout.setSpacing(12)
-        self.detail_layout.addWidget(list_container)
-        
-        for i in intents:
-            card = FunctionCard(i['tag'], i, self.accent_color)
-            list_layout.addWidget(card)
-        
-        self.detail_layout.addStretch()
+        self.detail_title.setText(f"<span style='color: {self.accent_color};'>{cat_name}</span> Environment")
+        self.detail_desc.setText(f"Managed tools and automation for {cat_key} operations.")
+        self.search_bar.blockSignals(True)
+        self.search_bar.clear()
+        self.search_bar.blockSignals(False)
+        self._show_functions()
         
         # UI State
         self.breadcrumb.setText(f"KNOWLEDGE HUB > <b>{cat_name.upper()}</b>")
         self.btn_back.setVisible(True)
         self.stack.setCurrentIndex(1)
 
+    def show_function(self, current, previous=None):
+        """Details of the selected function: every trigger, a sample response, the shell command."""
+        if not current.isValid():
+            return
+        record = self.function_model.record(current.row())
+        parts = [f"<h3 style='color: {self.accent_color};'>{html.escape(record['tag'])}</h3>"]
+        if record["patterns"]:
+            parts.append("<b style='color: #888;'>Triggers:</b><ul>")
+            parts.extend(f"<li>{html.escape(p)}</li>" for p in record["patterns"])
+            parts.append("</ul>")
+        if record["responses"]:
+            parts.append("<b style='color: #888;'>Sample Response:</b>")
+            parts.append(f"<p><i>{html.escape(record['responses'][0])}</i></p>")
+        commands = record.get("commands")
+        if isinstance(commands, dict):
+            command = commands.get(_OS_KEYS.get(platform.system(), "linux"))
+            if command:
+                parts.append("<b style='color: #888;'>Runs:</b>")
+                parts.append(f"<p><code>{html.escape(str(command))}</code></p>")
+        self.function_details.setHtml("".join(parts))
+
     def go_home(self):
+        self.current_category = None
         self.stack.setCurrentIndex(0)
         self.btn_back.setVisible(False)
         self.breadcrumb.setText("<b>KNOWLEDGE HUB</b>")
+        self.search_bar.blockSignals(True)
         self.search_bar.clear()
+        self.search_bar.blockSignals(False)
 
-    def handle_search(self, text):
-        """Powerful search that filters either Hub tiles or Detail cards."""
-        text = text.lower()
-        if self.stack.currentIndex() == 0:
-            # Filter Hub Tiles
-            for i in range(self.hub_grid.count()):
-                widget = self.hub_grid.itemAt(i).widget()
-                if isinstance(widget, ClickableCard):
-                    widget.setVisible(text in widget.title_label.text().lower())
+    def set_search(self, text):
+        """Runs once typing pauses (connect_search). Searches the open category, or everything from the hub."""
+        text = text.strip()
+        if self.current_category is None:
+            if not text:
+                self.go_home()
+                return
+            count = self._show_functions(text)
+            self.detail_title.setText(f"<span style='color: {self.accent_color};'>Search</span> Results")
+            self.detail_desc.setText(f"{count} functions match \"{text}\".")
+            self.breadcrumb.setText("KNOWLEDGE HUB > <b>SEARCH</b>")
+            self.btn_back.setVisible(True)
+            self.stack.setCurrentIndex(1)
         else:
-            # Filter Detail Cards
-            # Get the grid inside detail_layout (it's at index 2)
-            grid_widget = self.detail_layout.itemAt(2).widget()
-            grid = grid_widget.layout()
-            for i in range(grid.count()):
-                widget = grid.itemAt(i).widget()
-                if isinstance(widget, FunctionCard):
-                    # Match tag or patterns
-                    match = text in widget.tag.lower() or any(text in p.lower() for p in widget.data.get('patterns', []))
-                    widget.setVisible(match)
+            self._show_functions(text)
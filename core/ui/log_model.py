@@ -0,0 +1,192 @@
+"""
+Cortex Activity Log Model
+
+Keeps the Hub's activity log (every LOG message: user speech, replies,
+predictions, "Executing:" lines) in a fixed-size ring buffer, so the UI
+process uses the same memory after a week as after an hour.
+
+- At most MAX_ENTRIES entries are kept; the oldest fall off the front.
+  Each entry's text is cut at MAX_CHARS.
+- Appends are buffered and applied once per FLUSH_MS frame, as a single
+  row insert (and a single row removal for what fell off). A burst of
+  log lines costs one view update, not one per line.
+- Every entry gets a level (info / warning / error) and a subsystem
+  ("User", "Cortex", "Engine", or the "[Tag]" a line starts with) when it
+  arrives. Filtering by level, subsystem and text rebuilds the visible
+  rows in one pass over the buffer.
+- The model serves a QListView with uniform item sizes, which only draws
+  the rows on screen.
+
+Usage:
+    model = ActivityLogModel()
+    model.append("Executing: file_search")
+    view = QListView(); view.setUniformItemSizes(True); view.setModel(model)
+    model.set_filter(level="warning", subsystem="Engine", text="search")
+    connect_search(filter_input, model)     # debounced text filter (table_models)
+"""
+
+import collections
+import re
+import time
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor
+
+MAX_ENTRIES = 5000
+MAX_CHARS = 2000
+FLUSH_MS = 33               # appends are applied at most once per frame
+
+LEVELS = ("info", "warning", "error")
+_LEVEL_RANK = {level: rank for rank, level in enumerate(LEVELS)}
+_LEVEL_COLORS = {"warning": QColor(255, 191, 0), "error": QColor(255, 85, 85)}
+
+_TAG = re.compile(r"\[([^\]]{1,32})\]")
+_ERROR = re.compile(r"\b(error|errors|failed|failure|exception|traceback)\b", re.IGNORECASE)
+_WARNING = re.compile(r"\b(warning|fallback|unavailable|timed out|not found|could not|couldn't)\b", re.IGNORECASE)
+# Engine lines (CortexEngine._log) start with one of these
+_ENGINE_PREFIXES = ("Executing:", "Predicted:", "Compound:", "Context Override", "Quick Correction", "Fallback:")
+
+LogEntry = collections.namedtuple("LogEntry", ["time", "level", "subsystem", "text", "display"])
+
+
+def classify(message):
+    """(level, subsystem) of a log line."""
+    if message.startswith("User:"):
+        return "info", "User"
+    if message.startswith("Cortex:"):
+        # What the assistant said; its wording is not a log level
+        return "info", "Cortex"
+    match = _TAG.match(message)
+    if match:
+        subsystem = match.group(1).strip()
+    elif message.startswith(_ENGINE_PREFIXES):
+        subsystem = "Engine"
+    else:
+        subsystem = "Other"
+    if _ERROR.search(message):
+        return "error", subsystem
+    if _WARNING.search(message):
+        return "warning", subsystem
+    return "info", subsystem
+
+
+def make_entry(message, timestamp=None):
+    text = str(message)
+    if len(text) > MAX_CHARS:
+        text = text[:MAX_CHARS] + "…"
+    timestamp = time.time() if timestamp is None else timestamp
+    level, subsystem = classify(text)
+    # One line per row: the view uses uniform row heights
+    display = f"{time.strftime('%H:%M:%S', time.localtime(timestamp))}  {' '.join(text.splitlines())}"
+    return LogEntry(timestamp, level, subsystem, text, display)
+
+
+class ActivityLogModel(QAbstractListModel):
+    subsystemsChanged = pyqtSignal()
+
+    def __init__(self, capacity=MAX_ENTRIES, parent=None):
+        super().__init__(parent)
+        self.capacity = max(1, int(capacity))
+        self._entries = collections.deque()     # everything kept, oldest first
+        self._visible = collections.deque()     # the entries that pass the filter, in order
+        self._pending = []
+        self.subsystems = set()
+        self._level = "info"
+        self._subsystem = None
+        self._text = ""
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+    # ── Qt model ──
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._visible)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._visible):
+            return None
+        entry = self._visible[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return entry.display
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return _LEVEL_COLORS.get(entry.level)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{entry.subsystem} · {entry.level}\n{entry.text}"
+        return None
+
+    # ── Appending ──
+
+    def append(self, message):
+        """Buffers a log line; it shows up with the next frame's batch."""
+        self._pending.append(make_entry(message))
+        if len(self._pending) > self.capacity:
+            del self._pending[:-self.capacity]
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """Applies the buffered lines: one removal for evicted rows, one insert for new ones."""
+        self._flush_timer.stop()
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        overflow = len(self._entries) + len(batch) - self.capacity
+        if overflow > 0:
+            evicted = [self._entries.popleft() for _ in range(min(overflow, len(self._entries)))]
+            # Evicted entries are the oldest, so the visible ones among them lead _visible
+            dropped = sum(1 for entry in evicted if self._accepts(entry))
+            if dropped:
+                self.beginRemoveRows(QModelIndex(), 0, dropped - 1)
+                for _ in range(dropped):
+                    self._visible.popleft()
+                self.endRemoveRows()
+
+        self._entries.extend(batch)
+        new_subsystems = {entry.subsystem for entry in batch} - self.subsystems
+        shown = [entry for entry in batch if self._accepts(entry)]
+        if shown:
+            first = len(self._visible)
+            self.beginInsertRows(QModelIndex(), first, first + len(shown) - 1)
+            self._visible.extend(shown)
+            self.endInsertRows()
+        if new_subsystems:
+            self.subsystems |= new_subsystems
+            self.subsystemsChanged.emit()
+
+    def clear(self):
+        self.beginResetModel()
+        self._entries.clear()
+        self._visible.clear()
+        self._pending = []
+        self.endResetModel()
+
+    # ── Filtering ──
+
+    def _accepts(self, entry):
+        if _LEVEL_RANK[entry.level] < _LEVEL_RANK[self._level]:
+            return False
+        if self._subsystem is not None and entry.subsystem != self._subsystem:
+            return False
+        return not self._text or self._text in entry.text.lower()
+
+    def set_filter(self, level="info", subsystem=None, text=""):
+        """Shows entries at `level` or above, from `subsystem` (None = all), containing `text`."""
+        level = level if level in _LEVEL_RANK else "info"
+        text = (text or "").strip().lower()
+        if (level, subsystem, text) == (self._level, self._subsystem, self._text):
+            return
+        self.flush()
+        self._level, self._subsystem, self._text = level, subsystem, text
+        self.beginResetModel()
+        self._visible = collections.deque(entry for entry in self._entries if self._accepts(entry))
+        self.endResetModel()
+
+    def set_search(self, text):
+        """Text filter only, for table_models.connect_search()."""
+        self.set_filter(self._level, self._subsystem, text)
+
+    def __len__(self):
+        return len(self._entries)
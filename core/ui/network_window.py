@@ -0,0 +1,135 @@
+import sys
+import os
+import json
+import time
+from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import QTimer
+from .styles import get_stylesheet
+from core.runtime_path import get_app_root
+from core.network_monitor import NetworkMonitor, is_local_only
+
+
+def _rate(bytes_per_sec):
+    if bytes_per_sec >= 1024 ** 2:
+        return f"{bytes_per_sec / 1024 ** 2:.1f} MB/s"
+    if bytes_per_sec >= 1024:
+        return f"{bytes_per_sec / 1024:.0f} KB/s"
+    return f"{bytes_per_sec:.0f} B/s"
+
+
+class NetworkWindow(QWidget):
+    """Live interface rates, listening ports and per-process connections (refreshes every second)."""
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Cortex - Network Monitor")
+        self.setGeometry(150, 150, 900, 650)
+
+        config_path = os.path.join(get_app_root(), 'data', 'user_config.json')
+        theme = "Neon Green"
+        if os.path.exists(config_path):
+            try:
+                with open(config_path, 'r') as f:
+                    theme = json.load(f).get("theme", "Neon Green")
+            except: pass
+        self.setStyleSheet(get_stylesheet(theme))
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        header = QLabel("Network Monitor")
+        header.setObjectName("Header")
+        layout.addWidget(header)
+
+        self.lbl_totals = QLabel("Collecting...")
+        layout.addWidget(self.lbl_totals)
+
+        self.tbl_interfaces = self._make_table(["Interface", "Download", "Upload", "State"])
+        layout.addWidget(self.tbl_interfaces, stretch=1)
+
+        row = QHBoxLayout()
+        ports_box = QVBoxLayout()
+        lbl = QLabel("Listening Ports")
+        lbl.setObjectName("SubHeader")
+        ports_box.addWidget(lbl)
+        self.tbl_ports = self._make_table(["Port", "Proto", "Address", "Process"])
+        ports_box.addWidget(self.tbl_ports)
+        row.addLayout(ports_box, stretch=3)
+
+        conn_box = QVBoxLayout()
+        lbl = QLabel("Connections by Process")
+        lbl.setObjectName("SubHeader")
+        conn_box.addWidget(lbl)
+        self.tbl_connections = self._make_table(["Process", "Connections"])
+        conn_box.addWidget(self.tbl_connections)
+        row.addLayout(conn_box, stretch=2)
+        layout.addLayout(row, stretch=2)
+
+        self.lbl_events = QLabel("No port changes yet.")
+        self.lbl_events.setWordWrap(True)
+        layout.addWidget(self.lbl_events)
+
+        # Own monitor: stops with the window instead of sampling forever in the UI process
+        self.monitor = NetworkMonitor()
+        self.monitor.start()
+        self._shown_ts = 0.0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(1000)
+
+    def _make_table(self, headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        return table
+
+    def _fill(self, table, rows):
+        table.setRowCount(len(rows))
+        for r, values in enumerate(rows):
+            for c, value in enumerate(values):
+                item = table.item(r, c)
+                if item is None:
+                    item = QTableWidgetItem()
+                    table.setItem(r, c, item)
+                item.setText(str(value))
+
+    def refresh(self):
+        snapshot = self.monitor.latest(wait=False)
+        if snapshot is None or snapshot.ts == self._shown_ts:
+            return
+        self._shown_ts = snapshot.ts
+
+        self.lbl_totals.setText(f"Download {_rate(snapshot.recv_rate)}   |   Upload {_rate(snapshot.sent_rate)}"
+                                f"   |   {snapshot.established} established connections")
+        self._fill(self.tbl_interfaces, [
+            (r.name, _rate(r.recv_rate), _rate(r.sent_rate), "up" if r.is_up else "down")
+            for r in snapshot.interfaces
+        ])
+        self._fill(self.tbl_ports, [
+            (s.port, s.proto.upper(), f"{s.ip}{' (local)' if is_local_only(s) else ''}", s.process)
+            for s in snapshot.listening
+        ])
+        self._fill(self.tbl_connections, snapshot.connections)
+
+        events = self.monitor.port_events()[-3:]
+        if events:
+            self.lbl_events.setText("   ".join(
+                f"{time.strftime('%H:%M:%S', time.localtime(ts))} port {s.port}/{s.proto} {kind} ({s.process})"
+                for ts, kind, s in reversed(events)))
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.monitor.stop()
+        super().closeEvent(event)
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    window = NetworkWindow()
+    window.show()
+    sys.exit(app.exec())
@@ -1,17 +1,21 @@
 import sys
 import platform
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QTimer, QSocketNotifier
 from .status_window import StatusWindow
 # Import Workspace UI components here (runs in UI process)
 from components.workspace.ui import WorkspaceEditor, WorkspaceSelector
 from components.workspace.manager import WorkspaceManager
+from core import tracing
 
 def ui_process_target(status_queue, action_queue, reset_event=None, shutdown_event=None):
     """
     Target function for the UI process.
     Initializes QApplication and the StatusWindow.
     """
+    # Collects TRACE messages from the engine and TTS worker for the Hub latency panel
+    tracer = tracing.configure("ui")
+    
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
     
@@ -33,20 +37,11 @@ def ui_process_target(status_queue, action_queue, reset_event=None, shutdown_eve
     # Manager for UI process
     manager = WorkspaceManager()
 
-    # Timer to check queue without blocking the UI loop
-    timer = QTimer()
-    
     def check_queue():
-        while not status_queue.empty():
+        # Drain everything that arrived since the last wakeup in one batch.
+        # Superseded state changes and search counts are already coalesced by the bus.
+        for status, data in status_queue.drain():
             try:
-                msg = status_queue.get_nowait()
-                
-                # Handle tuple messages
-                if isinstance(msg, tuple):
-                    status, data = msg
-                else:
-                    status, data = msg, None
-
                 if status == "EXIT":
                     app.quit()
                     return
@@ -63,6 +58,9 @@ def ui_process_target(status_queue, action_queue, reset_event=None, shutdown_eve
                     selector.show()
                     track_window(selector)
                     
+                elif status == "TRACE":
+                    tracer.ingest(data)
+
                 elif status == "LOG":
                     # Forward log to StatusWindow -> HubWindow
                     window.log_activity(data)
@@ -150,6 +148,52 @@ def ui_process_target(status_queue, action_queue, reset_event=None, shutdown_eve
                             
                     dlg.finished.connect(on_dlg_close)
 
+                elif status == "NETWORK_MONITOR":
+                    # Raise the open window; a closed one has stopped its monitor, so build a new one
+                    win = getattr(window, '_network_window', None)
+                    if win is None or not win.isVisible():
+                        from .network_window import NetworkWindow
+                        win = NetworkWindow()
+                        track_window(win)
+                        window._network_window = win
+                    win.show()
+                    win.raise_()
+                    win.activateWindow()
+
+                elif status == "SECURITY_SCAN":
+                    # data = progress dict from core.security_scan
+                    scan_win = getattr(window, '_security_scan_window', None)
+                    if scan_win is None or not scan_win.isVisible():
+                        from components.system.scan_gui import BuiltinScanWindow
+                        if data.get("phase") in ("done", "cancelled"):
+                            continue
+                        scan_win = BuiltinScanWindow(action_queue=action_queue)
+                        scan_win.show()
+                        track_window(scan_win)
+                        window._security_scan_window = scan_win
+                    scan_win.update_progress(data)
+
+                elif status == "TASKS":
+                    # data = [task dicts] from core.task_runtime; listed in the capsule's context menu
+                    window.update_tasks(data)
+
+                elif status == "FILE_OPERATION":
+                    # data = progress dict from components.file_manager.transfer
+                    window.update_file_operation(data)
+
+                elif status == "COMMAND_OUTPUT":
+                    # data = job event from core.command_runner; one console keeps every job's output
+                    console = getattr(window, '_command_console', None)
+                    if console is None:
+                        from .command_console import CommandConsole
+                        console = CommandConsole(action_queue=action_queue)
+                        track_window(console)
+                        window._command_console = console
+                    console.handle_event(data)
+                    if data.get("event") == "queued" and not console.isVisible():
+                        console.show()
+                        console.raise_()
+
                 elif status == "PRIMARY_UPDATED":
                     dlg = getattr(window, '_active_automation_list_dlg', None)
                     if dlg and dlg.isVisible():
@@ -162,7 +206,24 @@ def ui_process_target(status_queue, action_queue, reset_event=None, shutdown_eve
                 print(f"UI Process Error: {e}")
                 pass
                 
-    timer.timeout.connect(check_queue)
-    timer.start(30) # Check every 30ms for responsiveness
+    # Wake up only when the engine sends something (event-driven).
+    # Windows pipes can't be watched by QSocketNotifier, so fall back to polling there.
+    fd = status_queue.fileno()
+    if fd is not None:
+        notifier = QSocketNotifier(fd, QSocketNotifier.Type.Read)
+        notifier.activated.connect(check_queue)
+    else:
+        # Poll every 30ms while messages flow; back off to 120ms while the engine is quiet
+        timer = QTimer()
+
+        def poll():
+            if status_queue.empty():
+                timer.setInterval(min(120, timer.interval() + 10))
+                return
+            timer.setInterval(30)
+            check_queue()
+
+        timer.timeout.connect(poll)
+        timer.start(30)
     
     sys.exit(app.exec())
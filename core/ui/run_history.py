@@ -0,0 +1,225 @@
+"""
+Cortex Automation Run History
+
+The "History" page of the Automation Manager: the recorded runs of one
+automation (core.run_journal) and a timeline of the selected run.
+
+- The run table shows start time, duration, status, steps, and the
+  slowest step, so a regression ("Open Target firefox 6.2s") stands out
+  without opening every run.
+- RunTimeline draws one run flame-style: time runs left to right, every
+  node is a bar as long as it took, and nodes of a sub-automation sit one
+  row below the Open Target node that started them. Failed nodes are red.
+  Hovering a bar shows its value, duration and error.
+- While the page is visible the journal file is checked every
+  POLL_MS ms and the table reloads only when it changed, so runs started
+  by voice show up as they finish.
+
+Usage:
+    panel = RunHistoryPanel(accent="#39FF14")
+    panel.show_workflow("Morning Routine")
+"""
+
+import math
+import os
+import time
+
+from PyQt6.QtCore import Qt, QRectF, QTimer
+from PyQt6.QtGui import QColor, QPainter, QPen, QFontMetrics
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableView, QToolTip, QSplitter
+
+from core.run_journal import get_journal, duration, slowest
+from .table_models import RecordTableModel, SearchFilterProxy, Column, configure_view, RIGHT
+
+POLL_MS = 2000
+RUN_LIMIT = 200             # runs listed per automation
+ROW_H = 22
+AXIS_H = 18
+MIN_BAR_W = 2
+
+STATUS_COLORS = {"ok": "#39FF14", "failed": "#FF5555", "cancelled": "#FFBF00",
+                 "stopped": "#FFBF00", "interrupted": "#888888"}
+# Bar colors by node type (node colors of the editor, plus one per slow-prone step type)
+TYPE_COLORS = {"Start": "#39FF14", "End": "#FF3131", "If Condition": "#B388FF",
+               "Open Target": "#FFB000", "System Command": "#FF7F50", "Delay": "#555555",
+               "Speak": "#00BFFF"}
+DEFAULT_COLOR = "#00FFFF"
+FAILED_COLOR = "#FF5555"
+
+
+def _seconds(value):
+    return f"{value * 1000:.0f} ms" if value < 1 else f"{value:.2f} s"
+
+
+class RunTimeline(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.run = None
+        self._bars = []         # [(QRectF, NodeSpan)] of the last paint, for tooltips
+        self.setMouseTracking(True)
+        self.setMinimumHeight(AXIS_H + 3 * ROW_H)
+
+    def set_run(self, run):
+        self.run = run
+        depth = max((n.depth for n in run.nodes), default=0) if run else 0
+        self.setMinimumHeight(AXIS_H + (depth + 2) * ROW_H)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#0e0e0e"))
+        self._bars = []
+        if self.run is None or not self.run.nodes:
+            painter.setPen(QColor("#555"))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter,
+                             "Select a run" if self.run is None else "No steps recorded")
+            return
+
+        total = max(duration(self.run), 1e-3)
+        left, width = 6.0, max(1.0, self.width() - 12.0)
+        scale = width / total
+
+        # Time axis: about one tick per 80 px, on a 1-2-5 step
+        painter.setPen(QColor("#444"))
+        step = total / max(1, int(width / 80))
+        magnitude = 10 ** math.floor(math.log10(step))
+        step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= step)
+        tick = 0.0
+        while tick <= total:
+            x = left + tick * scale
+            painter.drawLine(int(x), AXIS_H - 4, int(x), self.height())
+            painter.drawText(int(x) + 3, AXIS_H - 6, _seconds(tick))
+            tick += step
+
+        metrics = QFontMetrics(painter.font())
+        for span in self.run.nodes:
+            x = left + (span.start - self.run.started) * scale
+            w = max(MIN_BAR_W, (span.end - span.start) * scale)
+            rect = QRectF(x, AXIS_H + span.depth * ROW_H + 2, w, ROW_H - 4)
+            color = QColor(FAILED_COLOR if not span.ok else TYPE_COLORS.get(span.type, DEFAULT_COLOR))
+            painter.setPen(QPen(color.darker(150), 1))
+            painter.setBrush(color)
+            painter.drawRect(rect)
+            text = f"{span.type} {_seconds(span.end - span.start)}"
+            if metrics.horizontalAdvance(text) + 6 <= w:
+                painter.setPen(QColor("black"))
+                painter.drawText(rect.adjusted(3, 0, -3, 0), Qt.AlignmentFlag.AlignVCenter, text)
+            self._bars.append((rect, span))
+
+    def mouseMoveEvent(self, event):
+        pos = event.position()
+        for rect, span in reversed(self._bars):
+            if rect.contains(pos):
+                lines = [f"<b>{span.type}</b> — {_seconds(span.end - span.start)}"]
+                if span.label:
+                    lines.append(span.label)
+                if span.workflow:
+                    lines.append(f"in {span.workflow}")
+                if span.error:
+                    lines.append(f"<span style='color:{FAILED_COLOR}'>{span.error}</span>")
+                QToolTip.showText(event.globalPosition().toPoint(), "<br>".join(lines), self)
+                return
+        QToolTip.hideText()
+
+
+class RunHistoryPanel(QWidget):
+    def __init__(self, accent="#39FF14", parent=None):
+        super().__init__(parent)
+        self.workflow = None
+        self._mtime = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        self.summary = QLabel("")
+        self.summary.setStyleSheet("color: #888; font-size: 11px;")
+        layout.addWidget(self.summary)
+
+        self.model = RecordTableModel([
+            Column("Started", lambda r: time.strftime("%d %b %H:%M:%S", time.localtime(r["run"].started)),
+                   sort=lambda r: r["run"].started),
+            Column("Duration", lambda r: _seconds(r["duration"]), align=RIGHT, sort=lambda r: r["duration"]),
+            Column("Status", lambda r: r["run"].status, color=lambda r: STATUS_COLORS.get(r["run"].status)),
+            Column("Steps", lambda r: len(r["run"].nodes), align=RIGHT, sort=lambda r: len(r["run"].nodes)),
+            Column("Slowest step", "slowest", sort=lambda r: r["slowest_s"]),
+        ], search_keys=("slowest",))
+        self.proxy = SearchFilterProxy(self.model)
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        configure_view(self.table, row_height=26)
+        self.table.sortByColumn(0, Qt.SortOrder.DescendingOrder)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setStyleSheet(f"QTableView {{ background: #0e0e0e; border: 1px solid #232323; }}"
+                                 f" QTableView::item:selected {{ background: {accent}22; }}")
+        self.table.selectionModel().currentRowChanged.connect(self._on_row_changed)
+
+        self.timeline = RunTimeline()
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self.table)
+        splitter.addWidget(self.timeline)
+        splitter.setSizes([220, 140])
+        layout.addWidget(splitter, stretch=1)
+
+        self._poll = QTimer(self)
+        self._poll.setInterval(POLL_MS)
+        self._poll.timeout.connect(self._reload_if_changed)
+
+    def show_workflow(self, name):
+        self.workflow = name
+        self._mtime = None
+        self._reload_if_changed()
+
+    def _journal_mtime(self):
+        try:
+            return os.stat(get_journal().path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _reload_if_changed(self):
+        mtime = self._journal_mtime()
+        if mtime == self._mtime and self._mtime is not None:
+            return
+        self._mtime = mtime
+        self.reload()
+
+    def reload(self):
+        selected = self.timeline.run.id if self.timeline.run else None
+        runs = get_journal().load_runs(workflow=self.workflow, limit=RUN_LIMIT) if self.workflow else []
+        records = []
+        for run in runs:
+            top = slowest(run)
+            text = ""
+            if top:
+                text = " ".join(filter(None, [top.type, top.label, f"({_seconds(top.end - top.start)})"]))
+            records.append({"run": run, "duration": duration(run), "slowest": text,
+                            "slowest_s": top.end - top.start if top else 0.0})
+        self.model.set_records(records)
+
+        failed = sum(1 for r in runs if r.status == "failed")
+        if runs:
+            mean = sum(duration(r) for r in runs) / len(runs)
+            self.summary.setText(f"{len(runs)} runs  ·  {failed} failed  ·  average {_seconds(mean)}")
+        else:
+            self.summary.setText("No runs recorded yet.")
+
+        # Keep the selected run, or show the top row (the newest under the default sort)
+        row = self.model.find_row(lambda r: r["run"].id == selected) if selected else -1
+        if row >= 0:
+            self.table.setCurrentIndex(self.proxy.mapFromSource(self.model.index(row, 0)))
+        elif self.proxy.rowCount() > 0:
+            self.table.setCurrentIndex(self.proxy.index(0, 0))
+        else:
+            self.timeline.set_run(None)
+
+    def _on_row_changed(self, current, _previous):
+        if current.isValid():
+            self.timeline.set_run(self.proxy.record(current.row())["run"])
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._reload_if_changed()
+        self._poll.start()
+
+    def hideEvent(self, event):
+        self._poll.stop()
+        super().hideEvent(event)
@@ -11,7 +11,6 @@ import os
 from .styles import get_stylesheet
 from core.runtime_path import get_app_root
 import requests
-import pyaudio
 
 class VoiceDownloadThread(QThread):
     progress = pyqtSignal(int)
@@ -570,8 +569,8 @@ class SettingsWindow(QMainWindow):
                 text = "This is a test of your voice settings."
                 
                 if os_type == 'Windows':
-                    import pyaudio
                     import audioop
+                    from core.audio_io import get_backend
                     
                     piper_proc = subprocess.Popen(
                         [piper_bin, '--model', model_path, '--output_raw', '--length_scale', str(length_scale)], 
@@ -580,8 +579,7 @@ class SettingsWindow(QMainWindow):
                         stderr=subprocess.DEVNULL
                     )
 
-                    p = pyaudio.PyAudio()
-                    stream = p.open(format=pyaudio.paInt16, channels=1, rate=22050, output=True)
+                    stream = get_backend().open_playback(rate=22050, channels=1)
 
                     piper_proc.stdin.write(text.encode('utf-8'))
                     piper_proc.stdin.close()
@@ -599,9 +597,7 @@ class SettingsWindow(QMainWindow):
                             
                         stream.write(data)
                     
-                    stream.stop_stream()
                     stream.close()
-                    p.terminate()
                     piper_proc.wait()
                     
                 else:
@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import QMainWindow, QWidget, QLabel, QMenu, QApplication
 from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QRect, QRectF, QEasingCurve, QPoint
-from PyQt6.QtGui import QColor, QPainter, QBrush, QPen, QRadialGradient, QAction
+from PyQt6.QtGui import QColor, QPainter, QBrush, QPen, QRadialGradient, QAction, QPixmap
 import ctypes
 import platform
 import os
@@ -8,8 +8,18 @@ import json
 import math
 import random
 import re
+import time
 from core.runtime_path import get_app_root
 
+# Frame interval (ms) per animated state. IDLE and LISTENING draw a static
+# scene, so the animation timer stops and the overlay costs no CPU there.
+FRAME_MS = {"SPEAKING": 50, "THINKING": 33, "PROCESSING": 33}
+LOADER_FRAME_MS = 40            # search / file operation loaders spinning
+BASE_FRAME_MS = 25              # animation speeds are tuned per 25 ms step
+# Windows needs frequent re-assertion to stay above the taskbar; elsewhere the
+# window flags already keep it on top and raise_() is only a safety net
+TOPMOST_MS = 200 if platform.system() == "Windows" else 1000
+
 class StatusWindow(QMainWindow):
 
     def __init__(self, reset_event=None, shutdown_event=None, action_queue=None):
@@ -74,6 +84,11 @@ class StatusWindow(QMainWindow):
         self.action_queue = action_queue
         self.active_searches = {} # { query: { 'count': 0, 'progress': 0.0 } }
         self.hovered_search = None # Currently hovered query name
+        self.running_tasks = [] # Queued/running engine tasks (core.task_runtime), newest snapshot
+        
+        # Activity log ring buffer (shown by the Hub; kept here so it survives the Hub closing)
+        from .log_model import ActivityLogModel
+        self.activity_log = ActivityLogModel(parent=self)
         self.setMouseTracking(True)
         
         # Cursor Update based on lock
@@ -87,15 +102,16 @@ class StatusWindow(QMainWindow):
             "knowledge": None
         }
         
-        # Timer for animation
+        # Timer for animation: only runs while something moves (see _schedule_animation)
         self.anim_timer = QTimer()
         self.anim_timer.timeout.connect(self.animate)
-        self.anim_timer.start(25) # 40 FPS for smoother motion
+        self._last_frame = None
+        self._bg_cache = None # (key, QPixmap) of the capsule background
         
         # Enforce Always on Top (All Platforms)
         self.top_timer = QTimer()
         self.top_timer.timeout.connect(self.enforce_topmost)
-        self.top_timer.start(200) # Increased frequency (200ms) for Windows Taskbar dominance
+        self.top_timer.start(TOPMOST_MS)
 
         # Colors - Neon Palette
         self.colors = {
@@ -283,7 +299,9 @@ class StatusWindow(QMainWindow):
         if event.button() == Qt.MouseButton.LeftButton and self.hovered_search:
             if self.action_queue:
                 q = self.hovered_search
-                self.action_queue.put(("CANCEL_SEARCH", q))
+                # File transfers carry their own cancel message
+                entry = self.active_searches.get(q, {})
+                self.action_queue.put(entry.get("cancel", ("CANCEL_SEARCH", q)))
                 # Instantly remove from UI to prevent spam and ensure snappy response
                 if q in self.active_searches:
                     del self.active_searches[q]
@@ -398,6 +416,22 @@ class StatusWindow(QMainWindow):
         
         menu.addSeparator()
 
+        # --- Running Tasks (each entry cancels its task) ---
+        tasks_menu = menu.addMenu(f"⏳ Running Tasks ({len(self.running_tasks)})")
+        tasks_menu.setStyleSheet(menu.styleSheet())
+        if not self.running_tasks:
+            idle_action = QAction("No running tasks", self)
+            idle_action.setEnabled(False)
+            tasks_menu.addAction(idle_action)
+        for task in self.running_tasks:
+            state = "queued" if task["state"] == "queued" else f"{int(task['elapsed'])}s"
+            task_action = QAction(f"✖ {task['name']}  ({state})", self)
+            task_action.setToolTip("Cancel this task")
+            task_action.triggered.connect(lambda checked=False, tid=task["id"]: self.cancel_task(tid))
+            tasks_menu.addAction(task_action)
+
+        menu.addSeparator()
+
         # --- System Actions ---
         reset_action = QAction("🔄 Reset Assistant", self)
         reset_action.triggered.connect(self.reset_assistant)
@@ -419,9 +453,8 @@ class StatusWindow(QMainWindow):
             QApplication.quit()
 
     def log_activity(self, message):
-        """Forward log message to Hub if it is open."""
-        if self.windows["hub"] and self.windows["hub"].isVisible():
-            self.windows["hub"].add_log_entry(message)
+        """Keep the log line in the bounded activity log; the Hub shows it when open."""
+        self.activity_log.append(message)
 
     def open_module(self, module_name):
         """Lazy load and show the requested UI module."""
@@ -431,7 +464,7 @@ class StatusWindow(QMainWindow):
                 
                 if module_name == "hub":
                     from core.ui.hub_window import HubWindow
-                    self.windows["hub"] = HubWindow()
+                    self.windows["hub"] = HubWindow(log_model=self.activity_log)
                     
                 elif module_name == "automation":
                     from core.ui.automation_window import AutomationWindow
@@ -466,8 +499,11 @@ class StatusWindow(QMainWindow):
     def update_status(self, status, data=None):
         # Validate status to prevent resizing from unexpected data
         valid_states = ["IDLE", "LISTENING", "THINKING", "SPEAKING", "PROCESSING"]
-        if status in valid_states:
+        if status in valid_states and status != self.current_state:
             self.current_state = status
+            if status == "IDLE":
+                self.bar_heights = [5, 5, 5, 5, 5]
+            self._schedule_animation()
             self.update() # Trigger repaint
 
     def set_searching_state(self, msg_data):
@@ -486,6 +522,7 @@ class StatusWindow(QMainWindow):
                 self.active_searches.clear()
         
         self._update_window_width()
+        self._schedule_animation()
         self.update()
     
     def update_search_count(self, msg_data):
@@ -494,8 +531,31 @@ class StatusWindow(QMainWindow):
             query, count = msg_data
             if query in self.active_searches:
                 self.active_searches[query]["count"] = count
-                self.update()
+                self.update(self._loaders_rect())
                 
+    def update_file_operation(self, state):
+        """Shows a file transfer as a loader next to the searches, with its percentage."""
+        key = state.get("label", "File operation")
+        if state.get("phase") in ("done", "cancelled"):
+            self.active_searches.pop(key, None)
+        else:
+            entry = self.active_searches.setdefault(key, {
+                "count": 0, "progress": 0.0, "suffix": "%",
+                "cancel": ("CANCEL_FILE_OPERATION", state.get("op")),
+            })
+            entry["count"] = state.get("percent", 0)
+        self._update_window_width()
+        self._schedule_animation()
+        self.update()
+
+    def update_tasks(self, tasks):
+        """Keeps the latest list of engine tasks for the context menu."""
+        self.running_tasks = list(tasks or [])
+
+    def cancel_task(self, task_id):
+        if self.action_queue:
+            self.action_queue.put(("CANCEL_TASK", task_id))
+
     def _update_window_width(self):
         """Dynamically expand to the left based on active searches."""
         n = len(self.active_searches)
@@ -509,6 +569,30 @@ class StatusWindow(QMainWindow):
             self.setFixedSize(new_width, self.height_val)
             self.move(self.x() - diff, self.y())
     
+    def _schedule_animation(self):
+        """Runs the animation timer at the pace the current scene needs, or stops it when nothing moves."""
+        intervals = []
+        if self.isVisible():
+            if self.current_state in FRAME_MS:
+                intervals.append(FRAME_MS[self.current_state])
+            if self.active_searches:
+                intervals.append(LOADER_FRAME_MS)
+        if not intervals:
+            self.anim_timer.stop()
+            self._last_frame = None
+            return
+        interval = min(intervals)
+        if not self.anim_timer.isActive() or self.anim_timer.interval() != interval:
+            self.anim_timer.start(interval)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._schedule_animation()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._schedule_animation()
+
     def closeEvent(self, event):
         """Stop timers before closing to prevent Qt event loop crashes."""
         self.anim_timer.stop()
@@ -517,15 +601,20 @@ class StatusWindow(QMainWindow):
 
     def animate(self):
         try:
+            # Advance by the real time since the last frame, so motion speed
+            # doesn't depend on the state's frame interval
+            now = time.monotonic()
+            step = 1.0 if self._last_frame is None else min(4.0, (now - self._last_frame) * 1000.0 / BASE_FRAME_MS)
+            self._last_frame = now
+
             if self.current_state == "SPEAKING":
                 # Beatbox Animation: Randomize bar heights
                 self.bar_heights = [random.randint(5, 20) for _ in range(5)]
-                self.update()
                 
             elif self.current_state == "THINKING":
                 # Superimposed Sine Waves (Brain Waves)
                 # Use two waves with different frequencies and phases for organic look
-                self.wave_phase += 0.2
+                self.wave_phase += 0.2 * step
                 
                 for i in range(5):
                     # Primary slow wave
@@ -537,12 +626,11 @@ class StatusWindow(QMainWindow):
                     combined = (val1 + val2) / 2 # -1 to 1
                     height = 10 + (combined * 7) 
                     self.bar_heights[i] = max(3, int(height))
-                self.update()
 
             elif self.current_state == "PROCESSING":
                 # Smooth Gaussian Wave (Knight Rider / Cylon effect)
                 speed = 0.4
-                self.wave_phase += speed
+                self.wave_phase += speed * step
                 
                 # Ping-pong the peak position between 0 and 4
                 # Use sine to oscillate between -1 and 1, map to 0-4
@@ -561,69 +649,85 @@ class StatusWindow(QMainWindow):
                     # Map intensity (0 to 1) to height (5 to 22)
                     height = 5 + (intensity * 17)
                     self.bar_heights[i] = int(height)
-                self.update()
-                
-            elif self.current_state == "LISTENING":
-                # Pulse Animation (Gentle Breathing)
-                if self.wave_amplitude >= 15:
-                    self.pulse_direction = -1
-                elif self.wave_amplitude <= 5:
-                    self.pulse_direction = 1
-                    
-                self.wave_amplitude += self.pulse_direction * 0.5
-                self.bar_heights = [int(self.wave_amplitude)] * 5
-                self.update()
-                
-            elif self.current_state == "IDLE":
-                # Static low bars
-                self.bar_heights = [5, 5, 5, 5, 5]
-                self.update()
+
+            # Only the moving parts are repainted; the capsule comes from its cached pixmap
+            if self.current_state in FRAME_MS:
+                self.update(self._bars_rect())
 
             # Handle concurrent search rotations independent of AI state
             if self.active_searches:
                 for query, data in self.active_searches.items():
-                    data["progress"] = (data["progress"] + 0.02) % 1.0
-                self.update()
+                    data["progress"] = (data["progress"] + 0.02 * step) % 1.0
+                self.update(self._loaders_rect())
         except Exception as e:
             # Silently ignore animation errors to prevent crashes
             pass
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Background Capsule
+    # ── Geometry shared by paintEvent and the partial repaints ──
+
+    def _capsule_rect(self):
         margin_x = 20.0
         margin_y = 8.0
-        capsule_width = float(self.width()) - (2.0 * margin_x)
-        capsule_height = float(self.height()) - (2.0 * margin_y)
-        capsule_rect = QRectF(margin_x, margin_y, capsule_width, capsule_height)
-        
-        if not self.live_invisible:
-            if self.live_transparency:
-                # Transparent mode: use background color with specific alpha
-                bg_color = QColor(self.live_bg_color)
-                bg_color.setAlpha(self.live_bg_opacity)
-            else:
-                # Solid mode: use background color as is
-                bg_color = QColor(self.live_bg_color)
-                bg_color.setAlpha(255)
+        return QRectF(margin_x, margin_y,
+                      float(self.width()) - (2.0 * margin_x),
+                      float(self.height()) - (2.0 * margin_y))
 
+    def _content_rect(self, capsule_rect):
+        padding_for_searches = max(0.0, len(self.active_searches) * 40.0)
+        return QRectF(
+            capsule_rect.x() + padding_for_searches,
+            capsule_rect.y(),
+            capsule_rect.width() - padding_for_searches,
+            capsule_rect.height()
+        )
+
+    def _bars_rect(self):
+        """Area of the bar visualizer (tallest bar: 22 * 1.5 px)."""
+        content_rect = self._content_rect(self._capsule_rect())
+        total_width = (5.0 * 8.0) + (4.0 * 4.0)
+        start_x = content_rect.x() + (content_rect.width() - total_width) / 2.0
+        mid_y = content_rect.center().y()
+        return QRectF(start_x, mid_y - 17.0, total_width, 34.0).toAlignedRect().adjusted(-2, -2, 2, 2)
+
+    def _loaders_rect(self):
+        """Area of the search / file operation loaders, left of the content."""
+        capsule_rect = self._capsule_rect()
+        return QRect(0, 0, int(capsule_rect.x() + len(self.active_searches) * 40.0) + 4, self.height())
+
+    def _background_pixmap(self):
+        """The capsule background, rendered once per size / color / opacity."""
+        dpr = self.devicePixelRatioF()
+        bg_color = QColor(self.live_bg_color)
+        bg_color.setAlpha(self.live_bg_opacity if self.live_transparency and self.live_bg_opacity is not None else 255)
+        key = (self.width(), self.height(), dpr, bg_color.rgba())
+        if self._bg_cache is None or self._bg_cache[0] != key:
+            pixmap = QPixmap(max(1, round(self.width() * dpr)), max(1, round(self.height() * dpr)))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            capsule_rect = self._capsule_rect()
             painter.setBrush(QBrush(bg_color))
             painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRoundedRect(capsule_rect, capsule_height/2.0, capsule_height/2.0)
+            painter.drawRoundedRect(capsule_rect, capsule_rect.height() / 2.0, capsule_rect.height() / 2.0)
+            painter.end()
+            self._bg_cache = (key, pixmap)
+        return self._bg_cache[1]
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        # Background Capsule (transparent mode uses the background color's alpha, solid mode is opaque)
+        capsule_rect = self._capsule_rect()
+        if not self.live_invisible:
+            painter.drawPixmap(0, 0, self._background_pixmap())
             
         # Content based on state
         state_color = self.colors.get(self.current_state, self.colors["IDLE"])
         
         # ─── DYNAMIC LAYOUT FOR SEARCH ───
-        padding_for_searches = max(0.0, len(self.active_searches) * 40.0) 
-        content_rect = QRectF(
-            capsule_rect.x() + padding_for_searches,
-            capsule_rect.y(),
-            capsule_rect.width() - padding_for_searches,
-            capsule_rect.height()
-        )
+        content_rect = self._content_rect(capsule_rect)
 
         if self.current_state in ["IDLE", "LISTENING"]:
             # Draw Text
@@ -728,9 +832,10 @@ class StatusWindow(QMainWindow):
                     
                     count_text = str(data["count"])
                     if data["count"] > 999: count_text = "99+"
+                    count_text += data.get("suffix", "")
                     
                     painter.setPen(QColor("#FFFFFF"))
-                    font.setPointSize(8 if len(count_text) > 2 else 9)
+                    font.setPointSize(7 if len(count_text) > 3 else 8 if len(count_text) > 2 else 9)
                     painter.setFont(font)
                     painter.drawText(circle_rect, Qt.AlignmentFlag.AlignCenter, count_text)
 
@@ -0,0 +1,245 @@
+"""
+Cortex Table Models
+
+Model/view building blocks for the list windows (Apps, Drivers, Services),
+which show thousands of rows.
+
+- RecordTableModel serves a list of dicts through QAbstractTableModel. The
+  view asks for visible cells only, so nothing is built per row up front.
+  A lowercase search string is precomputed for every record when the list
+  is set.
+- SearchFilterProxy filters on that precomputed string (one substring test
+  per row, no per-cell lookups) and sorts on per-column sort keys.
+- connect_search() debounces a QLineEdit, so the filter runs once typing
+  pauses rather than on every keystroke.
+- ButtonDelegate paints an action button into a cell and reports clicks,
+  instead of creating one QPushButton widget per row.
+
+Usage:
+    model = RecordTableModel([Column("Name", "name"), Column("Size", "size", align=RIGHT)],
+                             search_keys=("name",))
+    proxy = SearchFilterProxy(model)
+    view.setModel(proxy)
+    connect_search(search_input, proxy)
+    view.setItemDelegateForColumn(2, ButtonDelegate(lambda r: "Remove", on_remove, view))
+    model.set_records(apps)
+"""
+
+import collections
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QSortFilterProxyModel, QModelIndex, QTimer, QEvent, QRectF
+from PyQt6.QtGui import QColor, QFont, QPainter
+from PyQt6.QtWidgets import (QStyledItemDelegate, QStyle, QStyleOptionViewItem, QApplication,
+                             QHeaderView, QAbstractItemView)
+
+RECORD_ROLE = Qt.ItemDataRole.UserRole          # the record dict behind a row
+SORT_ROLE = Qt.ItemDataRole.UserRole + 1        # value used for sorting a cell
+SEARCH_DELAY_MS = 150
+
+LEFT = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+CENTER = Qt.AlignmentFlag.AlignCenter
+
+# value: record key or callable(record) -> text
+# color / bold: callable(record) -> "#rrggbb" or None / bool, for per-row styling
+# sort: callable(record) -> sort key (defaults to the lowercase display text)
+Column = collections.namedtuple("Column", ["title", "value", "align", "color", "bold", "sort"],
+                                defaults=(LEFT, None, None, None))
+
+
+def size_sort_key(text):
+    """'12.50 MB' -> 12.5, for sorting size columns numerically ('-' sorts first)."""
+    try:
+        return float(str(text).split()[0])
+    except (ValueError, IndexError):
+        return -1.0
+
+
+class RecordTableModel(QAbstractTableModel):
+    def __init__(self, columns, search_keys=("name",), parent=None):
+        super().__init__(parent)
+        self.columns = list(columns)
+        self.search_keys = tuple(search_keys)
+        self._records = []
+        self._search = []
+        self._bold = QFont()
+        self._bold.setBold(True)
+
+    # ── Records ──
+
+    def set_records(self, records):
+        self.beginResetModel()
+        self._records = list(records)
+        self._search = [self._search_text(r) for r in self._records]
+        self.endResetModel()
+
+    def _search_text(self, record):
+        return "\n".join(str(record.get(key) or "") for key in self.search_keys).lower()
+
+    def records(self):
+        return self._records
+
+    def record(self, row):
+        return self._records[row]
+
+    def search_text(self, row):
+        return self._search[row]
+
+    def find_row(self, predicate):
+        """Source row of the first record matching predicate(record), or -1."""
+        for row, record in enumerate(self._records):
+            if predicate(record):
+                return row
+        return -1
+
+    def record_changed(self, row):
+        """Repaints a row after its record dict was modified in place."""
+        if 0 <= row < len(self._records):
+            self._search[row] = self._search_text(self._records[row])
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columns) - 1))
+
+    # ── QAbstractTableModel ──
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.columns[section].title
+        return None
+
+    def _text(self, column, record):
+        value = column.value(record) if callable(column.value) else record.get(column.value)
+        return "-" if value is None or value == "" else str(value)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._records[index.row()]
+        column = self.columns[index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._text(column, record)
+        if role == RECORD_ROLE:
+            return record
+        if role == SORT_ROLE:
+            return column.sort(record) if column.sort else self._text(column, record).lower()
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return column.align
+        if role == Qt.ItemDataRole.ForegroundRole and column.color:
+            color = column.color(record)
+            return QColor(color) if color else None
+        if role == Qt.ItemDataRole.FontRole and column.bold and column.bold(record):
+            return self._bold
+        return None
+
+
+class SearchFilterProxy(QSortFilterProxyModel):
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+        self.setSourceModel(model)
+        self.setSortRole(SORT_ROLE)
+
+    def set_search(self, text):
+        needle = text.strip().lower()
+        if needle != self._needle:
+            self._needle = needle
+            self.invalidateFilter()
+
+    def lessThan(self, left, right):
+        # Sort keys are plain Python values (numbers, tuples); compare them directly
+        a, b = left.data(SORT_ROLE), right.data(SORT_ROLE)
+        try:
+            return a < b
+        except TypeError:
+            return str(a) < str(b)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return not self._needle or self._needle in self.sourceModel().search_text(source_row)
+
+    def record(self, proxy_row):
+        return self.sourceModel().record(self.mapToSource(self.index(proxy_row, 0)).row())
+
+
+def connect_search(line_edit, proxy, delay=SEARCH_DELAY_MS):
+    """Filters `proxy` from `line_edit` once typing pauses for `delay` ms. Returns the timer."""
+    timer = QTimer(line_edit)
+    timer.setSingleShot(True)
+    timer.setInterval(delay)
+    timer.timeout.connect(lambda: proxy.set_search(line_edit.text()))
+    line_edit.textChanged.connect(lambda _text: timer.start())
+    return timer
+
+
+def configure_view(view, row_height=45, sort_column=0):
+    """Fixed-height rows and no per-row sizing, so only visible rows are ever measured."""
+    vertical = view.verticalHeader()
+    vertical.setVisible(False)
+    vertical.setDefaultSectionSize(row_height)
+    vertical.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    view.setWordWrap(False)
+    view.setMouseTracking(True)     # hover feedback for ButtonDelegate
+    view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    view.setSortingEnabled(True)
+    view.sortByColumn(sort_column, Qt.SortOrder.AscendingOrder)
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """
+    Paints a button in each cell of a column. `label(record)` gives the text
+    (None: plain '-' cell), `color(record)` the background, and
+    `on_click(record)` runs when it is clicked.
+    """
+
+    MARGIN = 6
+
+    def __init__(self, label, on_click, parent=None, color=None):
+        super().__init__(parent)
+        self.label = label
+        self.on_click = on_click
+        self.color = color or (lambda record: "#0078d4")
+
+    def _button_rect(self, option):
+        return QRectF(option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN))
+
+    def paint(self, painter, option, index):
+        record = index.data(RECORD_ROLE)
+        text = self.label(record) if record is not None else None
+        if text is None:
+            super().paint(painter, option, index)
+            return
+
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, opt, painter, opt.widget)
+
+        color = QColor(self.color(record))
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            color = color.lighter(115)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(color)
+        rect = self._button_rect(option)
+        painter.drawRoundedRect(rect, 4, 4)
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QColor("#ffffff"))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            record = index.data(RECORD_ROLE)
+            if record is not None and self.label(record) is not None \
+                    and self._button_rect(option).contains(event.position()):
+                self.on_click(record)
+                return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,214 @@
+"""
+Cortex Workflow Cache
+
+Compiled automations and the launch plans of their Open Target and System
+Command nodes, so running an automation again does no discovery work.
+
+- load_workflow() parses an automation file into nodes, wires (adjacency
+  by output port) and its Start node. The result is kept until the file's
+  mtime changes; sub-automations are compiled once the same way.
+- Each Open Target / System Command node gets a LaunchPlan the first time
+  it runs: what to start (argv, or a path for os.startfile), whether it
+  needs a shell, and the terminal chosen for commands on Linux. The plan
+  replaces the per-run checks: is the value a folder or a file, reading
+  the Exec line of a .desktop file, shutil.which() on every known
+  terminal.
+- A plan records the paths it was resolved from (the target, the
+  executable, the terminal) and whether each existed. Reusing it costs
+  one stat() per path. It is rebuilt when one of them appeared,
+  disappeared or (for files read while planning) changed, when PATH
+  changed, when the workflow file was saved, or after a launch from it
+  failed.
+
+Usage:
+    workflow = load_workflow(path)
+    plan = workflow.plan(node_id, "Open Target", value, find_terminal=engine._find_linux_terminal)
+    try:
+        launch(plan)
+    except OSError:
+        workflow.forget(node_id)
+"""
+
+import collections
+import json
+import os
+import platform
+import shutil
+import subprocess
+import threading
+
+MAX_CACHED_WORKFLOWS = 32
+AUTOMATION_SCHEME = "automations://"
+
+# kind: "launch" (start argv / startfile), "folder" (open a folder), "command" (command in a terminal),
+#       "automation" (run the sub-automation at target), "empty" (no value)
+# startfile: target is passed to os.startfile instead of running argv (Windows)
+# stamps: ((path, state)) where state is True / False (must exist / must not) or an mtime_ns
+LaunchPlan = collections.namedtuple("LaunchPlan", ["kind", "argv", "shell", "startfile", "target", "stamps", "path_env"])
+
+
+def _stamp(path, watch_changes=False):
+    """(path, state) for a plan's validity check; mtime only for files whose content was read."""
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return (path, False)
+    return (path, st.st_mtime_ns if watch_changes else True)
+
+
+def _still_valid(plan):
+    if plan.path_env != os.environ.get("PATH"):
+        return False
+    for path, state in plan.stamps:
+        if _stamp(path, watch_changes=not isinstance(state, bool)) != (path, state):
+            return False
+    return True
+
+
+def _which(program):
+    """Absolute path of `program` (so Popen doesn't search PATH again), or the name as given."""
+    return shutil.which(program) or program
+
+
+def _desktop_exec(desktop_file):
+    """First word of the Exec= line of a .desktop file, or None."""
+    try:
+        with open(desktop_file, encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                if line.startswith("Exec="):
+                    words = line.strip().split("=", 1)[1].split()
+                    return words[0] if words else None
+    except OSError:
+        pass
+    return None
+
+
+def _plan(kind, argv=None, shell=False, startfile=None, target=None, stamps=()):
+    return LaunchPlan(kind, argv, shell, startfile, target, tuple(stamps), os.environ.get("PATH"))
+
+
+def plan_open_target(value, data_dir):
+    """Launch plan of an Open Target node (app, file, folder or automations:// reference)."""
+    if not value:
+        return _plan("empty")
+    if value.startswith(AUTOMATION_SCHEME):
+        sub_file = os.path.join(data_dir, f"{value[len(AUTOMATION_SCHEME):]}.json")
+        return _plan("automation", target=sub_file, stamps=[_stamp(sub_file)])
+
+    system = platform.system()
+    if system == "Windows":
+        # UWP AUMID (contains '!' and is not a path) -> launch via shell:AppsFolder
+        if "!" in value and not os.path.exists(value):
+            return _plan("launch", ["explorer", f"shell:AppsFolder\\{value}"], stamps=[_stamp(value)])
+        return _plan("launch", startfile=value, stamps=[_stamp(value)])
+    if system == "Darwin":
+        # 'open' handles .app bundles, files, folders
+        return _plan("launch", [_which("open"), value], stamps=[_stamp(value)])
+
+    # Linux: .desktop entries are started through their Exec= program
+    if value.endswith(".desktop"):
+        stamps = [_stamp(value, watch_changes=True)]
+        exec_cmd = _desktop_exec(value)
+        if exec_cmd:
+            program = _which(exec_cmd)
+            stamps.append(_stamp(program))
+            return _plan("launch", [program], stamps=stamps)
+        return _plan("launch", [_which("xdg-open"), value], stamps=stamps)
+    return _plan("launch", [_which("xdg-open"), value], stamps=[_stamp(value)])
+
+
+def plan_system_command(value, find_terminal=None):
+    """Launch plan of a System Command node: open a folder, or run the command in a new terminal window."""
+    if not value:
+        return _plan("empty")
+    system = platform.system()
+    if os.path.isdir(value):
+        stamps = [(value, True)]
+        if system == "Windows":
+            return _plan("folder", startfile=value, stamps=stamps)
+        opener = "open" if system == "Darwin" else "xdg-open"
+        return _plan("folder", [_which(opener), value], stamps=stamps)
+
+    # Not a folder (re-planned if one by that name appears)
+    stamps = [_stamp(value)]
+    if system == "Windows":
+        return _plan("command", f'start cmd /k "{value}"', shell=True, stamps=stamps)
+    if system == "Darwin":
+        # Open Terminal.app and run the command
+        apple_script = f'tell application "Terminal" to do script "{value}"'
+        return _plan("command", [_which("osascript"), "-e", apple_script], stamps=stamps)
+    terminal = find_terminal() if find_terminal else None
+    if terminal:
+        terminal = _which(terminal)
+        stamps.append(_stamp(terminal))
+        return _plan("command", [terminal, "-e", "bash", "-c", f'{value}; exec bash'], stamps=stamps)
+    # Fallback: run in background
+    return _plan("command", value, shell=True, stamps=stamps)
+
+
+def launch(plan):
+    """Starts what a "launch" / "folder" / "command" plan describes. Raises on failure."""
+    if plan.startfile is not None:
+        os.startfile(plan.startfile)
+    else:
+        subprocess.Popen(plan.argv, shell=plan.shell)
+
+
+class Workflow:
+    """One compiled automation file."""
+
+    def __init__(self, path, mtime_ns, data):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.data_dir = os.path.dirname(path)
+        self.nodes = {n['id']: n for n in data['nodes']}
+        # Adjacency map: from_id -> {port_tag: [to_ids]}; tag is None, "true" or "false"
+        self.edges = {}
+        for conn in data['connections']:
+            self.edges.setdefault(conn['from'], {}).setdefault(conn.get('from_port'), []).append(conn['to'])
+        self.start_id = next((nid for nid, node in self.nodes.items() if node['type'] == 'Start'), None)
+        self._plans = {}            # node id -> (node type, value, LaunchPlan)
+        self._lock = threading.Lock()
+
+    def plan(self, node_id, node_type, value, find_terminal=None, data_dir=None):
+        """The node's launch plan, reused while it is still valid."""
+        with self._lock:
+            cached = self._plans.get(node_id)
+        if cached and cached[:2] == (node_type, value) and _still_valid(cached[2]):
+            return cached[2]
+        if node_type == 'System Command':
+            plan = plan_system_command(value, find_terminal)
+        else:
+            plan = plan_open_target(value, data_dir or self.data_dir)
+        with self._lock:
+            self._plans[node_id] = (node_type, value, plan)
+        return plan
+
+    def forget(self, node_id):
+        """Drops a node's plan, e.g. after launching from it failed."""
+        with self._lock:
+            self._plans.pop(node_id, None)
+
+
+_workflows = collections.OrderedDict()     # normalized path -> Workflow, least recently used first
+_workflows_lock = threading.Lock()
+
+
+def load_workflow(path):
+    """The compiled workflow at `path`, parsed again only when the file changed."""
+    key = os.path.normcase(os.path.abspath(path))
+    mtime_ns = os.stat(path).st_mtime_ns
+    with _workflows_lock:
+        workflow = _workflows.get(key)
+        if workflow is not None and workflow.mtime_ns == mtime_ns:
+            _workflows.move_to_end(key)
+            return workflow
+
+    with open(path, 'r') as f:
+        workflow = Workflow(path, mtime_ns, json.load(f))
+    with _workflows_lock:
+        _workflows[key] = workflow
+        _workflows.move_to_end(key)
+        while len(_workflows) > MAX_CACHED_WORKFLOWS:
+            _workflows.popitem(last=False)
+    return workflow
@@ -63,6 +63,21 @@ hiddenimports = [
     'core.nlu',
     'core.runtime_path',
     'core.alsa_error',
+    'core.ipc',
+    'core.startup',
+    'core.audio_io',
+    'core.telemetry',
+    'core.process_ranker',
+    'core.network_monitor',
+    'core.security_scan',
+    'core.command_runner',
+    'core.intent_scheduler',
+    'core.location_tracker',
+    'core.task_runtime',
+    'core.run_journal',
+    'core.workflow_cache',
+    'core.knowledge_index',
+    'core.metrics_store',
     'core.engines',
     'core.engines.general',
     'core.engines.static',
@@ -78,12 +93,28 @@ hiddenimports = [
     'core.ui.settings_window',
     'core.ui.knowledge_window',
     'core.ui.automation_window',
+    'core.ui.network_window',
+    'core.ui.table_models',
+    'core.ui.log_model',
+    'core.ui.run_history',
+    'core.ui.command_console',
     'core.ui.styles',
     'components',
     'components.system',
     'components.workspace',
 ]
 
+# core.location_tracker imports jeepney lazily (optional, Linux only)
+if os_type == 'Linux':
+    hiddenimports += ['jeepney', 'jeepney.io.threading']
+
+# core.engines.system imports its components lazily by name, which PyInstaller can't trace
+hiddenimports += [
+    f"components.system.{os.path.splitext(f)[0]}"
+    for f in sorted(os.listdir(os.path.join('components', 'system')))
+    if f.endswith('.py')
+]
+
 # ─── Packages to exclude (reduce bundle size) ───
 excludes = [
     'matplotlib',
@@ -4,6 +4,7 @@ import os
 import sys
 import platform
 from core.ui.process import ui_process_target
+from core.ipc import MessageBus
 
 def cleanup_system(app, ui_process, status_queue):
     """Performs a clean shutdown of all components."""
@@ -20,6 +21,7 @@ def cleanup_system(app, ui_process, status_queue):
     if ui_process and ui_process.is_alive():
         print("[System] Stopping UI...")
         try:
+            # Sent inline, after everything still buffered for the UI
             status_queue.put(("EXIT", None))
             ui_process.join(timeout=2)
             
@@ -93,8 +95,8 @@ if __name__ == "__main__":
         print(f"[Info] Auto-start setup skipped: {e}")
     
     # Create communication queues
-    status_queue = multiprocessing.Queue()
-    action_queue = multiprocessing.Queue()
+    status_queue = MessageBus()
+    action_queue = MessageBus()
     
     # Create reset and shutdown events
     reset_event = multiprocessing.Event()
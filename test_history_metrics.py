@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Test script for the metric history questions (components/system/history.py):
+spoken phrases must pick the right stored metric.
+
+Run from your terminal:
+    python test_history_metrics.py
+"""
+from components.system.history import _parse_metric
+
+
+def test_download_is_network_not_cpu():
+    assert _parse_metric("how much did i download in the last hour") == ("net_recv_rate", "network")
+    assert _parse_metric("when did my downloads spike") == ("net_recv_rate", "network")
+
+
+def test_upload_is_network_not_cpu():
+    assert _parse_metric("how much did i upload today") == ("net_sent_rate", "upload")
+    assert _parse_metric("show uploads over the past 10 minutes") == ("net_sent_rate", "upload")
+
+
+def test_cpu_words_still_match():
+    assert _parse_metric("what was the load in the last hour") == ("cpu_percent", "CPU")
+    assert _parse_metric("processor usage today") == ("cpu_percent", "CPU")
+    assert _parse_metric("how was memory usage") == ("mem_percent", "memory")
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[PASS] {name}")